@@ -15,7 +15,7 @@
 """Cache to manage functions based on their FunctionType."""
 
 import collections
-from typing import Any, NamedTuple, Optional
+from typing import Any, List, NamedTuple, Optional
 
 from tensorflow.core.function.polymorphism import function_type as function_type_lib
 from tensorflow.core.function.polymorphism import type_dispatch
@@ -89,6 +89,16 @@ class FunctionCache:
     else:
       return function_type
 
+  def function_types(
+      self, context: Optional[FunctionContext] = None
+  ) -> List[function_type_lib.FunctionType]:
+    """Returns the FunctionTypes of the functions held for a context."""
+    context = context or FunctionContext()
+    return [
+        function_type for (function_context, function_type) in self._primary
+        if function_context == context
+    ]
+
   # TODO(b/205971333): Remove this function.
   def clear(self):
     """Removes all functions from the cache."""
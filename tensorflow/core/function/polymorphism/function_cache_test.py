@@ -194,6 +194,19 @@ class FunctionCacheTest(test.TestCase):
     self.assertIsNone(cache.lookup(f_type_2))
     self.assertIsNone(cache.lookup(f_type_3))
 
+  def testFunctionTypesArePerContext(self):
+    cache = function_cache.FunctionCache()
+    ctx = function_cache.FunctionContext(0)
+    f_type_1 = make_type(1)
+    f_type_2 = make_type(2)
+    cache.add(MockFunction(f_type_1, "test_1"))
+    cache.add(MockFunction(f_type_2, "test_2"), ctx)
+
+    self.assertEqual(cache.function_types(), [f_type_1])
+    self.assertEqual(cache.function_types(ctx), [f_type_2])
+    self.assertEqual(
+        cache.function_types(function_cache.FunctionContext(1)), [])
+
   def testMostSpecificFunctionCacheKeyIsLookedUp(self):
     ctx = function_cache.FunctionContext(0)
     cache = function_cache.FunctionCache()
@@ -16,6 +16,7 @@
 
 import atexit
 import copy
+import functools
 import queue
 import threading
 import time
@@ -29,6 +30,7 @@ from tensorflow.python.distribute import device_util
 from tensorflow.python.eager import context
 from tensorflow.python.eager import def_function
 from tensorflow.python.eager import executor
+from tensorflow.python.eager import monitoring
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import variables
 from tensorflow.python.saved_model.pywrap_saved_model import metrics
@@ -47,6 +49,20 @@ _ASYNC_CHECKPOINT = "async_checkpoint"
 # to identify TPUEmbedding while avoiding import cycles.
 _TPU_EMBEDDING_ATTR = "_create_copy_for_async_checkpoint"
 
+# The size of the chunks of variables copied to the host by a single function
+# call, when no host memory limit is set.
+_DEFAULT_COPY_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Time the training thread stalls in `save()` waiting for a free host buffer
+# ("wait_for_buffer") and copying the variables to it ("copy_to_host"), and
+# time the async thread spends writing them ("write").
+_async_checkpoint_phase_time_sampler = monitoring.Sampler(
+    "/tensorflow/core/checkpoint/async_checkpoint_phase_time_usecs",
+    monitoring.ExponentialBuckets(10, 2, 30),
+    "Time spent in each phase of an async checkpoint save (us).",
+    "phase",
+)
+
 
 def _get_duration_microseconds(start_time_seconds, end_time_seconds):
   """Calculate the duration between start and end time.
@@ -65,6 +81,37 @@ def _get_duration_microseconds(start_time_seconds, end_time_seconds):
   return round((end_time_seconds - start_time_seconds) * 1000000)
 
 
+def _trackable_size(trackable):
+  """Returns the size of a variable in bytes, or 0 for other trackables."""
+  if (not isinstance(trackable, variables.Variable) or
+      not trackable.shape.is_fully_defined()):
+    return 0
+  return trackable.shape.num_elements() * trackable.dtype.size
+
+
+def _chunk_trackables(trackables, chunk_bytes):
+  """Splits `trackables` into lists of variables of about `chunk_bytes`."""
+  chunks = [[]]
+  chunk_size = 0
+  for trackable in trackables:
+    size = _trackable_size(trackable)
+    if chunks[-1] and chunk_size + size > chunk_bytes:
+      chunks.append([])
+      chunk_size = 0
+    chunks[-1].append(trackable)
+    chunk_size += size
+  return chunks
+
+
+def _copy_trackables_to_cpu(trackables, object_map):
+  """Copies `trackables` to their host copies in `object_map`."""
+  for t in trackables:
+    try:
+      t._copy_trackable_to_cpu(object_map=object_map)  # pylint: disable=protected-access
+    except NotImplementedError as e:
+      logging.warning("Trackable %s skipped due to: %s", t, e)
+
+
 def _get_all_trackables(root, exclude_set):
   """Return the list of checkpointable trackables dependent on `root`.
 
@@ -184,6 +231,18 @@ class AsyncCheckpointHelper:
     # The mapping between the original and the copied resource variables.
     # The copied variables are used for the underlying checkpointing.
     self._object_map = None
+    # The object maps of each host buffer, starting with `self._object_map`.
+    # Up to `experimental_async_max_pending_saves` buffers are created, so that
+    # a save does not need to wait for the previous one to be written.
+    self._object_maps = None
+    # Indices of the buffers which are not being copied to or written.
+    self._free_buffers = queue.Queue()
+    # The total size of the variables copied to a buffer, in bytes.
+    self._buffer_size = 0
+    # Lists of trackables copied to the host by a single function call.
+    self._copy_chunks = None
+    # The copy function of each (buffer index, chunk index).
+    self._copy_functions = {}
     # A list of TPUEmbedding objects included in the checkpoint items.
     self._tpu_embedding_objects = None
     # A list of highest level `Trackable`s we will copy; does not contain
@@ -193,18 +252,15 @@ class AsyncCheckpointHelper:
     self._default_device = device_util.current() or "CPU:0"
     self._default_device = device_util.canonicalize(self._default_device)
 
-    self._save_file_prefix = None
-    self._use_checkpoint_save = False
+    # The number of the last checkpoint passed to the async thread by `save()`,
+    # or None to read it from the save counter.
+    self._last_save_number = None
     self._async_save_thread = None
     # Concurrent queue that coordinates the events for writing/reading the
-    # cpu-copied variables. A 'True' in the queue triggers the async thread to
-    # perform saving; a 'False' breaks the while loop so that the async thread
-    # exits; no other values will be added to the queue.
-    # Maxsize is set to 1 only to ensure the exit procedure. We could have used
-    # queue.join() in _join_async_save_thread(), but queue.join() does not have
-    # a timeout argument. Hence we use queue.put(timeout=300), in case the last
-    # checkpoint takes forever. To achieve that, maxsize needs to be 1.
-    self._queue = queue.Queue(maxsize=1)
+    # cpu-copied variables. A `(buffer_index, file_prefix, use_checkpoint_save,
+    # options)` tuple in the queue triggers the async thread to save the
+    # buffer; a 'False' breaks the while loop so that the async thread exits.
+    self._queue = queue.Queue()
 
     # Register to join the async save thread upon exit.
     atexit.register(self._join_async_save_thread)
@@ -216,19 +272,31 @@ class AsyncCheckpointHelper:
       if _END_TIME_OF_LAST_ASYNC_WRITE is None:
         _END_TIME_OF_LAST_ASYNC_WRITE = time.time()
 
-  @def_function.function
-  def _copy_to_cpu(self):
+  def _copy_to_cpu(self, buffer_index):
     """Copy the checkpointed variables from the accelerator to the host CPU.
 
+    The variables are copied in chunks, each by its own `tf.function`, so that
+    the values in transit to the host are bounded by the chunk size.
+
     TODO(chienchunh): Get the concrete function before firstly called to avoid
                       hangining the accelerators idle during function tracing.
+
+    Args:
+      buffer_index: The index of the host buffer to copy the variables to.
     """
-    for t in self._saveable_trackables:
-      try:
-        t._copy_trackable_to_cpu(object_map=self._object_map)  # pylint: disable=protected-access
-      except NotImplementedError as e:
-        logging.warning("Trackable %s skipped due to: %s", t, e)
+    for chunk_index, chunk in enumerate(self._copy_chunks):
+      copy_function = self._copy_functions.get((buffer_index, chunk_index))
+      if copy_function is None:
+        copy_function = def_function.function(functools.partial(
+            _copy_trackables_to_cpu, chunk, self._object_maps[buffer_index]))
+        self._copy_functions[(buffer_index, chunk_index)] = copy_function
+      copy_function()
 
+    if self._tpu_embedding_objects:
+      self._retrieve_tpu_embedding_variables()
+
+  @def_function.function
+  def _retrieve_tpu_embedding_variables(self):
     for tpu_embedding in self._tpu_embedding_objects:
       tpu_embedding._retrieve_variables()  # pylint: disable=protected-access
 
@@ -238,8 +306,12 @@ class AsyncCheckpointHelper:
       self._checkpoint = self._checkpointer_impl(**self._checkpoint_items)
     return self._checkpoint
 
-  def _ensure_initialized(self):
-    """Initialize the async checkpoint internal state."""
+  def _ensure_initialized(self, options):
+    """Initialize the async checkpoint internal state.
+
+    Args:
+      options: The `CheckpointOptions` of the first save, or None.
+    """
     # This map will be used to store the CPU copy of all checkpointable objects
     self._object_map = object_identity.ObjectIdentityDictionary()
     self._tpu_embedding_objects = []
@@ -299,15 +371,29 @@ class AsyncCheckpointHelper:
 
     # TODO(charlieruan) Figure out a better work around to solve the access
     # out of scope error.
-    for t in self._saveable_trackables:
-      try:
-        t._copy_trackable_to_cpu(object_map=self._object_map)  # pylint: disable=protected-access
-      except NotImplementedError as e:
-        logging.warning("Trackable %s skipped due to: %s", t, e)
+    _copy_trackables_to_cpu(self._saveable_trackables, self._object_map)
 
     for tpu_embedding in self._tpu_embedding_objects:
       tpu_embedding._retrieve_variables()  # pylint: disable=protected-access
 
+    # Buffer 0 holds the copies just made; more are created on demand.
+    self._object_maps = [self._object_map]
+    self._buffer_size = sum(
+        _trackable_size(t) for t in self._saveable_trackables)
+    memory_limit = options and options.experimental_async_host_memory_limit
+    if memory_limit:
+      chunk_bytes = max(1, min(_DEFAULT_COPY_CHUNK_BYTES,
+                               memory_limit - self._buffer_size))
+      if memory_limit < self._buffer_size:
+        logging.warning(
+            "The async checkpoint host memory limit of %d bytes is smaller "
+            "than the %d bytes of variables copied to the host; it will be "
+            "exceeded.", memory_limit, self._buffer_size)
+    else:
+      chunk_bytes = _DEFAULT_COPY_CHUNK_BYTES
+    self._copy_chunks = _chunk_trackables(self._saveable_trackables,
+                                          chunk_bytes)
+
     # Initiate the async thread for checkpoint saving.
     self._async_save_thread = threading.Thread(
         target=self._async_save, daemon=True)
@@ -329,19 +415,20 @@ class AsyncCheckpointHelper:
     """Join the async save thread.
 
     The steps for terminating the async save thread:
-    1). Put will succeed when the last async save event is done. Putting a false
-        triggers the async save thread's while loop to end. We use put instead
-        of sync because sync does not have a timeout argument.
-    2). Join the async save thread. (The thread may finish before joining.)
+    1). Put a False in the queue, after any pending saves. It triggers the
+        async save thread's while loop to end once they are written.
+    2). Join the async save thread, waiting up to 300 seconds for the pending
+        saves. (The thread may finish before joining.)
     """
     try:
-      self._queue.put(False, timeout=300)  # Step-1.
+      self._queue.put(False)  # Step-1.
       logging.info("Joining the async save thread.")
       if self._async_save_thread is not None:
-        self._async_save_thread.join()  # Step-2.
-    except queue.Full:
-      logging.error("Timeout waiting for the async save thread; terminating the"
-                    " thread instead. The last checkpoint may be incomeplete.")
+        self._async_save_thread.join(timeout=300)  # Step-2.
+        if self._async_save_thread.is_alive():
+          logging.error("Timeout waiting for the async save thread; "
+                        "terminating the thread instead. The last checkpoint "
+                        "may be incomeplete.")
     finally:
       self._check_async_thread_error()
 
@@ -350,9 +437,15 @@ class AsyncCheckpointHelper:
     with context.executor_scope(
         executor.new_executor(
             enable_async=False, enable_streaming_enqueue=False)):
-      # The main thread inserts: a True to the queue when the user calls save,
-      # triggering async save; and a False when we exit the Checkpoint instance.
-      while self._queue.get():
+      # The main thread inserts: a `(buffer_index, file_prefix,
+      # use_checkpoint_save, options)` tuple to the queue when the user calls
+      # save, triggering async save; and a False when we exit the Checkpoint
+      # instance.
+      while True:
+        save_request = self._queue.get()
+        if not save_request:
+          break
+        buffer_index, file_prefix, use_checkpoint_save, options = save_request
         logging.info("Starting async checkpoint save on the device: %s",
                      self._default_device)
 
@@ -364,27 +457,31 @@ class AsyncCheckpointHelper:
         # placement, while the main thread's default placement would be the
         # master worker's CPU:0.
         try:
+          # Write the host buffer filled by this save.
+          saver = self.checkpointer()._saver  # pylint: disable=protected-access
+          saver._object_map = self._object_maps[buffer_index]  # pylint: disable=protected-access
           with ops.device(self._default_device):
             with checkpoint_context.async_metrics_context():
-              if self._use_checkpoint_save:
-                self.checkpointer().save(
-                    self._save_file_prefix, self._checkpoint_options
-                )
+              if use_checkpoint_save:
+                self.checkpointer().save(file_prefix, options)
               else:
                 self.checkpointer()._write(  # pylint: disable=protected-access
-                    self._save_file_prefix,
-                    options=self._checkpoint_options,
+                    file_prefix,
+                    options=options,
                 )
         except Exception as e:   # # pylint: disable=broad-except
           self._async_error = e
         finally:
+          self._free_buffers.put(buffer_index)
           self._queue.task_done()
 
         async_save_end_time = time.time()
+        async_save_duration = _get_duration_microseconds(
+            async_save_start_time, async_save_end_time)
         metrics.AddAsyncCheckpointWriteDuration(
-            api_label=_ASYNC_CHECKPOINT,
-            microseconds=_get_duration_microseconds(async_save_start_time,
-                                                    async_save_end_time))
+            api_label=_ASYNC_CHECKPOINT, microseconds=async_save_duration)
+        _async_checkpoint_phase_time_sampler.get_cell("write").add(
+            async_save_duration)
 
         # Measure the elapsed time since the last checkpoint.
         # Due to the nature of async checkpoint, here it actually captures the
@@ -401,6 +498,90 @@ class AsyncCheckpointHelper:
           _END_TIME_OF_LAST_ASYNC_WRITE = async_save_start_time
     logging.info("Async save thread reached the end of the execution.")
 
+  def _max_buffers(self, options):
+    """Returns the number of host buffers saves may be pending on."""
+    if self._tpu_embedding_objects:
+      # The retrieved TPU embedding tables are not double-buffered.
+      return 1
+    max_buffers = 1
+    if options and options.experimental_async_max_pending_saves:
+      max_buffers = options.experimental_async_max_pending_saves
+    memory_limit = options and options.experimental_async_host_memory_limit
+    if memory_limit and self._buffer_size:
+      max_chunk_size = max(
+          sum(_trackable_size(t) for t in chunk) for chunk in self._copy_chunks)
+      max_buffers = min(max_buffers,
+                        (memory_limit - max_chunk_size) // self._buffer_size)
+    return max(1, max_buffers)
+
+  def _acquire_buffer(self, options):
+    """Returns a host buffer no save is pending on.
+
+    A new buffer is created while fewer than `_max_buffers()` exist; otherwise
+    this blocks until the async thread has written one.
+
+    Args:
+      options: The `CheckpointOptions` of the save.
+
+    Returns:
+      A tuple `(buffer_index, populated)`, where `populated` is whether the
+      buffer was just created, and so already holds the current values.
+    """
+    try:
+      return self._free_buffers.get_nowait(), False
+    except queue.Empty:
+      pass
+    if len(self._object_maps) < self._max_buffers(options):
+      # Populate the new buffer outside of a tf.function, like the first one
+      # in `_ensure_initialized()`.
+      object_map = object_identity.ObjectIdentityDictionary()
+      _copy_trackables_to_cpu(self._saveable_trackables, object_map)
+      self._object_maps.append(object_map)
+      return len(self._object_maps) - 1, True
+    return self._free_buffers.get(), False
+
+  def _copy_to_free_buffer(self, options):
+    """Copies the variables to a free host buffer and returns its index."""
+    wait_start_time = time.time()
+    if not self._initialized:
+      self._ensure_initialized(options)
+      buffer_index = 0
+      copy_start_time = time.time()
+    else:
+      # First wait for the async thread to free a host buffer, then copy the
+      # variable values to the host CPU.
+      buffer_index, populated = self._acquire_buffer(options)
+      copy_start_time = time.time()
+      if not populated:
+        self._copy_to_cpu(buffer_index)
+
+    # Surface the error from the async thread, if any.
+    # This step should come after the buffer acquisition step in the above, so
+    # that it makes sure it waits until the previous async save finishes
+    # storing the error.
+    try:
+      self._check_async_thread_error()
+    except Exception:  # pylint: disable=broad-except
+      self._free_buffers.put(buffer_index)
+      raise
+
+    # Need to wait until the weight copying finishes before checkpoint save.
+    context.async_wait()
+    copy_end_time = time.time()
+    _async_checkpoint_phase_time_sampler.get_cell("wait_for_buffer").add(
+        _get_duration_microseconds(wait_start_time, copy_start_time))
+    _async_checkpoint_phase_time_sampler.get_cell("copy_to_host").add(
+        _get_duration_microseconds(copy_start_time, copy_end_time))
+    return buffer_index
+
+  def _next_save_number(self):
+    """Returns the save counter value of the next `save()` call."""
+    if self._last_save_number is None:
+      # No save is pending, so the save counter is up to date.
+      self._last_save_number = self.checkpointer().save_counter.numpy()
+    self._last_save_number += 1
+    return self._last_save_number
+
   def _handle_tpu_embedding(self, tpu_embedding):
     """Handle TPUEmbedding.
 
@@ -479,25 +660,7 @@ class AsyncCheckpointHelper:
     """
     write_start_time = time.time()
 
-    if not self._initialized:
-      self._ensure_initialized()
-    else:
-      # First wait for async thread to finish the previous save, then copy the
-      # variable values to the host CPU.
-      self._queue.join()
-      self._copy_to_cpu()
-
-    # Surface the error from the async thread, if any.
-    # This step should come after the sem acquision step in the above, so that
-    # it makes sure it waits until the previous async save finishes storing the
-    # error.
-    self._check_async_thread_error()
-
-    # Trigger the async thread to checkpoint the cpu-copied variables.
-    # Need to wait until the weight copying finishes before checkpoint save.
-    context.async_wait()
-    self._save_file_prefix = save_path
-    self._use_checkpoint_save = False
+    buffer_index = self._copy_to_free_buffer(options)
 
     # Ensure that we do not request async checkpointing to the underlying
     # checkpointer as this could lead to an infinite loop.
@@ -505,7 +668,9 @@ class AsyncCheckpointHelper:
     if self._checkpoint_options:
       self._checkpoint_options.experimental_enable_async_checkpoint = False
 
-    self._queue.put(True)  # Trigger save in async thread
+    # Trigger save in async thread.
+    self._queue.put(
+        (buffer_index, save_path, False, self._checkpoint_options))
 
     write_end_time = time.time()
     metrics.AddCheckpointWriteDuration(
@@ -531,38 +696,18 @@ class AsyncCheckpointHelper:
     # initialize the internal states like `self._saveable_trackables`. We also
     # populate `self._object_map` (i.e. initializing the cpu-copied variables
     # and copy over the value for the first time) by essentially performing a
-    # `self._copy_to_cpu()`, hence the if-else logic here.
+    # `self._copy_to_cpu()`.
     #
     # This is not performed in the initializer because some variables, e.g.,
     # slot variables of the optimizer, were not created until actually running
     # the train function, so we could only get the complete list of the
     # variables after some train steps were run.
-    if not self._initialized:
-      self._ensure_initialized()
-    else:
-      # First wait for async thread to finish the previous save, then copy the
-      # variable values to the host CPU.
-      self._queue.join()
-      self._copy_to_cpu()
+    buffer_index = self._copy_to_free_buffer(options)
 
-    # Surface the error from the async thread, if any.
-    # This step should come after the sem acquision step in the above, so that
-    # it makes sure it waits until the previous async save finishes storing the
-    # error.
-    self._check_async_thread_error()
-
-    # Retrieve the save counter from the underlying checkpoint object to
-    # re-construct the full path of the checkpoint file.
-    # This step has to happen before triggering the underlying checkpoint;
-    # otherwise, the save_counter value may or may not have been updated.
-    save_counter = self.checkpointer().save_counter.numpy() + 1
-    full_path = "{}-{}".format(save_path, save_counter)
-
-    # Trigger the async thread to checkpoint the cpu-copied variables.
-    # Need to wait until the weight copying finishes before checkpoint save.
-    context.async_wait()
-    self._save_file_prefix = save_path
-    self._use_checkpoint_save = True
+    # Re-construct the full path of the checkpoint file from the save counter
+    # of the underlying checkpoint object, counting the saves still pending in
+    # the async thread.
+    full_path = "{}-{}".format(save_path, self._next_save_number())
 
     # Ensure that we do not request async checkpointing to the underlying
     # checkpointer as this could lead to an infinite loop.
@@ -570,7 +715,9 @@ class AsyncCheckpointHelper:
     if self._checkpoint_options:
       self._checkpoint_options.experimental_enable_async_checkpoint = False
 
-    self._queue.put(True)  # Trigger save in async thread
+    # Trigger save in async thread.
+    self._queue.put(
+        (buffer_index, save_path, True, self._checkpoint_options))
 
     save_end_time = time.time()
     metrics.AddCheckpointWriteDuration(
@@ -617,6 +764,8 @@ class AsyncCheckpointHelper:
 
     # Wait for any ongoing checkpoint event to finish.
     self._queue.join()
+    # The restored save counter numbers the following saves.
+    self._last_save_number = None
     # Restore values of the cpu-copied variables directly back to accelerators
     status = self.checkpointer().restore(save_path, self._checkpoint_options)
 
@@ -30,6 +30,7 @@ from tensorflow.python.checkpoint import async_checkpoint_helper
 from tensorflow.python.checkpoint import checkpoint_context
 from tensorflow.python.checkpoint import checkpoint_management
 from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.checkpoint import functional_saver
 from tensorflow.python.checkpoint import graph_view as graph_view_lib
 from tensorflow.python.checkpoint import restore as restore_lib
@@ -288,6 +289,12 @@ class _CheckpointRestoreCoordinator:
     self.save_path_string = save_path
     self.dtype_map = reader.get_variable_to_dtype_map()
     self.shape_map = reader.get_variable_to_shape_map()
+    # For delta and deduplicated checkpoints, maps the keys of tensors stored
+    # in another checkpoint to the prefix of that checkpoint.
+    if isinstance(reader, delta_checkpoint.DeltaCheckpointReader):
+      self.tensor_locations = reader.tensor_locations
+    else:
+      self.tensor_locations = None
     # A NewCheckpointReader for the most recent checkpoint, for streaming Python
     # state restoration.
     # When graph building, contains a list of ops to run to restore objects from
@@ -367,7 +374,7 @@ class _CheckpointRestoreCoordinator:
       created, to restore `tensor_saveables`.
     """
     if reader is None:
-      reader = py_checkpoint_reader.NewCheckpointReader(self.save_path_string)
+      reader = delta_checkpoint.new_checkpoint_reader(self.save_path_string)
 
     restore_ops = []
     # Eagerly run restorations for Python state.
@@ -381,7 +388,9 @@ class _CheckpointRestoreCoordinator:
           tensor_saveables)
       new_restore_ops = functional_saver.MultiDeviceSaver.from_saveables(
           flat_saveables,
-          registered_savers).restore(self.save_path_tensor, self.options)
+          registered_savers).restore(self.save_path_tensor, self.options,
+                                     tensor_locations=self.tensor_locations,
+                                     reader=reader)
       if not context.executing_eagerly():
         for name, restore_op in sorted(new_restore_ops.items()):
           restore_ops.append(restore_op)
@@ -1234,6 +1243,13 @@ class TrackableSaver:
     # Op caching for restore, shared between _CheckpointRestoreCoordinators
     self._restore_op_cache = {}
 
+    # Digests of the tensors in the last delta or full checkpoint written with
+    # `CheckpointOptions.experimental_delta_chain_length`.
+    self._delta_tracker = delta_checkpoint.DeltaTracker()
+    # Locations of the tensors in the last checkpoint written with
+    # `CheckpointOptions.experimental_deduplicate_tensors`.
+    self._deduplication_tracker = delta_checkpoint.DeduplicationTracker()
+
     # Object map used for checkpoint. This attribute is to be overridden by a
     # Checkpoint subclass, e.g., AsyncCheckpoint, to replace the trackable
     # objects for checkpoint saving.
@@ -1282,6 +1298,13 @@ class TrackableSaver:
     """
     serialized_tensors, feed_additions, registered_savers, graph_proto = (
         self._gather_serialized_tensors(object_graph_tensor))
+    if options.experimental_delta_chain_length:
+      serialized_tensors = self._delta_tracker.filter_unchanged(
+          serialized_tensors, compat.as_str(file_prefix.numpy()),
+          options.experimental_delta_chain_length)
+    elif options.experimental_deduplicate_tensors:
+      serialized_tensors = self._deduplication_tracker.filter_stored(
+          serialized_tensors, compat.as_str(file_prefix.numpy()))
 
     if (self._last_save_object_graph != graph_proto
         # When executing eagerly, we need to re-create SaveableObjects each
@@ -1332,6 +1355,14 @@ class TrackableSaver:
     feed_dict = {}
     use_session = (not context.executing_eagerly() and
                    not ops.inside_function())
+    if (options.experimental_delta_chain_length or
+        options.experimental_deduplicate_tensors) and (
+            use_session or ops.inside_function() or
+            tensor_util.is_tensor(file_prefix)):
+      raise NotImplementedError(
+          "Delta and deduplicated checkpoints (`experimental_delta_chain_length`"
+          " and `experimental_deduplicate_tensors`) can only be saved when "
+          "executing eagerly, with a string `file_prefix`.")
     if checkpoint_number:
       file_prefix = "%s-%d" % (file_prefix, checkpoint_number)
     if use_session:
@@ -1363,6 +1394,11 @@ class TrackableSaver:
     elif session is None:
       session = get_session()
 
+    if options.experimental_delta_chain_length:
+      self._delta_tracker.commit()
+    elif options.experimental_deduplicate_tensors:
+      self._deduplication_tracker.commit()
+
     if session:
       return session.run(save_path, feed_dict=feed_dict)
     elif use_session:
@@ -1453,8 +1489,14 @@ class TrackableSaver:
     global _ASYNC_CHECKPOINT_THREAD
     if _ASYNC_CHECKPOINT_THREAD is not None:
       _ASYNC_CHECKPOINT_THREAD.join()
-    reader = py_checkpoint_reader.NewCheckpointReader(save_path)
+    reader = delta_checkpoint.new_checkpoint_reader(save_path)
     graph_building = not context.executing_eagerly()
+    if graph_building and isinstance(
+        reader, delta_checkpoint.DeltaCheckpointReader):
+      raise NotImplementedError(
+          f"The checkpoint {save_path} reads tensors from other checkpoints "
+          "(a delta or deduplicated checkpoint), which can only be restored "
+          "when executing eagerly.")
     if graph_building:
       dtype_map = None
     else:
@@ -25,6 +25,7 @@ from google.protobuf import text_format
 
 from tensorflow.core.protobuf import saver_pb2
 from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.eager import context
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
@@ -496,6 +497,18 @@ def _delete_file_if_exists(filespec):
           "process/thread is also deleting/moving the same file", pathname)
 
 
+# Name of the file in a `CheckpointManager`'s directory listing the checkpoints
+# removed from the active set which are only kept because a delta or
+# deduplicated checkpoint in it reads from them.
+_PENDING_DELETION_FILENAME = "checkpoint_pending_deletion"
+
+
+def _delete_checkpoint_files(filename):
+  """Deletes the index and data files of the checkpoint `filename`."""
+  _delete_file_if_exists(filename + ".index")
+  _delete_file_if_exists(filename + ".data-?????-of-?????")
+
+
 def meta_graph_filename(checkpoint_filename, meta_graph_suffix="meta"):
   """Returns the meta graph filename.
 
@@ -601,7 +614,11 @@ class CheckpointManager(object):
         checkpoints remain. If `None`, no checkpoints are deleted and everything
         stays in the active set. Note that `max_to_keep=None` will keep all
         checkpoint paths in memory and in the checkpoint state protocol buffer
-        on disk.
+        on disk. Checkpoints which a delta or deduplicated checkpoint in the
+        active set is read from (see `tf.train.CheckpointOptions`) are deleted
+        once no checkpoint in the active set depends on them. Until then they
+        are listed in a "checkpoint_pending_deletion" file in `directory`, so
+        that a new `CheckpointManager` deletes them too.
       keep_checkpoint_every_n_hours: Upon removal from the active set, a
         checkpoint will be preserved if it has been at least
         `keep_checkpoint_every_n_hours` since the last preserved checkpoint. The
@@ -640,6 +657,18 @@ class CheckpointManager(object):
       self._step_counter = step_counter
     self._checkpoint_interval = checkpoint_interval
 
+    # Set once a delta or deduplicated checkpoint is saved (see
+    # `CheckpointOptions.experimental_delta_chain_length` and
+    # `experimental_deduplicate_tensors`). Checkpoints removed from the active
+    # set are then only deleted once no checkpoint in the active set reads
+    # tensors from them.
+    self._saves_delta_checkpoints = False
+    self._delta_bases = {}
+    self._delete_when_unreferenced = collections.OrderedDict()
+    self._pending_deletion_path = os.path.join(
+        directory, _PENDING_DELETION_FILENAME)
+    self._read_pending_deletions()
+
     recovered_state = get_checkpoint_state(directory)
     current_clock = time.time()
     self._maybe_delete = collections.OrderedDict()
@@ -720,12 +749,72 @@ class CheckpointManager(object):
           and (timestamp - self._keep_checkpoint_every_n_hours * 3600.
                >= self._last_preserved_timestamp)):
         self._last_preserved_timestamp = timestamp
+        if self._saves_delta_checkpoints:
+          # The base checkpoints of a preserved delta checkpoint are preserved
+          # with it.
+          for base_prefix in self._get_delta_bases(filename):
+            self._delete_when_unreferenced.pop(base_prefix, None)
         continue
-      _delete_file_if_exists(filename + ".index")
-      _delete_file_if_exists(filename + ".data-?????-of-?????")
+      if self._saves_delta_checkpoints:
+        self._delete_when_unreferenced[filename] = None
+      else:
+        _delete_checkpoint_files(filename)
+    if self._saves_delta_checkpoints:
+      self._delete_unreferenced_checkpoints()
+
+  def _get_delta_bases(self, filename):
+    """Returns the other checkpoints a checkpoint is read from, if any."""
+    if filename not in self._delta_bases:
+      try:
+        self._delta_bases[filename] = delta_checkpoint.get_chain(filename)[1:]
+      except (errors.OpError, ValueError) as e:
+        logging.warning("Unable to read the base checkpoints of %s: %s",
+                        filename, e)
+        return []
+    return self._delta_bases[filename]
+
+  def _delete_unreferenced_checkpoints(self):
+    """Deletes removed checkpoints which no retained checkpoint reads from."""
+    referenced = set()
+    for filename in self._maybe_delete:
+      referenced.update(self._get_delta_bases(filename))
+    for filename in list(self._delete_when_unreferenced):
+      if filename not in referenced:
+        del self._delete_when_unreferenced[filename]
+        self._delta_bases.pop(filename, None)
+        _delete_checkpoint_files(filename)
+
+  def _read_pending_deletions(self):
+    """Recovers the removed checkpoints a previous manager did not delete."""
+    try:
+      if not file_io.file_exists(self._pending_deletion_path):
+        return
+      contents = file_io.read_file_to_string(self._pending_deletion_path)
+    except errors.OpError as e:
+      logging.warning("Unable to read the checkpoints pending deletion from "
+                      "%s: %s", self._pending_deletion_path, e)
+      return
+    self._saves_delta_checkpoints = True
+    for filename in contents.splitlines():
+      if filename:
+        self._delete_when_unreferenced[
+            os.path.join(self._directory, filename)] = None
+
+  def _write_pending_deletions(self):
+    """Saves the removed checkpoints which are not deleted yet."""
+    filenames = []
+    for filename in self._delete_when_unreferenced:
+      if os.path.dirname(filename) == self._directory:
+        filename = os.path.basename(filename)
+      filenames.append(filename + "\n")
+    file_io.atomic_write_string_to_file(
+        self._pending_deletion_path, "".join(filenames))
 
   def _record_state(self):
     """Saves the `CheckpointManager`'s state in `directory`."""
+    if self._saves_delta_checkpoints:
+      # Written first, so that no checkpoint is missing from both files.
+      self._write_pending_deletions()
     filenames, timestamps = zip(*self._maybe_delete.items())
     update_checkpoint_state_internal(
         self._directory,
@@ -778,6 +867,10 @@ class CheckpointManager(object):
     Returns:
       The path to the new checkpoint. It is also recorded in the `checkpoints`
       and `latest_checkpoint` properties. `None` if no checkpoint is saved.
+
+    Raises:
+      ValueError: If the checkpoint would overwrite one which a retained delta
+        or deduplicated checkpoint reads tensors from.
     """
     if self._checkpoint_interval is not None:
       current_step = _evaluate(self._step_counter)
@@ -823,6 +916,8 @@ class CheckpointManager(object):
       if save_path in self._maybe_delete:
         del self._maybe_delete[save_path]
       self._maybe_delete[save_path] = timestamp
+      self._delete_when_unreferenced.pop(save_path, None)
+      self._delta_bases.pop(save_path, None)
       self._latest_checkpoint = save_path
       # Before deleting anything we update the Checkpoint proto with the new
       # checkpoint. We'll go back and correct it after cleaning up old files,
@@ -834,6 +929,19 @@ class CheckpointManager(object):
       # checkpoints.
       self._record_state()
 
+    if options is not None and (options.experimental_delta_chain_length or
+                                options.experimental_deduplicate_tensors):
+      self._saves_delta_checkpoints = True
+    if self._saves_delta_checkpoints:
+      # Overwriting a checkpoint which retained ones read tensors from would
+      # change the values they restore.
+      for filename in self._maybe_delete:
+        if filename != prefix and prefix in self._get_delta_bases(filename):
+          raise ValueError(
+              f"Can not overwrite the checkpoint {prefix}, which the retained "
+              f"checkpoint {filename} reads tensors from. Pass a new "
+              "`checkpoint_number` instead.")
+
     # Register `_record_and_sweep_state` as a callback in `CheckpointOptions`
     if options is None:
       options = checkpoint_options.CheckpointOptions(
@@ -48,6 +48,13 @@ class CheckpointOptions(object):
       "enable_async",
       "experimental_sharding_callback",
       "experimental_skip_slot_variables",
+      "experimental_delta_chain_length",
+      "experimental_restore_threads",
+      "experimental_restore_memory_limit",
+      "experimental_lazy_restore_min_bytes",
+      "experimental_async_max_pending_saves",
+      "experimental_async_host_memory_limit",
+      "experimental_deduplicate_tensors",
   )
 
   @deprecated_args(
@@ -60,7 +67,14 @@ class CheckpointOptions(object):
       experimental_write_callbacks=None,
       enable_async=False,
       experimental_skip_slot_variables=False,
-      experimental_sharding_callback=None
+      experimental_sharding_callback=None,
+      experimental_delta_chain_length=None,
+      experimental_restore_threads=None,
+      experimental_restore_memory_limit=None,
+      experimental_lazy_restore_min_bytes=None,
+      experimental_async_max_pending_saves=None,
+      experimental_async_host_memory_limit=None,
+      experimental_deduplicate_tensors=False,
   ):
     """Creates an object that stores options for a Checkpoint.
 
@@ -97,9 +111,59 @@ class CheckpointOptions(object):
       experimental_sharding_callback: `tf.train.experimental.ShardingCallback`.
         A pre-made or custom callback that determines how checkpoints are
         sharded on disk. Pre-made callback options are
-        `tf.train.experimental.ShardByDevicePolicy` and
-        `tf.train.experimental.MaxShardSizePolicy`. You may also write a custom
-        callback, see `tf.train.experimental.ShardingCallback`.
+        `tf.train.experimental.ShardByDevicePolicy`,
+        `tf.train.experimental.MaxShardSizePolicy` and
+        `tf.train.experimental.BalancedShardSizePolicy`. You may also write a
+        custom callback, see `tf.train.experimental.ShardingCallback`.
+      experimental_delta_chain_length: int Type. If set, saving writes delta
+        checkpoints, which only contain the tensors whose values changed since
+        the previous checkpoint written with this option by the same
+        `tf.train.Checkpoint`, and read the other tensors from that previous
+        checkpoint when restored. A full checkpoint is written on the first
+        save and after every `experimental_delta_chain_length` delta
+        checkpoints. Restoring a delta checkpoint requires all the checkpoints
+        it depends on, so they must not be deleted; `tf.train.CheckpointManager`
+        keeps them until no retained checkpoint depends on them. Only supported
+        when executing eagerly.
+      experimental_restore_threads: int Type. If set, restoring reads tensors
+        from the checkpoint in batches on this many threads, while the values
+        already read are assigned to the variables, so that reading from disk
+        overlaps with copies to the devices. Only applies when executing
+        eagerly with all variables on a single task.
+      experimental_restore_memory_limit: int Type. The number of bytes of
+        tensors which may have been read from the checkpoint but not yet
+        assigned when restoring with `experimental_restore_threads`. A single
+        tensor larger than the limit is still read, on its own. If `None`
+        (default), the memory is not bounded.
+      experimental_lazy_restore_min_bytes: int Type. If set, resource
+        variables of at least this many bytes are not restored right away, but
+        the first time they are used, so that training can resume before
+        every large variable has been read. The checkpoint files must not be
+        deleted until the variables are restored. Variables which were used by
+        a `tf.function` traced before the restore are restored right away,
+        since the function would not trigger the restore. Only applies when
+        executing eagerly with all variables on a single task.
+      experimental_async_max_pending_saves: int Type. Applies with
+        `enable_async`. The number of saves which may be pending on the async
+        thread, each with its own host copy of the variables, so that a save
+        only waits for a previous one when this many are being written. If
+        `None` (default), a save waits until the previous one is written.
+      experimental_async_host_memory_limit: int Type. Applies with
+        `enable_async`. The number of bytes of host memory for copies of the
+        variables. Bounds the number of pending saves, and the variables are
+        copied to the host in chunks which fit the limit. If `None` (default),
+        the memory is not bounded.
+      experimental_deduplicate_tensors: bool Type. If True, saving only writes
+        the tensors whose contents are not already stored in a checkpoint
+        previously written with this option by the same `tf.train.Checkpoint`,
+        and references the checkpoint storing the others, so that tensors which
+        don't change, e.g. frozen layers, are stored once across all the
+        checkpoints. Restoring reads each referenced tensor directly from the
+        checkpoint storing it, so those checkpoints must not be deleted;
+        `tf.train.CheckpointManager` keeps them until no retained checkpoint
+        references them. Can not be combined with
+        `experimental_delta_chain_length`. Only supported when executing
+        eagerly.
     """
     self.experimental_io_device = experimental_io_device
     self.enable_async = experimental_enable_async_checkpoint or enable_async
@@ -117,6 +181,38 @@ class CheckpointOptions(object):
                          f"was of type {type(experimental_sharding_callback)}.")
     self.experimental_sharding_callback = experimental_sharding_callback
     self.experimental_skip_slot_variables = experimental_skip_slot_variables
+    if (experimental_delta_chain_length is not None and
+        experimental_delta_chain_length < 1):
+      raise ValueError("The experimental_delta_chain_length checkpoint option "
+                       "must be a positive integer or None, got "
+                       f"{experimental_delta_chain_length}.")
+    self.experimental_delta_chain_length = experimental_delta_chain_length
+    if experimental_deduplicate_tensors and experimental_delta_chain_length:
+      raise ValueError("The experimental_deduplicate_tensors and "
+                       "experimental_delta_chain_length checkpoint options "
+                       "can not both be set.")
+    self.experimental_deduplicate_tensors = experimental_deduplicate_tensors
+    for name, value, minimum in (
+        ("experimental_restore_threads", experimental_restore_threads, 1),
+        ("experimental_restore_memory_limit", experimental_restore_memory_limit,
+         1),
+        ("experimental_lazy_restore_min_bytes",
+         experimental_lazy_restore_min_bytes, 0),
+        ("experimental_async_max_pending_saves",
+         experimental_async_max_pending_saves, 1),
+        ("experimental_async_host_memory_limit",
+         experimental_async_host_memory_limit, 1)):
+      if value is not None and value < minimum:
+        raise ValueError(f"The {name} checkpoint option must be at least "
+                         f"{minimum} or None, got {value}.")
+    self.experimental_restore_threads = experimental_restore_threads
+    self.experimental_restore_memory_limit = experimental_restore_memory_limit
+    self.experimental_lazy_restore_min_bytes = (
+        experimental_lazy_restore_min_bytes)
+    self.experimental_async_max_pending_saves = (
+        experimental_async_max_pending_saves)
+    self.experimental_async_host_memory_limit = (
+        experimental_async_host_memory_limit)
 
   def __copy__(self):
     # Only `experimental_write_callbacks` needs special treatment to Ensure that
@@ -1307,6 +1307,65 @@ class CheckpointingTests(parameterized.TestCase, test.TestCase):
     # Ensure nothing else is written to `testing_list`
     self.assertLen(testing_list, 2)
 
+  def test_async_checkpoint_pending_saves(self):
+    v = variables_lib.Variable([1., 2.])
+    ckpt = async_checkpoint_helper.AsyncCheckpointHelper(
+        trackable_utils.Checkpoint, v=v)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    options = checkpoint_options.CheckpointOptions(
+        experimental_async_max_pending_saves=2,
+        experimental_async_host_memory_limit=1024)
+
+    save_paths = []
+    for value in range(4):
+      v.assign([value, value + 1.])
+      save_paths.append(ckpt.save(prefix, options=options))
+    ckpt.sync()
+    self.assertEqual(
+        ["{}-{}".format(prefix, i) for i in range(1, 5)], save_paths)
+    self.assertEqual(4, self.evaluate(ckpt.save_counter))
+
+    # Each save wrote the values of the variable when it was called.
+    for value, save_path in enumerate(save_paths):
+      restored = trackable_utils.Checkpoint(v=variables_lib.Variable([0., 0.]))
+      restored.restore(save_path).assert_consumed()
+      self.assertAllEqual([value, value + 1.], restored.v)
+
+    ckpt.restore(save_paths[1])
+    self.assertAllEqual([1., 2.], v)
+    self.assertEqual("{}-3".format(prefix), ckpt.save(prefix, options=options))
+    ckpt.sync()
+
+  def test_async_checkpoint_new_buffer_copied_once(self):
+    v = variables_lib.Variable([1., 2.])
+    ckpt = async_checkpoint_helper.AsyncCheckpointHelper(
+        trackable_utils.Checkpoint, v=v)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    options = checkpoint_options.CheckpointOptions(
+        experimental_async_max_pending_saves=3)
+
+    # pylint: disable=protected-access
+    with test.mock.patch.object(
+        ckpt, "_copy_to_cpu", wraps=ckpt._copy_to_cpu) as copy_to_cpu:
+      for value in range(5):
+        v.assign([value, value + 1.])
+        ckpt.save(prefix, options=options)
+      ckpt.sync()
+    # Buffers are populated when they are created, so they are only copied to
+    # again when reused.
+    num_buffers = len(ckpt._object_maps)
+    # pylint: enable=protected-access
+    self.assertBetween(num_buffers, 1, 3)
+    self.assertEqual(5 - num_buffers, copy_to_cpu.call_count)
+
+  def test_async_checkpoint_options_validation(self):
+    with self.assertRaisesRegex(ValueError, "at least 1"):
+      checkpoint_options.CheckpointOptions(
+          experimental_async_max_pending_saves=0)
+    with self.assertRaisesRegex(ValueError, "at least 1"):
+      checkpoint_options.CheckpointOptions(
+          experimental_async_host_memory_limit=0)
+
   def test_callback_argument_error(self):
     """Ensure passing in a callback with more than 1 argument raises error."""
     # Define callback 1 that takes in 1 argument
@@ -14,13 +14,16 @@
 # limitations under the License.
 # ==============================================================================
 import collections
+import fnmatch
+import re
 
 from tensorflow.core.protobuf import trackable_object_graph_pb2
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.checkpoint import trackable_view
+from tensorflow.python.eager import context
 from tensorflow.python.framework import errors_impl
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.trackable import base
-from tensorflow.python.training import py_checkpoint_reader
 from tensorflow.python.util import object_identity
 from tensorflow.python.util.tf_export import tf_export
 
@@ -71,7 +74,7 @@ class CheckpointView(object):
       ValueError: If the save_path does not lead to a TF2 checkpoint.
     """
 
-    reader = py_checkpoint_reader.NewCheckpointReader(save_path)
+    reader = delta_checkpoint.new_checkpoint_reader(save_path)
     try:
       object_graph_string = reader.get_tensor(base.OBJECT_GRAPH_PROTO_KEY)
     except errors_impl.NotFoundError as not_found_error:
@@ -84,6 +87,9 @@ class CheckpointView(object):
     object_graph_proto = (trackable_object_graph_pb2.TrackableObjectGraph())
     object_graph_proto.ParseFromString(object_graph_string)
     self._object_graph_proto = object_graph_proto
+    self._reader = reader
+    self._names = None
+    self._paths = None
 
   def children(self, node_id):
     """Returns all child trackables attached to obj.
@@ -109,23 +115,157 @@ class CheckpointView(object):
 
     The names returned by this private method are subject to change.
     """
+    return {node_id: ".".join(("root",) + names)
+            for node_id, names in self._descendant_names().items()}
 
-    all_nodes_with_paths = {}
-    to_visit = collections.deque([0])
-    # node_id:0 will always be "root".
-    all_nodes_with_paths[0] = "root"
-    path = all_nodes_with_paths.get(0)
-    while to_visit:
-      node_id = to_visit.popleft()
-      obj = self._object_graph_proto.nodes[node_id]
-      for child in obj.children:
-        if child.node_id == 0 or child.node_id in all_nodes_with_paths.keys():
-          continue
-        path = all_nodes_with_paths.get(node_id)
-        if child.node_id not in all_nodes_with_paths.keys():
+  def _descendant_names(self):
+    """Returns the names of the dependencies leading to each descendant.
+
+    Nodes are visited breadth first, so a node which can be reached in several
+    ways is named by its shortest path from the root.
+
+    Returns:
+      A dict mapping the node_id of each descendant to a tuple of the local
+      names leading to it from the root, which is mapped to `()`.
+    """
+    if self._names is None:
+      self._names = {0: ()}
+      to_visit = collections.deque([0])
+      while to_visit:
+        node_id = to_visit.popleft()
+        for child in self._object_graph_proto.nodes[node_id].children:
+          if child.node_id in self._names:
+            continue
+          self._names[child.node_id] = (
+              self._names[node_id] + (child.local_name,))
           to_visit.append(child.node_id)
-        all_nodes_with_paths[child.node_id] = path + "." + child.local_name
-    return all_nodes_with_paths
+    return self._names
+
+  def _node_ids_by_path(self):
+    """Returns a dict mapping the path of each non-root node to its node_id.
+
+    Paths are the names of `_descendant_names()` joined by "/", see `find`.
+    """
+    if self._paths is None:
+      self._paths = {"/".join(names): node_id
+                     for node_id, names in self._descendant_names().items()
+                     if node_id != 0}
+    return self._paths
+
+  def find(self, patterns, use_regex=False):
+    """Returns the objects whose paths match any of `patterns`.
+
+    The path of an object is the names of the dependencies leading to it from
+    the root, joined by "/", e.g. "model/embedding/embeddings". An object which
+    can be reached in several ways is named by its shortest path. Only the
+    object graph is read, not the tensors.
+
+    Example usage:
+
+    >>> root = tf.Module()
+    >>> root.encoder = tf.Module()
+    >>> root.encoder.embeddings = tf.Variable([[1., 2.], [3., 4.]])
+    >>> save_path = tf.train.Checkpoint(model=root).save('/tmp/tf_ckpts')
+    >>> checkpoint_view = tf.train.CheckpointView(save_path)
+    >>> list(checkpoint_view.find("model/*/embeddings"))
+    ['model/encoder/embeddings']
+
+    Args:
+      patterns: A glob pattern, or a list of them, matched against the whole
+        path with `fnmatch` (so `*` also matches "/").
+      use_regex: If True, `patterns` are regular expressions matched against
+        the whole path instead.
+
+    Returns:
+      A dictionary mapping the paths of the matching objects to their
+      `node_id`.
+    """
+    if isinstance(patterns, str):
+      patterns = [patterns]
+    if use_regex:
+      regexes = [re.compile(pattern) for pattern in patterns]
+      matches = lambda path: any(regex.fullmatch(path) for regex in regexes)
+    else:
+      matches = lambda path: any(
+          fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+    return {path: node_id
+            for path, node_id in self._node_ids_by_path().items()
+            if matches(path)}
+
+  def read_tensors(self, patterns, use_regex=False):
+    """Reads the tensors of the objects whose paths match `patterns`.
+
+    Only the matching tensors are read, one at a time, without building any
+    Python objects.
+
+    >>> root = tf.Module()
+    >>> root.encoder = tf.Module()
+    >>> root.encoder.embeddings = tf.Variable([[1., 2.], [3., 4.]])
+    >>> save_path = tf.train.Checkpoint(model=root).save('/tmp/tf_ckpts')
+    >>> checkpoint_view = tf.train.CheckpointView(save_path)
+    >>> for name, value in checkpoint_view.read_tensors("*/embeddings"):
+    ...   print(name, value.tolist())
+    model/encoder/embeddings [[1.0, 2.0], [3.0, 4.0]]
+
+    Args:
+      patterns: Patterns matched against object paths, see `find`.
+      use_regex: If True, `patterns` are regular expressions.
+
+    Yields:
+      Tuples of a name and a NumPy array. The value of a variable is named by
+      the path of the variable, other tensors by the path of their object
+      followed by "/" and the name of the tensor.
+    """
+    for path, node_id in self.find(patterns, use_regex=use_regex).items():
+      for attribute in self._object_graph_proto.nodes[node_id].attributes:
+        if attribute.name == base.VARIABLE_VALUE_KEY:
+          name = path
+        else:
+          name = f"{path}/{attribute.name}"
+        yield name, self._reader.get_tensor(attribute.checkpoint_key)
+
+  def restore_variables(self, variables_by_path):
+    """Assigns variables from the checkpoint, by path.
+
+    Only the values of the given variables are read from the checkpoint, so
+    parts of a large model can be restored without building the rest of it.
+
+    >>> root = tf.Module()
+    >>> root.encoder = tf.Module()
+    >>> root.encoder.embeddings = tf.Variable([[1., 2.], [3., 4.]])
+    >>> save_path = tf.train.Checkpoint(model=root).save('/tmp/tf_ckpts')
+    >>> checkpoint_view = tf.train.CheckpointView(save_path)
+    >>> embeddings = tf.Variable(tf.zeros([2, 2]))
+    >>> checkpoint_view.restore_variables(
+    ...     {"model/encoder/embeddings": embeddings})
+    >>> embeddings.numpy().tolist()
+    [[1.0, 2.0], [3.0, 4.0]]
+
+    Args:
+      variables_by_path: A dictionary mapping object paths (see `find`) to the
+        `tf.Variable` to assign the value of that variable to.
+
+    Raises:
+      ValueError: If a path does not name a variable in the checkpoint.
+      RuntimeError: If not executing eagerly.
+    """
+    if not context.executing_eagerly():
+      raise RuntimeError(
+          "CheckpointView.restore_variables is only supported when executing "
+          "eagerly.")
+    node_ids = self._node_ids_by_path()
+    checkpoint_keys = {}
+    for path in variables_by_path:
+      if path in node_ids:
+        for attribute in self._object_graph_proto.nodes[
+            node_ids[path]].attributes:
+          if attribute.name == base.VARIABLE_VALUE_KEY:
+            checkpoint_keys[path] = attribute.checkpoint_key
+      if path not in checkpoint_keys:
+        raise ValueError(
+            f"The path \"{path}\" does not name a variable in the checkpoint.")
+    for path, variable in variables_by_path.items():
+      variable.assign(self._reader.get_tensor(checkpoint_keys[path]))
 
   def match(self, obj):
     """Returns all matching trackables between CheckpointView and Trackable.
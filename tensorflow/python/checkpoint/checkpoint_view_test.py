@@ -19,6 +19,7 @@ import os
 from tensorflow.python.checkpoint import checkpoint as trackable_utils
 from tensorflow.python.checkpoint import checkpoint_view
 from tensorflow.python.eager import test
+from tensorflow.python.ops import variables
 from tensorflow.python.trackable import autotrackable
 
 
@@ -144,5 +145,68 @@ class CheckpointViewTest(test.TestCase):
     self.assertListEqual(diff[1], [3, 5])
     self.assertListEqual(diff[2], [leaf16])
 
+  def test_find(self):
+    root = autotrackable.AutoTrackable()
+    root.encoder = autotrackable.AutoTrackable()
+    root.encoder.embeddings = variables.Variable([[1., 2.]])
+    root.decoder = autotrackable.AutoTrackable()
+    root.decoder.embeddings = variables.Variable([[3., 4.]])
+    root.decoder.bias = variables.Variable(0.)
+    save_path = trackable_utils.Checkpoint(model=root).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+    view = checkpoint_view.CheckpointView(save_path)
+    self.assertCountEqual(
+        ["model/encoder/embeddings", "model/decoder/embeddings"],
+        view.find("*/embeddings"))
+    self.assertCountEqual(
+        ["model/decoder/bias"], view.find(r"model/dec\w+/b.*", use_regex=True))
+    self.assertCountEqual(
+        ["model/encoder", "model/decoder/bias"],
+        view.find(["model/encoder", "*bias"]))
+
+  def test_find_shared_object_paths(self):
+    root = autotrackable.AutoTrackable()
+    root.a = autotrackable.AutoTrackable()
+    root.a.b = autotrackable.AutoTrackable()
+    shared = root.a.b.shared = variables.Variable(1.)
+    root.shared = shared
+    save_path = trackable_utils.Checkpoint(model=root).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+    view = checkpoint_view.CheckpointView(save_path)
+    # Objects are named by their shortest path, with the same names as in
+    # `_descendants_with_paths`.
+    [node_id] = view.find("*shared").values()
+    self.assertEqual({"model/shared": node_id}, view.find("*shared"))
+    paths = view._descendants_with_paths()  # pylint: disable=protected-access
+    self.assertEqual("root.model.shared", paths[node_id])
+    self.assertCountEqual(
+        [path.replace(".", "/") for node, path in paths.items() if node],
+        ["root/" + path for path in view.find("*")])
+
+  def test_read_tensors(self):
+    root = autotrackable.AutoTrackable()
+    root.encoder = autotrackable.AutoTrackable()
+    root.encoder.embeddings = variables.Variable([[1., 2.], [3., 4.]])
+    root.decoder = variables.Variable(5.)
+    save_path = trackable_utils.Checkpoint(model=root).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+    view = checkpoint_view.CheckpointView(save_path)
+    tensors = dict(view.read_tensors("model/encoder/*"))
+    self.assertEqual(["model/encoder/embeddings"], list(tensors))
+    self.assertAllEqual([[1., 2.], [3., 4.]],
+                        tensors["model/encoder/embeddings"])
+
+  def test_restore_variables(self):
+    root = autotrackable.AutoTrackable()
+    root.embeddings = variables.Variable([[1., 2.], [3., 4.]])
+    save_path = trackable_utils.Checkpoint(model=root).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+    view = checkpoint_view.CheckpointView(save_path)
+    embeddings = variables.Variable([[0., 0.], [0., 0.]])
+    view.restore_variables({"model/embeddings": embeddings})
+    self.assertAllEqual([[1., 2.], [3., 4.]], embeddings)
+    with self.assertRaisesRegex(ValueError, "does not name a variable"):
+      view.restore_variables({"model": embeddings})
+
 if __name__ == "__main__":
   test.main()
@@ -0,0 +1,482 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Incremental checkpoints which only store tensors changed since a base.
+
+A delta checkpoint is a regular V2 checkpoint which holds the object graph and
+the tensors whose values changed since the previous checkpoint written by the
+same saver, plus the path to that previous checkpoint under `DELTA_BASE_KEY`.
+Following the base paths gives a chain of checkpoints ending in a full one, and
+each tensor is read from the newest checkpoint of the chain which holds it.
+
+A deduplicated checkpoint instead holds the tensors which are not stored in any
+checkpoint previously written by the same saver, plus a table under
+`TENSOR_REFERENCES_KEY` mapping the keys of the other tensors to the checkpoint
+which stores them. Each tensor is stored once while its contents don't change,
+and is read directly from that checkpoint, so there are no chains to bound.
+
+Changes are detected with a farmhash64 fingerprint of each tensor's contents.
+"""
+
+import collections
+import os
+
+from tensorflow.core.framework import types_pb2
+from tensorflow.python.checkpoint import tensor_callable
+from tensorflow.python.checkpoint.sharding import sharding_util
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import io_ops
+from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.trackable import base
+from tensorflow.python.training import py_checkpoint_reader
+from tensorflow.python.training.saving import saveable_object
+from tensorflow.python.util import compat
+from tensorflow.python.util import object_identity
+
+# Checkpoint key holding the path of the base of a delta checkpoint, relative
+# to the delta's directory when both are in the same directory.
+DELTA_BASE_KEY = "_CHECKPOINTABLE_DELTA_BASE"
+
+# Checkpoint key holding the (key, path) pairs of the tensors a deduplicated
+# checkpoint reads from other checkpoints. Paths are encoded like the base path
+# of delta checkpoints.
+TENSOR_REFERENCES_KEY = "_CHECKPOINTABLE_TENSOR_REFERENCES"
+
+# Keys which describe the checkpoint holding them rather than saved values, so
+# are never read from a base checkpoint, and are written whether or not they
+# changed.
+METADATA_KEYS = frozenset([
+    base.OBJECT_GRAPH_PROTO_KEY, DELTA_BASE_KEY, TENSOR_REFERENCES_KEY,
+    sharding_util.SHARD_LAYOUT_KEY])
+
+# Dtypes whose contents can not be fingerprinted; always written.
+_UNFINGERPRINTABLE_DTYPES = frozenset([dtypes.resource, dtypes.variant])
+
+
+def _encode_base_path(base_prefix, file_prefix):
+  if os.path.dirname(base_prefix) == os.path.dirname(file_prefix):
+    return os.path.basename(base_prefix)
+  return base_prefix
+
+
+def _decode_base_path(base_path, file_prefix):
+  if os.path.basename(base_path) == base_path:
+    return os.path.join(os.path.dirname(file_prefix), base_path)
+  return base_path
+
+
+def get_base_prefix(reader, file_prefix):
+  """Returns the prefix of the base of a delta checkpoint, or None.
+
+  Args:
+    reader: A `CheckpointReader` for `file_prefix`.
+    file_prefix: The checkpoint prefix.
+  """
+  if not reader.has_tensor(DELTA_BASE_KEY):
+    return None
+  return _decode_base_path(
+      compat.as_str(reader.get_tensor(DELTA_BASE_KEY)), file_prefix)
+
+
+def get_references(reader, file_prefix):
+  """Returns the tensors a deduplicated checkpoint reads elsewhere, or None.
+
+  Args:
+    reader: A `CheckpointReader` for `file_prefix`.
+    file_prefix: The checkpoint prefix.
+
+  Returns:
+    None if `file_prefix` is not a deduplicated checkpoint, otherwise a dict
+    mapping checkpoint keys to the prefix of the checkpoint storing them.
+  """
+  if not reader.has_tensor(TENSOR_REFERENCES_KEY):
+    return None
+  return {
+      compat.as_str(key): _decode_base_path(compat.as_str(path), file_prefix)
+      for key, path in reader.get_tensor(TENSOR_REFERENCES_KEY)}
+
+
+def _open_chain(file_prefix):
+  """Returns the prefixes a checkpoint is read from and a reader for each.
+
+  Also returns the references of a deduplicated checkpoint, or None.
+  """
+  reader = py_checkpoint_reader.NewCheckpointReader(file_prefix)
+  references = get_references(reader, file_prefix)
+  if references is not None:
+    chain = [file_prefix] + list(dict.fromkeys(references.values()))
+    readers = [reader] + [py_checkpoint_reader.NewCheckpointReader(prefix)
+                          for prefix in chain[1:]]
+    return chain, readers, references
+
+  chain = []
+  readers = []
+  prefix = file_prefix
+  while prefix is not None:
+    if prefix in chain:
+      raise ValueError(
+          f"The delta checkpoint {file_prefix} has a cyclic chain of base "
+          f"checkpoints: {chain + [prefix]}.")
+    if chain:
+      reader = py_checkpoint_reader.NewCheckpointReader(prefix)
+    chain.append(prefix)
+    readers.append(reader)
+    prefix = get_base_prefix(reader, prefix)
+  return chain, readers, None
+
+
+def get_chain(file_prefix):
+  """Returns the prefixes a checkpoint is read from, newest first.
+
+  For a full checkpoint this is `[file_prefix]`. For a delta checkpoint, it is
+  followed by its base, the base of the base, and so on. For a deduplicated
+  checkpoint, it is followed by the checkpoints storing the tensors it
+  references.
+
+  Args:
+    file_prefix: The checkpoint prefix.
+
+  Raises:
+    ValueError: If the chain of base checkpoints contains a cycle.
+  """
+  chain, _, _ = _open_chain(file_prefix)
+  return chain
+
+
+class DeltaCheckpointReader(object):
+  """Reads a delta or deduplicated checkpoint, resolving each tensor.
+
+  Implements the subset of the `CheckpointReader` interface used to restore
+  object-based checkpoints.
+  """
+
+  def __init__(self, chain, readers, references=None):
+    """Creates a reader.
+
+    Args:
+      chain: The prefixes of the checkpoint and the checkpoints it is read
+        from, as returned by `get_chain`.
+      readers: A `CheckpointReader` for each prefix in `chain`.
+      references: For a deduplicated checkpoint, a dict mapping the keys of the
+        tensors it does not store to the prefix of the checkpoint storing them.
+    """
+    self._chain = list(chain)
+    self._readers = list(readers)
+    self._dtype_map = {}
+    self._shape_map = {}
+    # Maps keys missing from the newest checkpoint to the prefix holding them.
+    self._tensor_locations = {}
+    self._reader_by_key = {}
+    for prefix, reader in zip(self._chain, self._readers):
+      is_newest = reader is self._readers[0]
+      shape_map = reader.get_variable_to_shape_map()
+      for key, dtype in reader.get_variable_to_dtype_map().items():
+        if key in self._reader_by_key or (
+            key in METADATA_KEYS and not is_newest):
+          continue
+        if (references is not None and not is_newest and
+            references.get(key) != prefix):
+          continue
+        self._reader_by_key[key] = reader
+        self._dtype_map[key] = dtype
+        self._shape_map[key] = shape_map[key]
+        if not is_newest:
+          self._tensor_locations[key] = prefix
+
+  @property
+  def chain(self):
+    return list(self._chain)
+
+  @property
+  def tensor_locations(self):
+    """Maps keys not stored in the newest checkpoint to their prefix."""
+    return dict(self._tensor_locations)
+
+  def has_tensor(self, key):
+    return key in self._reader_by_key
+
+  def get_tensor(self, key):
+    return self._reader_by_key.get(key, self._readers[0]).get_tensor(key)
+
+  def get_variable_to_dtype_map(self):
+    return dict(self._dtype_map)
+
+  def get_variable_to_shape_map(self):
+    return dict(self._shape_map)
+
+  def debug_string(self):
+    """Returns the dtype and shape of each tensor, like `CheckpointReader`."""
+    lines = []
+    for key in sorted(self._dtype_map):
+      lines.append("{} ({}) [{}]\n".format(
+          key, types_pb2.DataType.Name(self._dtype_map[key].as_datatype_enum),
+          ",".join(str(dim) for dim in self._shape_map[key])))
+    return compat.as_bytes("".join(lines))
+
+
+def new_checkpoint_reader(file_prefix):
+  """Returns a reader for `file_prefix` which resolves delta checkpoints.
+
+  Args:
+    file_prefix: The checkpoint prefix.
+
+  Returns:
+    A `CheckpointReader` for full checkpoints, or a `DeltaCheckpointReader`
+    for checkpoints which read tensors from other checkpoints.
+  """
+  chain, readers, references = _open_chain(file_prefix)
+  if len(chain) == 1:
+    return readers[0]
+  return DeltaCheckpointReader(chain, readers, references)
+
+
+def restore_v2(prefix, tensor_names, shape_and_slices, dtypes,  # pylint: disable=redefined-outer-name
+               tensor_locations=None, name=None):
+  """Like `io_ops.restore_v2`, reading tensors from their delta checkpoint.
+
+  Args:
+    prefix: The prefix of the checkpoint to read from.
+    tensor_names: The checkpoint keys to read.
+    shape_and_slices: The slice specs to read.
+    dtypes: The dtypes of the tensors.
+    tensor_locations: An optional dict mapping checkpoint keys to the prefix
+      of the checkpoint to read them from instead of `prefix`, as returned by
+      `DeltaCheckpointReader.tensor_locations`.
+    name: A name for the operations.
+
+  Returns:
+    A list of restored tensors, in the order of `tensor_names`.
+  """
+  if not tensor_locations:
+    return io_ops.restore_v2(
+        prefix, tensor_names, shape_and_slices, dtypes, name=name)
+
+  indices_by_prefix = collections.OrderedDict()
+  for index, tensor_name in enumerate(tensor_names):
+    location = (tensor_locations.get(tensor_name)
+                if isinstance(tensor_name, str) else None)
+    indices_by_prefix.setdefault(location, []).append(index)
+
+  restored = [None] * len(tensor_names)
+  for location, indices in indices_by_prefix.items():
+    values = io_ops.restore_v2(
+        prefix if location is None else location,
+        [tensor_names[i] for i in indices],
+        [shape_and_slices[i] for i in indices],
+        [dtypes[i] for i in indices],
+        name=name)
+    for index, value in zip(indices, values):
+      restored[index] = value
+  return restored
+
+
+def _tensor_digest(tensor):
+  """Returns a digest of the contents of an eager tensor, or None."""
+  if tensor is None or tensor.dtype in _UNFINGERPRINTABLE_DTYPES:
+    return None
+  fingerprint = array_ops.fingerprint(array_ops.reshape(tensor, [1, -1]))
+  return (tensor.dtype.as_datatype_enum, tuple(tensor.shape.as_list()),
+          fingerprint.numpy().tobytes())
+
+
+def _value_digest(value):
+  """Returns a digest of a serialized tensor, SaveSpec or slice dict."""
+  if isinstance(value, dict):
+    digests = []
+    for slice_spec, slice_value in sorted(value.items()):
+      digest = _value_digest(slice_value)
+      if digest is None:
+        return None
+      digests.append((slice_spec, digest))
+    return tuple(digests)
+  if isinstance(value, saveable_object.SaveSpec):
+    if isinstance(value, tensor_callable.Callable):
+      # Calling a `Callable` may be expensive, e.g. copy from an accelerator,
+      # so its value is always written rather than read twice.
+      return None
+    with ops.device(value.device):
+      value = value.tensor
+  return _tensor_digest(value)
+
+
+class DeltaTracker(object):
+  """Tracks the contents of the last checkpoint written by a saver.
+
+  Used by `TrackableSaver` to write delta checkpoints: `filter_unchanged`
+  drops tensors which did not change since the last checkpoint, and `commit`
+  makes the new checkpoint the base of the next one once it has been written.
+  """
+
+  __slots__ = ["_chain", "_digests", "_pending"]
+
+  def __init__(self):
+    # The prefixes of the last full checkpoint and of the delta checkpoints
+    # written against it since, oldest first.
+    self._chain = ()
+    self._digests = {}
+    self._pending = None
+
+  def filter_unchanged(self, serialized_tensors, file_prefix,
+                       max_chain_length):
+    """Removes tensors unchanged since the last save from `serialized_tensors`.
+
+    A full checkpoint is written on the first save, after `max_chain_length`
+    consecutive delta checkpoints, and when `file_prefix` is one of the
+    checkpoints the next delta would be read from, since overwriting it would
+    make the new checkpoint its own base.
+
+    Args:
+      serialized_tensors: A dict mapping `Trackable`s to the tensors to save,
+        as returned by `save_util.serialize_graph_view`.
+      file_prefix: The prefix the checkpoint will be written to.
+      max_chain_length: The maximum number of delta checkpoints in a row.
+
+    Returns:
+      A new dict of serialized tensors, which for delta checkpoints also holds
+      the base path under `DELTA_BASE_KEY`.
+    """
+    write_full = (not self._chain or
+                  len(self._chain) > max_chain_length or
+                  file_prefix in self._chain)
+    digests = {}
+    filtered = object_identity.ObjectIdentityDictionary()
+    num_written = num_skipped = 0
+    for trackable, tensor_dict in serialized_tensors.items():
+      kept = {}
+      for checkpoint_key, value in tensor_dict.items():
+        if checkpoint_key in METADATA_KEYS:
+          kept[checkpoint_key] = value
+          continue
+        digest = _value_digest(value)
+        if digest is not None:
+          digests[checkpoint_key] = digest
+        if (write_full or digest is None or
+            self._digests.get(checkpoint_key) != digest):
+          kept[checkpoint_key] = value
+          num_written += 1
+        else:
+          num_skipped += 1
+      if kept:
+        filtered[trackable] = kept
+
+    if write_full:
+      if file_prefix in self._chain:
+        logging.vlog(1, "Writing full checkpoint %s, which is in the chain of "
+                     "the previous delta checkpoint.", file_prefix)
+      chain = (file_prefix,)
+    else:
+      base_prefix = self._chain[-1]
+      with ops.device("/cpu:0"):
+        filtered.setdefault(None, {})[DELTA_BASE_KEY] = constant_op.constant(
+            _encode_base_path(base_prefix, file_prefix),
+            dtype=dtypes.string)
+      logging.vlog(1, "Writing delta checkpoint %s against %s: %d tensors "
+                   "written, %d unchanged.", file_prefix, base_prefix,
+                   num_written, num_skipped)
+      chain = self._chain + (file_prefix,)
+    self._pending = (chain, digests)
+    return filtered
+
+  def commit(self):
+    """Marks the checkpoint passed to `filter_unchanged` as written."""
+    if self._pending is not None:
+      self._chain, self._digests = self._pending
+      self._pending = None
+
+
+class DeduplicationTracker(object):
+  """Tracks which checkpoint stores each tensor written by a saver.
+
+  Used by `TrackableSaver` to write deduplicated checkpoints: `filter_stored`
+  replaces tensors whose contents are already stored in a checkpoint by a
+  reference to it, and `commit` records where the tensors of the new
+  checkpoint are stored once it has been written.
+  """
+
+  __slots__ = ["_locations", "_referenced", "_pending"]
+
+  def __init__(self):
+    # Maps checkpoint keys to the digest of the stored tensor and the prefix
+    # of the checkpoint storing it.
+    self._locations = {}
+    # The prefixes of the checkpoints which other checkpoints read from.
+    self._referenced = set()
+    self._pending = None
+
+  def filter_stored(self, serialized_tensors, file_prefix):
+    """Removes tensors which are already stored from `serialized_tensors`.
+
+    Args:
+      serialized_tensors: A dict mapping `Trackable`s to the tensors to save,
+        as returned by `save_util.serialize_graph_view`.
+      file_prefix: The prefix the checkpoint will be written to.
+
+    Returns:
+      A new dict of serialized tensors, which also holds the references to the
+      tensors stored in other checkpoints under `TENSOR_REFERENCES_KEY`.
+
+    Raises:
+      ValueError: If `file_prefix` is a checkpoint which other checkpoints
+        written by the saver read tensors from. Overwriting it would change
+        the values they restore.
+    """
+    if file_prefix in self._referenced:
+      raise ValueError(
+          f"Can not overwrite the checkpoint {file_prefix}, which other "
+          "deduplicated checkpoints read tensors from. Save to a new prefix "
+          "instead.")
+    locations = {}
+    references = {}
+    filtered = object_identity.ObjectIdentityDictionary()
+    for trackable, tensor_dict in serialized_tensors.items():
+      kept = {}
+      for checkpoint_key, value in tensor_dict.items():
+        if checkpoint_key in METADATA_KEYS:
+          kept[checkpoint_key] = value
+          continue
+        digest = _value_digest(value)
+        stored = self._locations.get(checkpoint_key)
+        if (digest is not None and stored is not None and
+            stored[0] == digest and stored[1] != file_prefix):
+          references[checkpoint_key] = stored[1]
+          locations[checkpoint_key] = stored
+          continue
+        kept[checkpoint_key] = value
+        if digest is not None:
+          locations[checkpoint_key] = (digest, file_prefix)
+      if kept:
+        filtered[trackable] = kept
+
+    if references:
+      with ops.device("/cpu:0"):
+        filtered.setdefault(None, {})[TENSOR_REFERENCES_KEY] = (
+            constant_op.constant(
+                [[key, _encode_base_path(prefix, file_prefix)]
+                 for key, prefix in sorted(references.items())],
+                dtype=dtypes.string))
+      logging.vlog(1, "Writing deduplicated checkpoint %s: %d tensors "
+                   "referenced from %d other checkpoints.", file_prefix,
+                   len(references), len(set(references.values())))
+    self._pending = (locations, set(references.values()))
+    return filtered
+
+  def commit(self):
+    """Marks the checkpoint passed to `filter_stored` as written."""
+    if self._pending is not None:
+      self._locations, referenced = self._pending
+      self._referenced.update(referenced)
+      self._pending = None
@@ -0,0 +1,312 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for delta checkpoints."""
+
+import os
+
+from tensorflow.python.checkpoint import checkpoint
+from tensorflow.python.checkpoint import checkpoint_management
+from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.checkpoint import delta_checkpoint
+from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
+from tensorflow.python.ops import variables
+from tensorflow.python.training import checkpoint_utils
+from tensorflow.python.training import py_checkpoint_reader
+
+
+def _checkpoint_keys(save_path):
+  reader = py_checkpoint_reader.NewCheckpointReader(save_path)
+  return set(reader.get_variable_to_dtype_map())
+
+
+class DeltaCheckpointTest(test.TestCase):
+
+  def test_only_changed_tensors_are_written(self):
+    ckpt = checkpoint.Checkpoint(
+        changing=variables.Variable([1., 2.]),
+        frozen=variables.Variable(constant_op.constant(3., shape=[100])))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=5)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+
+    full_path = ckpt.save(prefix, options=options)
+    self.assertEqual([full_path], delta_checkpoint.get_chain(full_path))
+
+    ckpt.changing.assign([4., 5.])
+    delta_path = ckpt.save(prefix, options=options)
+    keys = _checkpoint_keys(delta_path)
+    self.assertIn("changing/.ATTRIBUTES/VARIABLE_VALUE", keys)
+    self.assertNotIn("frozen/.ATTRIBUTES/VARIABLE_VALUE", keys)
+    self.assertIn(delta_checkpoint.DELTA_BASE_KEY, keys)
+    self.assertEqual([delta_path, full_path],
+                     delta_checkpoint.get_chain(delta_path))
+
+    restored = checkpoint.Checkpoint(
+        changing=variables.Variable([0., 0.]),
+        frozen=variables.Variable(constant_op.constant(0., shape=[100])))
+    restored.restore(delta_path).assert_consumed()
+    self.assertAllEqual([4., 5.], restored.changing)
+    self.assertAllEqual([3.] * 100, restored.frozen)
+    self.assertEqual(2, self.evaluate(restored.save_counter))
+
+  def test_deferred_restore(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(1.))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=5)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    ckpt.save(prefix, options=options)
+    ckpt.w = variables.Variable(2.)
+    delta_path = ckpt.save(prefix, options=options)
+
+    restored = checkpoint.Checkpoint()
+    status = restored.restore(delta_path)
+    restored.v = variables.Variable(0.)
+    restored.w = variables.Variable(0.)
+    status.assert_consumed()
+    self.assertEqual(1., self.evaluate(restored.v))
+    self.assertEqual(2., self.evaluate(restored.w))
+
+  def test_full_checkpoint_after_chain_length(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(1.))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=2)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    chain_lengths = [
+        len(delta_checkpoint.get_chain(ckpt.save(prefix, options=options)))
+        for _ in range(5)]
+    self.assertEqual([1, 2, 3, 1, 2], chain_lengths)
+
+  def test_overwriting_chain_writes_full_checkpoint(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(1.))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=5)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    ckpt.write(prefix, options=options)
+    ckpt.v.assign(2.)
+    # A delta against itself could not be read.
+    ckpt.write(prefix, options=options)
+    self.assertEqual([prefix], delta_checkpoint.get_chain(prefix))
+
+    other = os.path.join(self.get_temp_dir(), "other")
+    ckpt.write(other, options=options)
+    ckpt.v.assign(3.)
+    # `prefix` is the base of `other`.
+    ckpt.write(prefix, options=options)
+    self.assertEqual([prefix], delta_checkpoint.get_chain(prefix))
+
+    restored = checkpoint.Checkpoint(v=variables.Variable(0.))
+    restored.restore(prefix).assert_consumed()
+    self.assertEqual(3., self.evaluate(restored.v))
+
+  def test_load_variable(self):
+    ckpt = checkpoint.Checkpoint(
+        changing=variables.Variable([1., 2.]),
+        frozen=variables.Variable(constant_op.constant(3., shape=[10])))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=5)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    ckpt.save(prefix, options=options)
+    ckpt.changing.assign([4., 5.])
+    delta_path = ckpt.save(prefix, options=options)
+
+    self.assertAllEqual(
+        [4., 5.], checkpoint_utils.load_variable(
+            delta_path, "changing/.ATTRIBUTES/VARIABLE_VALUE"))
+    self.assertAllEqual(
+        [3.] * 10, checkpoint_utils.load_variable(
+            delta_path, "frozen/.ATTRIBUTES/VARIABLE_VALUE"))
+    self.assertIn(("frozen/.ATTRIBUTES/VARIABLE_VALUE", [10]),
+                  checkpoint_utils.list_variables(delta_path))
+
+  def test_restarted_manager_keeps_base_checkpoints(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(0.))
+    directory = self.get_temp_dir()
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=2)
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=5)
+    paths = []
+    for value in range(3):
+      ckpt.v.assign(float(value))
+      paths.append(manager.save(options=options))
+
+    def exists(path):
+      return os.path.exists(path + ".index")
+
+    # paths[0] was removed from the active set, but paths[1:] read from it.
+    self.assertEqual([True, True, True], [exists(p) for p in paths])
+
+    # A new manager saving full checkpoints must not delete paths[1] while
+    # the retained paths[2] reads from it.
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(3.))
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=2)
+    paths.append(manager.save(checkpoint_number=4))
+    self.assertEqual(paths[2:], manager.checkpoints)
+    self.assertEqual([True, True, True, True], [exists(p) for p in paths])
+    restored = checkpoint.Checkpoint(v=variables.Variable(0.))
+    restored.restore(paths[2]).assert_consumed()
+    self.assertEqual(2., self.evaluate(restored.v))
+
+    paths.append(manager.save(checkpoint_number=5))
+    self.assertEqual([False, False, False, True, True],
+                     [exists(p) for p in paths])
+
+  def test_invalid_chain_length(self):
+    with self.assertRaisesRegex(ValueError, "positive integer"):
+      checkpoint_options.CheckpointOptions(experimental_delta_chain_length=0)
+
+  def test_manager_keeps_base_checkpoints(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(0.))
+    directory = self.get_temp_dir()
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=1)
+    options = checkpoint_options.CheckpointOptions(
+        experimental_delta_chain_length=2)
+
+    paths = []
+    for value in range(4):
+      ckpt.v.assign(float(value))
+      paths.append(manager.save(options=options))
+    self.assertEqual([paths[-1]], manager.checkpoints)
+
+    def exists(path):
+      return os.path.exists(path + ".index")
+
+    # paths[3] is a full checkpoint, so the chain of paths[0..2] is deleted.
+    self.assertEqual([False, False, False, True], [exists(p) for p in paths])
+
+    ckpt.v.assign(4.)
+    paths.append(manager.save(options=options))
+    # paths[4] is a delta against paths[3].
+    self.assertEqual([False, False, False, True, True],
+                     [exists(p) for p in paths])
+
+    restored = checkpoint.Checkpoint(v=variables.Variable(0.))
+    restored.restore(manager.latest_checkpoint).assert_consumed()
+    self.assertEqual(4., self.evaluate(restored.v))
+
+
+class DeduplicatedCheckpointTest(test.TestCase):
+
+  def test_unchanged_tensors_are_stored_once(self):
+    ckpt = checkpoint.Checkpoint(
+        changing=variables.Variable(0.),
+        frozen=variables.Variable(constant_op.constant(3., shape=[100])))
+    directory = self.get_temp_dir()
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=2)
+    options = checkpoint_options.CheckpointOptions(
+        experimental_deduplicate_tensors=True)
+
+    paths = []
+    for value in range(5):
+      ckpt.changing.assign(float(value))
+      paths.append(manager.save(options=options))
+    self.assertEqual(paths[-2:], manager.checkpoints)
+    self.assertIn("frozen/.ATTRIBUTES/VARIABLE_VALUE",
+                  _checkpoint_keys(paths[0]))
+    for path in paths[-2:]:
+      keys = _checkpoint_keys(path)
+      self.assertIn("changing/.ATTRIBUTES/VARIABLE_VALUE", keys)
+      self.assertNotIn("frozen/.ATTRIBUTES/VARIABLE_VALUE", keys)
+      self.assertEqual([path, paths[0]], delta_checkpoint.get_chain(path))
+
+    def exists(path):
+      return os.path.exists(path + ".index")
+
+    # paths[0] stores the frozen tensor referenced by the retained checkpoints.
+    self.assertEqual([True, False, False, True, True],
+                     [exists(p) for p in paths])
+
+    restored = checkpoint.Checkpoint(
+        changing=variables.Variable(0.),
+        frozen=variables.Variable(constant_op.constant(0., shape=[100])))
+    restored.restore(manager.latest_checkpoint).assert_consumed()
+    self.assertEqual(4., self.evaluate(restored.changing))
+    self.assertAllEqual([3.] * 100, restored.frozen)
+
+    # Once the frozen tensor changes, the first checkpoint is unreferenced.
+    ckpt.frozen.assign(constant_op.constant(5., shape=[100]))
+    paths.append(manager.save(options=options))
+    paths.append(manager.save(options=options))
+    self.assertFalse(exists(paths[0]))
+    restored.restore(manager.latest_checkpoint).assert_consumed()
+    self.assertAllEqual([5.] * 100, restored.frozen)
+
+  def test_overwriting_referenced_checkpoint_raises(self):
+    ckpt = checkpoint.Checkpoint(v=variables.Variable(1.))
+    options = checkpoint_options.CheckpointOptions(
+        experimental_deduplicate_tensors=True)
+    first = os.path.join(self.get_temp_dir(), "first")
+    second = os.path.join(self.get_temp_dir(), "second")
+    ckpt.write(first, options=options)
+    ckpt.write(second, options=options)
+    self.assertEqual([second, first], delta_checkpoint.get_chain(second))
+
+    ckpt.v.assign(2.)
+    with self.assertRaisesRegex(ValueError, "Can not overwrite"):
+      ckpt.write(first, options=options)
+    # Nothing reads from `second`, so it may be overwritten.
+    ckpt.write(second, options=options)
+
+    restored = checkpoint.Checkpoint(v=variables.Variable(0.))
+    restored.restore(first).assert_consumed()
+    self.assertEqual(1., self.evaluate(restored.v))
+    restored.restore(second).assert_consumed()
+    self.assertEqual(2., self.evaluate(restored.v))
+
+  def test_restarted_manager_keeps_referenced_checkpoints(self):
+    ckpt = checkpoint.Checkpoint(
+        changing=variables.Variable(0.),
+        frozen=variables.Variable(constant_op.constant(3., shape=[10])))
+    directory = self.get_temp_dir()
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=1)
+    options = checkpoint_options.CheckpointOptions(
+        experimental_deduplicate_tensors=True)
+    paths = [manager.save(options=options)]
+    ckpt.changing.assign(1.)
+    paths.append(manager.save(options=options))
+
+    def exists(path):
+      return os.path.exists(path + ".index")
+
+    # paths[1] reads the frozen tensor from paths[0].
+    self.assertEqual([True, True], [exists(p) for p in paths])
+
+    ckpt = checkpoint.Checkpoint(
+        changing=variables.Variable(2.),
+        frozen=variables.Variable(constant_op.constant(4., shape=[10])))
+    manager = checkpoint_management.CheckpointManager(
+        ckpt, directory, max_to_keep=1)
+    with self.assertRaisesRegex(ValueError, "Can not overwrite"):
+      manager.save(checkpoint_number=1, options=options)
+    self.assertEqual([True, True], [exists(p) for p in paths])
+
+    # Once paths[1] leaves the active set, neither is read from anymore.
+    paths.append(manager.save(checkpoint_number=3, options=options))
+    self.assertEqual([False, False, True], [exists(p) for p in paths])
+
+  def test_incompatible_with_delta_chain_length(self):
+    with self.assertRaisesRegex(ValueError, "can not both be set"):
+      checkpoint_options.CheckpointOptions(
+          experimental_delta_chain_length=2,
+          experimental_deduplicate_tensors=True)
+
+
+if __name__ == "__main__":
+  test.main()
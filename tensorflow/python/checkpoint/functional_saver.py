@@ -14,6 +14,8 @@
 # ==============================================================================
 """Saves and restore variables inside traced @tf.functions."""
 
+import collections
+from concurrent import futures
 import dataclasses
 import math
 import time
@@ -23,6 +25,7 @@ from absl import logging
 
 from tensorflow.core.protobuf import saver_pb2
 from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.checkpoint.sharding import sharding_policies
 from tensorflow.python.checkpoint.sharding import sharding_util
 from tensorflow.python.eager import context
@@ -37,7 +40,9 @@ from tensorflow.python.framework import tensor_util
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_io_ops
 from tensorflow.python.ops import io_ops
+from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.ops import string_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.saved_model import registration
 from tensorflow.python.saved_model.pywrap_saved_model import metrics
 from tensorflow.python.trackable import base
@@ -45,6 +50,7 @@ from tensorflow.python.trackable import trackable_utils
 from tensorflow.python.training.saving import saveable_object
 from tensorflow.python.training.saving import saveable_object_util
 from tensorflow.python.types import core
+from tensorflow.python.util import compat
 from tensorflow.python.util import nest
 from tensorflow.python.util import object_identity
 
@@ -105,7 +111,8 @@ def _single_shard_save(
 def _single_shard_restore(
     file_prefix: tensor_lib.Tensor,
     shardable_tensors: Sequence[sharding_util.ShardableTensor],
-    options: "checkpoint_options.CheckpointOptions | None" = None
+    options: "checkpoint_options.CheckpointOptions | None" = None,
+    tensor_locations: "Mapping[str, str] | None" = None,
 ) -> sharding_util.Shard:
   """Restore the saveable objects from a checkpoint with `file_prefix`.
 
@@ -114,6 +121,8 @@ def _single_shard_restore(
       files to read from.
     shardable_tensors: A list of ShardableTensors to restore.
     options: Optional `CheckpointOptions` object.
+    tensor_locations: Optional dict mapping checkpoint keys to the prefix of
+      the base checkpoint holding them, when restoring a delta checkpoint.
 
   Returns:
     A restored tensor dict (maps checkpoint_key -> slice_spec -> tensor).
@@ -135,8 +144,9 @@ def _single_shard_restore(
 
   restore_device = options.experimental_io_device or "cpu:0"
   with ops.device(restore_device):
-    restored_tensors = io_ops.restore_v2(
-        file_prefix, tensor_names, slice_specs, tensor_dtypes)
+    restored_tensors = delta_checkpoint.restore_v2(
+        file_prefix, tensor_names, slice_specs, tensor_dtypes,
+        tensor_locations=tensor_locations)
 
   restored_tensor_dict = {}
   for shardable_tensor in shardable_tensors:
@@ -147,6 +157,95 @@ def _single_shard_restore(
   return restored_tensor_dict
 
 
+def _restored_bytes(
+    shardable_tensors: Sequence[sharding_util.ShardableTensor],
+    shape_map: Mapping[str, Sequence[int]],
+) -> int:
+  """Returns the size of `shardable_tensors` in the checkpoint, in bytes."""
+  total = 0
+  for shardable_tensor in shardable_tensors:
+    shape = shape_map.get(shardable_tensor.checkpoint_key)
+    if shape is not None:
+      total += math.prod(shape) * shardable_tensor.dtype.size
+  return total
+
+
+def _restore_fn_inputs(
+    shardable_tensors: Sequence[sharding_util.ShardableTensor],
+    restored_tensor_dict: sharding_util.Shard,
+) -> Mapping[str, "tensor_lib.Tensor | Mapping[str, tensor_lib.Tensor]"]:
+  """Returns the tensors restored for a restore function, by local name."""
+  restored_tensors = {}
+  for shardable_tensor in shardable_tensors:
+    tensor = restored_tensor_dict[shardable_tensor.checkpoint_key][
+        shardable_tensor.slice_spec]
+    local_name = trackable_utils.extract_local_name(
+        shardable_tensor.checkpoint_key)
+    if shardable_tensor.slice_spec:
+      restored_tensors.setdefault(local_name, {})[
+          shardable_tensor.slice_spec] = tensor
+    else:
+      restored_tensors[local_name] = tensor
+  return restored_tensors
+
+
+def _row_splits_to_read(
+    shardable_tensors: Sequence[sharding_util.ShardableTensor],
+    row_splits: Mapping[str, Sequence[int]],
+) -> "Sequence[int] | None":
+  """Returns the row splits to read a restore function's tensor in, or None."""
+  if len(shardable_tensors) != 1:
+    return None
+  [shardable_tensor] = shardable_tensors
+  save_spec = shardable_tensor._tensor_save_spec  # pylint: disable=protected-access
+  splits = row_splits.get(shardable_tensor.checkpoint_key)
+  if (shardable_tensor.slice_spec or not splits or len(splits) < 3 or
+      (save_spec is not None and
+       save_spec.name != shardable_tensor.checkpoint_key)):
+    return None
+  return splits
+
+
+def _restore_rows(
+    file_prefix: tensor_lib.Tensor,
+    shardable_tensor: sharding_util.ShardableTensor,
+    full_shape: Sequence[int],
+    rows: tuple[int, int],
+    options: checkpoint_options.CheckpointOptions,
+    tensor_locations: "Mapping[str, str] | None",
+) -> tensor_lib.Tensor:
+  """Restores the rows `[start, stop)` of a tensor."""
+  start, stop = rows
+  slice_spec = variables.Variable.SaveSliceInfo(
+      full_name=shardable_tensor.checkpoint_key,
+      full_shape=full_shape,
+      var_offset=[start] + [0] * (len(full_shape) - 1),
+      var_shape=[stop - start] + list(full_shape[1:])).spec
+  with ops.device(options.experimental_io_device or "cpu:0"):
+    [restored_tensor] = delta_checkpoint.restore_v2(
+        file_prefix, [shardable_tensor.checkpoint_key], [slice_spec],
+        [shardable_tensor.dtype], tensor_locations=tensor_locations)
+  return restored_tensor
+
+
+def _lazily_restorable_variable(
+    trackable: base.Trackable,
+) -> "resource_variable_ops.BaseResourceVariable | None":
+  """Returns the variable restored by `trackable` if it can restore lazily."""
+  if isinstance(trackable, saveable_object_util.SaveableCompatibilityConverter):
+    saveables = trackable.saveables
+    if (len(saveables) != 1 or not isinstance(
+        saveables[0], saveable_object_util.TrackableSaveable)):
+      return None
+    trackable = saveables[0]._trackable  # pylint: disable=protected-access
+  # Subclasses overriding `handle` would not run the deferred restore.
+  base_variable_cls = resource_variable_ops.BaseResourceVariable
+  if (isinstance(trackable, base_variable_cls) and
+      type(trackable).handle is base_variable_cls.handle):
+    return trackable
+  return None
+
+
 def sharded_filename(
     filename_tensor: tensor_lib.Tensor,
     shard: int,
@@ -515,6 +614,20 @@ class MultiDeviceSaver:
 
       shards_by_task = self._get_shards_by_task(
           options.experimental_sharding_callback)
+      if (isinstance(options.experimental_sharding_callback,
+                     sharding_policies.BalancedShardSizePolicy) and
+          shards_by_task and shards_by_task[0][1]):
+        # Record the layout in the first shard, for restore to read the
+        # slices of split tensors concurrently.
+        all_shards = []
+        for _, shards in shards_by_task:
+          all_shards.extend(shards)
+        first_task, first_shards = shards_by_task[0]
+        with ops.device(saveable_object_util.set_cpu0(first_task.to_string())):
+          manifest = constant_op.constant(
+              sharding_util.build_layout_manifest(all_shards),
+              dtype=dtypes.string)
+        first_shards[0][sharding_util.SHARD_LAYOUT_KEY] = {"": manifest}
       num_shards = sum([len(shards) for _, shards in shards_by_task])
       metrics.AddNumCheckpointShardsWritten(num_shards=num_shards)
       num_shards_tensor = constant_op.constant(num_shards, name="num_shards")
@@ -561,7 +674,9 @@ class MultiDeviceSaver:
   def restore(
       self,
       file_prefix: tensor_lib.Tensor,
-      options: "checkpoint_options.CheckpointOptions | None" = None
+      options: "checkpoint_options.CheckpointOptions | None" = None,
+      tensor_locations: "Mapping[str, str] | None" = None,
+      reader=None,
   ) -> Mapping[str, ops.Operation]:
     """Restore the saveable objects from a checkpoint with `file_prefix`.
 
@@ -569,6 +684,12 @@ class MultiDeviceSaver:
       file_prefix: A string or scalar string Tensor containing the prefix for
         files to read from.
       options: Optional `CheckpointOptions` object.
+      tensor_locations: Optional dict mapping checkpoint keys to the prefix of
+        the checkpoint to read them from instead of `file_prefix`, as returned
+        by `delta_checkpoint.DeltaCheckpointReader.tensor_locations`.
+      reader: Optional `CheckpointReader` for `file_prefix`, used to look up
+        tensor sizes when restoring with `experimental_restore_threads` or
+        `experimental_lazy_restore_min_bytes`.
 
     Returns:
       When not run eagerly or when saving on a single device, returns a
@@ -588,7 +709,7 @@ class MultiDeviceSaver:
         with ops.device(task):
           # Load values from checkpoint
           restored_tensor_dict = _single_shard_restore(
-              file_prefix, shard, options)
+              file_prefix, shard, options, tensor_locations)
 
           # Map restored tensors to the corresponding restore_fn, and see if
           # all inputs have all been loaded. Call `restore_fn` if that is the
@@ -646,8 +767,14 @@ class MultiDeviceSaver:
     # of variables we are restoring to. In practice, this means that custom
     # devices need the AssignVariableOps along with the Restore op within the
     # same graph to infer shapes and shard specs for Restore op.
-    if context.executing_eagerly() and (self._num_unique_tasks > 1 or
-                                        has_custom_device_saver):
+    if (context.executing_eagerly() and self._num_unique_tasks <= 1 and
+        not has_custom_device_saver and
+        (options.experimental_restore_threads is not None or
+         options.experimental_lazy_restore_min_bytes is not None)):
+      restore_ops = self._pipelined_restore(
+          file_prefix, options, tensor_locations, reader)
+    elif context.executing_eagerly() and (self._num_unique_tasks > 1 or
+                                          has_custom_device_saver):
       @def_function.function(jit_compile=False, autograph=False)
       def tf_function_restore() -> Mapping[str, ops.Operation]:
         restore_fn()
@@ -658,3 +785,180 @@ class MultiDeviceSaver:
       restore_ops = restore_fn()
 
     return restore_ops
+
+  def _pipelined_restore(
+      self,
+      file_prefix: tensor_lib.Tensor,
+      options: checkpoint_options.CheckpointOptions,
+      tensor_locations: "Mapping[str, str] | None",
+      reader,
+  ) -> Mapping[str, ops.Operation]:
+    """Restores eagerly, reading batches of tensors on a thread pool.
+
+    Restore functions of large enough resource variables are deferred until
+    the variable is first used, unless a `tf.function` may have captured the
+    variable already. The tensors of the others are packed into
+    batches, which are read concurrently while the main thread runs the
+    restore functions of the batches already read, in order, so that reading
+    from disk overlaps with the copies to the devices. Tensors which the
+    checkpoint's layout manifest (see `sharding_util.build_layout_manifest`)
+    records as saved in slices of rows are read one slice at a time, so that
+    the slices of a large tensor are read concurrently. The total size of the
+    batches read but not yet restored stays within
+    `options.experimental_restore_memory_limit`.
+
+    Args:
+      file_prefix: A string or scalar string Tensor containing the prefix for
+        files to read from.
+      options: `CheckpointOptions` object.
+      tensor_locations: Optional dict mapping checkpoint keys to the prefix of
+        the checkpoint to read them from instead of `file_prefix`.
+      reader: Optional `CheckpointReader` for `file_prefix`.
+
+    Returns:
+      A dictionary mapping from SaveableObject names to restore operations.
+    """
+    if reader is None:
+      reader = delta_checkpoint.new_checkpoint_reader(compat.as_str(
+          file_prefix.numpy() if isinstance(file_prefix, tensor_lib.Tensor)
+          else file_prefix))
+    shape_map = reader.get_variable_to_shape_map()
+    row_splits = {}
+    if reader.has_tensor(sharding_util.SHARD_LAYOUT_KEY):
+      row_splits = sharding_util.get_row_splits(
+          reader.get_tensor(sharding_util.SHARD_LAYOUT_KEY))
+    num_threads = options.experimental_restore_threads or 1
+    memory_limit = options.experimental_restore_memory_limit
+    lazy_min_bytes = options.experimental_lazy_restore_min_bytes
+
+    restore_ops = {}
+    for task, shard in self._shardable_tensors_by_task.items():
+      tensors_by_restore_fn = collections.OrderedDict()
+      for shardable_tensor in shard:
+        restore_fn = self._keys_to_restore_fn[(shardable_tensor.checkpoint_key,
+                                               shardable_tensor.slice_spec)]
+        tensors_by_restore_fn.setdefault(restore_fn, []).append(
+            shardable_tensor)
+
+      # (restore_fn, shardable_tensors, size) for each eager restore function.
+      eager_restores = []
+      num_deferred = 0
+      for restore_fn, shardable_tensors in tensors_by_restore_fn.items():
+        size = _restored_bytes(shardable_tensors, shape_map)
+        variable = (_lazily_restorable_variable(shardable_tensors[0].trackable)
+                    if lazy_min_bytes is not None and size >= lazy_min_bytes
+                    else None)
+        if variable is None:
+          eager_restores.append((restore_fn, shardable_tensors, size))
+          continue
+
+        def deferred_restore(restore_fn=restore_fn,
+                             shardable_tensors=shardable_tensors, task=task):
+          with ops.device(task):
+            restored_tensor_dict = _single_shard_restore(
+                file_prefix, shardable_tensors, options, tensor_locations)
+            restore_fn(_restore_fn_inputs(shardable_tensors,
+                                          restored_tensor_dict))
+        # Variables which a function may have captured are restored right away.
+        if variable._defer_restore(deferred_restore):  # pylint: disable=protected-access
+          num_deferred += 1
+        else:
+          eager_restores.append((restore_fn, shardable_tensors, size))
+
+      # Batches of about half of each thread's share of the memory, so that
+      # every thread can read a batch while the previous one is restored.
+      total_size = sum(size for _, _, size in eager_restores)
+      batch_size = max(
+          1, (memory_limit or total_size) // (2 * num_threads))
+
+      # (index in eager_restores, rows, size) for each read. `rows` is None to
+      # read all the tensors of the restore function, or a (start, stop) row
+      # range of its single tensor, which was saved in slices of those rows.
+      reads = []
+      num_row_reads = {}
+      for index, (_, shardable_tensors, size) in enumerate(eager_restores):
+        splits = _row_splits_to_read(shardable_tensors, row_splits)
+        if splits is None:
+          reads.append((index, None, size))
+          continue
+        num_row_reads[index] = len(splits) - 1
+        for start, stop in zip(splits[:-1], splits[1:]):
+          reads.append((index, (start, stop),
+                        size * (stop - start) // splits[-1]))
+
+      batches = []
+      for read in reads:
+        if not batches or batches[-1][1] >= batch_size:
+          batches.append(([], 0))
+        batch_reads, size = batches[-1]
+        batch_reads.append(read)
+        batches[-1] = (batch_reads, size + read[2])
+
+      def read_batch(batch_reads, task=task):
+        """Returns the restored tensors of each read in `batch_reads`."""
+        shardable_tensors = []
+        for index, rows, _ in batch_reads:
+          if rows is None:
+            shardable_tensors.extend(eager_restores[index][1])
+        with ops.device(task):
+          restored_tensor_dict = _single_shard_restore(
+              file_prefix, shardable_tensors, options, tensor_locations)
+          restored = []
+          for index, rows, _ in batch_reads:
+            if rows is None:
+              restored.append(restored_tensor_dict)
+            else:
+              [shardable_tensor] = eager_restores[index][1]
+              restored.append(_restore_rows(
+                  file_prefix, shardable_tensor,
+                  shape_map[shardable_tensor.checkpoint_key], rows, options,
+                  tensor_locations))
+          return restored
+
+      row_parts = {}
+
+      def restore_batch(in_flight):
+        future, batch_reads, size = in_flight.popleft()
+        for (index, rows, _), restored in zip(batch_reads, future.result()):
+          restore_fn, shardable_tensors, _ = eager_restores[index]
+          if rows is not None:
+            parts = row_parts.setdefault(index, [])
+            parts.append(restored)
+            if len(parts) < num_row_reads[index]:
+              continue
+            del row_parts[index]
+            with ops.device(options.experimental_io_device or "cpu:0"):
+              restored = {shardable_tensors[0].checkpoint_key: {
+                  "": array_ops.concat(parts, axis=0)}}
+          with ops.device(task):
+            ret = restore_fn(_restore_fn_inputs(shardable_tensors, restored))
+          if isinstance(ret, dict):
+            restore_ops.update(ret)
+        return size
+
+      start_time = time.time()
+      with futures.ThreadPoolExecutor(
+          max_workers=num_threads,
+          thread_name_prefix="checkpoint_restore") as executor:
+        in_flight = collections.deque()
+        in_flight_size = 0
+        for batch_reads, size in batches:
+          while in_flight and (
+              len(in_flight) >= 2 * num_threads or
+              (memory_limit is not None and
+               in_flight_size + size > memory_limit)):
+            in_flight_size -= restore_batch(in_flight)
+          in_flight.append(
+              (executor.submit(read_batch, batch_reads), batch_reads, size))
+          in_flight_size += size
+        while in_flight:
+          in_flight_size -= restore_batch(in_flight)
+      logging.vlog(
+          1, "Restored %d bytes in %d batches on %d threads in %.2fs, "
+          "deferred %d variables.", total_size, len(batches), num_threads,
+          time.time() - start_time, num_deferred)
+
+    # Run registered restore methods after the default restore ops.
+    for _, (_, restore_fn) in self._registered_savers.items():
+      restore_fn(file_prefix)
+    return restore_ops
@@ -22,6 +22,7 @@ from tensorflow.python.checkpoint import checkpoint_options
 from tensorflow.python.checkpoint import functional_saver
 from tensorflow.python.checkpoint import graph_view
 from tensorflow.python.eager import context
+from tensorflow.python.eager import def_function
 from tensorflow.python.eager import remote
 from tensorflow.python.eager import test
 from tensorflow.python.eager import wrap_function
@@ -30,6 +31,7 @@ from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import test_util
 from tensorflow.python.module import module
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_io_ops
 from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.platform import gfile
@@ -117,6 +119,95 @@ class SaverTest(test.TestCase):
         if op.type in ("SaveV2", "RestoreV2"):
           self.assertEqual(LOCALHOST, op.device)
 
+  def test_pipelined_restore(self):
+    root = checkpoint.Checkpoint(variables=[
+        resource_variable_ops.ResourceVariable(
+            constant_op.constant(float(i), shape=[10])) for i in range(5)])
+    save_path = root.save(os.path.join(self.get_temp_dir(), "ckpt"))
+    for v in root.variables:
+      v.assign(array_ops.zeros([10]))
+
+    options = checkpoint_options.CheckpointOptions(
+        experimental_restore_threads=2,
+        experimental_restore_memory_limit=80)
+    root.restore(save_path, options=options).assert_consumed()
+    for i, v in enumerate(root.variables):
+      self.assertAllEqual([float(i)] * 10, v)
+
+  def test_lazy_restore(self):
+    root = checkpoint.Checkpoint(
+        large=resource_variable_ops.ResourceVariable(
+            constant_op.constant(1., shape=[100])),
+        small=resource_variable_ops.ResourceVariable(2.))
+    save_path = root.save(os.path.join(self.get_temp_dir(), "ckpt"))
+    root.large.assign(array_ops.zeros([100]))
+    root.small.assign(0.)
+
+    options = checkpoint_options.CheckpointOptions(
+        experimental_lazy_restore_min_bytes=100)
+    root.restore(save_path, options=options).assert_consumed()
+    self.assertIsNotNone(root.large._deferred_restore)
+    self.assertIsNone(root.small._deferred_restore)
+    self.assertEqual(2., self.evaluate(root.small))
+    self.assertAllEqual([1.] * 100, root.large)
+    self.assertIsNone(root.large._deferred_restore)
+
+    # Writes before the first read are applied after the deferred restore.
+    root.large.assign(array_ops.zeros([100]))
+    root.restore(save_path, options=options)
+    root.large.assign_add(array_ops.ones([100]))
+    self.assertAllEqual([2.] * 100, root.large)
+
+  def test_lazy_restore_unread_variable(self):
+    root = checkpoint.Checkpoint(
+        large=resource_variable_ops.ResourceVariable(
+            constant_op.constant(1., shape=[100])))
+    save_path = root.save(os.path.join(self.get_temp_dir(), "ckpt"))
+    unread = root.large.assign(array_ops.zeros([100]))
+
+    options = checkpoint_options.CheckpointOptions(
+        experimental_lazy_restore_min_bytes=100)
+    root.restore(save_path, options=options).assert_consumed()
+    self.assertIsNotNone(root.large._deferred_restore)
+    # The result of an earlier assignment shares the handle of the variable.
+    self.assertAllEqual([1.] * 100, unread.read_value())
+    self.assertIsNone(root.large._deferred_restore)
+
+  def test_lazy_restore_captured_variable(self):
+    root = checkpoint.Checkpoint(
+        large=resource_variable_ops.ResourceVariable(
+            constant_op.constant(1., shape=[100])),
+        unused=resource_variable_ops.ResourceVariable(
+            constant_op.constant(2., shape=[100])))
+    save_path = root.save(os.path.join(self.get_temp_dir(), "ckpt"))
+    root.large.assign(array_ops.zeros([100]))
+    root.unused.assign(array_ops.zeros([100]))
+
+    @def_function.function
+    def train_step():
+      root.large.assign_add(array_ops.ones([100]))
+      return root.large.read_value()
+
+    self.assertAllEqual([1.] * 100, train_step())
+
+    # The function uses the handle it captured, which would skip a deferred
+    # restore, so the variable is restored right away.
+    options = checkpoint_options.CheckpointOptions(
+        experimental_lazy_restore_min_bytes=100)
+    root.restore(save_path, options=options).assert_consumed()
+    self.assertIsNone(root.large._deferred_restore)
+    self.assertIsNotNone(root.unused._deferred_restore)
+    self.assertAllEqual([2.] * 100, train_step())
+    self.assertAllEqual([2.] * 100, root.large)
+
+    # Functions traced after the restore trigger it.
+    @def_function.function
+    def read_unused():
+      return root.unused.read_value()
+
+    self.assertAllEqual([2.] * 100, read_unused())
+    self.assertIsNone(root.unused._deferred_restore)
+
   def test_to_proto(self):
     v1 = resource_variable_ops.ResourceVariable(2.)
     saver = functional_saver.MultiDeviceSaver.from_saveables(
@@ -19,6 +19,7 @@ from typing import Optional, Mapping, Any
 
 from tensorflow.python.checkpoint import checkpoint_adapter
 from tensorflow.python.checkpoint import checkpoint_view
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.checkpoint import functional_saver
 from tensorflow.python.checkpoint import save_util_v1
 from tensorflow.python.checkpoint import saveable_compat
@@ -26,8 +27,6 @@ from tensorflow.python.eager import context
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor
 from tensorflow.python.ops import array_ops
-from tensorflow.python.ops import gen_io_ops as io_ops
-from tensorflow.python.ops import io_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.saved_model import registration
 from tensorflow.python.trackable import base
@@ -174,11 +173,12 @@ class CheckpointPosition(object):
           for key in checkpoint_keys:
             dtype = self._checkpoint.dtype_map[key]
             dtypes.append(dtype.base_dtype)
-          restored_values = io_ops.restore_v2(
+          restored_values = delta_checkpoint.restore_v2(
               prefix=self._checkpoint.save_path_tensor,
               tensor_names=checkpoint_keys,
               shape_and_slices=full_shape_and_slices,
               dtypes=dtypes,
+              tensor_locations=self._checkpoint.tensor_locations,
               name="%s_checkpoint_read" % (serialized_tensor.name,),
           )
           value = self.callback.reshard(
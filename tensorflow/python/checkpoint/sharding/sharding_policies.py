@@ -14,6 +14,7 @@
 # ==============================================================================
 """Checkpoint policies that determine how tensors are split into shards."""
 
+import heapq
 import math
 import operator
 from typing import MutableSequence, Sequence
@@ -351,3 +352,146 @@ class MaxShardSizePolicy(sharding_util.ShardingCallback):
   ) -> Sequence[sharding_util.Shard]:
     return self.MaxShardSizePartitioner().get_shards(
         self.max_shard_size, shardable_tensors)
+
+
+def _size_in_bytes(shardable_tensor: sharding_util.ShardableTensor) -> int:
+  """Returns the size of a tensor to save, or 0 if it can not be computed."""
+  dtype = dtypes.as_dtype(shardable_tensor.dtype)
+  shape = tensor_shape.TensorShape(shardable_tensor.shape)
+  if (shardable_tensor.checkpoint_key == base.OBJECT_GRAPH_PROTO_KEY or
+      dtype == dtypes.variant or not shape.is_fully_defined()):
+    # The object graph is only populated when the save runs, and the size of a
+    # variant can not be determined. Neither is large.
+    return 0
+  if dtype == dtypes.string:
+    if not context.executing_eagerly():
+      return 0
+    with ops.device(shardable_tensor.device):
+      return int(sum(string_ops.string_length(
+          shardable_tensor.tensor, unit="BYTE").numpy().flat))
+  return shape.num_elements() * dtype.size
+
+
+@tf_export.tf_export("train.experimental.BalancedShardSizePolicy")
+class BalancedShardSizePolicy(sharding_util.ShardingCallback):
+  """Policy that balances the size of tensors across a number of shards.
+
+  Tensors larger than an even share of the total size are split along their
+  first axis, so that a single large variable, such as an embedding table, is
+  spread over several shards. The pieces are then assigned to the shards,
+  largest first, each to the shard with the fewest bytes so far.
+
+  Checkpoints written with this policy also hold a layout manifest, which
+  records the tensors and size of each shard and the rows at which each
+  tensor was split. When restoring with the `experimental_restore_threads`
+  option of `tf.train.CheckpointOptions`, the pieces of a split tensor are
+  read concurrently.
+
+  ```
+  ckpt.save(
+      "path",
+      options=tf.train.CheckpointOptions(
+          experimental_sharding_callback=(
+              tf.train.experimental.BalancedShardSizePolicy(num_shards=8))))
+  ```
+  """
+
+  def __init__(self, num_shards: int):
+    if num_shards < 1:
+      raise ValueError("The number of shards of BalancedShardSizePolicy must "
+                       f"be at least 1, got {num_shards}.")
+    self.num_shards = num_shards
+
+  @property
+  def description(self) -> str:
+    return "Balance the size of tensors across a number of shards."
+
+  def _split_rows(
+      self,
+      shardable_tensor: sharding_util.ShardableTensor,
+      size: int,
+      max_size: int,
+  ) -> Sequence[tuple[str, tensor_lib.Tensor, int]]:
+    """Splits a tensor along its first axis into pieces of at most max_size.
+
+    Args:
+      shardable_tensor: The ShardableTensor to split.
+      size: The size of the tensor in bytes.
+      max_size: The target size of a piece in bytes.
+
+    Returns:
+      A list of (slice_spec, tensor, size) tuples, one per piece.
+    """
+    shape = tensor_shape.TensorShape(shardable_tensor.shape)
+    if (size <= max_size or shape.rank is None or shape.rank == 0 or
+        shape.dims[0].value is None or shape.dims[0].value < 2 or
+        shardable_tensor.dtype == dtypes.string):
+      return [(shardable_tensor.slice_spec, shardable_tensor.tensor, size)]
+
+    if shardable_tensor.slice_spec:
+      save_slice_info = variables.Variable.SaveSliceInfo.from_spec(
+          shardable_tensor.slice_spec)
+      full_shape = save_slice_info.full_shape
+      root_offset = save_slice_info.var_offset
+    else:
+      full_shape = shape.as_list()
+      root_offset = [0] * shape.rank
+
+    num_rows = shape.dims[0].value
+    rows_per_piece = math.ceil(
+        num_rows / min(num_rows, math.ceil(size / max_size)))
+    pieces = []
+    for start in range(0, num_rows, rows_per_piece):
+      piece_shape = shape.as_list()
+      piece_shape[0] = min(rows_per_piece, num_rows - start)
+      piece_offset = list(root_offset)
+      piece_offset[0] += start
+      with ops.device(shardable_tensor.device):
+        piece = array_ops.slice(
+            shardable_tensor.tensor,
+            begin=[start] + [0] * (shape.rank - 1), size=piece_shape)
+      slice_spec = variables.Variable.SaveSliceInfo(
+          full_name=shardable_tensor.checkpoint_key,
+          full_shape=full_shape,
+          var_offset=piece_offset,
+          var_shape=piece_shape).spec.strip()
+      pieces.append((slice_spec, piece, size * piece_shape[0] // num_rows))
+    return pieces
+
+  def __call__(
+      self, shardable_tensors: Sequence[sharding_util.ShardableTensor]
+  ) -> Sequence[sharding_util.Shard]:
+    """Callback to balance tensors across `num_shards` shards.
+
+    Args:
+      shardable_tensors: A list of ShardableTensors.
+
+    Returns:
+      List of shard dicts containing tensors.
+          [ {checkpoint key: {slice_spec: tensor} } ]
+    """
+    sizes = [_size_in_bytes(t) for t in shardable_tensors]
+    max_piece_size = max(1, math.ceil(sum(sizes) / self.num_shards))
+
+    # (size, checkpoint_key, slice_spec, tensor) for each piece.
+    pieces = []
+    for shardable_tensor, size in zip(shardable_tensors, sizes):
+      for slice_spec, tensor, piece_size in self._split_rows(
+          shardable_tensor, size, max_piece_size):
+        pieces.append(
+            (piece_size, shardable_tensor.checkpoint_key, slice_spec, tensor))
+    # Largest first; the sort is stable, so equal sizes keep their order.
+    pieces.sort(key=lambda piece: piece[0], reverse=True)
+
+    shards = [{} for _ in range(self.num_shards)]
+    # (bytes in the shard, shard index), smallest first.
+    shard_sizes = [(0, index) for index in range(self.num_shards)]
+    for piece_size, checkpoint_key, slice_spec, tensor in pieces:
+      shard_size, index = heapq.heappop(shard_sizes)
+      shards[index].setdefault(checkpoint_key, {})[slice_spec] = tensor
+      heapq.heappush(shard_sizes, (shard_size + piece_size, index))
+
+    logging.vlog(1, "Balanced %d tensors in %d pieces across shards of %s "
+                 "bytes.", len(shardable_tensors), len(pieces),
+                 sorted(shard_sizes))
+    return [shard for shard in shards if shard]
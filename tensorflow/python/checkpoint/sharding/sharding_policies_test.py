@@ -14,6 +14,7 @@
 # ==============================================================================
 """Tests for checkpoint sharding policies."""
 
+import json
 import random
 import re
 import string
@@ -34,6 +35,8 @@ from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import test_util
 from tensorflow.python.module import module
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
@@ -804,6 +807,62 @@ class ShardingPoliciesTest(test.TestCase):
     self.assertTrue(
         re.search("sharding policy is being executed in a tf.function", output))
 
+  def test_BalancedShardSizePolicy(self):
+    root = module.Module()
+    with ops.device("cpu:0"):
+      root.v0 = resource_variable_ops.ResourceVariable(
+          array_ops.reshape(math_ops.range(16.0), [8, 2]), name="v0")
+      root.v1 = resource_variable_ops.ResourceVariable([1.0, 2.0], name="v1")
+      root.v2 = resource_variable_ops.ResourceVariable([3.0, 4.0], name="v2")
+    v0_name = "v0/.ATTRIBUTES/VARIABLE_VALUE"
+
+    shardable_tensors = self._get_shardable_tensors_by_task(root)
+    callback = sharding_policies.BalancedShardSizePolicy(num_shards=2)
+    shards = []
+    for tensors in shardable_tensors:
+      shards.extend(callback(tensors))
+
+    # The 80 bytes are balanced as v0[:4] and v1 (or v2) in each shard.
+    self.assertLen(shards, 2)
+    v0_slices = [list(shard[v0_name].keys()) for shard in shards]
+    self.assertEqual([["8 2 0,4:0,2"], ["8 2 4,4:0,2"]], v0_slices)
+    self.assertAllEqual(
+        [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0], [6.0, 7.0]],
+        shards[0][v0_name]["8 2 0,4:0,2"])
+    manifest = sharding_util.build_layout_manifest(shards)
+    self.assertEqual(
+        [40, 40], [shard["bytes"] for shard in json.loads(manifest)["shards"]])
+    self.assertEqual({v0_name: [0, 4, 8]},
+                     sharding_util.get_row_splits(manifest))
+
+  def test_CheckpointOption_BalancedShardSizePolicy(self):
+    root = module.Module()
+    with ops.device("cpu:0"):
+      root.v0 = resource_variable_ops.ResourceVariable(
+          array_ops.reshape(math_ops.range(16.0), [8, 2]), name="v0")
+      root.v1 = resource_variable_ops.ResourceVariable([1.0, 2.0], name="v1")
+
+    tmp_dir = self.create_tempdir("ckpt")
+    ckpt = checkpoint.Checkpoint(root)
+    save_path = ckpt.save(
+        tmp_dir, options=checkpoint_options.CheckpointOptions(
+            experimental_sharding_callback=(
+                sharding_policies.BalancedShardSizePolicy(num_shards=3))))
+    self.assertLen(gfile.Glob(save_path + ".data*"), 3)
+
+    root.v0.assign(array_ops.zeros([8, 2]))
+    root.v1.assign([0.0, 0.0])
+    ckpt.restore(
+        save_path, options=checkpoint_options.CheckpointOptions(
+            experimental_restore_threads=2)).assert_consumed()
+    self.assertAllEqual(
+        array_ops.reshape(math_ops.range(16.0), [8, 2]), root.v0)
+    self.assertAllEqual([1.0, 2.0], root.v1)
+
+  def test_BalancedShardSizePolicy_InvalidNumShards(self):
+    with self.assertRaisesRegex(ValueError, "at least 1"):
+      sharding_policies.BalancedShardSizePolicy(num_shards=0)
+
 
 if __name__ == "__main__":
   ops.enable_eager_execution()
@@ -17,6 +17,7 @@
 import abc
 import dataclasses
 import inspect
+import json
 from typing import Hashable, MutableMapping, Sequence
 
 from tensorflow.python.framework import device as device_lib
@@ -36,6 +37,10 @@ TensorSlices = MutableMapping[tensor_spec.TensorSpec, tensor_lib.Tensor]
 # checkpoint shard data file.
 Shard = MutableMapping[str, TensorSlices]
 
+# Checkpoint key of the layout manifest written with
+# `tf.train.experimental.BalancedShardSizePolicy`.
+SHARD_LAYOUT_KEY = "_CHECKPOINTABLE_SHARD_LAYOUT"
+
 
 @tf_export.tf_export("train.experimental.ShardableTensor")
 @dataclasses.dataclass(frozen=True)
@@ -286,3 +291,72 @@ def validate_shards(
         "object graph were not found in the checkpoint shards:\n"
         f"  callback_description: {callback_description}\n"
         f"{tensors_info}")
+
+
+def build_layout_manifest(shards: Sequence[Shard]) -> str:
+  """Returns a JSON manifest describing the layout of `shards`.
+
+  The manifest holds, for each shard, its tensors as `[checkpoint_key,
+  slice_spec]` pairs and its size in bytes, and for each tensor split only
+  along its first axis, the row offsets of its slices ending with the number of
+  rows (see `get_row_splits`).
+
+  Args:
+    shards: A list of shards, as returned by a `ShardingCallback`.
+  """
+  shard_layouts = []
+  row_ranges = {}
+  not_row_split = set()
+  for shard in shards:
+    shard_tensors = []
+    shard_size = 0
+    for checkpoint_key, tensor_slice_dict in shard.items():
+      for slice_spec, tensor in tensor_slice_dict.items():
+        slice_spec = slice_spec.strip()
+        shard_tensors.append([checkpoint_key, slice_spec])
+        shape = tensor_shape.TensorShape(tensor.shape)
+        if shape.is_fully_defined() and tensor.dtype != dtypes.string:
+          shard_size += shape.num_elements() * tensor.dtype.size
+        if not slice_spec:
+          not_row_split.add(checkpoint_key)
+          continue
+        save_slice_info = variables.Variable.SaveSliceInfo.from_spec(
+            slice_spec)
+        if (any(save_slice_info.var_offset[1:]) or
+            save_slice_info.var_shape[1:] != save_slice_info.full_shape[1:]):
+          not_row_split.add(checkpoint_key)
+          continue
+        row_ranges.setdefault(checkpoint_key, []).append(
+            (save_slice_info.var_offset[0], save_slice_info.var_shape[0],
+             save_slice_info.full_shape[0]))
+    shard_layouts.append({"tensors": shard_tensors, "bytes": shard_size})
+
+  row_splits = {}
+  for checkpoint_key, ranges in row_ranges.items():
+    if checkpoint_key in not_row_split:
+      continue
+    splits = [0]
+    for offset, num_rows, total_rows in sorted(ranges):
+      if offset != splits[-1]:
+        break
+      splits.append(offset + num_rows)
+    else:
+      if splits[-1] == total_rows:
+        row_splits[checkpoint_key] = splits
+  return json.dumps({"shards": shard_layouts, "row_splits": row_splits},
+                    sort_keys=True)
+
+
+def get_row_splits(manifest: "str | bytes") -> MutableMapping[str, list[int]]:
+  """Returns the row splits recorded in a layout manifest.
+
+  Args:
+    manifest: A manifest returned by `build_layout_manifest`.
+
+  Returns:
+    A dict mapping the checkpoint keys of tensors saved in slices along their
+    first axis to the row offsets of the slices, followed by the number of
+    rows. For example, `[0, 5, 10]` for a tensor of 10 rows saved in two
+    slices.
+  """
+  return json.loads(manifest)["row_splits"]
@@ -34,6 +34,24 @@ from tensorflow.python.ops.ragged import ragged_tensor
 from tensorflow.python.platform import test
 
 
+# Worker processes may need to unpickle the generator, so it must be defined at
+# module level.
+def _sharded_range(stop, worker_index, num_workers):
+  for i in range(worker_index, stop, num_workers):
+    yield i, np.full([2], i, dtype=np.float32)
+
+
+def _sharded_ragged_range(stop, worker_index, num_workers):
+  for i in range(worker_index, stop, num_workers):
+    yield np.arange(i, dtype=np.float32)
+
+
+def _failing_generator(worker_index, num_workers):
+  del num_workers
+  yield worker_index
+  raise ValueError("generator failed")
+
+
 class FromGeneratorTest(test_base.DatasetTestBase, parameterized.TestCase):
 
   def _testFromGenerator(self, generator, elem_sequence, num_repeats,
@@ -512,6 +530,108 @@ class FromGeneratorTest(test_base.DatasetTestBase, parameterized.TestCase):
       dataset_ops.Dataset.from_generator(
           generator, output_types=(dtypes.int64), output_shapes=[[1]])
 
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatched(self):
+
+    def generator():
+      for i in range(7):
+        yield i, [i] * 2
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator,
+        output_signature=(tensor_spec.TensorSpec([], dtypes.int64),
+                          tensor_spec.TensorSpec([2], dtypes.int64)),
+        batch_size=3)
+    self.assertEqual([None], dataset.element_spec[0].shape.as_list())
+    self.assertEqual([None, 2], dataset.element_spec[1].shape.as_list())
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[([0, 1, 2], [[0, 0], [1, 1], [2, 2]]),
+                         ([3, 4, 5], [[3, 3], [4, 4], [5, 5]]),
+                         ([6], [[6, 6]])])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatchedShapeError(self):
+
+    def generator():
+      yield [1, 2]
+      yield [3]
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator, output_types=dtypes.int64, output_shapes=[2], batch_size=2)
+    get_next = self.getNext(dataset)
+    with self.assertRaises(errors.InvalidArgumentError):
+      self.evaluate(get_next())
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(batch_size=[None, 2])))
+  def testFromGeneratorWorkers(self, batch_size):
+    dataset = dataset_ops.Dataset.from_generator(
+        _sharded_range,
+        output_signature=(tensor_spec.TensorSpec([], dtypes.int64),
+                          tensor_spec.TensorSpec([2], dtypes.float32)),
+        args=(9,),
+        batch_size=batch_size,
+        num_workers=3)
+    if batch_size is not None:
+      dataset = dataset.unbatch()
+    elements = self.getDatasetOutput(dataset)
+    self.assertCountEqual(range(9), [i for i, _ in elements])
+    for i, values in elements:
+      self.assertAllEqual([i, i], values)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorWorkersUnknownShape(self):
+    dataset = dataset_ops.Dataset.from_generator(
+        _sharded_ragged_range,
+        output_signature=tensor_spec.TensorSpec([None], dtypes.float32),
+        args=(5,),
+        num_workers=2)
+    elements = self.getDatasetOutput(dataset)
+    self.assertCountEqual(range(5), [len(values) for values in elements])
+    for values in elements:
+      self.assertAllEqual(np.arange(len(values)), values)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorWorkersError(self):
+    dataset = dataset_ops.Dataset.from_generator(
+        _failing_generator,
+        output_signature=tensor_spec.TensorSpec([], dtypes.int64),
+        num_workers=1)
+    get_next = self.getNext(dataset)
+    self.assertEqual(0, self.evaluate(get_next()))
+    with self.assertRaisesRegex(errors.InvalidArgumentError,
+                                "generator failed"):
+      self.evaluate(get_next())
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testBatchedRaggedSignatureError(self):
+
+    def generator():
+      yield ragged_factory_ops.constant_value([[1], [2, 3]])
+
+    with self.assertRaisesRegex(TypeError, "only `tf.TensorSpec` objects"):
+      dataset_ops.Dataset.from_generator(
+          generator,
+          output_signature=ragged_tensor.RaggedTensorSpec(
+              shape=(2, None), dtype=dtypes.int64),
+          batch_size=2)
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(kwargs=[{"batch_size": 0},
+                                       {"num_workers": 0}])))
+  def testInvalidBatchSizeOrNumWorkers(self, kwargs):
+
+    def generator():
+      yield 42
+
+    with self.assertRaisesRegex(ValueError, "must be at least 1"):
+      dataset_ops.Dataset.from_generator(
+          generator, output_types=dtypes.int64, **kwargs)
+
   @combinations.generate(test_base.default_test_combinations())
   def testName(self):
 
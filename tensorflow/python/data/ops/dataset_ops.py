@@ -880,6 +880,8 @@ class DatasetV2(
       args=None,
       output_signature=None,
       name=None,
+      batch_size=None,
+      num_workers=None,
   ) -> "DatasetV2":
     """Creates a `Dataset` whose elements are generated by `generator`.
 
@@ -940,6 +942,29 @@ class DatasetV2(
     tf.data operations within the generator function is an anti-pattern and may
     result in incremental memory growth.
 
+    Each element that `generator` yields is passed to TensorFlow through a
+    separate `tf.numpy_function` call. When elements are small, set
+    `batch_size` to convert and stack up to `batch_size` elements per call
+    instead. The resulting dataset is equivalent to
+    `from_generator(...).batch(batch_size)`:
+
+    >>> dataset = tf.data.Dataset.from_generator(
+    ...     lambda: range(5),
+    ...     output_signature=tf.TensorSpec(shape=(), dtype=tf.int64),
+    ...     batch_size=2)
+    >>> list(dataset.as_numpy_iterator())
+    [array([0, 1]), array([2, 3]), array([4])]
+
+    Set `num_workers` to run `generator` in that many worker processes, which
+    send their elements back through shared memory. Each worker calls
+    `generator(*args, worker_index, num_workers)`, which should yield that
+    worker's shard of the elements. The elements of the shards are interleaved
+    in a nondeterministic order.
+
+    Both options require every component of an element to be a `tf.Tensor`.
+    With `num_workers`, `generator` and `args` must be picklable, since the
+    worker processes are spawned rather than forked.
+
     Args:
       generator: A callable object that returns an object that supports the
         `iter()` protocol. If `args` is not specified, `generator` must take no
@@ -957,6 +982,11 @@ class DatasetV2(
         `generator`.
       name: (Optional.) A name for the tf.data operations used by
         `from_generator`.
+      batch_size: (Optional.) A Python integer. If set, the dataset produces
+        batches of up to `batch_size` consecutive elements of `generator`.
+      num_workers: (Optional.) A Python integer. If set, `generator` is run in
+        `num_workers` worker processes, each producing a shard of the
+        elements.
 
     Returns:
       Dataset: A `Dataset`.
@@ -967,7 +997,8 @@ class DatasetV2(
     from tensorflow.python.data.ops import from_generator_op
     return from_generator_op._from_generator(generator, output_types,
                                              output_shapes, args,
-                                             output_signature, name)
+                                             output_signature, name,
+                                             batch_size, num_workers)
     # pylint: enable=g-import-not-at-top,protected-access
 
   @staticmethod
@@ -3958,7 +3989,9 @@ class DatasetV1(DatasetV2, data_types.DatasetV1):
                      output_shapes=None,
                      args=None,
                      output_signature=None,
-                     name=None):
+                     name=None,
+                     batch_size=None,
+                     num_workers=None):
     # Calling DatasetV2.from_generator with output_shapes or output_types is
     # deprecated, but this is already checked by the decorator on this function.
     with deprecation.silence():
@@ -3969,7 +4002,9 @@ class DatasetV1(DatasetV2, data_types.DatasetV1):
               output_shapes,
               args,
               output_signature,
-              name=name))
+              name=name,
+              batch_size=batch_size,
+              num_workers=num_workers))
 
   @staticmethod
   @functools.wraps(DatasetV2.range)
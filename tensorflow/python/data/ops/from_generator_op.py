@@ -14,10 +14,14 @@
 # ==============================================================================
 """The implementation of `tf.data.Dataset.from_generator`."""
 
+import functools
+import itertools
+
 import numpy as np
 
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import structured_function
+from tensorflow.python.data.util import multiprocess_generator
 from tensorflow.python.data.util import nest
 from tensorflow.python.data.util import structure
 from tensorflow.python.framework import dtypes
@@ -30,7 +34,7 @@ from tensorflow.python.ops import script_ops
 
 
 def _from_generator(generator, output_types, output_shapes, args,
-                    output_signature, name):
+                    output_signature, name, batch_size=None, num_workers=None):
   """Creates a `Dataset` whose elements are generated by `generator`.
 
   Note: The current implementation of `Dataset.from_generator()` uses
@@ -90,6 +94,28 @@ def _from_generator(generator, output_types, output_shapes, args,
   tf.data operations within the generator function is an anti-pattern and may
   result in incremental memory growth.
 
+  Each element that `generator` yields is passed to TensorFlow through a
+  separate `tf.numpy_function` call. When elements are small, set `batch_size`
+  to convert and stack up to `batch_size` elements per call instead. The
+  resulting dataset is equivalent to `from_generator(...).batch(batch_size)`:
+
+  >>> dataset = tf.data.Dataset.from_generator(
+  ...     lambda: range(5),
+  ...     output_signature=tf.TensorSpec(shape=(), dtype=tf.int64),
+  ...     batch_size=2)
+  >>> list(dataset.as_numpy_iterator())
+  [array([0, 1]), array([2, 3]), array([4])]
+
+  Set `num_workers` to run `generator` in that many worker processes, which
+  send their elements back through shared memory. Each worker calls
+  `generator(*args, worker_index, num_workers)`, which should yield that
+  worker's shard of the elements. The elements of the shards are interleaved
+  in a nondeterministic order.
+
+  Both options require every component of an element to be a `tf.Tensor`.
+  With `num_workers`, `generator` and `args` must be picklable, since the
+  worker processes are spawned rather than forked.
+
   Args:
     generator: A callable object that returns an object that supports the
       `iter()` protocol. If `args` is not specified, `generator` must take no
@@ -105,6 +131,10 @@ def _from_generator(generator, output_types, output_shapes, args,
       corresponding to each component of an element yielded by `generator`.
     name: (Optional.) A name for the tf.data operations used by
       `from_generator`.
+    batch_size: (Optional.) A Python integer. If set, the dataset produces
+      batches of up to `batch_size` consecutive elements of `generator`.
+    num_workers: (Optional.) A Python integer. If set, `generator` is run in
+      `num_workers` worker processes, each producing a shard of the elements.
 
   Returns:
     Dataset: A `Dataset`.
@@ -129,6 +159,10 @@ def _from_generator(generator, output_types, output_shapes, args,
       raise TypeError("To specify the output signature you need to provide "
                       "either the `output_signature` argument or the "
                       "`output_types` argument.")
+  if batch_size is not None and batch_size < 1:
+    raise ValueError(f"`batch_size` must be at least 1, got {batch_size}.")
+  if num_workers is not None and num_workers < 1:
+    raise ValueError(f"`num_workers` must be at least 1, got {num_workers}.")
 
   if output_signature is None:
     if output_shapes is None:
@@ -148,13 +182,38 @@ def _from_generator(generator, output_types, output_shapes, args,
         output_signature, [x.dtype for x in nest.flatten(output_signature)])
     output_shapes = nest.pack_sequence_as(
         output_signature, [x.shape for x in nest.flatten(output_signature)])
+  elif batch_size is not None or num_workers is not None:
+    raise TypeError("The `batch_size` and `num_workers` arguments can only be "
+                    "used when `output_signature` contains only "
+                    "`tf.TensorSpec` objects.")
 
   if args is None:
     args = ()
   else:
     args = tuple(ops.convert_n_to_tensor(args, name="args"))
 
-  generator_state = dataset_ops.DatasetV2._GeneratorState(generator)  # pylint: disable=protected-access
+  if output_types and output_shapes:
+    converter = _ElementConverter(output_types, output_shapes)
+    if num_workers is not None:
+      slot_bytes = _slot_bytes(output_types, output_shapes, batch_size)
+      def converted_generator(*generator_args):
+        return multiprocess_generator.MultiprocessGenerator(
+            functools.partial(_generate_shard, generator, generator_args,
+                              converter, batch_size), num_workers, slot_bytes)
+    else:
+      def converted_generator(*generator_args):
+        return _convert_elements(
+            iter(generator(*generator_args)), converter, batch_size)
+    if batch_size is not None:
+      def batch_shape(shape):
+        return tensor_shape.TensorShape([None]).concatenate(shape)
+      output_shapes = nest.map_structure_up_to(
+          output_types, batch_shape, output_shapes)
+      output_signature = nest.map_structure_up_to(
+          output_types, tensor_spec.TensorSpec, output_shapes, output_types)
+    generator_state = dataset_ops.DatasetV2._GeneratorState(converted_generator)  # pylint: disable=protected-access
+  else:
+    generator_state = dataset_ops.DatasetV2._GeneratorState(generator)  # pylint: disable=protected-access
 
   def get_iterator_id_fn(unused_dummy):
     """Creates a unique `iterator_id` for each pass over the dataset.
@@ -194,49 +253,9 @@ def _from_generator(generator, output_types, output_shapes, args,
       def generator_py_func(iterator_id):
         """A `py_func` that will be called to invoke the iterator."""
         # `next()` raises `StopIteration` when there are no more
-        # elements remaining to be generated.
-        values = next(generator_state.get_iterator(iterator_id))
-
-        # Use the same _convert function from the py_func() implementation to
-        # convert the returned values to arrays early, so that we can inspect
-        # their values.
-        try:
-          flattened_values = nest.flatten_up_to(output_types, values)
-        except (TypeError, ValueError) as e:
-          raise TypeError(
-              f"`generator` yielded an element that did not match the "
-              f"expected structure. The expected structure was "
-              f"{output_types}, but the yielded element was {values}.") from e
-        ret_arrays = []
-        for ret, dtype in zip(flattened_values, flattened_types):
-          try:
-            ret_arrays.append(
-                script_ops.FuncRegistry._convert(  # pylint: disable=protected-access
-                    ret,
-                    dtype=dtype.as_numpy_dtype))
-          except (TypeError, ValueError) as e:
-            raise TypeError(
-                f"`generator` yielded an element that could not be "
-                f"converted to the expected type. The expected type was "
-                f"{dtype.name}, but the yielded element was {ret}.") from e
-
-        # Additional type and shape checking to ensure that the components of
-        # the generated element match the `output_types` and `output_shapes`
-        # arguments.
-        for (ret_array, expected_dtype,
-             expected_shape) in zip(ret_arrays, flattened_types,
-                                    flattened_shapes):
-          if ret_array.dtype != expected_dtype.as_numpy_dtype:
-            raise TypeError(
-                f"`generator` yielded an element of type {ret_array.dtype} "
-                f"where an element of type {expected_dtype.as_numpy_dtype} "
-                f"was expected.")
-          if not expected_shape.is_compatible_with(ret_array.shape):
-            raise TypeError(
-                f"`generator` yielded an element of shape {ret_array.shape} "
-                f"where an element of shape {expected_shape} was expected.")
-
-        return ret_arrays
+        # elements remaining to be generated. The iterator has already
+        # converted the element to a list of arrays.
+        return next(generator_state.get_iterator(iterator_id))
 
       flat_values = script_ops.numpy_function(generator_py_func,
                                               [iterator_id_t], flattened_types)
@@ -331,6 +350,101 @@ def _from_generator(generator, output_types, output_shapes, args,
   return id_dataset.flat_map(flat_map_fn, name=name)
 
 
+class _ElementConverter:
+  """Converts the elements yielded by a generator to lists of arrays.
+
+  This is a class rather than a closure so that it can be pickled and sent to
+  the worker processes of `from_generator(..., num_workers=...)`.
+  """
+
+  def __init__(self, output_types, output_shapes):
+    self._output_types = output_types
+    self._flattened_types = [
+        dtypes.as_dtype(dt) for dt in nest.flatten(output_types)
+    ]
+    self._flattened_shapes = nest.flatten(output_shapes)
+
+  def __call__(self, values):
+    # Use the same _convert function from the py_func() implementation to
+    # convert the returned values to arrays early, so that we can inspect
+    # their values.
+    try:
+      flattened_values = nest.flatten_up_to(self._output_types, values)
+    except (TypeError, ValueError) as e:
+      raise TypeError(
+          f"`generator` yielded an element that did not match the "
+          f"expected structure. The expected structure was "
+          f"{self._output_types}, but the yielded element was {values}.") from e
+    ret_arrays = []
+    for ret, dtype in zip(flattened_values, self._flattened_types):
+      try:
+        ret_arrays.append(
+            script_ops.FuncRegistry._convert(  # pylint: disable=protected-access
+                ret,
+                dtype=dtype.as_numpy_dtype))
+      except (TypeError, ValueError) as e:
+        raise TypeError(
+            f"`generator` yielded an element that could not be "
+            f"converted to the expected type. The expected type was "
+            f"{dtype.name}, but the yielded element was {ret}.") from e
+
+    # Additional type and shape checking to ensure that the components of
+    # the generated element match the `output_types` and `output_shapes`
+    # arguments.
+    for (ret_array, expected_dtype,
+         expected_shape) in zip(ret_arrays, self._flattened_types,
+                                self._flattened_shapes):
+      if ret_array.dtype != expected_dtype.as_numpy_dtype:
+        raise TypeError(
+            f"`generator` yielded an element of type {ret_array.dtype} "
+            f"where an element of type {expected_dtype.as_numpy_dtype} "
+            f"was expected.")
+      if not expected_shape.is_compatible_with(ret_array.shape):
+        raise TypeError(
+            f"`generator` yielded an element of shape {ret_array.shape} "
+            f"where an element of shape {expected_shape} was expected.")
+
+    return ret_arrays
+
+
+def _convert_elements(iterator, converter, batch_size):
+  """Converts the elements of `iterator`, batching them if requested."""
+  if batch_size is None:
+    return map(converter, iterator)
+  return _batch_elements(iterator, converter, batch_size)
+
+
+def _batch_elements(iterator, converter, batch_size):
+  """Yields the stacked arrays of up to `batch_size` converted elements."""
+  while True:
+    batch = [converter(values)
+             for values in itertools.islice(iterator, batch_size)]
+    if not batch:
+      return
+    yield [np.stack(component) for component in zip(*batch)]
+
+
+def _slot_bytes(output_types, output_shapes, batch_size):
+  """Returns the shared memory needed to send one converted value."""
+  components = []
+  for dtype, shape in zip(nest.flatten(output_types),
+                          nest.flatten(output_shapes)):
+    shape = tensor_shape.as_shape(shape)
+    if batch_size is not None:
+      shape = tensor_shape.TensorShape([batch_size]).concatenate(shape)
+    components.append((dtypes.as_dtype(dtype).as_numpy_dtype,
+                       tuple(shape.as_list()) if shape.is_fully_defined()
+                       else None))
+  return multiprocess_generator.required_slot_bytes(components)
+
+
+def _generate_shard(generator, args, converter, batch_size, worker_index,
+                    num_workers):
+  """Runs in a worker process to produce its shard of the elements."""
+  iterator = iter(generator(*args, worker_index, num_workers))
+  return _convert_elements(iterator, converter, batch_size)
+
+
 class _GeneratorDataset(dataset_ops.DatasetSource):
   """A `Dataset` that generates elements by invoking a function."""
 
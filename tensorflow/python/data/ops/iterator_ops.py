@@ -708,6 +708,8 @@ class OwnedIterator(IteratorBase):
             "not be specified.")
       self._create_iterator(dataset)
 
+    self._decode_element = structure.compatible_tensor_list_decoder(
+        self._element_spec)
     self._get_next_call_count = 0
 
   def _create_iterator(self, dataset):
@@ -768,7 +770,7 @@ class OwnedIterator(IteratorBase):
             self._iterator_resource,
             output_types=self._flat_output_types,
             output_shapes=self._flat_output_shapes)
-      return structure.from_compatible_tensor_list(self._element_spec, ret)
+      return self._decode_element(ret)
 
     # TODO(b/77291417): This runs in sync mode as iterators use an error status
     # to communicate that there is no more data to iterate over.
@@ -777,12 +779,7 @@ class OwnedIterator(IteratorBase):
           self._iterator_resource,
           output_types=self._flat_output_types,
           output_shapes=self._flat_output_shapes)
-
-      try:
-        # Fast path for the case `self._structure` is not a nested structure.
-        return self._element_spec._from_compatible_tensor_list(ret)  # pylint: disable=protected-access
-      except AttributeError:
-        return structure.from_compatible_tensor_list(self._element_spec, ret)
+      return self._decode_element(ret)
 
   def _save(self):
     external_state_policy = None
@@ -0,0 +1,227 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Runs shards of a Python generator in worker processes.
+
+Each worker sends its values back as lists of NumPy arrays. Numeric arrays are
+written to shared memory slots owned by the consuming process, so only a small
+description of each value goes through the pipe; other arrays are pickled.
+
+Workers are started with the "spawn" method: forking a process which runs
+TensorFlow's thread pools can deadlock the child.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+import pickle
+import queue
+import traceback
+
+import numpy as np
+
+# Number of values each worker may have in flight.
+_SLOTS_PER_WORKER = 2
+# Size of each shared memory slot when the size of the values is unknown. Values
+# that don't fit are pickled instead.
+_DEFAULT_SLOT_BYTES = 1 << 20
+_ALIGNMENT = 64
+# NumPy dtype kinds which are written to shared memory.
+_PACKED_KINDS = "biufc"
+# Seconds to wait for a worker to exit before terminating it.
+_JOIN_TIMEOUT = 5
+# Seconds between checks that the workers are still alive.
+_POLL_INTERVAL = 1
+
+
+def _align(offset):
+  return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def required_slot_bytes(components):
+  """Returns the shared memory needed to send values with `components`.
+
+  Args:
+    components: A list of `(dtype, shape)` pairs describing the arrays of a
+      value, where `shape` is a tuple of integers, or `None` if unknown.
+
+  Returns:
+    The number of bytes, or `None` if the shape of a numeric array is unknown.
+  """
+  size = 0
+  for dtype, shape in components:
+    dtype = np.dtype(dtype)
+    if dtype.kind not in _PACKED_KINDS:
+      continue
+    if shape is None:
+      return None
+    size = _align(size + dtype.itemsize * int(np.prod(shape, dtype=np.int64)))
+  return size
+
+
+def _pack(arrays, buf):
+  """Writes the numeric `arrays` to `buf` and returns their layout."""
+  layout = []
+  offset = 0
+  for array in arrays:
+    array = np.asarray(array)
+    end = offset + array.nbytes
+    if array.dtype.kind in _PACKED_KINDS and end <= len(buf):
+      np.ndarray(array.shape, array.dtype, buffer=buf, offset=offset)[...] = (
+          array)
+      layout.append((array.dtype, array.shape, offset))
+      offset = _align(end)
+    else:
+      layout.append(array)
+  return layout
+
+
+def _unpack(layout, buf):
+  """Copies the arrays described by `layout` out of `buf`."""
+  arrays = []
+  for item in layout:
+    if isinstance(item, np.ndarray):
+      arrays.append(item)
+    else:
+      dtype, shape, offset = item
+      arrays.append(
+          np.ndarray(shape, dtype, buffer=buf, offset=offset).copy())
+  return arrays
+
+
+def _picklable_error(error):
+  try:
+    pickle.dumps(error)
+    return error
+  except Exception:  # pylint: disable=broad-except
+    return RuntimeError("".join(
+        traceback.format_exception(type(error), error, error.__traceback__)))
+
+
+def _worker_main(generate_shard, worker_index, num_workers, slot_names,
+                 output_queue, free_queue):
+  """Produces the shard `worker_index` and sends it to `output_queue`."""
+  slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+  try:
+    for arrays in generate_shard(worker_index, num_workers):
+      slot = free_queue.get()
+      if slot is None:
+        return
+      output_queue.put(
+          ("value", worker_index, (slot, _pack(arrays, slots[slot].buf))))
+  except Exception as e:  # pylint: disable=broad-except
+    output_queue.put(("error", worker_index, _picklable_error(e)))
+  finally:
+    for slot in slots:
+      slot.close()
+    output_queue.put(("done", worker_index, None))
+
+
+class MultiprocessGenerator:
+  """Iterates over values produced by `num_workers` worker processes.
+
+  `generate_shard(worker_index, num_workers)` is called in each worker and must
+  return an iterable of lists of NumPy arrays. It must be picklable, since the
+  workers are spawned. The values of all shards are interleaved in the order in
+  which they arrive.
+
+  Each worker gets `_SLOTS_PER_WORKER` shared memory slots of `slot_bytes`
+  bytes, which should be the size returned by `required_slot_bytes()` for the
+  values of `generate_shard`. If it is `None`, `_DEFAULT_SLOT_BYTES` are used.
+  """
+
+  def __init__(self, generate_shard, num_workers, slot_bytes=None):
+    if slot_bytes is None:
+      slot_bytes = _DEFAULT_SLOT_BYTES
+    # `SharedMemory` rejects a size of zero.
+    slot_bytes = max(slot_bytes, _ALIGNMENT)
+    context = multiprocessing.get_context("spawn")
+    self._slots = []
+    self._free_queues = []
+    self._output_queue = context.Queue()
+    self._workers = []
+    self._num_running = num_workers
+    for worker_index in range(num_workers):
+      slots = [
+          shared_memory.SharedMemory(create=True, size=slot_bytes)
+          for _ in range(_SLOTS_PER_WORKER)
+      ]
+      free_queue = context.Queue()
+      for slot in range(len(slots)):
+        free_queue.put(slot)
+      worker = context.Process(
+          target=_worker_main,
+          args=(generate_shard, worker_index, num_workers,
+                [slot.name for slot in slots], self._output_queue, free_queue),
+          daemon=True)
+      self._slots.append(slots)
+      self._free_queues.append(free_queue)
+      self._workers.append(worker)
+    for worker in self._workers:
+      worker.start()
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    while self._num_running:
+      try:
+        kind, worker_index, payload = self._output_queue.get(
+            timeout=_POLL_INTERVAL)
+      except queue.Empty:
+        self._check_workers()
+        continue
+      if kind == "done":
+        self._num_running -= 1
+      elif kind == "error":
+        self.close()
+        raise payload
+      else:
+        slot, layout = payload
+        arrays = _unpack(layout, self._slots[worker_index][slot].buf)
+        self._free_queues[worker_index].put(slot)
+        return arrays
+    self.close()
+    raise StopIteration
+
+  def _check_workers(self):
+    for worker in self._workers:
+      # Workers exit cleanly even when the generator raises, so a nonzero exit
+      # code means the process crashed or was killed.
+      if worker.exitcode:
+        exitcode = worker.exitcode
+        self.close()
+        raise RuntimeError(
+            f"A worker process of `Dataset.from_generator()` exited "
+            f"unexpectedly with exit code {exitcode}.")
+
+  def close(self):
+    """Stops the workers and releases the shared memory."""
+    if self._workers is None:
+      return
+    for free_queue in self._free_queues:
+      free_queue.put(None)
+    for worker in self._workers:
+      worker.join(_JOIN_TIMEOUT if not self._num_running else 0)
+      if worker.is_alive():
+        worker.terminate()
+        worker.join()
+    for slots in self._slots:
+      for slot in slots:
+        slot.close()
+        slot.unlink()
+    self._workers = None
+    self._num_running = 0
+
+  def __del__(self):
+    self.close()
@@ -89,6 +89,22 @@ def pack_sequence_as(structure, flat_sequence):
   )
 
 
+def structure_plan(structure):
+  """Returns a plan for repeatedly flattening and packing `structure`.
+
+  `plan.pack(flat_sequence)` is equivalent to
+  `pack_sequence_as(structure, flat_sequence)`, but the type hierarchy of
+  `structure` is only walked once, when the plan is created.
+
+  Args:
+    structure: an arbitrarily nested structure.
+
+  Returns:
+    A `nest_util.StructurePlan` for `structure`.
+  """
+  return nest_util.StructurePlan(nest_util.Modality.DATA, structure)
+
+
 def map_structure(func, *structure, **check_types_dict):
   """Applies `func` to each entry in `structure` and returns a new structure.
 
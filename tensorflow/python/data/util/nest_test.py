@@ -191,6 +191,37 @@ class NestTest(test_base.DatasetTestBase, parameterized.TestCase):
         ordered_reconstruction)
     self.assertEqual({"d": 3, "b": 1, "a": 0, "c": 2}, plain_reconstruction)
 
+  @combinations.generate(test_base.default_test_combinations())
+  def testStructurePlan(self):
+    point = collections.namedtuple("Point", ["x", "y"])
+    structure = ((3, 4), point(x=5, y=[6, 7]),
+                 collections.OrderedDict([("d", 0), ("b", 1)]),
+                 collections.defaultdict(list, a=2))
+    plan = nest.structure_plan(structure)
+    self.assertIs(plan.structure, structure)
+    self.assertEqual(plan.num_leaves, 7)
+    self.assertEqual(plan.flatten(structure), nest.flatten(structure))
+    plan.assert_same_structure(structure)
+
+    flat = ["a", "b", "c", "d", "e", "f", "g"]
+    packed = plan.pack(flat)
+    self.assertEqual(packed, nest.pack_sequence_as(structure, flat))
+    self.assertIsInstance(packed[1], point)
+    self.assertEqual(list(packed[2]), ["d", "b"])
+    self.assertEqual(packed[3].default_factory, list)
+    self.assertEqual(plan.flatten(packed), flat)
+
+    self.assertEqual("a", nest.structure_plan(5).pack(["a"]))
+
+    with self.assertRaisesRegex(ValueError, "Could not pack sequence"):
+      plan.pack(flat[:-1])
+    with self.assertRaisesRegex(TypeError, "flat_sequence"):
+      plan.pack("bad_sequence")
+    with self.assertRaisesRegex(ValueError, "7 elements"):
+      plan.flatten((1, 2))
+    with self.assertRaises(ValueError):
+      plan.assert_same_structure((1, 2))
+
   @combinations.generate(test_base.default_test_combinations())
   def testFlattenAndPackWithDicts(self):
     # A nice messy mix of tuples, lists, dicts, and `OrderedDict`s.
@@ -252,6 +252,46 @@ def from_compatible_tensor_list(element_spec, tensor_list):
       element_spec, tensor_list)
 
 
+def compatible_tensor_list_decoder(element_spec):
+  """Returns a function constructing elements of `element_spec` from tensors.
+
+  The returned function is equivalent to
+  `functools.partial(from_compatible_tensor_list, element_spec)`, but
+  `element_spec` is flattened and compiled into a `nest.structure_plan` once,
+  which makes it suitable for decoding every element of an iterator.
+
+  Args:
+    element_spec: A nested structure of `tf.TypeSpec` objects representing to
+      element type specification.
+
+  Returns:
+    A function taking a list of tensors and returning an element.
+  """
+  # pylint: disable=protected-access
+  if not nest.is_nested(element_spec):
+    return element_spec._from_compatible_tensor_list
+
+  plan = nest.structure_plan(element_spec)
+  flat_specs = []
+  num_tensors = 0
+  for component_spec in plan.flatten(element_spec):
+    num_flat_values = len(component_spec._flat_tensor_specs)
+    flat_specs.append(
+        (component_spec, num_tensors, num_tensors + num_flat_values))
+    num_tensors += num_flat_values
+
+  def decode(tensor_list):
+    if num_tensors != len(tensor_list):
+      raise ValueError("Expected {} tensors but got {}.".format(
+          num_tensors, len(tensor_list)))
+    return plan.pack([
+        component_spec._from_compatible_tensor_list(tensor_list[start:end])
+        for component_spec, start, end in flat_specs
+    ])
+
+  return decode
+
+
 def from_tensor_list(element_spec, tensor_list):
   """Returns an element constructed from the given spec and tensor list.
 
@@ -629,6 +629,29 @@ class StructureTest(test_base.DatasetTestBase, parameterized.TestCase):
       else:
         self.assertAllEqual(b, a)
 
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         _test_round_trip_conversion_combinations()))
+  def testCompatibleTensorListDecoder(self, value_fn):
+    value = value_fn()
+    s = structure.type_spec_from_value(value)
+    decode = structure.compatible_tensor_list_decoder(s)
+    tensor_list = structure.to_tensor_list(s, value)
+
+    expected = structure.from_compatible_tensor_list(s, tensor_list)
+    actual = decode(tensor_list)
+    nest.assert_same_structure(expected, actual)
+    for e, a in zip(nest.flatten(expected), nest.flatten(actual)):
+      self.assertEqual(type(e), type(a))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testCompatibleTensorListDecoderWrongLength(self):
+    s = (tensor.TensorSpec([], dtypes.int32),
+         tensor.TensorSpec([], dtypes.int32))
+    decode = structure.compatible_tensor_list_decoder(s)
+    with self.assertRaisesRegex(ValueError, "Expected 2 tensors but got 1."):
+      decode([constant_op.constant(1)])
+
   # pylint: enable=g-long-lambda
 
   def preserveStaticShape(self):
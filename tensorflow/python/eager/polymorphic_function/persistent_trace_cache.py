@@ -0,0 +1,446 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Opt-in on-disk cache of traced tf.function graphs.
+
+Tracing a large `tf.function` can take minutes, and every process start pays
+for it again. When enabled, traced `ConcreteFunction`s are serialized to a cache
+directory, keyed by the code of the Python function, the `FunctionType` it was
+traced for and the TensorFlow version, and are loaded back instead of tracing on
+a later cache miss of the in-memory function cache.
+
+The cache is enabled with `enable(cache_dir)` or by setting the
+`TF_FUNCTION_TRACE_CACHE_DIR` environment variable.
+
+The code of a function is identified by its bytecode and constants, the values
+of its closure cells and defaults, and, transitively, the globals it refers to:
+Python literals are keyed by value, functions defined outside of TensorFlow and
+other installed libraries by their own code, and library functions, classes and
+modules by their qualified name and the version of their package. Functions
+that refer to any other object, e.g. an instance of a user defined class or
+parsed command line flags, are not persisted. State that is not reachable
+through globals, such as environment variables or files read at trace time, is
+not part of the key either; pass a `key` to `enable` that identifies it.
+
+Only functions that can be restored faithfully are persisted:
+
+  * the function is a plain Python function, not a bound method;
+  * its closure cells, defaults and globals are of the kinds listed above;
+  * the traced graph captures no tensors or variables and runs no Python code,
+    i.e. it has no `tf.py_function` or `tf.numpy_function` ops;
+  * it is traced eagerly, outside of any distribution strategy, device scope or
+    SavedModel export.
+
+A function loaded from the cache is not traced, so Python side effects that
+would run during tracing, like printing, appending to a list or creating
+variables, do not happen.
+"""
+
+import hashlib
+import inspect
+import os
+import sys
+import threading
+
+from tensorflow.core.function import trace_type
+from tensorflow.core.function.polymorphism import function_type as function_type_lib
+from tensorflow.core.protobuf import meta_graph_pb2
+from tensorflow.python.eager import context
+from tensorflow.python.eager import monitoring
+from tensorflow.python.eager.polymorphic_function import concrete_function as concrete_function_lib
+from tensorflow.python.eager.polymorphic_function import function_context
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import func_graph as func_graph_module
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.framework import versions
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.util import compat
+from tensorflow.python.util import lazy_loader
+
+# Loaded lazily due to a circular dependency (tracing_compilation ->
+# persistent_trace_cache -> function_deserialization -> def_function ->
+# tracing_compilation).
+function_deserialization = lazy_loader.LazyLoader(
+    "function_deserialization", globals(),
+    "tensorflow.python.saved_model.function_deserialization")
+nested_structure_coder = lazy_loader.LazyLoader(
+    "nested_structure_coder", globals(),
+    "tensorflow.python.saved_model.nested_structure_coder")
+
+_persistent_cache_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/persistent_trace_cache",
+    "Number of persistent tf.function trace cache lookups and writes.",
+    "event",
+)
+
+_CACHE_DIR_ENV_VAR = "TF_FUNCTION_TRACE_CACHE_DIR"
+_CACHE_FILE_SUFFIX = ".tfcache"
+
+# Values that are safe to key the cache on by value.
+_LITERAL_TYPES = (type(None), bool, int, float, complex, str, bytes)
+_REPR_TYPES = (dtypes.DType, tensor_shape.TensorShape)
+
+# Packages whose functions and classes are keyed by name and package version
+# rather than by their code, in addition to the standard library and packages
+# installed into site-packages.
+_LIBRARY_PACKAGES = frozenset(
+    ["builtins", "tensorflow", "keras", "tf_keras", "numpy", "absl"])
+
+# Ops that call back into the Python process that traced the function.
+_PY_FUNC_OPS = frozenset(["EagerPyFunc", "PyFunc", "PyFuncStateless"])
+
+# The function context of a tf.function called eagerly, outside of any
+# distribution strategy, device scope or SavedModel export.
+_EAGER_CONTEXT = function_context.EagerContext(
+    parent_graph=None,
+    device_functions=(),
+    colocation_stack=(),
+    in_cross_replica_context=False,
+    variable_policy=None,
+    xla_context_id=0,
+)
+
+
+class _Fingerprinter(object):
+  """Collects the code and globals a Python function depends on."""
+
+  def __init__(self, python_function):
+    # The module of the traced function is user code, even when it is part of
+    # a library package, e.g. in TensorFlow's own tests.
+    self._user_module = python_function.__module__
+    self._parts = []
+    self._visited = set()
+
+  @property
+  def fingerprint(self):
+    return b"\0".join(compat.as_bytes(part) for part in self._parts)
+
+  def _is_library(self, module_name):
+    if not module_name or module_name == self._user_module:
+      return False
+    package = module_name.partition(".")[0]
+    if (package in _LIBRARY_PACKAGES or package in sys.builtin_module_names or
+        package in getattr(sys, "stdlib_module_names", ())):
+      return True
+    path = getattr(sys.modules.get(module_name), "__file__", None) or ""
+    return "site-packages" in path or "dist-packages" in path
+
+  def _add_library_object(self, value):
+    module_name = value.__module__
+    package = sys.modules.get(module_name.partition(".")[0])
+    self._parts.append("{}.{}@{}".format(
+        module_name, getattr(value, "__qualname__", value.__name__),
+        getattr(package, "__version__", "")))
+
+  def _add_code(self, code, names):
+    self._parts.append(code.co_code)
+    self._parts.append(repr(code.co_names))
+    self._parts.append(repr(code.co_varnames))
+    names.update(code.co_names)
+    for const in code.co_consts:
+      if inspect.iscode(const):
+        self._add_code(const, names)
+      elif isinstance(const, frozenset):
+        # The iteration order of frozensets depends on the hash seed.
+        self._parts.append(repr(sorted(repr(c) for c in const)))
+      else:
+        self._parts.append(repr(const))
+
+  def add_function(self, function):
+    """Adds `function`. Returns False if it can not be fingerprinted."""
+    if id(function) in self._visited:
+      self._parts.append(function.__qualname__)
+      return True
+    self._visited.add(id(function))
+    self._parts.append("{}.{}".format(function.__module__,
+                                      function.__qualname__))
+    names = set()
+    self._add_code(function.__code__, names)
+
+    for cell in function.__closure__ or ():
+      try:
+        value = cell.cell_contents
+      except ValueError:  # Empty cell.
+        return False
+      if not self._add_value(value, names):
+        return False
+    if not self._add_value(function.__defaults__ or (), names):
+      return False
+    for name, value in sorted((function.__kwdefaults__ or {}).items()):
+      self._parts.append(name)
+      if not self._add_value(value, names):
+        return False
+
+    # `co_names` holds both global and attribute names, so this may include
+    # globals the function does not read, which only makes the key stricter.
+    function_globals = function.__globals__
+    for name in sorted(names):
+      if name in function_globals:
+        self._parts.append(name)
+        if not self._add_value(function_globals[name], names):
+          return False
+    return True
+
+  def _add_value(self, value, names):
+    """Adds a global, closure or default value of a function."""
+    if type(value) in _LITERAL_TYPES:  # pylint: disable=unidiomatic-typecheck
+      self._parts.append(repr(value))
+      return True
+    if type(value) in (tuple, list):  # pylint: disable=unidiomatic-typecheck
+      self._parts.append(type(value).__name__)
+      return all(self._add_value(v, names) for v in value)
+    if isinstance(value, _REPR_TYPES):
+      self._parts.append(repr(value))
+      return True
+    if inspect.ismodule(value):
+      self._parts.append(value.__name__)
+      if self._is_library(value.__name__) or id(value) in self._visited:
+        return True
+      # Functions of user modules called as `module.function` are tracked like
+      # globals of the calling function.
+      self._visited.add(id(value))
+      module_dict = vars(value)
+      for name in sorted(names.intersection(module_dict)):
+        self._parts.append(name)
+        if not self._add_value(module_dict[name], names):
+          return False
+      return True
+    if (inspect.isclass(value) or inspect.isroutine(value)) and self._is_library(
+        getattr(value, "__module__", None)):
+      self._add_library_object(value)
+      return True
+    if inspect.isfunction(value):
+      return self.add_function(value)
+    # `tf.function`s defined in user code.
+    python_function = getattr(value, "python_function", None)
+    if inspect.isfunction(python_function):
+      return self.add_function(python_function)
+    return False
+
+
+def _code_fingerprint(python_function):
+  """Returns a string identifying the code of `python_function`, or None."""
+  if inspect.ismethod(python_function) or not inspect.isfunction(
+      python_function):
+    return None
+  fingerprinter = _Fingerprinter(python_function)
+  if not fingerprinter.add_function(python_function):
+    return None
+  return fingerprinter.fingerprint
+
+
+class PersistentTraceCache(object):
+  """Stores traced `ConcreteFunction`s in a directory."""
+
+  def __init__(self, cache_dir, key=None):
+    self._cache_dir = cache_dir
+    self._key = key or ""
+    self._lock = threading.Lock()
+    file_io.recursive_create_dir(cache_dir)
+
+  @property
+  def cache_dir(self):
+    return self._cache_dir
+
+  def make_key(self, tracing_options, function_type, func_context):
+    """Returns the cache key for a trace, or None if it can not be persisted.
+
+    Args:
+      tracing_options: The `TracingOptions` of the trace.
+      function_type: The `FunctionType` to trace for, i.e. the looked up one
+        generalized like the function cache would with `reduce_retracing`.
+      func_context: The `FunctionContext` of the trace.
+
+    Returns:
+      A hex digest string, or None.
+    """
+    if (function_type.captures or not context.executing_eagerly() or
+        func_context.context != _EAGER_CONTEXT):
+      return None
+    fingerprint = _code_fingerprint(tracing_options.python_function)
+    if fingerprint is None:
+      return None
+    try:
+      function_type_proto = function_type.to_proto().SerializeToString(
+          deterministic=True)
+    except (TypeError, ValueError, NotImplementedError):
+      # Some argument's TraceType is not serializable.
+      return None
+
+    attributes = sorted((tracing_options.attributes or {}).items())
+    hasher = hashlib.sha256()
+    for part in (
+        versions.__version__,
+        versions.__git_version__,
+        self._key,
+        fingerprint,
+        tracing_options.name,
+        repr(func_context.scope_type),
+        repr(tracing_options.autograph),
+        repr(tracing_options.autograph_options),
+        repr(tracing_options.reduce_retracing),
+        repr(attributes),
+        function_type_proto,
+    ):
+      hasher.update(compat.as_bytes(part))
+      hasher.update(b"\0")
+    return hasher.hexdigest()
+
+  def _path(self, key):
+    return os.path.join(self._cache_dir, key + _CACHE_FILE_SUFFIX)
+
+  def load(self, key, function_type, type_context, tracing_options):
+    """Returns the `ConcreteFunction` cached under `key`, or None.
+
+    Args:
+      key: A key returned by `make_key`.
+      function_type: The `FunctionType` passed to `make_key`.
+      type_context: The `InternalTracingContext` of the lookup.
+      tracing_options: The `TracingOptions` of the trace.
+    """
+    path = self._path(key)
+    try:
+      if not file_io.file_exists(path):
+        _persistent_cache_counter.get_cell("miss").increase_by(1)
+        return None
+      meta_graph_def = meta_graph_pb2.MetaGraphDef.FromString(
+          file_io.read_file_to_string(path, binary_mode=True))
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning("Failed to read tf.function trace cache entry %s: %s",
+                      path, e)
+      _persistent_cache_counter.get_cell("error").increase_by(1)
+      return None
+    if (meta_graph_def.meta_info_def.tensorflow_version !=
+        versions.__version__ or
+        meta_graph_def.meta_info_def.tensorflow_git_version !=
+        versions.__git_version__):
+      _persistent_cache_counter.get_cell("miss").increase_by(1)
+      return None
+
+    try:
+      [name] = meta_graph_def.object_graph_def.concrete_functions
+      loaded = function_deserialization.load_function_def_library(
+          meta_graph_def.graph_def.library,
+          saved_object_graph=meta_graph_def.object_graph_def)[name]
+      func_graph = loaded.graph
+      output_type = trace_type.from_value(func_graph.structured_outputs,
+                                          type_context)
+      concrete_function = (
+          concrete_function_lib.ConcreteFunction.from_func_graph(
+              func_graph,
+              function_type_lib.FunctionType(
+                  function_type.parameters.values(),
+                  func_graph.function_captures.capture_types,
+                  return_annotation=output_type,
+              ),
+              tracing_options.attributes,
+              shared_func_graph=False,
+          ))
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning("Failed to load tf.function trace cache entry %s: %s",
+                      path, e)
+      _persistent_cache_counter.get_cell("error").increase_by(1)
+      return None
+    _persistent_cache_counter.get_cell("hit").increase_by(1)
+    logging.vlog(1, "Loaded traced function %r from %s",
+                 tracing_options.python_function, path)
+    return concrete_function
+
+  def save(self, key, concrete_function):
+    """Writes `concrete_function` to the cache under `key`.
+
+    Functions capturing tensors or variables or running Python code through
+    `tf.py_function` or `tf.numpy_function` are not written. Failures are
+    logged rather than raised, so that they never fail the traced call.
+
+    Args:
+      key: A key returned by `make_key`.
+      concrete_function: The traced `ConcreteFunction`.
+    """
+    graph = concrete_function.graph
+    if graph.external_captures or graph.deferred_external_captures:
+      return
+    try:
+      meta_graph_def = meta_graph_pb2.MetaGraphDef()
+      meta_graph_def.meta_info_def.tensorflow_version = versions.__version__
+      meta_graph_def.meta_info_def.tensorflow_git_version = (
+          versions.__git_version__)
+
+      library_graph = ops.Graph()
+      concrete_function.add_to_graph(library_graph)
+      library = library_graph.as_graph_def().library
+      if any(node.op in _PY_FUNC_OPS  # pylint: disable=g-complex-comprehension
+             for function_def in library.function
+             for node in function_def.node_def):
+        logging.vlog(1, "Not caching %s, it runs Python functions.",
+                     concrete_function.name)
+        _persistent_cache_counter.get_cell("skip").increase_by(1)
+        return
+      meta_graph_def.graph_def.library.CopyFrom(library)
+      name = compat.as_str(concrete_function.function_def.signature.name)
+      saved_function = meta_graph_def.object_graph_def.concrete_functions[name]
+      saved_function.canonicalized_input_signature.CopyFrom(
+          nested_structure_coder.encode_structure(
+              concrete_function.structured_input_signature))
+      saved_function.output_signature.CopyFrom(
+          nested_structure_coder.encode_structure(
+              func_graph_module.convert_structure_to_signature(
+                  concrete_function.structured_outputs)))
+
+      with self._lock:
+        file_io.atomic_write_string_to_file(
+            self._path(key), meta_graph_def.SerializeToString())
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning(
+          "Failed to write tf.function trace cache entry for %s: %s",
+          concrete_function.name, e)
+      _persistent_cache_counter.get_cell("error").increase_by(1)
+      return
+    _persistent_cache_counter.get_cell("write").increase_by(1)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enable(cache_dir, key=None):
+  """Enables the persistent trace cache, storing entries in `cache_dir`.
+
+  Args:
+    cache_dir: The directory to store cache entries in.
+    key: An optional string added to the key of every entry. It should identify
+      any state the traced functions depend on that is not reachable through
+      their globals, e.g. command line flags or environment variables.
+  """
+  global _cache
+  with _cache_lock:
+    _cache = PersistentTraceCache(cache_dir, key)
+
+
+def disable():
+  """Disables the persistent trace cache."""
+  global _cache
+  with _cache_lock:
+    _cache = None
+
+
+def get_cache():
+  """Returns the enabled `PersistentTraceCache`, or None."""
+  return _cache
+
+
+if os.environ.get(_CACHE_DIR_ENV_VAR):
+  enable(os.environ[_CACHE_DIR_ENV_VAR])
@@ -60,6 +60,8 @@ ops above and associated assignment operations), tf.function traces a second
 time if it sees variables on the first call.
 """
 
+import collections
+from concurrent import futures
 import dataclasses
 import functools
 import os
@@ -90,6 +92,7 @@ from tensorflow.python.framework import errors
 from tensorflow.python.framework import func_graph as func_graph_module
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_spec
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import array_ops_stack
 from tensorflow.python.ops import cond
 from tensorflow.python.ops import control_flow_ops
@@ -111,6 +114,9 @@ FREQUENT_TRACING_WARNING_MAX_CALL_HISTORY = 10
 FREQUENT_TRACING_WARNING_THRESHOLD = 5
 FREQUENT_TRACING_WARNING_MAX_WARNING_PER_DETECTOR = 2
 
+# Number of most recent traces reported by experimental_get_tracing_report().
+MAX_TRACE_RECORDS = 100
+
 _tf_function_counter = monitoring.Counter(
     "/tensorflow/core/tf_function_counter",
     "Counter for the number of tf.functions created when Eager execution is "
@@ -431,6 +437,22 @@ def _evaluate_var_is_initialized(variables):
   return var_is_initialized
 
 
+def _warmup_inputs(signature):
+  """Returns zero-valued inputs matching `signature`, or None if unsupported."""
+  inputs = []
+  for spec in nest.flatten(signature, expand_composites=True):
+    if (not isinstance(spec, tensor_spec.TensorSpec) or
+        not spec.dtype.is_numpy_compatible):
+      return None
+    if spec.shape.rank is None:
+      shape = []
+    else:
+      # Unknown dimensions only need some size for the function to run.
+      shape = [1 if dim is None else dim for dim in spec.shape.as_list()]
+    inputs.append(array_ops.zeros(shape, spec.dtype))
+  return nest.pack_sequence_as(signature, inputs, expand_composites=True)
+
+
 class OptionalXlaContext:
   """Wrapper for XLA context optionally applied under a context manager."""
 
@@ -493,6 +515,7 @@ class Function(core.PolymorphicFunction, trackable.Trackable):
     )
     self._function_cache = function_cache.FunctionCache()
     self._function_captures = capture_container.FunctionCaptures()
+    self._trace_records = collections.deque(maxlen=MAX_TRACE_RECORDS)
 
     self._attributes = {}
     if experimental_implements is not None:
@@ -656,6 +679,7 @@ class Function(core.PolymorphicFunction, trackable.Trackable):
         function_cache=self._function_cache,
         function_captures=self._function_captures,
         lock=self._lock,
+        trace_records=self._trace_records,
     )
 
   def _initialize(self, args, kwds, add_initializers_to=None):
@@ -798,6 +822,105 @@ class Function(core.PolymorphicFunction, trackable.Trackable):
     """
     return len(self._function_cache)
 
+  def experimental_get_tracing_report(self):
+    """Returns the cause and cost of the most recent traces of the function.
+
+    Each trace is described by a `TraceRecord` holding the reason the function
+    cache missed, the names of the arguments that did not match the closest
+    previously traced signature, and the time spent tracing the Python function,
+    building the graph and instantiating the function. Only the last
+    `MAX_TRACE_RECORDS` traces are kept.
+
+    Example:
+
+    >>> @tf.function
+    ... def double(a):
+    ...   return a + a
+    >>> _ = double(tf.constant(1))
+    >>> _ = double(tf.constant("a"))
+    >>> report = double.experimental_get_tracing_report()
+    >>> [r.reason.value for r in report]
+    ['first_trace', 'argument_mismatch']
+    >>> report[1].mismatched_arguments
+    ('a',)
+
+    The same information is exported, aggregated over all functions, on the
+    `/tensorflow/core/tf_function/trace_count_by_reason` and
+    `/tensorflow/core/tf_function/trace_phase_time_usecs` metrics.
+
+    Returns:
+      A list of `TraceRecord`s, oldest first.
+    """
+    with self._lock:
+      return list(self._trace_records)
+
+  def experimental_warmup(self, signatures, executor=None, instantiate=False):
+    """Traces the function for `signatures` ahead of time on a thread pool.
+
+    Tracing a `tf.function`, and instantiating and optimizing the traced graph,
+    normally happens on the thread making the first call with a new signature.
+    `experimental_warmup` does this work in the background instead, so that the
+    first real call finds a ready `ConcreteFunction`:
+
+    >>> @tf.function
+    ... def double(a):
+    ...   return a + a
+    >>> futures = double.experimental_warmup(
+    ...     [(tf.TensorSpec([None], tf.float32),),
+    ...      (tf.TensorSpec([None], tf.int32),)])
+    >>> _ = [f.result() for f in futures]
+    >>> double.experimental_get_tracing_count()
+    2
+
+    Traces of the same `Function` are serialized, but run concurrently with
+    the caller and with warmups of other functions sharing `executor`. The
+    traces are made for the default execution context: warmups started under a
+    device scope or a distribution strategy do not apply to calls made in that
+    scope.
+
+    The TensorFlow runtime instantiates and optimizes a function the first time
+    it runs. If `instantiate` is True, each traced function is also run once,
+    in the background, with zero-valued inputs, which is only safe for
+    functions without side effects. Signatures with inputs other than
+    `tf.TensorSpec`s of numeric, boolean or string dtypes are only traced.
+
+    Args:
+      signatures: A list of signatures to trace. Each signature is a tuple of
+        positional arguments, as passed to `get_concrete_function`, e.g. a tuple
+        of `tf.TensorSpec`s.
+      executor: An optional `concurrent.futures.Executor` to run the warmup on.
+        Defaults to a new thread pool, which is shut down once all signatures
+        are traced.
+      instantiate: Whether to also run each traced function once with
+        zero-valued inputs.
+
+    Returns:
+      A list of `concurrent.futures.Future`s, one per signature, resolving to
+      the traced `ConcreteFunction`. Tracing errors are raised by the futures'
+      `result()`.
+    """
+    signatures = [tuple(signature) for signature in signatures]
+    owns_executor = executor is None
+    if owns_executor:
+      executor = futures.ThreadPoolExecutor(
+          max_workers=max(1, min(len(signatures), os.cpu_count() or 1)),
+          thread_name_prefix=f"{self._name}_warmup")
+
+    def warmup(signature):
+      concrete = self.get_concrete_function(*signature)
+      if instantiate:
+        inputs = _warmup_inputs(signature)
+        if inputs is not None:
+          concrete(*inputs)
+      return concrete
+
+    try:
+      return [executor.submit(warmup, signature) for signature in signatures]
+    finally:
+      if owns_executor:
+        # Already submitted signatures still run to completion.
+        executor.shutdown(wait=False)
+
   @property
   def _run_functions_eagerly(self):
     return eager_function_run.RUN_FUNCTIONS_EAGERLY
@@ -42,6 +42,7 @@ from tensorflow.python.eager import context
 from tensorflow.python.eager import lift_to_graph
 from tensorflow.python.eager.polymorphic_function import attributes as attributes_lib
 from tensorflow.python.eager.polymorphic_function import polymorphic_function
+from tensorflow.python.eager.polymorphic_function import tracing_compilation
 from tensorflow.python.framework import composite_tensor
 from tensorflow.python.framework import config
 from tensorflow.python.framework import constant_op
@@ -4414,6 +4415,98 @@ class FunctionTest(test.TestCase, parameterized.TestCase):
     double(constant_op.constant('a'))
     self.assertAllEqual(double.experimental_get_tracing_count(), 2)
 
+  def test_experimental_get_tracing_report(self):
+
+    @polymorphic_function.function
+    def scale(a, b):
+      return a * b
+
+    scale(constant_op.constant(1), 2)
+    scale(constant_op.constant(3), 2)
+    scale(constant_op.constant(1.0), 2)
+    scale(constant_op.constant(1.0), 3)
+
+    report = scale.experimental_get_tracing_report()
+    self.assertLen(report, scale.experimental_get_tracing_count())
+    self.assertEqual(
+        [r.reason for r in report],
+        [
+            tracing_compilation.TraceReason.FIRST_TRACE,
+            tracing_compilation.TraceReason.ARGUMENT_MISMATCH,
+            tracing_compilation.TraceReason.ARGUMENT_MISMATCH,
+        ],
+    )
+    self.assertEqual(
+        [r.mismatched_arguments for r in report], [(), ('a',), ('b',)]
+    )
+    for record in report:
+      self.assertEqual(record.name, 'scale')
+      self.assertGreater(record.python_tracing_time_usecs, 0)
+      self.assertGreaterEqual(record.graph_building_time_usecs, 0)
+      self.assertGreater(record.instantiation_time_usecs, 0)
+      self.assertEqual(
+          record.total_time_usecs,
+          record.python_tracing_time_usecs
+          + record.graph_building_time_usecs
+          + record.instantiation_time_usecs,
+      )
+
+  def test_experimental_get_tracing_report_new_context(self):
+
+    @polymorphic_function.function
+    def double(a):
+      return a + a
+
+    double(constant_op.constant(1))
+    with ops.Graph().as_default():
+      double(constant_op.constant(1))
+
+    report = double.experimental_get_tracing_report()
+    self.assertEqual(
+        [r.reason for r in report],
+        [
+            tracing_compilation.TraceReason.FIRST_TRACE,
+            tracing_compilation.TraceReason.NEW_CONTEXT,
+        ],
+    )
+
+  def test_experimental_warmup(self):
+    traced_signatures = []
+
+    @polymorphic_function.function
+    def add(a, b):
+      traced_signatures.append((a.dtype, b.dtype))
+      return a + b
+
+    signatures = [
+        (tensor_lib.TensorSpec([None], dtypes.float32),
+         tensor_lib.TensorSpec([None], dtypes.float32)),
+        (tensor_lib.TensorSpec([None], dtypes.int32),
+         tensor_lib.TensorSpec([None], dtypes.int32)),
+    ]
+    warmup_futures = add.experimental_warmup(signatures, instantiate=True)
+    concrete_functions = [f.result() for f in warmup_futures]
+    self.assertLen(traced_signatures, 2)
+    self.assertEqual(add.experimental_get_tracing_count(), 2)
+
+    self.assertAllEqual(
+        add(constant_op.constant([1, 2]), constant_op.constant([3, 4])),
+        [4, 6])
+    self.assertIs(
+        add.get_concrete_function(*signatures[1]), concrete_functions[1])
+    self.assertLen(traced_signatures, 2)
+
+  def test_experimental_warmup_error(self):
+
+    @polymorphic_function.function
+    def needs_float(a):
+      return math_ops.sqrt(a)
+
+    [warmup_future] = needs_float.experimental_warmup(
+        [(tensor_lib.TensorSpec([], dtypes.string),)])
+    with self.assertRaises(TypeError):
+      warmup_future.result()
+
   def test_experimental_get_tracing_count_method(self):
 
     class TestClass():
@@ -18,7 +18,8 @@ import contextlib
 import dataclasses
 import enum
 import threading
-from typing import Any, Callable, Dict, Optional, Tuple
+import time
+from typing import Any, Callable, Dict, MutableSequence, Optional, Tuple
 
 from tensorflow.core.function import trace_type
 from tensorflow.core.function.capture import capture_container
@@ -30,6 +31,7 @@ from tensorflow.python.eager.polymorphic_function import attributes as attribute
 from tensorflow.python.eager.polymorphic_function import concrete_function as concrete_function_lib
 from tensorflow.python.eager.polymorphic_function import function_context
 from tensorflow.python.eager.polymorphic_function import function_type_utils
+from tensorflow.python.eager.polymorphic_function import persistent_trace_cache
 from tensorflow.python.eager.polymorphic_function import transform
 from tensorflow.python.framework import func_graph as func_graph_module
 from tensorflow.python.framework import ops
@@ -42,6 +44,19 @@ _graph_building_time_counter = monitoring.Counter(
     "Time for tf.function to build a graph (us).",
 )
 
+_trace_reason_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/trace_count_by_reason",
+    "Number of tf.function traces, by the reason the function cache missed.",
+    "reason",
+)
+
+_trace_phase_time_sampler = monitoring.Sampler(
+    "/tensorflow/core/tf_function/trace_phase_time_usecs",
+    monitoring.ExponentialBuckets(10, 2, 30),
+    "Time spent in each phase of tracing a tf.function (us).",
+    "phase",
+)
+
 
 class ScopeType(enum.Enum):
   """Enumerate scopes under which functions might be traced."""
@@ -50,6 +65,52 @@ class ScopeType(enum.Enum):
   NO_VARIABLE_CREATION = 3
 
 
+class TraceReason(enum.Enum):
+  """Enumerate reasons for which a function is traced."""
+  # The function had not been traced before.
+  FIRST_TRACE = "first_trace"
+  # The function had only been traced under a different FunctionContext, e.g.
+  # another graph, device scope or distribution strategy.
+  NEW_CONTEXT = "new_context"
+  # At least one argument is not a subtype of any traced FunctionType.
+  ARGUMENT_MISMATCH = "argument_mismatch"
+  # The arguments match a traced FunctionType, but its captures do not.
+  CAPTURE_MISMATCH = "capture_mismatch"
+
+
+@dataclasses.dataclass(frozen=True)
+class TraceRecord:
+  """Cause and cost of a single trace of a Python function."""
+  # Name given to the traced function.
+  name: str
+
+  # FunctionType that missed the function cache.
+  function_type: function_type_lib.FunctionType
+
+  # Why the function cache missed.
+  reason: TraceReason
+
+  # Names of the parameters (or captures, for CAPTURE_MISMATCH) that did not
+  # match the closest previously traced FunctionType.
+  mismatched_arguments: Tuple[str, ...]
+
+  # Time spent running the Python function to build its graph, including the
+  # tracing of nested functions.
+  python_tracing_time_usecs: int
+
+  # Time spent creating placeholders, transforming the graph and computing its
+  # output type.
+  graph_building_time_usecs: int
+
+  # Time spent creating the function and registering it with the runtime.
+  instantiation_time_usecs: int
+
+  @property
+  def total_time_usecs(self):
+    return (self.python_tracing_time_usecs + self.graph_building_time_usecs +
+            self.instantiation_time_usecs)
+
+
 @dataclasses.dataclass
 class TracingOptions:
   """Configuration options for tracing."""
@@ -92,6 +153,9 @@ class TracingOptions:
   # If specified, guards tracing and function lookup
   lock: Optional[threading.Lock] = None
 
+  # If specified, a TraceRecord is appended for every trace.
+  trace_records: Optional[MutableSequence[TraceRecord]] = None
+
   def __post_init__(self):
     if self.attributes:
       for attribute in self.attributes:
@@ -245,6 +309,54 @@ def _maybe_define_function(args, kwargs, tracing_options):
   if concrete_function is not None:
     return concrete_function
 
+  if (
+      tracing_options.input_signature is None
+      and tracing_options.reduce_retracing
+      and tracing_options.function_cache
+  ):
+    target_func_type = tracing_options.function_cache.generalize(
+        current_func_context, lookup_func_type
+    )
+  else:
+    target_func_type = lookup_func_type
+
+  # The persistent cache is keyed on the type that is actually traced, so that
+  # functions loaded from it are added to the function cache like new traces.
+  persistent_cache = persistent_trace_cache.get_cache()
+  persistent_cache_key = None
+  if persistent_cache is not None:
+    persistent_cache_key = persistent_cache.make_key(
+        tracing_options, target_func_type, current_func_context
+    )
+  if persistent_cache_key is not None:
+    concrete_function = persistent_cache.load(
+        persistent_cache_key,
+        target_func_type,
+        lookup_func_context,
+        tracing_options,
+    )
+    if concrete_function is not None:
+      _set_arg_keywords(concrete_function)
+      transform.call_concrete_function_callbacks(concrete_function)
+      if tracing_options.function_cache is not None:
+        tracing_options.function_cache.add(
+            concrete_function, current_func_context
+        )
+      return concrete_function
+
+  trace_reason, mismatched_arguments = _explain_cache_miss(
+      tracing_options.function_cache, lookup_func_type, current_func_context
+  )
+  logging.vlog(
+      1,
+      "Tracing Python function %r (reason: %s, mismatched arguments: %s)",
+      tracing_options.python_function,
+      trace_reason.value,
+      mismatched_arguments,
+  )
+  phase_times = {}
+  trace_start_time = time.perf_counter()
+
   # Use a timer for graph building only if not already inside a function. This
   # avoids double counting graph building time for nested functions.
   with monitoring.MonitoredTimer(
@@ -270,18 +382,20 @@ def _maybe_define_function(args, kwargs, tracing_options):
           status=ag_status, options=tracing_options.autograph_options
       ):
         func_graph = func_graph_module.FuncGraph(tracing_options.name)
-        if (
-            tracing_options.input_signature is None
-            and tracing_options.reduce_retracing
-            and tracing_options.function_cache
-        ):
-          target_func_type = tracing_options.function_cache.generalize(
-              current_func_context, lookup_func_type
-          )
-        else:
-          target_func_type = lookup_func_type
         concrete_function = _create_concrete_function(
-            target_func_type, lookup_func_context, func_graph, tracing_options
+            target_func_type,
+            lookup_func_context,
+            func_graph,
+            tracing_options,
+            phase_times,
+        )
+        _record_trace(
+            tracing_options,
+            lookup_func_type,
+            trace_reason,
+            mismatched_arguments,
+            time.perf_counter() - trace_start_time,
+            phase_times,
         )
 
         if tracing_options.function_cache is not None:
@@ -289,13 +403,132 @@ def _maybe_define_function(args, kwargs, tracing_options):
               concrete_function, current_func_context
           )
 
+        if persistent_cache_key is not None:
+          persistent_cache.save(persistent_cache_key, concrete_function)
+
         return concrete_function
 
 
+def _explain_cache_miss(function_cache, function_type, func_context):
+  """Returns why `function_type` missed `function_cache`.
+
+  Args:
+    function_cache: The FunctionCache that was looked up, or None.
+    function_type: The FunctionType that was looked up.
+    func_context: The FunctionContext that was looked up.
+
+  Returns:
+    A tuple of the TraceReason and the names of the parameters (or captures)
+    that did not match the closest FunctionType held by the cache.
+  """
+  if function_cache is None or not len(function_cache):  # pylint: disable=g-explicit-length-test
+    return TraceReason.FIRST_TRACE, ()
+  traced_types = function_cache.function_types(func_context)
+  if not traced_types:
+    return TraceReason.NEW_CONTEXT, ()
+
+  closest = None
+  for traced_type in traced_types:
+    mismatched = _mismatched_names(
+        function_type.parameters, traced_type.parameters
+    )
+    if closest is None or len(mismatched) < len(closest[1]):
+      closest = (traced_type, mismatched)
+  traced_type, mismatched = closest
+  if mismatched:
+    return TraceReason.ARGUMENT_MISMATCH, mismatched
+  return TraceReason.CAPTURE_MISMATCH, _mismatched_names(
+      function_type.captures, traced_type.captures
+  )
+
+
+def _mismatched_names(looked_up, traced):
+  """Returns the names in `looked_up` not matched by `traced`.
+
+  Args:
+    looked_up: Mapping of names to `Parameter`s or capture `TraceType`s.
+    traced: Mapping of names to `Parameter`s or capture `TraceType`s.
+
+  Returns:
+    A tuple of names, including the names only present in `traced`.
+  """
+  mismatched = []
+  for name, value in looked_up.items():
+    other = traced.get(name)
+    if isinstance(value, function_type_lib.Parameter):
+      matches = (
+          other is not None
+          and value.kind == other.kind
+          and _is_subtype(value.type_constraint, other.type_constraint)
+      )
+    else:
+      matches = other is not None and _is_subtype(value, other)
+    if not matches:
+      mismatched.append(name)
+  mismatched.extend(name for name in traced if name not in looked_up)
+  return tuple(mismatched)
+
+
+def _is_subtype(type_constraint, other):
+  if type_constraint is None or other is None:
+    return type_constraint is other
+  return type_constraint.is_subtype_of(other)
+
+
+def _record_trace(
+    tracing_options,
+    function_type,
+    reason,
+    mismatched_arguments,
+    total_time,
+    phase_times,
+):
+  """Exports the cause and cost of a trace."""
+  python_tracing_usecs = int(phase_times.get("python_tracing", 0) * 1e6)
+  instantiation_usecs = int(phase_times.get("instantiation", 0) * 1e6)
+  graph_building_usecs = max(
+      int(total_time * 1e6) - python_tracing_usecs - instantiation_usecs, 0
+  )
+
+  _trace_reason_counter.get_cell(reason.value).increase_by(1)
+  for phase, usecs in (
+      ("python_tracing", python_tracing_usecs),
+      ("graph_building", graph_building_usecs),
+      ("instantiation", instantiation_usecs),
+  ):
+    _trace_phase_time_sampler.get_cell(phase).add(usecs)
+
+  if tracing_options.trace_records is not None:
+    tracing_options.trace_records.append(
+        TraceRecord(
+            name=tracing_options.name,
+            function_type=function_type,
+            reason=reason,
+            mismatched_arguments=mismatched_arguments,
+            python_tracing_time_usecs=python_tracing_usecs,
+            graph_building_time_usecs=graph_building_usecs,
+            instantiation_time_usecs=instantiation_usecs,
+        )
+    )
+
+
 def _create_concrete_function(
-    function_type, type_context, func_graph, tracing_options
+    function_type, type_context, func_graph, tracing_options, phase_times=None
 ):
-  """Create a `ConcreteFunction` from `args`, `kwargs`, and `func_graph`."""
+  """Create a `ConcreteFunction` from `args`, `kwargs`, and `func_graph`.
+
+  Args:
+    function_type: The FunctionType to trace the function for.
+    type_context: The InternalTracingContext of `function_type`.
+    func_graph: The FuncGraph to trace the function into.
+    tracing_options: The TracingOptions of the trace.
+    phase_times: If given, a dict updated with the time in seconds spent
+      tracing the Python function ("python_tracing") and instantiating the
+      traced function ("instantiation").
+
+  Returns:
+    The traced ConcreteFunction.
+  """
   placeholder_context = trace_type.InternalPlaceholderContext(
       func_graph, type_context.get_placeholder_mapping()
   )
@@ -307,6 +540,7 @@ def _create_concrete_function(
   disable_acd = tracing_options.attributes and tracing_options.attributes.get(
       attributes_lib.DISABLE_ACD, False
   )
+  python_tracing_start_time = time.perf_counter()
   traced_func_graph = func_graph_module.func_graph_from_py_func(
       tracing_options.name,
       tracing_options.python_function,
@@ -319,6 +553,8 @@ def _create_concrete_function(
       create_placeholders=False,
   )
 
+  python_tracing_time = time.perf_counter() - python_tracing_start_time
+
   transform.apply_func_graph_transforms(traced_func_graph)
 
   graph_capture_container = traced_func_graph.function_captures
@@ -337,6 +573,7 @@ def _create_concrete_function(
       return_annotation=output_type,
   )
 
+  instantiation_start_time = time.perf_counter()
   concrete_function = concrete_function_lib.ConcreteFunction.from_func_graph(
       traced_func_graph,
       traced_func_type,
@@ -347,6 +584,11 @@ def _create_concrete_function(
       # ConcreteFunction.
       shared_func_graph=False,
   )
+  if phase_times is not None:
+    phase_times["python_tracing"] = python_tracing_time
+    phase_times["instantiation"] = (
+        time.perf_counter() - instantiation_start_time
+    )
   _set_arg_keywords(concrete_function)
   transform.call_concrete_function_callbacks(concrete_function)
 
@@ -28,7 +28,9 @@ from tensorflow.core.protobuf import rewriter_config_pb2
 from tensorflow.python.eager import backprop
 from tensorflow.python.eager import context
 from tensorflow.python.eager.polymorphic_function import function_type_utils
+from tensorflow.python.eager.polymorphic_function import persistent_trace_cache
 from tensorflow.python.eager.polymorphic_function import tracing_compilation
+from tensorflow.python.eager.polymorphic_function import transform
 from tensorflow.python.framework import config
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
@@ -45,6 +47,7 @@ from tensorflow.python.ops import gradients_impl
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.ops import script_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
 from tensorflow.python.ops import while_loop
@@ -63,6 +66,14 @@ except ImportError:
   attr = None
 
 
+# Globals read by functions traced with the persistent trace cache.
+_persistent_cache_scale = 2.0
+
+
+def _persistent_cache_helper(x):
+  return x * _persistent_cache_scale
+
+
 def compiled_fn(fn=None, **tracing_options):
   """Decorator that compiles/calls wrapped function."""
   if fn is None:
@@ -432,6 +443,110 @@ class TracingCompilationTest(test.TestCase, parameterized.TestCase):
     defined(foo_2)
     self.assertLen(function_cache, 2)
 
+  def testPersistentTraceCache(self):
+    persistent_trace_cache.enable(self.create_tempdir().full_path)
+    self.addCleanup(persistent_trace_cache.disable)
+    counter = persistent_trace_cache._persistent_cache_counter  # pylint: disable=protected-access
+    hits = counter.get_cell('hit').value()
+    writes = counter.get_cell('write').value()
+
+    def func(x, y=2):
+      return {'sum': x + y, 'product': x * y}
+
+    # Without a function cache every call traces, so the second call can only
+    # be served from disk.
+    defined = compiled_fn(func)
+    first = defined(constant_op.constant([1.0, 2.0]))
+    self.assertEqual(counter.get_cell('write').value(), writes + 1)
+    second = defined(constant_op.constant([3.0, 4.0]))
+    self.assertEqual(counter.get_cell('hit').value(), hits + 1)
+    self.assertAllEqual(first['sum'], [3.0, 4.0])
+    self.assertAllEqual(second['sum'], [5.0, 6.0])
+    self.assertAllEqual(second['product'], [6.0, 8.0])
+
+    # A different FunctionType is a different cache entry.
+    third = defined(constant_op.constant([1, 2]), y=3)
+    self.assertEqual(counter.get_cell('write').value(), writes + 2)
+    self.assertAllEqual(third['sum'], [4, 5])
+
+  def testPersistentTraceCacheCallsConcreteFunctionCallbacks(self):
+    persistent_trace_cache.enable(self.create_tempdir().full_path)
+    self.addCleanup(persistent_trace_cache.disable)
+    counter = persistent_trace_cache._persistent_cache_counter  # pylint: disable=protected-access
+    hits = counter.get_cell('hit').value()
+    concrete_functions = []
+
+    def func(x):
+      return x + 1.0
+
+    with test.mock.patch.object(transform, 'CONCRETE_FUNCTION_CALLBACKS',
+                                [concrete_functions.append]):
+      defined = compiled_fn(func)
+      defined(constant_op.constant(1.0))
+      defined(constant_op.constant(2.0))
+    self.assertEqual(counter.get_cell('hit').value(), hits + 1)
+    # The function loaded from disk is seen like a newly traced one.
+    self.assertLen(concrete_functions, 2)
+    self.assertIsNot(concrete_functions[0], concrete_functions[1])
+
+  def testPersistentTraceCacheTracksGlobals(self):
+    persistent_trace_cache.enable(self.create_tempdir().full_path)
+    self.addCleanup(persistent_trace_cache.disable)
+    counter = persistent_trace_cache._persistent_cache_counter  # pylint: disable=protected-access
+    hits = counter.get_cell('hit').value()
+    writes = counter.get_cell('write').value()
+
+    def func(x):
+      return _persistent_cache_helper(x)
+
+    defined = compiled_fn(func)
+    self.assertAllEqual(defined(constant_op.constant(1.0)), 2.0)
+    self.assertAllEqual(defined(constant_op.constant(1.0)), 2.0)
+    self.assertEqual(counter.get_cell('hit').value(), hits + 1)
+
+    # Changing a global read by a helper or the code of the helper itself must
+    # not reuse the stale graph.
+    with test.mock.patch.dict(globals(), _persistent_cache_scale=3.0):
+      self.assertAllEqual(defined(constant_op.constant(1.0)), 3.0)
+    with test.mock.patch.dict(
+        globals(), _persistent_cache_helper=lambda x: x + 1.0):
+      self.assertAllEqual(defined(constant_op.constant(1.0)), 2.0)
+    self.assertEqual(counter.get_cell('hit').value(), hits + 1)
+    self.assertEqual(counter.get_cell('write').value(), writes + 3)
+
+  def testPersistentTraceCacheSkipsPyFunc(self):
+    persistent_trace_cache.enable(self.create_tempdir().full_path)
+    self.addCleanup(persistent_trace_cache.disable)
+    counter = persistent_trace_cache._persistent_cache_counter  # pylint: disable=protected-access
+    hits = counter.get_cell('hit').value()
+    writes = counter.get_cell('write').value()
+    skips = counter.get_cell('skip').value()
+
+    def func(x):
+      return script_ops.numpy_function(lambda a: a * 2, [x], dtypes.float32)
+
+    defined = compiled_fn(func)
+    self.assertAllEqual(defined(constant_op.constant(1.0)), 2.0)
+    self.assertAllEqual(defined(constant_op.constant(2.0)), 4.0)
+    self.assertEqual(counter.get_cell('hit').value(), hits)
+    self.assertEqual(counter.get_cell('write').value(), writes)
+    self.assertEqual(counter.get_cell('skip').value(), skips + 2)
+
+  def testPersistentTraceCacheSkipsCaptures(self):
+    persistent_trace_cache.enable(self.create_tempdir().full_path)
+    self.addCleanup(persistent_trace_cache.disable)
+    counter = persistent_trace_cache._persistent_cache_counter  # pylint: disable=protected-access
+    writes = counter.get_cell('write').value()
+    v = variables.Variable(1.0)
+
+    def func(x):
+      return x + v
+
+    defined = compiled_fn(func)
+    self.assertAllEqual(defined(constant_op.constant(1.0)), 2.0)
+    self.assertAllEqual(defined(constant_op.constant(2.0)), 3.0)
+    self.assertEqual(counter.get_cell('write').value(), writes)
+
   def testCacheTensorDtypeCollision(self):
     def func(t):
       return t + t
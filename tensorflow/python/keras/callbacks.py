@@ -23,7 +23,9 @@ import json
 import os
 import re
 import sys
+import threading
 import time
+import weakref
 
 import numpy as np
 
@@ -112,7 +114,8 @@ def configure_callbacks(callbacks,
     callbacks = [BaseLogger()] + (callbacks or []) + [model.history]
     if verbose:
       callbacks.append(ProgbarLogger(count_mode))
-  callback_list = CallbackList(callbacks)
+  callback_list = CallbackList(
+      callbacks, async_batch_hooks=model.async_batch_hooks)
 
   # Set callback model
   callback_model = model._get_callback_model()  # pylint: disable=protected-access
@@ -198,6 +201,157 @@ def make_logs(model, logs, outputs, mode, prefix=''):
   return logs
 
 
+class _LazyNumpyLogs(collections.abc.MutableMapping):
+  """Batch logs whose values are converted to NumPy when they are first read."""
+
+  def __init__(self, logs):
+    self._logs = dict(logs or {})
+    self._converted = set()
+
+  def __getitem__(self, key):
+    if key not in self._converted:
+      self._logs[key] = tf_utils.sync_to_numpy_or_python_type(self._logs[key])
+      self._converted.add(key)
+    return self._logs[key]
+
+  def __setitem__(self, key, value):
+    self._logs[key] = value
+    self._converted.add(key)
+
+  def __delitem__(self, key):
+    del self._logs[key]
+    self._converted.discard(key)
+
+  def __iter__(self):
+    return iter(self._logs)
+
+  def __len__(self):
+    return len(self._logs)
+
+  def copy(self):
+    return dict(self.items())
+
+  __copy__ = copy
+
+
+def _num_samples(logs):
+  return logs.get('size', 0) * logs.get('num_steps', 1)
+
+
+class _AsyncBatchEvent(object):
+  """The batch hooks of a batch, or of several coalesced batches."""
+
+  def __init__(self, callbacks, begin_hook_name, begin, end_hook_name, end):
+    self.callbacks = callbacks
+    self.begin_hook_name = begin_hook_name
+    self.begin = begin
+    self.end_hook_name = end_hook_name
+    self.end = end
+
+  def coalesce(self, event):
+    """Replaces the `end` hook with the one of the later `event`."""
+    batch, logs = event.end
+    _, pending_logs = self.end
+    if logs and pending_logs and 'size' in logs:
+      # `ProgbarLogger(count_mode='samples')` counts `size * num_steps`
+      # samples for each `end` hook it sees.
+      logs = dict(logs)
+      logs['size'] = _num_samples(pending_logs) + _num_samples(logs)
+      logs.pop('num_steps', None)
+    self.end = (batch, logs)
+
+  def run(self):
+    for hook_name, hook_args in ((self.begin_hook_name, self.begin),
+                                 (self.end_hook_name, self.end)):
+      if hook_args is None:
+        continue
+      batch, logs = hook_args
+      numpy_logs = _LazyNumpyLogs(logs)
+      for callback in self.callbacks:
+        hook = getattr(callback, hook_name)
+        hook(batch, logs if callback._supports_tf_logs else numpy_logs)  # pylint: disable=protected-access
+
+
+class _AsyncBatchHookRunner(object):
+  """Runs batch hooks on a background thread.
+
+  At most one event waits for the thread. The hooks of a batch that ends while
+  the previous batch is still waiting are coalesced with it: the callbacks see
+  the `begin` hooks of the first batch and the `end` hooks of the last one, as
+  with `steps_per_execution`.
+  """
+
+  def __init__(self):
+    self._condition = threading.Condition()
+    self._events = collections.deque()
+    self._busy = False
+    self._stopping = False
+    self._thread = None
+    self._error = None
+
+  def submit(self, event):
+    with self._condition:
+      self._raise_error()
+      if self._events:
+        pending = self._events[-1]
+        if (pending.callbacks is event.callbacks and
+            pending.end_hook_name == event.end_hook_name):
+          pending.coalesce(event)
+          return
+      self._events.append(event)
+      if self._thread is None:
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name='keras_callbacks', daemon=True)
+        self._thread.start()
+      self._condition.notify_all()
+
+  def _run(self):
+    while True:
+      with self._condition:
+        while not self._events and not self._stopping:
+          self._condition.wait()
+        if not self._events:
+          self._thread = None
+          self._condition.notify_all()
+          return
+        event = self._events.popleft()
+        self._busy = True
+      try:
+        event.run()
+      except Exception as e:  # pylint: disable=broad-except
+        with self._condition:
+          self._error = e
+          self._events.clear()
+      finally:
+        with self._condition:
+          self._busy = False
+          self._condition.notify_all()
+
+  def _raise_error(self):
+    if self._error is not None:
+      error, self._error = self._error, None
+      raise error
+
+  def flush(self):
+    """Waits for the submitted hooks, re-raising the error of any of them."""
+    with self._condition:
+      while self._events or self._busy:
+        self._condition.wait()
+      self._raise_error()
+
+  def stop(self):
+    """Runs the submitted hooks and stops the thread."""
+    with self._condition:
+      self._stopping = True
+      self._condition.notify_all()
+      thread = self._thread
+    if thread is not None and thread is not threading.current_thread():
+      thread.join()
+    with self._condition:
+      self._raise_error()
+
+
 class CallbackList:
   """Container abstracting a list of callbacks."""
 
@@ -206,6 +360,7 @@ class CallbackList:
                add_history=False,
                add_progbar=False,
                model=None,
+               async_batch_hooks=False,
                **params):
     """Container for `Callback` instances.
 
@@ -220,6 +375,11 @@ class CallbackList:
       add_progbar: Whether a `ProgbarLogger` callback should be added, if one
         does not already exist in the `callbacks` list.
       model: The `Model` these callbacks are used with.
+      async_batch_hooks: Whether to run the batch hooks of the callbacks which
+        support it, e.g. `ProgbarLogger`, on a background thread. These
+        callbacks receive batch logs which are converted to NumPy only when
+        read, and the hooks of batches which end while the thread is busy are
+        coalesced. All other hooks wait for the pending batch hooks.
       **params: If provided, parameters will be passed to each `Callback` via
         `Callback.set_params`.
     """
@@ -251,6 +411,13 @@ class CallbackList:
 
     self._disallow_batch_hooks_in_ps_strategy()
 
+    self._async_runner = None
+    self._async_batch_begin = None
+    if async_batch_hooks:
+      self._async_runner = _AsyncBatchHookRunner()
+      weakref.finalize(self, self._async_runner.stop)
+    self._split_async_callbacks()
+
     # Performance check: Check batch hooks for slowness compared to batch time.
     # Only run check for custom callbacks (i.e. not present in this file).
     self._check_timing = any(
@@ -279,6 +446,35 @@ class CallbackList:
       self._history = History()
       self.callbacks.append(self._history)
 
+  def _split_async_callbacks(self):
+    """Separates the callbacks whose batch hooks run in the background."""
+    self._async_callbacks = []
+    self._sync_callbacks = self.callbacks
+    if self._async_runner is not None:
+      self._async_callbacks = [
+          cb for cb in self.callbacks
+          if getattr(cb, '_supports_async_batch_hooks', False)
+      ]
+      self._sync_callbacks = [
+          cb for cb in self.callbacks
+          if not getattr(cb, '_supports_async_batch_hooks', False)
+      ]
+      # pylint: disable=protected-access
+      self._batch_hooks_support_tf_logs = all(
+          getattr(cb, '_supports_tf_logs', False)
+          for cb in self._sync_callbacks
+          if cb._implements_train_batch_hooks() or cb
+          ._implements_test_batch_hooks() or cb._implements_predict_batch_hooks())
+      # pylint: enable=protected-access
+
+  def _flush_async_batch_hooks(self):
+    if self._async_runner is not None:
+      self._async_runner.flush()
+
+  def _stop_async_batch_hooks(self):
+    if self._async_runner is not None:
+      self._async_runner.stop()
+
   def _process_logs(self, logs, is_batch_hook=False):
     """Turns tensors into numpy arrays or Python scalars if necessary."""
     if logs is None:
@@ -291,6 +487,7 @@ class CallbackList:
 
   def append(self, callback):
     self.callbacks.append(callback)
+    self._split_async_callbacks()
 
   def set_params(self, params):
     self.params = params
@@ -367,10 +564,21 @@ class CallbackList:
     if self._check_timing:
       start_time = time.time()
 
-    logs = self._process_logs(logs, is_batch_hook=True)
-    for callback in self.callbacks:
-      hook = getattr(callback, hook_name)
-      hook(batch, logs)
+    if self._async_callbacks:
+      if hook_name.endswith('_begin'):
+        self._async_batch_begin = (hook_name, (batch, logs))
+      else:
+        begin_hook_name, begin = self._async_batch_begin or (None, None)
+        self._async_batch_begin = None
+        self._async_runner.submit(
+            _AsyncBatchEvent(self._async_callbacks, begin_hook_name, begin,
+                             hook_name, (batch, logs)))
+
+    if self._sync_callbacks:
+      logs = self._process_logs(logs, is_batch_hook=True)
+      for callback in self._sync_callbacks:
+        hook = getattr(callback, hook_name)
+        hook(batch, logs)
 
     if self._check_timing:
       if hook_name not in self._hook_times:
@@ -413,6 +621,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._flush_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_epoch_begin(epoch, logs)
@@ -428,6 +637,7 @@ class CallbackList:
           validation epoch if validation is performed. Validation result keys
           are prefixed with `val_`.
     """
+    self._flush_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_epoch_end(epoch, logs)
@@ -505,6 +715,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._flush_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_train_begin(logs)
@@ -516,6 +727,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._stop_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_train_end(logs)
@@ -527,6 +739,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._flush_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_test_begin(logs)
@@ -538,6 +751,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._stop_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_test_end(logs)
@@ -549,6 +763,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._flush_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_predict_begin(logs)
@@ -560,6 +775,7 @@ class CallbackList:
         logs: Dict. Currently no data is passed to this argument for this method
           but that may change in the future.
     """
+    self._stop_async_batch_hooks()
     logs = self._process_logs(logs)
     for callback in self.callbacks:
       callback.on_predict_end(logs)
@@ -655,6 +871,9 @@ class Callback:
     # TODO(omalleyt): Make this attr public once solution is stable.
     self._chief_worker_only = None
     self._supports_tf_logs = False
+    # Whether the batch hooks may run on a background thread when the
+    # `CallbackList` has `async_batch_hooks=True`.
+    self._supports_async_batch_hooks = False
 
   def set_params(self, params):
     self.params = params
@@ -985,6 +1204,7 @@ class ProgbarLogger(Callback):
   def __init__(self, count_mode='samples', stateful_metrics=None):
     super(ProgbarLogger, self).__init__()
     self._supports_tf_logs = True
+    self._supports_async_batch_hooks = True
     if count_mode == 'samples':
       self.use_steps = False
     elif count_mode == 'steps':
@@ -1266,6 +1486,11 @@ class ModelCheckpoint(Callback):
       options: Optional `tf.train.CheckpointOptions` object if
         `save_weights_only` is true or optional `tf.saved_model.SaveOptions`
         object if `save_weights_only` is false.
+      async_save: Whether to write the weights in the background. The training
+        thread only waits for the weights to be copied to host memory, and the
+        time each write takes is logged once it finishes. Requires
+        `save_weights_only=True` and the TensorFlow format. The writes are
+        finished by the end of `model.fit()`. Defaults to `False`.
       **kwargs: Additional arguments for backwards compatibility. Possible key
         is `period`.
   """
@@ -1279,6 +1504,7 @@ class ModelCheckpoint(Callback):
                mode='auto',
                save_freq='epoch',
                options=None,
+               async_save=False,
                **kwargs):
     super(ModelCheckpoint, self).__init__()
     self._supports_tf_logs = True
@@ -1306,6 +1532,24 @@ class ModelCheckpoint(Callback):
         raise TypeError('If save_weights_only is False, then `options` must be'
                         'either None or a tf.saved_model.SaveOptions')
 
+    self.async_save = async_save
+    if async_save:
+      if not save_weights_only or self.filepath.endswith(
+          ('.h5', '.keras', '.hdf5')):
+        raise ValueError('`async_save=True` is only supported when saving '
+                         'weights in the TensorFlow format, i.e. with '
+                         '`save_weights_only=True` and a `filepath` which does '
+                         'not end in ".h5". Received: filepath={}, '
+                         'save_weights_only={}'.format(self.filepath,
+                                                       save_weights_only))
+      self._options = copy.copy(self._options)
+      self._options.experimental_enable_async_checkpoint = True
+      self._options.experimental_write_callbacks = list(
+          self._options.experimental_write_callbacks or []) + [
+              self._on_async_write_done]
+      # Start time of the saves being written in the background, by path.
+      self._async_save_start_times = {}
+
     # Deprecated field `load_weights_on_restart` is for loading the checkpoint
     # file from `filepath` at the start of `model.fit()`
     # TODO(rchao): Remove the arg during next breaking release.
@@ -1367,6 +1611,12 @@ class ModelCheckpoint(Callback):
           raise ValueError('Error loading file from {}. Reason: {}'.format(
               filepath_to_load, e))
 
+  def on_train_end(self, logs=None):
+    if self.async_save:
+      # Finish the pending writes so that the checkpoints can be loaded once
+      # `fit()` returns.
+      self.model._checkpoint.sync()  # pylint: disable=protected-access
+
   def _implements_train_batch_hooks(self):
     # Only call batch hooks when saving on batch
     return self.save_freq != 'epoch'
@@ -1430,11 +1680,7 @@ class ModelCheckpoint(Callback):
                       ' saving model to %s' % (epoch + 1, self.monitor,
                                                self.best, current, filepath))
               self.best = current
-              if self.save_weights_only:
-                self.model.save_weights(
-                    filepath, overwrite=True, options=self._options)
-              else:
-                self.model.save(filepath, overwrite=True, options=self._options)
+              self._save(filepath)
             else:
               if self.verbose > 0:
                 print('\nEpoch %05d: %s did not improve from %0.5f' %
@@ -1442,13 +1688,10 @@ class ModelCheckpoint(Callback):
         else:
           if self.verbose > 0:
             print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
-          if self.save_weights_only:
-            self.model.save_weights(
-                filepath, overwrite=True, options=self._options)
-          else:
-            self.model.save(filepath, overwrite=True, options=self._options)
+          self._save(filepath)
 
-        self._maybe_remove_file()
+        if not self.async_save:
+          self._maybe_remove_file()
       except IsADirectoryError as e:  # h5py 3.x
         raise IOError('Please specify a non-directory filepath for '
                       'ModelCheckpoint. Filepath used is an existing '
@@ -1462,6 +1705,34 @@ class ModelCheckpoint(Callback):
         # Re-throw the error for any other causes.
         raise e
 
+  def _save(self, filepath):
+    """Saves the model or its weights to `filepath`."""
+    if not self.save_weights_only:
+      self.model.save(filepath, overwrite=True, options=self._options)
+      return
+    start_time = time.time()
+    if self.async_save:
+      self._async_save_start_times[filepath] = start_time
+    self.model.save_weights(filepath, overwrite=True, options=self._options)
+    if self.async_save:
+      logging.info('Copied the weights to save to %s in %0.3fs; writing them '
+                   'in the background.', filepath, time.time() - start_time)
+
+  def _on_async_write_done(self, save_path):
+    """Called on the async checkpoint thread when `save_path` is written.
+
+    `save_weights` has recorded the checkpoint state by then, so the checkpoint
+    is only visible from `tf.train.latest_checkpoint` once it is complete.
+    """
+    start_time = self._async_save_start_times.pop(save_path, None)
+    if start_time is not None:
+      logging.info('Saved the weights to %s in %0.3fs.', save_path,
+                   time.time() - start_time)
+    # The temporary checkpoint of a worker which should not checkpoint can only
+    # be removed once it is written.
+    distributed_file_utils.remove_temp_dir_with_filepath(
+        save_path, self.model.distribute_strategy)
+
   def _get_file_path(self, epoch, logs):
     """Returns the file path for checkpoint."""
     # pylint: disable=protected-access
@@ -1640,11 +1911,16 @@ class BackupAndRestore(Callback):
         cannot be reused elsewhere to store other files, e.g. by
         BackupAndRestore callback of another training, or by another callback
         (ModelCheckpoint) of the same training.
+      async_save: Whether to write the backups in the background. The training
+        thread only waits for the training state to be copied to host memory,
+        and the time each write takes is logged once it finishes. Defaults to
+        `False`.
   """
 
-  def __init__(self, backup_dir):
+  def __init__(self, backup_dir, async_save=False):
     super(BackupAndRestore, self).__init__()
     self.backup_dir = backup_dir
+    self.async_save = async_save
     self._supports_tf_logs = True
     self._supported_strategies = (
         mirrored_strategy.MirroredStrategy,
@@ -1680,7 +1956,8 @@ class BackupAndRestore(Callback):
           'MirroredStrategy, MultiWorkerMirroredStrategy and TPUStrategy.' %
           type(self.model.distribute_strategy).__name__)
     self.model._training_state = (
-        worker_training_state.WorkerTrainingState(self.model, self.backup_dir))
+        worker_training_state.WorkerTrainingState(
+            self.model, self.backup_dir, async_save=self.async_save))
     self._training_state = self.model._training_state
     self._training_state.restore()
 
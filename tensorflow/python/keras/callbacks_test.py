@@ -0,0 +1,240 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the async saves and async batch hooks of Keras callbacks."""
+
+import os
+import threading
+
+import numpy as np
+
+from tensorflow.python.checkpoint import checkpoint_management
+from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.framework import test_util
+from tensorflow.python.keras import callbacks
+from tensorflow.python.keras import layers
+from tensorflow.python.keras.engine import sequential
+from tensorflow.python.platform import test
+
+
+def _make_model():
+  model = sequential.Sequential([layers.Dense(2, input_shape=(3,))])
+  model.compile(optimizer='sgd', loss='mse')
+  return model
+
+
+class _RecordingCallback(callbacks.Callback):
+  """Records its hooks, optionally blocking in the first batch end hook."""
+
+  def __init__(self, gate=None, error_batch=None):
+    super(_RecordingCallback, self).__init__()
+    self._supports_async_batch_hooks = True
+    self.events = []
+    self.end_logs = []
+    self.batch_threads = set()
+    self.started = threading.Event()
+    self._gate = gate
+    self._error_batch = error_batch
+
+  def _record_batch(self, hook, batch, logs=None):
+    self.batch_threads.add(threading.current_thread())
+    self.events.append((hook, batch))
+
+  def on_train_batch_begin(self, batch, logs=None):
+    self._record_batch('train_batch_begin', batch)
+
+  def on_train_batch_end(self, batch, logs=None):
+    self._record_batch('train_batch_end', batch)
+    self.end_logs.append(dict(logs or {}))
+    self.started.set()
+    if self._gate is not None and batch == 0:
+      self._gate.wait()
+    if batch == self._error_batch:
+      raise ValueError('hook failed')
+
+  def on_test_batch_end(self, batch, logs=None):
+    self._record_batch('test_batch_end', batch)
+
+  def on_test_end(self, logs=None):
+    self.events.append(('test_end', None))
+
+  def on_epoch_end(self, epoch, logs=None):
+    self.events.append(('epoch_end', epoch))
+
+
+def _wait_until_idle(callback_list):
+  runner = callback_list._async_runner  # pylint: disable=protected-access
+  with runner._condition:  # pylint: disable=protected-access
+    runner._condition.wait_for(  # pylint: disable=protected-access
+        lambda: not runner._events and not runner._busy)  # pylint: disable=protected-access
+
+
+class AsyncBatchHooksTest(test.TestCase):
+
+  def test_hooks_run_off_main_thread_before_epoch_end(self):
+    recorder = _RecordingCallback()
+    cbks = callbacks.CallbackList([recorder], async_batch_hooks=True)
+    cbks.on_epoch_begin(0)
+    for batch in range(5):
+      cbks.on_train_batch_begin(batch)
+      cbks.on_train_batch_end(batch, {'loss': float(batch)})
+    cbks.on_epoch_end(0)
+    cbks.on_train_end()
+
+    self.assertNotIn(threading.current_thread(), recorder.batch_threads)
+    self.assertEqual(('train_batch_end', 4), recorder.events[-2])
+    self.assertEqual(('epoch_end', 0), recorder.events[-1])
+    self.assertEqual(4., recorder.end_logs[-1]['loss'])
+
+  def test_sync_callbacks_run_on_main_thread(self):
+    recorder = _RecordingCallback()
+    cbks = callbacks.CallbackList([recorder])
+    cbks.on_train_batch_begin(0)
+    cbks.on_train_batch_end(0)
+    self.assertEqual({threading.current_thread()}, recorder.batch_threads)
+
+  def test_coalesced_hooks(self):
+    gate = threading.Event()
+    recorder = _RecordingCallback(gate=gate)
+    progbar = callbacks.ProgbarLogger(count_mode='samples')
+    progbar.verbose = 0
+    cbks = callbacks.CallbackList([recorder, progbar], async_batch_hooks=True)
+    cbks.on_epoch_begin(0)
+    cbks.on_train_batch_begin(0)
+    cbks.on_train_batch_end(0, {'size': 4, 'num_steps': 1})
+    self.assertTrue(recorder.started.wait(10))
+    # The thread is blocked in batch 0, so batches 1 to 3 are coalesced.
+    for batch in range(1, 3):
+      cbks.on_train_batch_begin(batch)
+      cbks.on_train_batch_end(batch, {'size': 4, 'num_steps': 1})
+    cbks.on_train_batch_begin(3)
+    cbks.on_train_batch_end(3, {'size': 2, 'num_steps': 2})
+    gate.set()
+    cbks.on_epoch_end(0)
+    cbks.on_train_end()
+
+    self.assertEqual([('train_batch_begin', 0), ('train_batch_end', 0),
+                      ('train_batch_begin', 1), ('train_batch_end', 3),
+                      ('epoch_end', 0)], recorder.events)
+    self.assertEqual({'size': 12}, recorder.end_logs[-1])
+    # `ProgbarLogger(count_mode='samples')` counts every coalesced sample.
+    self.assertEqual(16, progbar.seen)
+
+  def test_hook_error_raised_by_next_hook(self):
+    recorder = _RecordingCallback(error_batch=0)
+    cbks = callbacks.CallbackList([recorder], async_batch_hooks=True)
+    cbks.on_train_batch_begin(0)
+    cbks.on_train_batch_end(0)
+    _wait_until_idle(cbks)
+    cbks.on_train_batch_begin(1)
+    with self.assertRaisesRegex(ValueError, 'hook failed'):
+      cbks.on_train_batch_end(1)
+
+    # The error is raised once, and later hooks run.
+    cbks.on_train_batch_begin(2)
+    cbks.on_train_batch_end(2)
+    cbks.on_epoch_end(0)
+    cbks.on_train_end()
+    self.assertEqual(('train_batch_end', 2), recorder.events[-2])
+
+  def test_hook_error_raised_by_epoch_end(self):
+    recorder = _RecordingCallback(error_batch=0)
+    cbks = callbacks.CallbackList([recorder], async_batch_hooks=True)
+    cbks.on_train_batch_begin(0)
+    cbks.on_train_batch_end(0)
+    with self.assertRaisesRegex(ValueError, 'hook failed'):
+      cbks.on_epoch_end(0)
+    cbks.on_train_end()
+
+  @test_util.run_v2_only
+  def test_fit_with_validation(self):
+    model = _make_model()
+    model.async_batch_hooks = True
+    recorder = _RecordingCallback()
+    x = np.ones((8, 3), dtype=np.float32)
+    y = np.zeros((8, 2), dtype=np.float32)
+    history = model.fit(
+        x, y, batch_size=2, epochs=2, validation_data=(x, y),
+        callbacks=[recorder], verbose=0)
+
+    self.assertLen(history.history['val_loss'], 2)
+    self.assertNotIn(threading.current_thread(), recorder.batch_threads)
+    events = recorder.events
+    test_ends = [i for i, e in enumerate(events) if e == ('test_end', None)]
+    epoch_ends = [i for i, e in enumerate(events) if e[0] == 'epoch_end']
+    self.assertLen(test_ends, 2)
+    self.assertLen(epoch_ends, 2)
+    start = 0
+    for test_end, epoch_end in zip(test_ends, epoch_ends):
+      # The batch hooks of each phase run before it ends.
+      self.assertIn(('train_batch_end', 3), events[start:test_end])
+      self.assertEqual(('test_batch_end', 3), events[test_end - 1])
+      self.assertEqual(test_end + 1, epoch_end)
+      start = epoch_end + 1
+
+class ModelCheckpointAsyncSaveTest(test.TestCase):
+
+  @test_util.run_v2_only
+  def test_async_save(self):
+    model = _make_model()
+    filepath = os.path.join(self.get_temp_dir(), 'weights.{epoch:02d}')
+    checkpoint = callbacks.ModelCheckpoint(
+        filepath, save_weights_only=True, async_save=True)
+    x = np.ones((4, 3), dtype=np.float32)
+    y = np.zeros((4, 2), dtype=np.float32)
+    model.fit(x, y, epochs=2, callbacks=[checkpoint], verbose=0)
+
+    # `fit()` waits for the writes, and each checkpoint is recorded once it
+    # has been written.
+    last_path = os.path.join(self.get_temp_dir(), 'weights.02')
+    self.assertEqual(
+        last_path, checkpoint_management.latest_checkpoint(
+            self.get_temp_dir()))
+    restored = _make_model()
+    restored.load_weights(last_path)
+    for expected, actual in zip(model.get_weights(), restored.get_weights()):
+      self.assertAllEqual(expected, actual)
+
+  @test_util.run_v2_only
+  def test_async_save_weights_records_state_when_written(self):
+    model = _make_model()
+    filepath = os.path.join(self.get_temp_dir(), 'weights')
+    latest_checkpoints = []
+
+    def on_write_done():
+      latest_checkpoints.append(
+          checkpoint_management.latest_checkpoint(self.get_temp_dir()))
+
+    model.save_weights(
+        filepath,
+        options=checkpoint_options.CheckpointOptions(
+            experimental_enable_async_checkpoint=True,
+            experimental_write_callbacks=[on_write_done]))
+    model._checkpoint.sync()  # pylint: disable=protected-access
+    self.assertEqual([filepath], latest_checkpoints)
+
+  def test_async_save_requires_weights_only(self):
+    filepath = os.path.join(self.get_temp_dir(), 'model')
+    with self.assertRaisesRegex(ValueError, '`async_save=True`'):
+      callbacks.ModelCheckpoint(filepath, async_save=True)
+
+  def test_async_save_rejects_h5(self):
+    filepath = os.path.join(self.get_temp_dir(), 'weights.h5')
+    with self.assertRaisesRegex(ValueError, '`async_save=True`'):
+      callbacks.ModelCheckpoint(
+          filepath, save_weights_only=True, async_save=True)
+
+
+if __name__ == '__main__':
+  test.main()
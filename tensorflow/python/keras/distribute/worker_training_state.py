@@ -15,8 +15,11 @@
 """Training state management."""
 
 import os
+import time
+
 from tensorflow.python.checkpoint import checkpoint as trackable_util
 from tensorflow.python.checkpoint import checkpoint_management
+from tensorflow.python.checkpoint import checkpoint_options
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
@@ -25,6 +28,7 @@ from tensorflow.python.keras.distribute import distributed_file_utils
 from tensorflow.python.keras.utils import mode_keys
 from tensorflow.python.lib.io import file_io
 from tensorflow.python.ops import variables
+from tensorflow.python.platform import tf_logging as logging
 
 # Constant for `tf.keras.Model` attribute to store the epoch at which the most
 # recently saved checkpoint was saved.
@@ -41,7 +45,7 @@ class WorkerTrainingState(object):
   for fault-tolerance, also known as preemption-recovery purpose.
   """
 
-  def __init__(self, model, checkpoint_dir):
+  def __init__(self, model, checkpoint_dir, async_save=False):
     self._model = model
 
     # The epoch at which the checkpoint is saved. Used for fault-tolerance.
@@ -58,6 +62,16 @@ class WorkerTrainingState(object):
     # when backing up.
     checkpoint = trackable_util.Checkpoint(
         model=self._model, ckpt_saved_epoch=self._ckpt_saved_epoch)
+    self._checkpoint = checkpoint
+
+    # With `async_save`, `back_up()` only copies the training state to host
+    # memory and the checkpoint is written by a background thread.
+    self._save_options = None
+    self._back_up_start_time = None
+    if async_save:
+      self._save_options = checkpoint_options.CheckpointOptions(
+          experimental_enable_async_checkpoint=True,
+          experimental_write_callbacks=[self._on_async_write_done])
 
     # If this is single-worker training, checkpoint_dir are the same for
     # write_checkpoint_manager and read_checkpoint_manager.
@@ -90,10 +104,30 @@ class WorkerTrainingState(object):
     """
     backend.set_value(self._ckpt_saved_epoch, epoch)
     # Save the model plus CKPT_SAVED_EPOCH variable.
-    if self.write_checkpoint_manager.save():
+    self._back_up_start_time = time.time()
+    if (self.write_checkpoint_manager.save(options=self._save_options) and
+        self._save_options is None):
       distributed_file_utils.remove_temp_dirpath(
           self.write_checkpoint_manager.directory,
           self._model.distribute_strategy)
+    if self._save_options is not None:
+      logging.info('Copied the training state to back up in %0.3fs; writing '
+                   'it in the background.',
+                   time.time() - self._back_up_start_time)
+
+  def _on_async_write_done(self, save_path):
+    """Called on the async checkpoint thread when `save_path` is written."""
+    logging.info('Backed up the training state to %s in %0.3fs.', save_path,
+                 time.time() - self._back_up_start_time)
+    # The temporary backup of a worker which should not checkpoint can only be
+    # removed once it is written.
+    distributed_file_utils.remove_temp_dirpath(
+        self.write_checkpoint_manager.directory,
+        self._model.distribute_strategy)
+
+  def sync(self):
+    """Waits for the backups being written in the background."""
+    self._checkpoint.sync()
 
   def restore(self):
     """Restore the training state from the backed up checkpoint file.
@@ -110,6 +144,7 @@ class WorkerTrainingState(object):
     Delete the backup directories which should not exist after `fit()`
     successfully finishes.
     """
+    self.sync()
     if self.write_checkpoint_manager is self.read_checkpoint_manager:
       try:
         file_io.delete_recursively_v2(self.write_checkpoint_manager.directory)
@@ -15,11 +15,16 @@
 """Adapter module that convert different input data objects into tf.dataset."""
 
 import abc
+import concurrent.futures
 import contextlib
 import functools
 import itertools
 import math
+import mmap
+import os
 import random
+import threading
+import weakref
 
 import numpy as np
 
@@ -224,6 +229,10 @@ class TensorLikeDataAdapter(DataAdapter):
     tensor_types = _get_tensor_types()
 
     def _is_tensor(v):
+      # Memory-mapped arrays are read batch by batch by
+      # `GenericArrayLikeDataAdapter` instead of being loaded into memory.
+      if isinstance(v, np.memmap):
+        return False
       if isinstance(v, tensor_types):
         return True
       return False
@@ -399,16 +408,149 @@ class TensorLikeDataAdapter(DataAdapter):
     return False
 
 
+# Number of threads reading the batches of `GenericArrayLikeDataAdapter`.
+_NUM_ARRAY_READER_THREADS = 16
+# Thread pool shared by the datasets of all `GenericArrayLikeDataAdapter`s.
+_array_reader_executor = None
+_array_reader_executor_lock = threading.Lock()
+
+
+def _get_array_reader_executor():
+  """Returns the thread pool reading the batches of array-like inputs."""
+  global _array_reader_executor
+  with _array_reader_executor_lock:
+    if _array_reader_executor is None:
+      _array_reader_executor = concurrent.futures.ThreadPoolExecutor(
+          _NUM_ARRAY_READER_THREADS, thread_name_prefix="keras_array_reader")
+    return _array_reader_executor
+
+
+def _memmap_file_offset(data):
+  """Returns the offset of `data` in its file, or None if it isn't mapped."""
+  root = data
+  while isinstance(root.base, np.ndarray):
+    root = root.base
+  if not isinstance(root, np.memmap) or not isinstance(root.base, mmap.mmap):
+    return None
+  return root.offset + (data.ctypes.data - root.ctypes.data)
+
+
+def _pread_into(fd, buf, offset):
+  """Fills the writable buffer `buf` from `fd`, starting at `offset`."""
+  while buf:
+    n = os.preadv(fd, [buf], offset)
+    if not n:
+      raise EOFError("Unexpected end of file while reading a memmap.")
+    buf = buf[n:]
+    offset += n
+
+
+class _ArrayReader(object):
+  """Reads runs of consecutive rows of an array-like input.
+
+  C-contiguous `np.memmap`s are read with `os.preadv`, which releases the GIL,
+  so the runs of a batch are read concurrently. Other array-likes are indexed
+  with the sorted indices, which keeps their reads sequential.
+
+  Floating point NumPy arrays are cast to `backend.floatx()`, as
+  `_process_tensorlike` does for the inputs of `TensorLikeDataAdapter`.
+  """
+
+  def __init__(self, data):
+    self.dtype = data.dtype
+    self._cast_dtype = None
+    if (isinstance(data, np.ndarray) and
+        issubclass(data.dtype.type, np.floating)):
+      self.dtype = self._cast_dtype = backend.floatx()
+    if isinstance(data, tensor.Tensor):
+      data = data.numpy()
+    self._data = data
+    self._fd = None
+    # Copy-on-write memmaps may have been modified without changing the file.
+    if (isinstance(data, np.memmap) and data.mode != "c" and
+        data.flags.c_contiguous and data.filename and hasattr(os, "preadv")):
+      self._offset = _memmap_file_offset(data)
+      if self._offset is not None:
+        self._fd = os.open(data.filename, os.O_RDONLY)
+        weakref.finalize(self, os.close, self._fd)
+        self._row_bytes = data.itemsize * int(np.prod(data.shape[1:]))
+
+  def read(self, sorted_indices, run_starts, run_ends):
+    """Returns the rows at `sorted_indices`, split into consecutive runs."""
+    if self._fd is None:
+      if len(run_starts) == 1:
+        rows = self._data[sorted_indices[0]:sorted_indices[-1] + 1]
+      else:
+        rows = self._data[sorted_indices]
+      return self._cast(np.asarray(rows))
+
+    out = np.empty((len(sorted_indices),) + tuple(self._data.shape[1:]),
+                   dtype=self._data.dtype)
+    if not out.nbytes:
+      return self._cast(out)
+    buf = memoryview(out).cast("B")
+    row_bytes = self._row_bytes
+
+    def read_runs(runs):
+      for start, end in runs:
+        start, end = int(start), int(end)
+        _pread_into(
+            self._fd, buf[start * row_bytes:end * row_bytes],
+            self._offset + int(sorted_indices[start]) * row_bytes)
+
+    runs = list(zip(run_starts, run_ends))
+    num_chunks = min(len(runs), _NUM_ARRAY_READER_THREADS)
+    if num_chunks == 1:
+      read_runs(runs)
+    else:
+      executor = _get_array_reader_executor()
+      futures = [executor.submit(read_runs, runs[i::num_chunks])
+                 for i in range(num_chunks)]
+      for future in futures:
+        future.result()
+    return self._cast(out)
+
+  def _cast(self, rows):
+    if self._cast_dtype is None:
+      return rows
+    return rows.astype(self._cast_dtype, copy=False)
+
+
+def _read_batch(readers, indices):
+  """Reads the rows at `indices` of each reader, in the order of `indices`."""
+  order = np.argsort(indices, kind="stable")
+  sorted_indices = indices[order]
+  run_breaks = np.flatnonzero(np.diff(sorted_indices) != 1) + 1
+  run_starts = np.concatenate([[0], run_breaks])
+  run_ends = np.concatenate([run_breaks, [len(indices)]])
+  in_order = np.array_equal(order, np.arange(len(indices)))
+
+  batch = []
+  for reader in readers:
+    rows = reader.read(sorted_indices, run_starts, run_ends)
+    if not in_order:
+      shuffled_rows = np.empty_like(rows)
+      shuffled_rows[order] = rows
+      rows = shuffled_rows
+    batch.append(rows)
+  return batch
+
+
 class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
   """Adapter that handles array-like data without forcing it into memory.
 
   This adapter handles array-like datasets that may be too big to fully
-  fit into memory.
+  fit into memory, such as `np.memmap`s and HDF5 datasets.
 
   Specifically, this adapter handles any Python class which implements:
   `__get_item__`, `__len__`, `shape`, and `dtype` with the same meanings
   as Numpy, but it ignores any case where all the inputs are Tensors or Numpy
-  arrays (because that case is handled by the base TensorLikeDataAdapter).
+  arrays that aren't memory-mapped (because that case is handled by the base
+  TensorLikeDataAdapter).
+
+  The indices of each batch are shuffled by the base adapter. They are sorted
+  and split into runs of consecutive rows, which are read on a thread pool and
+  prefetched.
 
   It ignores scipy sparse matrices and Composite Tensors because those are
   handled by the CompositeTensorDataAdapter.
@@ -438,14 +580,16 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     else:
       return False
 
-  def __init__(self, *args, **kwargs):
-    logging.warning(
-        "Keras is training/fitting/evaluating on array-like data. Keras may "
-        "not be optimized for this format, so if your input data format is "
-        "supported by TensorFlow I/O (https://github.com/tensorflow/io) we "
-        "recommend using that to load a Dataset instead.")
+  def __init__(self, x, y=None, **kwargs):
+    if not all(isinstance(v, np.ndarray)
+               for v in nest.flatten((x, y)) if v is not None):
+      logging.warning(
+          "Keras is training/fitting/evaluating on array-like data. Keras may "
+          "not be optimized for this format, so if your input data format is "
+          "supported by TensorFlow I/O (https://github.com/tensorflow/io) we "
+          "recommend using that to load a Dataset instead.")
 
-    super(GenericArrayLikeDataAdapter, self).__init__(*args, **kwargs)
+    super(GenericArrayLikeDataAdapter, self).__init__(x, y, **kwargs)
 
   def slice_inputs(self, indices_dataset, inputs):
     """Slice inputs into a Dataset of batches.
@@ -468,10 +612,8 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
       shape[0] = None
       return tuple(shape)
 
-    flat_dtypes = [inp.dtype for inp in flat_inputs]
-    contiguous = True
-    if self._shuffle and self._shuffle != "batch":
-      contiguous = False
+    readers = [_ArrayReader(inp) for inp in flat_inputs]
+    flat_dtypes = [reader.dtype for reader in readers]
 
     def grab_batch(indices):
       """Grab a batch of data from the inputs."""
@@ -479,10 +621,7 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
       # into a Tensor before slicing it, because converting the array-like
       # to a Tensor may force it into memory..
       def py_method(ind):
-        def slice_array(data):
-          return training_utils.slice_arrays(data, ind.numpy(),
-                                             contiguous=contiguous)
-        return [slice_array(inp) for inp in flat_inputs]
+        return _read_batch(readers, ind.numpy())
 
       flat_out = script_ops.eager_py_func(py_method, [indices], flat_dtypes)
       for v, original_inp in zip(flat_out, flat_inputs):
@@ -492,7 +631,7 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     dataset = indices_dataset.map(
         grab_batch, num_parallel_calls=dataset_ops.AUTOTUNE)
 
-    return dataset
+    return dataset.prefetch(dataset_ops.AUTOTUNE)
 
 
 class DatasetCreatorAdapter(DataAdapter):
@@ -1031,7 +1170,8 @@ def _process_tensorlike(inputs):
   """
 
   def _convert_numpy_and_scipy(x):
-    if isinstance(x, np.ndarray):
+    # Memory-mapped arrays are read batch by batch rather than loaded.
+    if isinstance(x, np.ndarray) and not isinstance(x, np.memmap):
       dtype = None
       if issubclass(x.dtype.type, np.floating):
         dtype = backend.floatx()
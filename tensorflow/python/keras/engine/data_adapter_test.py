@@ -0,0 +1,134 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the memmap reads of GenericArrayLikeDataAdapter."""
+
+import os
+
+import numpy as np
+
+from tensorflow.python.framework import test_util
+from tensorflow.python.keras import backend
+from tensorflow.python.keras.engine import data_adapter
+from tensorflow.python.platform import test
+
+_NUM_ROWS = 20
+_ROW_SHAPE = (3, 2)
+
+
+class GenericArrayLikeMemmapTest(test.TestCase):
+
+  def _memmap(self, name='data', dtype=np.float32, offset=0, mode='r'):
+    shape = (_NUM_ROWS,) + _ROW_SHAPE
+    values = np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+    filename = os.path.join(self.get_temp_dir(), name)
+    with open(filename, 'wb') as f:
+      f.write(b'\xff' * offset)
+      f.write(values.tobytes())
+    return values, np.memmap(
+        filename, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+  def assertReadsRows(self, data, expected, indices):
+    reader = data_adapter._ArrayReader(data)
+    indices = np.array(indices, dtype=np.int64)
+    batch, = data_adapter._read_batch([reader], indices)
+    self.assertAllEqual(expected[indices], batch)
+
+  def test_memmap_selects_generic_adapter(self):
+    _, x = self._memmap('x')
+    _, y = self._memmap('y')
+    self.assertFalse(data_adapter.TensorLikeDataAdapter.can_handle(x, y))
+    self.assertIs(data_adapter.GenericArrayLikeDataAdapter,
+                  data_adapter.select_data_adapter(x, y))
+
+  def test_read_batch_in_order(self):
+    values, data = self._memmap()
+    self.assertIsNotNone(data_adapter._ArrayReader(data)._fd)
+    self.assertReadsRows(data, values, range(4, 12))
+
+  def test_read_batch_shuffled_runs(self):
+    values, data = self._memmap()
+    # Runs [3, 6), [10, 12) and the single rows 0 and 17, out of order.
+    self.assertReadsRows(data, values, [10, 4, 17, 3, 11, 0, 5])
+
+  def test_read_batch_shuffled_without_runs(self):
+    values, data = self._memmap()
+    self.assertReadsRows(data, values, [18, 2, 14, 6, 0, 10])
+
+  def test_read_batch_with_duplicate_indices(self):
+    values, data = self._memmap()
+    self.assertReadsRows(data, values, [7, 7, 1])
+
+  def test_copy_on_write_memmap_is_indexed(self):
+    values, data = self._memmap(mode='c')
+    data[0] = -1.
+    values[0] = -1.
+    self.assertIsNone(data_adapter._ArrayReader(data)._fd)
+    self.assertReadsRows(data, values, [5, 0, 1, 2, 9])
+
+  def test_non_contiguous_memmap_is_indexed(self):
+    values, data = self._memmap()
+    data = data[:, :, ::2]
+    self.assertIsInstance(data, np.memmap)
+    self.assertFalse(data.flags.c_contiguous)
+    self.assertIsNone(data_adapter._ArrayReader(data)._fd)
+    self.assertReadsRows(data, values[:, :, ::2], [5, 0, 1, 2, 9])
+
+  def test_memmap_with_offset(self):
+    values, data = self._memmap(offset=24)
+    self.assertEqual(24, data_adapter._ArrayReader(data)._offset)
+    self.assertReadsRows(data, values, [19, 0, 1, 2, 8])
+
+  def test_sliced_memmap_offset(self):
+    values, data = self._memmap(offset=8)
+    data = data[5:]
+    row_bytes = data.itemsize * int(np.prod(_ROW_SHAPE))
+    self.assertEqual(8 + 5 * row_bytes,
+                     data_adapter._ArrayReader(data)._offset)
+    self.assertReadsRows(data, values[5:], [3, 0, 1, 14])
+
+  def test_float64_cast_to_floatx(self):
+    values, data = self._memmap(dtype=np.float64)
+    reader = data_adapter._ArrayReader(data)
+    self.assertEqual(backend.floatx(), reader.dtype)
+    indices = np.array([3, 1, 2], dtype=np.int64)
+    batch, = data_adapter._read_batch([reader], indices)
+    self.assertEqual(backend.floatx(), batch.dtype)
+    self.assertAllClose(values[indices], batch)
+
+  def test_integer_memmap_keeps_dtype(self):
+    values, data = self._memmap(dtype=np.int32)
+    reader = data_adapter._ArrayReader(data)
+    self.assertEqual(np.int32, reader.dtype)
+    self.assertReadsRows(data, values, [3, 1, 2])
+
+  @test_util.run_v2_only
+  def test_shuffled_epoch_reads_every_row(self):
+    x_values, x = self._memmap('x')
+    y_values, y = self._memmap('y', dtype=np.int32)
+    adapter = data_adapter.GenericArrayLikeDataAdapter(
+        x, y, batch_size=6, shuffle=True)
+    xs, ys = [], []
+    for batch_x, batch_y in adapter.get_dataset():
+      xs.append(batch_x.numpy())
+      ys.append(batch_y.numpy())
+    xs, ys = np.concatenate(xs), np.concatenate(ys)
+    # Rows are shuffled, but `x` and `y` stay aligned.
+    order = np.argsort(ys[:, 0, 0])
+    self.assertAllEqual(x_values, xs[order])
+    self.assertAllEqual(y_values, ys[order])
+
+
+if __name__ == '__main__':
+  test.main()
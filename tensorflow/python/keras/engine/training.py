@@ -301,6 +301,7 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
 
     # Defaults to value of `tf.config.experimental_functions_run_eagerly`.
     self._run_eagerly = None
+    self._async_batch_hooks = False
     # Initialize cache attrs.
     self._reset_compile_cache()
 
@@ -762,6 +763,25 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
   def run_eagerly(self, value):
     self._run_eagerly = value
 
+  @property
+  def async_batch_hooks(self):
+    """Settable attribute indicating whether batch hooks may run in background.
+
+    When `True`, `fit`, `evaluate` and `predict` run the batch hooks of the
+    callbacks which support it, e.g. `ProgbarLogger`, on a background thread,
+    so that the training loop doesn't wait for them. The hooks of batches
+    which end while the thread is busy are coalesced. This has no effect when
+    a `CallbackList` is passed as `callbacks`.
+
+    Returns:
+      Boolean, whether batch hooks may run on a background thread.
+    """
+    return self._async_batch_hooks
+
+  @async_batch_hooks.setter
+  def async_batch_hooks(self, value):
+    self._async_batch_hooks = value
+
   def train_step(self, data):
     """The logic for one training step.
 
@@ -1157,6 +1177,7 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             add_history=True,
             add_progbar=verbose != 0,
             model=self,
+            async_batch_hooks=self.async_batch_hooks,
             verbose=verbose,
             epochs=epochs,
             steps=data_handler.inferred_steps)
@@ -1480,6 +1501,7 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             add_history=True,
             add_progbar=verbose != 0,
             model=self,
+            async_batch_hooks=self.async_batch_hooks,
             verbose=verbose,
             epochs=1,
             steps=data_handler.inferred_steps)
@@ -1726,6 +1748,7 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             add_history=True,
             add_progbar=verbose != 0,
             model=self,
+            async_batch_hooks=self.async_batch_hooks,
             verbose=verbose,
             epochs=1,
             steps=data_handler.inferred_steps)
@@ -2241,13 +2264,17 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
       if not context.executing_eagerly():
         # Call `get_session` to initialize any uninitialized variables.
         backend.get_session()
-      self._checkpoint.write(filepath, options=options)
-      # Record this checkpoint so it's visible from tf.train.latest_checkpoint.
-      checkpoint_management.update_checkpoint_state_internal(
-          save_dir=os.path.dirname(filepath),
-          model_checkpoint_path=filepath,
-          save_relative_paths=True,
-          all_model_checkpoint_paths=[filepath])
+      if options is not None and options.experimental_enable_async_checkpoint:
+        # The checkpoint is written in the background, so only record it once
+        # it is complete, before any other write callback runs.
+        options = copy.copy(options)
+        options.experimental_write_callbacks = (
+            [_record_checkpoint_state] +
+            list(options.experimental_write_callbacks or []))
+        self._checkpoint.write(filepath, options=options)
+      else:
+        self._checkpoint.write(filepath, options=options)
+        _record_checkpoint_state(filepath)
 
   def load_weights(self,
                    filepath,
@@ -2979,6 +3006,15 @@ def _is_readable_tf_checkpoint(filepath):
     return False
 
 
+def _record_checkpoint_state(filepath):
+  """Records `filepath` so it's visible from tf.train.latest_checkpoint."""
+  checkpoint_management.update_checkpoint_state_internal(
+      save_dir=os.path.dirname(filepath),
+      model_checkpoint_path=filepath,
+      save_relative_paths=True,
+      all_model_checkpoint_paths=[filepath])
+
+
 def flatten_metrics_in_order(logs, metrics_names):
   """Turns the `logs` dict into a list as per key order of `metrics_names`."""
   results = []
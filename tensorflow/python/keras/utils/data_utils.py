@@ -16,11 +16,14 @@
 """Utilities for file download and caching."""
 
 from abc import abstractmethod
+import collections
 from contextlib import closing
 import functools
 import hashlib
 import multiprocessing
 import multiprocessing.dummy
+import multiprocessing.util
+from multiprocessing import shared_memory
 import os
 import queue
 import random
@@ -41,6 +44,7 @@ from six.moves.urllib.request import urlopen
 from tensorflow.python.keras.utils import tf_inspect
 from tensorflow.python.keras.utils.generic_utils import Progbar
 from tensorflow.python.keras.utils.io_utils import path_to_string
+from tensorflow.python.util import nest
 
 # Required to support google internal urlretrieve
 if sys.version_info[0] == 2:
@@ -544,6 +548,219 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+# Offsets of the arrays written to a shared memory segment are aligned to this.
+_SHARED_MEMORY_ALIGNMENT = 64
+# Number of shared memory segments each worker process keeps mapped.
+_WORKER_SEGMENT_CACHE_SIZE = 16
+# Segments mapped by the current worker process, in least recently used order.
+_WORKER_SEGMENTS = collections.OrderedDict()
+
+
+class _SharedArray(object):
+  """Describes an array written to a shared memory segment."""
+
+  __slots__ = ['dtype', 'shape', 'offset']
+
+  def __init__(self, dtype, shape, offset):
+    self.dtype = dtype
+    self.shape = shape
+    self.offset = offset
+
+  def __getstate__(self):
+    return self.dtype, self.shape, self.offset
+
+  def __setstate__(self, state):
+    self.dtype, self.shape, self.offset = state
+
+
+def _prune_worker_segments(live_names):
+  """Unmaps the segments which the consumer no longer uses."""
+  for name in list(_WORKER_SEGMENTS):
+    if name not in live_names:
+      _WORKER_SEGMENTS.pop(name).close()
+
+
+def _clear_worker_segments():
+  """Unmaps every segment mapped by the current worker process."""
+  while _WORKER_SEGMENTS:
+    _, segment = _WORKER_SEGMENTS.popitem()
+    segment.close()
+
+
+def _attach_worker_segment(name):
+  """Maps the segment `name` in a worker process, reusing earlier mappings."""
+  segment = _WORKER_SEGMENTS.pop(name, None)
+  if segment is None:
+    segment = shared_memory.SharedMemory(name=name)
+  _WORKER_SEGMENTS[name] = segment
+  while len(_WORKER_SEGMENTS) > _WORKER_SEGMENT_CACHE_SIZE:
+    _, evicted = _WORKER_SEGMENTS.popitem(last=False)
+    evicted.close()
+  return segment
+
+
+def write_to_shared_memory(fn, args, slot, segment_names):
+  """Calls `fn(*args)` and writes the NumPy arrays it returns to a segment.
+
+  Runs in the worker processes of an enqueuer with `use_shared_memory=True`.
+  Numeric arrays are written to the segment of `slot`. If they don't fit, or
+  the slot has no segment yet, a larger segment is created in its place.
+  Mapped segments which are not in `segment_names` anymore are unmapped.
+
+  Args:
+      fn: Function producing the value, e.g. `get_index`.
+      args: Arguments of `fn`.
+      slot: The slot of the `_SharedMemoryRing` the value is written to.
+      segment_names: The names of the segments of the ring's slots, with None
+        for slots without a segment.
+
+  Returns:
+      A tuple `(slot, segment_name, created, structure)`, where `structure`
+      is the value of `fn` with the arrays replaced by `_SharedArray`s.
+  """
+  _prune_worker_segments(segment_names)
+  segment_name = segment_names[slot]
+  value = fn(*args)
+  flat_value = nest.flatten(value)
+  offsets = {}
+  size = 0
+  for j, x in enumerate(flat_value):
+    if isinstance(x, np.ndarray) and x.dtype.kind in 'biufc':
+      offsets[j] = size
+      size += -(-x.nbytes // _SHARED_MEMORY_ALIGNMENT) * _SHARED_MEMORY_ALIGNMENT
+  if not offsets:
+    return slot, segment_name, False, value
+
+  created = False
+  segment = None
+  if segment_name is not None:
+    segment = _attach_worker_segment(segment_name)
+  if segment is None or segment.size < size:
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    created = True
+    _WORKER_SEGMENTS[segment.name] = segment
+  try:
+    for j, offset in offsets.items():
+      x = flat_value[j]
+      np.ndarray(x.shape, x.dtype, buffer=segment.buf, offset=offset)[...] = x
+      flat_value[j] = _SharedArray(x.dtype, x.shape, offset)
+  except Exception:
+    # The consumer only learns about segments of successful tasks.
+    if created:
+      del _WORKER_SEGMENTS[segment.name]
+      segment.close()
+      segment.unlink()
+    raise
+  return (slot, segment.name, created,
+          nest.pack_sequence_as(value, flat_value))
+
+
+def _close_segment(segment):
+  if segment is None:
+    return
+  try:
+    segment.close()
+  except BufferError:
+    # The arrays of its last value are still being freed.
+    pass
+
+
+class _SegmentView(np.ndarray):
+  """The bytes of a shared memory segment used by one value.
+
+  The arrays handed to the consumer are views of this array, so it is freed
+  only once none of them is referenced, which releases its slot. Since it is a
+  subclass, NumPy doesn't collapse the `base` of those views past it.
+  """
+
+
+class _SharedMemoryRing(object):
+  """Shared memory segments that enqueuer workers write values into.
+
+  Each slot owns a segment which is reused for the values of successive tasks.
+  A slot is acquired when a task is submitted and released once the consumer
+  no longer references the arrays of its value, or when the task fails, so the
+  consumer can use them without copying. If every slot is in use, a new one is
+  added.
+
+  Segments created by the workers are adopted by the `on_written` callback of
+  the task, so that they are unlinked on `close()` even when the consumer never
+  reads the value.
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._segments = []
+    self._free = []
+    self._closed = False
+
+  def acquire(self):
+    """Returns a free slot and the names of the segments of all slots."""
+    with self._lock:
+      if self._free:
+        slot = self._free.pop()
+      else:
+        slot = len(self._segments)
+        self._segments.append(None)
+      return slot, tuple(None if segment is None else segment.name
+                         for segment in self._segments)
+
+  def release(self, slot):
+    """Makes `slot` available to the next task."""
+    # Runs while the arrays of the value are being freed, so a closed ring's
+    # segment is left to be closed when the ring is garbage collected.
+    with self._lock:
+      if not self._closed:
+        self._free.append(slot)
+
+  def on_written(self, result):
+    """Adopts the segment a worker created for the result of its task."""
+    slot, segment_name, created, _ = result
+    if not created:
+      return
+    segment = shared_memory.SharedMemory(name=segment_name)
+    with self._lock:
+      if self._closed:
+        old_segment = segment
+      else:
+        old_segment = self._segments[slot]
+        self._segments[slot] = segment
+    if old_segment is not None:
+      _close_segment(old_segment)
+      old_segment.unlink()
+
+  def read(self, result):
+    """Returns the value written by `write_to_shared_memory`."""
+    slot, _, _, structure = result
+    segment = self._segments[slot]
+    if segment is None:
+      self.release(slot)
+      return structure
+
+    view = np.frombuffer(segment.buf, dtype=np.uint8).view(_SegmentView)
+    weakref.finalize(view, self.release, slot)
+
+    def to_array(x):
+      if not isinstance(x, _SharedArray):
+        return x
+      nbytes = int(np.prod(x.shape)) * x.dtype.itemsize
+      return (view[x.offset:x.offset + nbytes].view(np.ndarray)
+              .view(x.dtype).reshape(x.shape))
+
+    return nest.map_structure(to_array, structure)
+
+  def close(self):
+    """Unlinks the segments, closing those whose values are no longer used."""
+    with self._lock:
+      self._closed = True
+      for slot in self._free:
+        _close_segment(self._segments[slot])
+      self._free = []
+      for segment in self._segments:
+        if segment is not None:
+          segment.unlink()
+
+
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
 
@@ -563,12 +780,20 @@ class SequenceEnqueuer(object):
   ```
 
   The `enqueuer.get()` should be an infinite stream of datas.
+
+  With `use_multiprocessing=True` and `use_shared_memory=True`, workers write
+  the NumPy arrays of each value to shared memory and the arrays yielded by
+  `get()` are views of it rather than unpickled copies. The memory of a value
+  is reused once none of its arrays is referenced anymore, so copy an array
+  before writing to it.
   """
 
   def __init__(self, sequence,
-               use_multiprocessing=False):
+               use_multiprocessing=False,
+               use_shared_memory=False):
     self.sequence = sequence
     self.use_multiprocessing = use_multiprocessing
+    self.use_shared_memory = use_shared_memory
 
     global _SEQUENCE_COUNTER
     if _SEQUENCE_COUNTER is None:
@@ -594,6 +819,7 @@ class SequenceEnqueuer(object):
     self.queue = None
     self.run_thread = None
     self.stop_signal = None
+    self._ring = None
 
   def is_running(self):
     return self.stop_signal is not None and not self.stop_signal.is_set()
@@ -611,6 +837,8 @@ class SequenceEnqueuer(object):
     else:
       # We do not need the init since it's threads.
       self.executor_fn = lambda _: get_pool_class(False)(workers)
+    if self.use_multiprocessing and self.use_shared_memory:
+      self._ring = _SharedMemoryRing()
     self.workers = workers
     self.queue = queue.Queue(max_queue_size)
     self.stop_signal = threading.Event()
@@ -638,6 +866,27 @@ class SequenceEnqueuer(object):
       self.queue.not_full.notify()
     self.run_thread.join(timeout)
     _SHARED_SEQUENCES[self.uid] = None
+    if self._ring is not None:
+      self._ring.close()
+      self._ring = None
+
+  def _apply_async(self, executor, fn, args):
+    """Submits `fn(*args)` to `executor`, through shared memory if enabled."""
+    if self._ring is None:
+      return executor.apply_async(fn, args)
+    ring = self._ring
+    slot, segment_names = ring.acquire()
+    return executor.apply_async(
+        write_to_shared_memory, (fn, args, slot, segment_names),
+        callback=ring.on_written,
+        error_callback=lambda unused_error: ring.release(slot))
+
+  def _get_result(self, future):
+    """Returns the value computed by a future of `_apply_async`."""
+    result = future.get()
+    if self._ring is None:
+      return result
+    return self._ring.read(result)
 
   def __del__(self):
     if self.is_running():
@@ -679,10 +928,15 @@ class OrderedEnqueuer(SequenceEnqueuer):
       sequence: A `tf.keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      use_shared_memory: if True and `use_multiprocessing` is True, batches
+          are passed from the workers through shared memory instead of being
+          pickled
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
-    super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing)
+  def __init__(self, sequence, use_multiprocessing=False, shuffle=False,
+               use_shared_memory=False):
+    super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing,
+                                          use_shared_memory)
     self.shuffle = shuffle
 
   def _get_executor_init(self, workers):
@@ -724,7 +978,8 @@ class OrderedEnqueuer(SequenceEnqueuer):
             return
 
           self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+              self._apply_async(executor, get_index, (self.uid, i)),
+              block=True)
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -749,7 +1004,7 @@ class OrderedEnqueuer(SequenceEnqueuer):
     """
     while self.is_running():
       try:
-        inputs = self.queue.get(block=True, timeout=5).get()
+        inputs = self._get_result(self.queue.get(block=True, timeout=5))
         if self.is_running():
           self.queue.task_done()
         if inputs is not None:
@@ -787,6 +1042,10 @@ def init_pool_generator(gens, random_seed=None, id_queue=None):
     # If a worker dies during init, the pool will just create a replacement.
     id_queue.put(worker_proc.ident, block=True, timeout=0.1)
 
+  # `stop()` closes the pool, so unmap the segments of `use_shared_memory` as
+  # the worker exits.
+  multiprocessing.util.Finalize(None, _clear_worker_segments, exitpriority=0)
+
 
 def next_sample(uid):
   """Gets the next value from the generator `uid`.
@@ -815,12 +1074,17 @@ class GeneratorEnqueuer(SequenceEnqueuer):
       use_multiprocessing: use multiprocessing if True, otherwise threading
       random_seed: Initial seed for workers,
           will be incremented by one for each worker.
+      use_shared_memory: if True and `use_multiprocessing` is True, batches
+          are passed from the workers through shared memory instead of being
+          pickled
   """
 
   def __init__(self, generator,
                use_multiprocessing=False,
-               random_seed=None):
-    super(GeneratorEnqueuer, self).__init__(generator, use_multiprocessing)
+               random_seed=None,
+               use_shared_memory=False):
+    super(GeneratorEnqueuer, self).__init__(generator, use_multiprocessing,
+                                            use_shared_memory)
     self.random_seed = random_seed
 
   def _get_executor_init(self, workers):
@@ -849,7 +1113,7 @@ class GeneratorEnqueuer(SequenceEnqueuer):
           return
 
         self.queue.put(
-            executor.apply_async(next_sample, (self.uid,)), block=True)
+            self._apply_async(executor, next_sample, (self.uid,)), block=True)
 
   def get(self):
     """Creates a generator to extract data from the queue.
@@ -863,7 +1127,7 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     """
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        inputs = self._get_result(self.queue.get(block=True))
         self.queue.task_done()
         if inputs is not None:
           yield inputs
@@ -876,7 +1140,11 @@ class GeneratorEnqueuer(SequenceEnqueuer):
       for f in last_ones:
         f.wait()
       # Keep the good ones
-      last_ones = [future.get() for future in last_ones if future.successful()]
+      last_ones = [
+          self._get_result(future)
+          for future in last_ones
+          if future.successful()
+      ]
       for inputs in last_ones:
         if inputs is not None:
           yield inputs
@@ -0,0 +1,191 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the shared memory transport of the enqueuers in data_utils."""
+
+import gc
+import multiprocessing.dummy
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tensorflow.python.keras.utils import data_utils
+from tensorflow.python.platform import test
+
+_NUM_BATCHES = 6
+_SHM_DIR = '/dev/shm'
+
+
+def _batch(i):
+  return (np.full([4, 3], i, dtype=np.float32),
+          {'label': np.arange(4, dtype=np.int64) + i, 'name': 'batch%d' % i})
+
+
+class _TestSequence(data_utils.Sequence):
+
+  def __len__(self):
+    return _NUM_BATCHES
+
+  def __getitem__(self, i):
+    return _batch(i)
+
+
+def _test_generator():
+  i = 0
+  while True:
+    yield _batch(i)
+    i += 1
+
+
+def _failing_fn():
+  raise ValueError('task failed')
+
+
+def _take(enqueuer, count):
+  enqueuer.start(workers=1, max_queue_size=2)
+  try:
+    batches = []
+    iterator = enqueuer.get()
+    for _ in range(count):
+      x, y = next(iterator)
+      # Copies the views of the shared memory, so the slots can be reused.
+      batches.append((np.array(x), {'label': np.array(y['label']),
+                                    'name': y['name']}))
+    return batches
+  finally:
+    enqueuer.stop()
+
+
+def _shm_segments():
+  return set(os.listdir(_SHM_DIR))
+
+
+class SharedMemoryEnqueuerTest(test.TestCase):
+
+  def tearDown(self):
+    data_utils._clear_worker_segments()
+    super(SharedMemoryEnqueuerTest, self).tearDown()
+
+  def assertBatchesEqual(self, expected, actual):
+    self.assertEqual(len(expected), len(actual))
+    for (x, y), (other_x, other_y) in zip(expected, actual):
+      self.assertAllEqual(x, other_x)
+      self.assertAllEqual(y['label'], other_y['label'])
+      self.assertEqual(y['name'], other_y['name'])
+
+  def test_ordered_enqueuer_matches_pickled(self):
+    pickled = _take(
+        data_utils.OrderedEnqueuer(_TestSequence(), use_multiprocessing=True),
+        _NUM_BATCHES)
+    shared = _take(
+        data_utils.OrderedEnqueuer(
+            _TestSequence(), use_multiprocessing=True, use_shared_memory=True),
+        _NUM_BATCHES)
+    self.assertBatchesEqual([_batch(i) for i in range(_NUM_BATCHES)], pickled)
+    self.assertBatchesEqual(pickled, shared)
+
+  def test_generator_enqueuer_matches_pickled(self):
+    pickled = _take(
+        data_utils.GeneratorEnqueuer(
+            _test_generator(), use_multiprocessing=True), _NUM_BATCHES)
+    shared = _take(
+        data_utils.GeneratorEnqueuer(
+            _test_generator(), use_multiprocessing=True,
+            use_shared_memory=True), _NUM_BATCHES)
+    self.assertBatchesEqual(pickled, shared)
+
+  def test_slot_reused_after_views_freed(self):
+    ring = data_utils._SharedMemoryRing()
+    try:
+      slot, names = ring.acquire()
+      result = data_utils.write_to_shared_memory(_batch, (1,), slot, names)
+      ring.on_written(result)
+      value = ring.read(result)
+      self.assertAllEqual(_batch(1)[0], value[0])
+
+      # The slot is still used by `value`.
+      other_slot, _ = ring.acquire()
+      self.assertNotEqual(slot, other_slot)
+      ring.release(other_slot)
+
+      del value
+      gc.collect()
+      # Freed last, so acquired first.
+      self.assertEqual(slot, ring.acquire()[0])
+    finally:
+      ring.close()
+
+  def test_bigger_batch_replaces_segment(self):
+    ring = data_utils._SharedMemoryRing()
+    try:
+      slot, names = ring.acquire()
+      result = data_utils.write_to_shared_memory(
+          np.zeros, ([4], np.float32), slot, names)
+      ring.on_written(result)
+      _, old_name, created, _ = result
+      self.assertTrue(created)
+      del result
+      ring.release(slot)
+
+      same_slot, names = ring.acquire()
+      self.assertEqual(slot, same_slot)
+      self.assertEqual(old_name, names[slot])
+      result = data_utils.write_to_shared_memory(
+          np.ones, ([1 << 16], np.float32), slot, names)
+      ring.on_written(result)
+      _, new_name, created, _ = result
+      self.assertTrue(created)
+      self.assertNotEqual(old_name, new_name)
+      self.assertAllEqual(np.ones([1 << 16], np.float32), ring.read(result))
+      with self.assertRaises(FileNotFoundError):
+        shared_memory.SharedMemory(name=old_name)
+    finally:
+      ring.close()
+
+  def test_failing_task_releases_slot(self):
+    enqueuer = data_utils.OrderedEnqueuer(
+        _TestSequence(), use_multiprocessing=True, use_shared_memory=True)
+    enqueuer._ring = ring = data_utils._SharedMemoryRing()
+    try:
+      with multiprocessing.dummy.Pool(1) as pool:
+        future = enqueuer._apply_async(pool, _failing_fn, ())
+        future.wait()
+        self.assertFalse(future.successful())
+        with self.assertRaisesRegex(ValueError, 'task failed'):
+          enqueuer._get_result(future)
+      slot, _ = ring.acquire()
+      self.assertEqual(0, slot)
+    finally:
+      ring.close()
+
+  def test_stop_unlinks_segments(self):
+    if not os.path.isdir(_SHM_DIR):
+      self.skipTest('Requires %s.' % _SHM_DIR)
+    segments_before = _shm_segments()
+    _take(
+        data_utils.OrderedEnqueuer(
+            _TestSequence(), use_multiprocessing=True, use_shared_memory=True),
+        2)
+    gc.collect()
+    # Tasks still running at `stop()` unlink their segments as they finish.
+    deadline = time.time() + 10
+    while _shm_segments() - segments_before and time.time() < deadline:
+      time.sleep(0.1)
+    self.assertEmpty(_shm_segments() - segments_before)
+
+
+if __name__ == '__main__':
+  test.main()
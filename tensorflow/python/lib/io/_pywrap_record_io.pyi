@@ -13,7 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
-from typing import Any
+from typing import Any, List
 
 class RandomRecordReader:
     def __init__(self, arg0: str) -> None: ...
@@ -31,6 +31,8 @@ class RecordWriter:
     def __init__(self, arg0: str, arg1: RecordWriterOptions) -> None: ...
     def close(self) -> None: ...
     def flush(self) -> None: ...
+    def flush_records(self) -> None: ...
+    def tell(self) -> int: ...
     def write(self, record: str) -> None: ...
     def __enter__(self) -> object: ...
     def __exit__(self, *args) -> None: ...
@@ -52,3 +54,6 @@ class ZlibCompressionOptions:
     output_buffer_size: int
     window_bits: int
     def __init__(self, *args, **kwargs) -> None: ...
+
+def encode_records(records: List[bytes]) -> bytes: ...
+def verify_records(data: Any, offsets: List[int]) -> None: ...
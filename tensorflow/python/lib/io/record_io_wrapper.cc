@@ -15,11 +15,15 @@ limitations under the License.
 
 #include <memory>
 #include <string>
+#include <vector>
 
 #include "absl/memory/memory.h"
 #include "pybind11/pybind11.h"  // from @pybind11
+#include "pybind11/stl.h"  // from @pybind11
 #include "tensorflow/core/lib/core/errors.h"
+#include "tensorflow/core/lib/core/raw_coding.h"
 #include "tensorflow/core/lib/core/stringpiece.h"
+#include "tensorflow/core/lib/hash/crc32c.h"
 #include "tensorflow/core/lib/io/record_reader.h"
 #include "tensorflow/core/lib/io/record_writer.h"
 #include "tensorflow/core/lib/io/zlib_compression_options.h"
@@ -201,6 +205,24 @@ class PyRecordWriter {
     return status;
   }
 
+  // Writes the records buffered by the writer to the underlying file without
+  // flushing the file.
+  tensorflow::Status FlushRecords() {
+    if (IsClosed()) {
+      return tensorflow::errors::FailedPrecondition("Writer is closed.");
+    }
+    return writer_->AppendRestartPoint();
+  }
+
+  // Returns the number of bytes written to the underlying file. Data still
+  // buffered by the writer is only accounted for after `Flush()`.
+  tensorflow::Status Tell(int64_t* position) {
+    if (IsClosed()) {
+      return tensorflow::errors::FailedPrecondition("Writer is closed.");
+    }
+    return file_->Tell(position);
+  }
+
   bool IsClosed() const { return file_ == nullptr && writer_ == nullptr; }
 
   tensorflow::Status Close() {
@@ -229,7 +251,95 @@ class PyRecordWriter {
   void operator=(const PyRecordWriter&) = delete;
 };
 
+// Verifies the length and data checksums of the uncompressed records starting
+// at each of `offsets` in `data`.
+tensorflow::Status VerifyRecords(
+    tensorflow::StringPiece data,
+    const std::vector<tensorflow::uint64>& offsets) {
+  using tensorflow::io::RecordWriter;
+  for (const tensorflow::uint64 offset : offsets) {
+    if (offset > data.size() ||
+        data.size() - offset < RecordWriter::kHeaderSize) {
+      return tensorflow::errors::DataLoss("Truncated record at offset ",
+                                          offset);
+    }
+    const char* header = data.data() + offset;
+    const tensorflow::uint64 length = tensorflow::core::DecodeFixed64(header);
+    const tensorflow::uint32 length_crc = tensorflow::crc32c::Unmask(
+        tensorflow::core::DecodeFixed32(header + sizeof(tensorflow::uint64)));
+    if (length_crc !=
+        tensorflow::crc32c::Value(header, sizeof(tensorflow::uint64))) {
+      return tensorflow::errors::DataLoss("Found corrupted record at offset ",
+                                          offset);
+    }
+    if (data.size() - offset - RecordWriter::kHeaderSize <
+        length + RecordWriter::kFooterSize) {
+      return tensorflow::errors::DataLoss("Truncated record at offset ",
+                                          offset);
+    }
+    const char* record = header + RecordWriter::kHeaderSize;
+    const tensorflow::uint32 data_crc = tensorflow::crc32c::Unmask(
+        tensorflow::core::DecodeFixed32(record + length));
+    if (data_crc != tensorflow::crc32c::Value(record, length)) {
+      return tensorflow::errors::DataLoss("Found corrupted record at offset ",
+                                          offset);
+    }
+  }
+  return absl::OkStatus();
+}
+
+// Frames each of `records` as a TFRecord with its length and data checksums.
+std::string EncodeRecords(const std::vector<std::string>& records) {
+  using tensorflow::io::RecordWriter;
+  size_t size = 0;
+  for (const std::string& record : records) {
+    size +=
+        RecordWriter::kHeaderSize + record.size() + RecordWriter::kFooterSize;
+  }
+  std::string output;
+  output.reserve(size);
+  char header[RecordWriter::kHeaderSize];
+  char footer[RecordWriter::kFooterSize];
+  for (const std::string& record : records) {
+    RecordWriter::PopulateHeader(header, record.data(), record.size());
+    RecordWriter::PopulateFooter(footer, record.data(), record.size());
+    output.append(header, sizeof(header));
+    output.append(record);
+    output.append(footer, sizeof(footer));
+  }
+  return output;
+}
+
 PYBIND11_MODULE(_pywrap_record_io, m) {
+  m.def(
+      "encode_records",
+      [](const std::vector<std::string>& records) {
+        std::string output;
+        {
+          py::gil_scoped_release release;
+          output = EncodeRecords(records);
+        }
+        return py::bytes(output);
+      },
+      py::arg("records"));
+
+  m.def(
+      "verify_records",
+      [](const py::buffer& data,
+         const std::vector<tensorflow::uint64>& offsets) {
+        py::buffer_info info = data.request();
+        tensorflow::StringPiece view(static_cast<const char*>(info.ptr),
+                                     info.size * info.itemsize);
+        tensorflow::Status status;
+        {
+          py::gil_scoped_release release;
+          status = VerifyRecords(view, offsets);
+        }
+        tsl::MaybeRaiseRegisteredFromStatus(status);
+      },
+      py::arg("data"), py::arg("offsets"));
+
+
   py::class_<PyRecordReader>(m, "RecordIterator")
       .def(py::init(
           [](const std::string& filename, const std::string& compression_type) {
@@ -359,6 +469,16 @@ PYBIND11_MODULE(_pywrap_record_io, m) {
            [](PyRecordWriter* self) {
              tsl::MaybeRaiseRegisteredFromStatus(self->Flush());
            })
+      .def("flush_records",
+           [](PyRecordWriter* self) {
+             tsl::MaybeRaiseRegisteredFromStatus(self->FlushRecords());
+           })
+      .def("tell",
+           [](PyRecordWriter* self) {
+             int64_t position = 0;
+             tsl::MaybeRaiseRegisteredFromStatus(self->Tell(&position));
+             return position;
+           })
       .def("close", [](PyRecordWriter* self) {
         tsl::MaybeRaiseRegisteredFromStatus(self->Close());
       });
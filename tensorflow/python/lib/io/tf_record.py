@@ -15,7 +15,23 @@
 
 """For reading and writing TFRecords files."""
 
+import array
+import bisect
+import collections
+from concurrent import futures
+import copy
+import json
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+
+from tensorflow.python.framework import errors
 from tensorflow.python.lib.io import _pywrap_record_io
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.util import compat
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
@@ -208,6 +224,409 @@ def tf_record_random_reader(path):
   return _pywrap_record_io.RandomRecordReader(path)
 
 
+# Size of the length header, length CRC and data CRC framing each record.
+_RECORD_HEADER_SIZE = 12
+_RECORD_FOOTER_SIZE = 4
+
+# Sidecar index format. The index file starts with a fixed header followed by
+# three little-endian uint64 arrays:
+#
+#   block_offsets[num_blocks]       Offset of each block in the record file.
+#   block_first_record[num_blocks]  Id of the first record in each block.
+#   record_offsets[num_records]     Offset of each record in the (uncompressed)
+#                                   data of its block.
+#
+# A new block starts whenever the writer is flushed. Compressed files also get
+# a zlib full flush at least every `_INDEX_BLOCK_SIZE` bytes, so that inflation
+# can restart at any block offset. These restart points only append the
+# compressed data to the file, without flushing it.
+_INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"TFRINDEX"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<8sIIQQ")
+_INDEX_COMPRESSION_CODES = {"": 0, "ZLIB": 1, "GZIP": 2}
+
+# Uncompressed bytes written to a compressed file before a new block (and
+# restart point) is started.
+_INDEX_BLOCK_SIZE = 256 * 1024
+# Size of the reads issued when inflating a compressed block.
+_INDEX_READ_CHUNK_SIZE = 64 * 1024
+
+
+def tf_record_index_path(path):
+  """Returns the path of the sidecar index written next to `path`."""
+  return path + _INDEX_SUFFIX
+
+
+def _uint64_array(values=()):
+  return array.array("Q", values)
+
+
+def _uint64_array_to_bytes(values):
+  if sys.byteorder != "little":
+    values = _uint64_array(values)
+    values.byteswap()
+  return values.tobytes()
+
+
+def _uint64_array_from_bytes(data, start, count):
+  values = _uint64_array()
+  values.frombytes(data[start:start + 8 * count])
+  if sys.byteorder != "little":
+    values.byteswap()
+  return values
+
+
+class _RecordIndexBuilder(object):
+  """Accumulates record offsets for a sidecar index while a file is written."""
+
+  def __init__(self, path, compression_type):
+    self._path = path
+    self._compression_type = compression_type
+    self._block_offsets = _uint64_array([0])
+    self._block_first_record = _uint64_array([0])
+    self._record_offsets = _uint64_array()
+    self._position = 0
+
+  def add_record(self, size):
+    self._record_offsets.append(self._position)
+    self._position += _RECORD_HEADER_SIZE + size + _RECORD_FOOTER_SIZE
+
+  def needs_restart(self):
+    return (bool(self._compression_type) and
+            self._position >= _INDEX_BLOCK_SIZE)
+
+  def start_block(self, offset):
+    """Starts a new block at compressed `offset` of the record file."""
+    if self._block_first_record[-1] == len(self._record_offsets):
+      # The current block is still empty, so just move it.
+      self._block_offsets[-1] = offset
+    else:
+      self._block_offsets.append(offset)
+      self._block_first_record.append(len(self._record_offsets))
+    self._position = 0
+
+  def write(self):
+    header = _INDEX_HEADER.pack(
+        _INDEX_MAGIC, _INDEX_VERSION,
+        _INDEX_COMPRESSION_CODES[self._compression_type],
+        len(self._block_offsets), len(self._record_offsets))
+    file_io.atomic_write_string_to_file(
+        tf_record_index_path(self._path),
+        b"".join([
+            header,
+            _uint64_array_to_bytes(self._block_offsets),
+            _uint64_array_to_bytes(self._block_first_record),
+            _uint64_array_to_bytes(self._record_offsets),
+        ]))
+
+
+class _IndexedRecordFile(object):
+  """Random access to the records of one file through its sidecar index."""
+
+  def __init__(self, path):
+    self._path = path
+    index_path = tf_record_index_path(path)
+    data = file_io.read_file_to_string(index_path, binary_mode=True)
+    if len(data) < _INDEX_HEADER.size:
+      raise errors.DataLossError(
+          None, None, "Truncated TFRecord index: {}".format(index_path))
+    magic, version, compression, num_blocks, num_records = (
+        _INDEX_HEADER.unpack_from(data))
+    if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+      raise errors.DataLossError(
+          None, None, "Not a TFRecord index: {}".format(index_path))
+    if len(data) != _INDEX_HEADER.size + 8 * (2 * num_blocks + num_records):
+      raise errors.DataLossError(
+          None, None, "Truncated TFRecord index: {}".format(index_path))
+    start = _INDEX_HEADER.size
+    self._block_offsets = _uint64_array_from_bytes(data, start, num_blocks)
+    start += 8 * num_blocks
+    self._block_first_record = _uint64_array_from_bytes(
+        data, start, num_blocks)
+    start += 8 * num_blocks
+    self._record_offsets = _uint64_array_from_bytes(data, start, num_records)
+    self._compressed = compression != 0
+    self._lock = threading.Lock()
+    self._reader = None
+
+  def __len__(self):
+    return len(self._record_offsets)
+
+  def read(self, record_ids):
+    """Returns a dict mapping each of `record_ids` to its record."""
+    with self._lock:
+      if self._compressed:
+        return self._read_compressed(sorted(set(record_ids)))
+      if self._reader is None:
+        self._reader = _pywrap_record_io.RandomRecordReader(self._path)
+      return {i: self._reader.read(self._offset(i))[0] for i in record_ids}
+
+  def close(self):
+    with self._lock:
+      if self._reader is not None:
+        self._reader.close()
+        self._reader = None
+
+  def _block(self, record_id):
+    return bisect.bisect_right(self._block_first_record, record_id) - 1
+
+  def _offset(self, record_id):
+    """Returns the offset of an uncompressed record in the file."""
+    return (self._block_offsets[self._block(record_id)] +
+            self._record_offsets[record_id])
+
+  def _read_compressed(self, record_ids):
+    """Reads sorted `record_ids`, inflating each needed block at most once."""
+    if self._reader is None:
+      self._reader = file_io.FileIO(self._path, "rb")
+    records = {}
+    block = None
+    for i in record_ids:
+      record_block = self._block(i)
+      if record_block != block:
+        block = record_block
+        offset = self._block_offsets[block]
+        self._reader.seek(offset)
+        # The first block starts with the GZIP or ZLIB header, all others are
+        # raw deflate data following a full flush.
+        inflater = zlib.decompressobj(
+            32 + zlib.MAX_WBITS if offset == 0 else -zlib.MAX_WBITS)
+        data = bytearray()
+      offset = self._record_offsets[i]
+      self._inflate(inflater, data, offset + _RECORD_HEADER_SIZE)
+      length, = struct.unpack_from("<Q", data, offset)
+      if (i + 1 < len(self._record_offsets) and
+          self._block(i + 1) == block and
+          self._record_offsets[i + 1] !=
+          offset + _RECORD_HEADER_SIZE + length + _RECORD_FOOTER_SIZE):
+        # Don't inflate up to a corrupted length.
+        raise errors.DataLossError(
+            None, None, "Found corrupted record {} in {}".format(i, self._path))
+      start = offset + _RECORD_HEADER_SIZE
+      self._inflate(inflater, data, start + length + _RECORD_FOOTER_SIZE)
+      # Check the length and data CRCs like the sequential reader does.
+      _pywrap_record_io.verify_records(data, [offset])
+      records[i] = bytes(data[start:start + length])
+    return records
+
+  def _inflate(self, inflater, data, size):
+    while len(data) < size:
+      chunk = self._reader.read(_INDEX_READ_CHUNK_SIZE)
+      if not chunk:
+        raise errors.DataLossError(
+            None, None,
+            "Truncated record in {} according to its index".format(self._path))
+      data += inflater.decompress(chunk)
+
+
+class TFRecordIndexedReader(object):
+  """Reads records by id from TFRecord files written with a sidecar index.
+
+  The files must have been written by a `TFRecordWriter` created with
+  `write_index=True`. Records are numbered consecutively across `paths`, in
+  order, and each record is fetched with a single seek using the index, for
+  both uncompressed and GZIP/ZLIB compressed files.
+
+  Usage example:
+  ```py
+  with TFRecordIndexedReader(shard_paths) as reader:
+    num_records = len(reader)
+    record = reader.read(12345)
+    batch = reader.read_batch(np.random.permutation(num_records)[:256])
+  ```
+
+  Batches are read with one task per file on a thread pool, so records from
+  different files are read concurrently.
+  """
+
+  def __init__(self, paths, num_parallel_reads=None):
+    """Loads the sidecar indices of `paths`.
+
+    Args:
+      paths: A path or list of paths of TFRecord files with sidecar indices.
+      num_parallel_reads: (optional) Number of files read concurrently by
+        `read_batch`. Defaults to the number of files, up to 32.
+
+    Raises:
+      IOError: If a file or its index cannot be opened for reading.
+      DataLossError: If an index is corrupted.
+    """
+    if isinstance(paths, (str, bytes)):
+      paths = [paths]
+    paths = [compat.as_str_any(path) for path in paths]
+    if num_parallel_reads is None:
+      num_parallel_reads = min(32, len(paths))
+    self._executor = futures.ThreadPoolExecutor(
+        max_workers=max(1, num_parallel_reads))
+    self._files = list(self._executor.map(_IndexedRecordFile, paths))
+    self._first_record = [0]
+    for f in self._files:
+      self._first_record.append(self._first_record[-1] + len(f))
+
+  def __len__(self):
+    return self._first_record[-1]
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def _locate(self, record_id):
+    record_id = int(record_id)
+    if record_id < 0:
+      record_id += len(self)
+    if not 0 <= record_id < len(self):
+      raise IndexError("Record id {} out of range for {} records".format(
+          record_id, len(self)))
+    file_index = bisect.bisect_right(self._first_record, record_id) - 1
+    return file_index, record_id - self._first_record[file_index]
+
+  def read(self, record_id):
+    """Returns the serialized record with id `record_id`.
+
+    Raises:
+      IndexError: If `record_id` is out of range.
+      DataLossError: If the record is corrupted.
+    """
+    file_index, local_id = self._locate(record_id)
+    return self._files[file_index].read([local_id])[local_id]
+
+  def read_batch(self, record_ids):
+    """Returns a list with the serialized records for `record_ids`, in order.
+
+    Raises:
+      IndexError: If any of `record_ids` is out of range.
+      DataLossError: If any of the records is corrupted.
+    """
+    locations = [self._locate(record_id) for record_id in record_ids]
+    ids_by_file = collections.defaultdict(list)
+    for file_index, local_id in locations:
+      ids_by_file[file_index].append(local_id)
+    pending = {
+        file_index: self._executor.submit(self._files[file_index].read, ids)
+        for file_index, ids in ids_by_file.items()
+    }
+    records = {file_index: f.result() for file_index, f in pending.items()}
+    return [records[file_index][local_id]
+            for file_index, local_id in locations]
+
+  def close(self):
+    """Closes all files and stops the reader threads."""
+    for f in self._files:
+      f.close()
+    self._executor.shutdown(wait=True)
+
+
+_RECORD_LENGTH = struct.Struct("<Q")
+
+
+class TFRecordMmapIterator(object):
+  """Zero-copy iterator over the records of a local, uncompressed file.
+
+  The file is memory-mapped and records are returned as read-only `memoryview`
+  slices of the mapping instead of being copied into new `bytes` objects.
+  Records can be read one at a time by iterating, or many at once with
+  `read_batch(n)`. Checksums are only verified with `verify_checksums=True`,
+  in which case they are verified for a whole batch in a single call.
+
+  Usage example:
+  ```py
+  with TFRecordMmapIterator(file_path) as records:
+    while True:
+      batch = records.read_batch(1024)
+      if not batch:
+        break
+      ...
+  ```
+
+  The returned views keep the mapping alive; the file is unmapped once it has
+  been closed and all views have been released. Records appended to the file
+  after the iterator has been created are not visible to it.
+  """
+
+  def __init__(self, path, verify_checksums=False):
+    """Memory-maps the file at `path`.
+
+    Args:
+      path: The path to a local, uncompressed TFRecords file.
+      verify_checksums: (optional) Whether to verify the checksums of the
+        records as they are read.
+
+    Raises:
+      IOError: If `path` cannot be opened for reading.
+    """
+    with open(compat.path_to_str(path), "rb") as f:
+      if os.fstat(f.fileno()).st_size:
+        self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      else:
+        # Empty files cannot be mapped.
+        self._mmap = b""
+    self._view = memoryview(self._mmap)
+    self._offset = 0
+    self._verify_checksums = verify_checksums
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    records = self.read_batch(1)
+    if not records:
+      raise StopIteration
+    return records[0]
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def read_batch(self, n):
+    """Returns a list with up to `n` records, as `memoryview`s.
+
+    An empty list is returned once all records have been read. Like
+    `tf_record_iterator`, the records preceding a truncated or corrupted one
+    are returned first and the next call raises.
+
+    Raises:
+      DataLossError: If a record is truncated or its length is corrupted, or if
+        checksums are verified and a record is corrupted.
+    """
+    data = self._mmap
+    size = len(data)
+    offset = self._offset
+    offsets = []
+    records = []
+    while len(records) < n and offset < size:
+      end = size
+      if size - offset >= _RECORD_HEADER_SIZE:
+        length, = _RECORD_LENGTH.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER_SIZE
+        end = start + length
+      if end + _RECORD_FOOTER_SIZE > size:
+        if records:
+          break
+        # Reports a corrupted length or a truncated record.
+        _pywrap_record_io.verify_records(data, [offset])
+        raise errors.DataLossError(
+            None, None, "Truncated record at offset {}".format(offset))
+      offsets.append(offset)
+      records.append(self._view[start:end])
+      offset = end + _RECORD_FOOTER_SIZE
+    if self._verify_checksums and offsets:
+      _pywrap_record_io.verify_records(data, offsets)
+    self._offset = offset
+    return records
+
+  def close(self):
+    """Stops iteration and unmaps the file once no views are left."""
+    self._view.release()
+    self._view = memoryview(b"")
+    self._mmap = b""
+    self._offset = 0
+
+
 @tf_export(
     "io.TFRecordWriter", v1=["io.TFRecordWriter", "python_io.TFRecordWriter"])
 @deprecation.deprecated_endpoints("python_io.TFRecordWriter")
@@ -272,16 +691,24 @@ class TFRecordWriter(_pywrap_record_io.RecordWriter):
 
   This class implements `__enter__` and `__exit__`, and can be used
   in `with` blocks like a normal file. (See the usage example above.)
+
+  With `write_index=True` the writer also produces a sidecar index of record
+  offsets (at `path + ".idx"`) when it is closed, which allows reading
+  arbitrary records with `TFRecordIndexedReader` without scanning the file.
+  Compressed files are then written with periodic zlib full flushes, which
+  remain readable by all TFRecord readers.
   """
 
   # TODO(josh11b): Support appending?
-  def __init__(self, path, options=None):
+  def __init__(self, path, options=None, write_index=False):
     """Opens file `path` and creates a `TFRecordWriter` writing to it.
 
     Args:
       path: The path to the TFRecords file.
       options: (optional) String specifying compression type,
           `TFRecordCompressionType`, or `TFRecordOptions` object.
+      write_index: (optional) Whether to write a sidecar index of record
+          offsets when the writer is closed.
 
     Raises:
       IOError: If `path` cannot be opened for writing.
@@ -290,10 +717,24 @@ class TFRecordWriter(_pywrap_record_io.RecordWriter):
     if not isinstance(options, TFRecordOptions):
       options = TFRecordOptions(compression_type=options)
 
+    index = None
+    if write_index:
+      compression_type = options.get_compression_type_string(options)
+      if compression_type:
+        # Full flushes reset the deflate state, which makes every block start
+        # a valid point to restart inflation from.
+        options = copy.copy(options)
+        options.flush_mode = zlib.Z_FULL_FLUSH
+      index = _RecordIndexBuilder(compat.as_str_any(path), compression_type)
+
     # pylint: disable=protected-access
     super(TFRecordWriter, self).__init__(
         compat.as_bytes(path), options._as_record_writer_options())
     # pylint: enable=protected-access
+    self._index = index
+
+  def __exit__(self, *args):
+    self.close()
 
   # TODO(slebedev): The following wrapper methods are there to compensate
   # for lack of signatures in pybind11-generated classes. Switch to
@@ -307,12 +748,389 @@ class TFRecordWriter(_pywrap_record_io.RecordWriter):
       record: str
     """
     super(TFRecordWriter, self).write(record)
+    if self._index is not None:
+      self._index.add_record(len(compat.as_bytes(record)))
+      if self._index.needs_restart():
+        # Start a restart point without flushing the file itself.
+        self.flush_records()
+        self._index.start_block(self.tell())
 
   def flush(self):
     """Flush the file."""
     super(TFRecordWriter, self).flush()
+    if self._index is not None:
+      self._index.start_block(self.tell())
 
   def close(self):
     """Close the file."""
     super(TFRecordWriter, self).close()
+    if self._index is not None:
+      index, self._index = self._index, None
+      index.write()
   # pylint: enable=useless-super-delegation
+
+
+# Records are compressed in chunks of about this many (uncompressed) bytes. Each
+# chunk is compressed by its own task, so the chunks of a shard are compressed
+# concurrently.
+_SHARD_CHUNK_SIZE = 1024 * 1024
+
+# GZIP header without file name or modification time.
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+class _ShardStream(object):
+  """Compresses the chunks of records of a shard independently.
+
+  Each chunk is compressed to raw deflate data ending with a full flush, so the
+  chunks can be compressed in parallel and concatenated into a single ZLIB or
+  GZIP stream, which `header()` and `trailer()` complete. The checksum of the
+  stream is updated by `update()` as the chunks are written, in order.
+  """
+
+  def __init__(self, options):
+    self.compression_type = TFRecordOptions.get_compression_type_string(options)
+    self._options = options
+    self._checksum = 0
+    self._size = 0
+    if self.compression_type == "ZLIB":
+      self._checksum = zlib.adler32(b"")
+    elif self.compression_type == "GZIP":
+      self._checksum = zlib.crc32(b"")
+
+  def _window_bits(self):
+    # `window_bits` may include the GZIP offset of 16.
+    return (self._options.window_bits or zlib.MAX_WBITS) % 16 or zlib.MAX_WBITS
+
+  def _compressobj(self):
+    options = self._options
+    return zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION
+        if options.compression_level is None else options.compression_level,
+        zlib.DEFLATED, -self._window_bits(),
+        options.mem_level or zlib.DEF_MEM_LEVEL,
+        options.compression_strategy or zlib.Z_DEFAULT_STRATEGY)
+
+  def header(self):
+    if self.compression_type == "GZIP":
+      return _GZIP_HEADER
+    if self.compression_type == "ZLIB":
+      cmf = (self._window_bits() - 8) << 4 | zlib.DEFLATED
+      flg = (31 - (cmf << 8) % 31) % 31
+      return bytes([cmf, flg])
+    return b""
+
+  def compress(self, data):
+    """Compresses a chunk. Thread-safe."""
+    if not self.compression_type:
+      return data
+    compressor = self._compressobj()
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+  def update(self, data):
+    """Accounts for the uncompressed `data` of the next chunk written."""
+    if self.compression_type == "ZLIB":
+      self._checksum = zlib.adler32(data, self._checksum)
+    elif self.compression_type == "GZIP":
+      self._checksum = zlib.crc32(data, self._checksum)
+    self._size += len(data)
+
+  def trailer(self):
+    if not self.compression_type:
+      return b""
+    # An empty final deflate block ends the concatenated chunks.
+    final_block = self._compressobj().flush(zlib.Z_FINISH)
+    if self.compression_type == "ZLIB":
+      return final_block + struct.pack(">I", self._checksum & 0xFFFFFFFF)
+    return final_block + struct.pack("<II", self._checksum & 0xFFFFFFFF,
+                                     self._size & 0xFFFFFFFF)
+
+
+class _Shard(object):
+  """A shard written in the background by `ShardedTFRecordWriter`."""
+
+  def __init__(self, path, options):
+    self.path = path
+    self.stream = _ShardStream(options)
+    self.num_records = 0
+    self.num_bytes = 0
+    # Chunks being compressed, flush events and finally `None`, in write order.
+    self.items = queue.Queue()
+    self.future = None
+
+
+class ShardedTFRecordWriter(object):
+  """Writes records to a sequence of TFRecord shards in the background.
+
+  A new shard is started whenever the current one reaches `max_shard_records`
+  records or `max_shard_bytes` bytes. Shards are named
+  `"{path_prefix}-{index:05d}"`. `write()` only buffers records. They are
+  compressed in chunks of about 1MB, each independently on a pool of
+  `num_parallel_writes` threads, so a single shard is compressed by all of
+  them. The compressed chunks of each shard are then appended to its file in
+  order by a background writer. At most `max_pending_bytes` of records are
+  buffered, after which `write()` blocks until the background writers catch
+  up.
+
+  When closed, the writer emits a JSON manifest listing every shard with its
+  number of records:
+
+  ```json
+  {"num_records": 3000,
+   "shards": [{"path": "/data/train-00000", "num_records": 1000,
+               "num_bytes": 1048000}, ...]}
+  ```
+
+  Usage example:
+  ```py
+  with ShardedTFRecordWriter(
+      "/data/train", "GZIP", max_shard_bytes=256 * 1024 * 1024) as writer:
+    for example in examples:
+      writer.write(example.SerializeToString())
+  ```
+
+  Errors raised by the background writers are re-raised by the next call to
+  `write()`, `flush()` or `close()`.
+  """
+
+  def __init__(self,
+               path_prefix,
+               options=None,
+               max_shard_bytes=None,
+               max_shard_records=None,
+               num_parallel_writes=None,
+               max_pending_bytes=None,
+               manifest_path=None,
+               write_index=False):
+    """Creates a `ShardedTFRecordWriter`.
+
+    Args:
+      path_prefix: Prefix of the paths of the shards.
+      options: (optional) String specifying compression type,
+          `TFRecordCompressionType`, or `TFRecordOptions` object.
+      max_shard_bytes: (optional) Maximum number of uncompressed bytes per
+          shard. A shard always holds at least one record.
+      max_shard_records: (optional) Maximum number of records per shard.
+      num_parallel_writes: (optional) Number of chunks of records compressed
+          concurrently, and of shards written concurrently. Defaults to the
+          number of CPUs.
+      max_pending_bytes: (optional) Maximum number of bytes of records buffered
+          before `write()` blocks. Defaults to four chunks of records per
+          thread.
+      manifest_path: (optional) Path of the manifest. Defaults to
+          `path_prefix + ".manifest.json"`.
+      write_index: (optional) Whether to write a sidecar index for each shard,
+          see `TFRecordWriter`.
+
+    Raises:
+      ValueError: If valid compression_type can't be determined from `options`.
+    """
+    if not isinstance(options, TFRecordOptions):
+      options = TFRecordOptions(compression_type=options)
+    self._path_prefix = compat.as_str_any(path_prefix)
+    self._options = options
+    self._max_shard_bytes = max_shard_bytes
+    self._max_shard_records = max_shard_records
+    num_parallel_writes = num_parallel_writes or os.cpu_count()
+    self._max_pending_bytes = max_pending_bytes or (
+        4 * num_parallel_writes * _SHARD_CHUNK_SIZE)
+    self._manifest_path = manifest_path or (
+        self._path_prefix + ".manifest.json")
+    self._write_index = write_index
+    # Compresses chunks of records.
+    self._executor = futures.ThreadPoolExecutor(
+        max_workers=num_parallel_writes)
+    # Appends the compressed chunks of each shard to its file.
+    self._write_executor = futures.ThreadPoolExecutor(
+        max_workers=num_parallel_writes)
+    self._shards = []
+    self._shard = None
+    self._chunk = []
+    self._chunk_bytes = 0
+    self._pending_bytes = 0
+    self._pending_cv = threading.Condition()
+    self._error = None
+    self._closed = False
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def write(self, record):
+    """Buffers a string record to be written to the current shard.
+
+    Args:
+      record: str
+    """
+    self._check_open()
+    record = compat.as_bytes(record)
+    size = _RECORD_HEADER_SIZE + len(record) + _RECORD_FOOTER_SIZE
+    shard = self._shard
+    if shard is not None and shard.num_records and (
+        (self._max_shard_records and
+         shard.num_records >= self._max_shard_records) or
+        (self._max_shard_bytes and
+         shard.num_bytes + size > self._max_shard_bytes)):
+      self._finish_shard()
+    if self._shard is None:
+      self._start_shard()
+    self._chunk.append(record)
+    self._chunk_bytes += size
+    self._shard.num_records += 1
+    self._shard.num_bytes += size
+    if self._chunk_bytes >= _SHARD_CHUNK_SIZE:
+      self._submit_chunk()
+
+  def flush(self):
+    """Waits until all records written so far have been flushed to files."""
+    self._check_open()
+    if self._shard is not None:
+      self._submit_chunk()
+      flushed = threading.Event()
+      self._shard.items.put(flushed)
+      flushed.wait()
+    for shard in self._shards:
+      if shard is not self._shard:
+        shard.future.result()
+    self._raise_error()
+
+  def close(self):
+    """Writes all remaining records, closes the shards and the manifest."""
+    if self._closed:
+      return
+    self._closed = True
+    if self._shard is not None:
+      self._finish_shard()
+    for shard in self._shards:
+      shard.future.result()
+    self._executor.shutdown(wait=True)
+    self._write_executor.shutdown(wait=True)
+    self._raise_error()
+    manifest = {
+        "num_records": sum(shard.num_records for shard in self._shards),
+        "shards": [{"path": shard.path,
+                    "num_records": shard.num_records,
+                    "num_bytes": shard.num_bytes} for shard in self._shards],
+    }
+    file_io.atomic_write_string_to_file(
+        self._manifest_path, json.dumps(manifest, indent=2))
+
+  @property
+  def shard_paths(self):
+    """The paths of the shards started so far."""
+    return [shard.path for shard in self._shards]
+
+  def _check_open(self):
+    if self._closed:
+      raise errors.FailedPreconditionError(None, None, "Writer is closed.")
+    self._raise_error()
+
+  def _raise_error(self):
+    with self._pending_cv:
+      error = self._error
+    if error is not None:
+      raise error
+
+  def _set_error(self, error):
+    with self._pending_cv:
+      if self._error is None:
+        self._error = error
+
+  def _failed(self):
+    with self._pending_cv:
+      return self._error is not None
+
+  def _start_shard(self):
+    shard = _Shard("%s-%05d" % (self._path_prefix, len(self._shards)),
+                   self._options)
+    shard.future = self._write_executor.submit(self._write_shard, shard)
+    self._shards.append(shard)
+    self._shard = shard
+
+  def _finish_shard(self):
+    self._submit_chunk()
+    self._shard.items.put(None)
+    self._shard = None
+
+  def _submit_chunk(self):
+    if not self._chunk:
+      return
+    size = self._chunk_bytes
+    with self._pending_cv:
+      while (self._pending_bytes and
+             self._pending_bytes + size > self._max_pending_bytes):
+        self._pending_cv.wait()
+      self._pending_bytes += size
+    record_sizes = None
+    if self._write_index:
+      record_sizes = [len(record) for record in self._chunk]
+    future = self._executor.submit(
+        self._encode_chunk, self._shard.stream, self._chunk)
+    self._shard.items.put((future, record_sizes, size))
+    self._chunk = []
+    self._chunk_bytes = 0
+
+  @staticmethod
+  def _encode_chunk(stream, records):
+    """Returns the framed `records` and their compressed data."""
+    data = _pywrap_record_io.encode_records(records)
+    return data, stream.compress(data)
+
+  def _write_shard(self, shard):
+    """Writes the chunks of `shard` until it is finished. Runs on a worker."""
+    stream = shard.stream
+    f = None
+    index = None
+    offset = 0
+    try:
+      f = file_io.FileIO(shard.path, "wb")
+      header = stream.header()
+      f.write(header)
+      offset = len(header)
+      if self._write_index:
+        index = _RecordIndexBuilder(shard.path, stream.compression_type)
+    except Exception as e:  # pylint: disable=broad-except
+      self._set_error(e)
+    while True:
+      item = shard.items.get()
+      if item is None:
+        break
+      try:
+        if isinstance(item, threading.Event):
+          if not self._failed():
+            f.flush()
+        else:
+          future, record_sizes, _ = item
+          data, compressed = future.result()
+          if not self._failed():
+            if index is not None:
+              if stream.compression_type:
+                # Every chunk starts after a full flush, so inflation can
+                # restart there.
+                index.start_block(offset)
+              for size in record_sizes:
+                index.add_record(size)
+            f.write(compressed)
+            stream.update(data)
+            offset += len(compressed)
+      except Exception as e:  # pylint: disable=broad-except
+        self._set_error(e)
+      finally:
+        # Always drain the queue, so that a failure does not block callers.
+        if isinstance(item, threading.Event):
+          item.set()
+        else:
+          with self._pending_cv:
+            self._pending_bytes -= item[2]
+            self._pending_cv.notify_all()
+    if f is not None:
+      try:
+        if not self._failed():
+          f.write(stream.trailer())
+        f.close()
+        if index is not None and not self._failed():
+          index.write()
+      except Exception as e:  # pylint: disable=broad-except
+        self._set_error(e)
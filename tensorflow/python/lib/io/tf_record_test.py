@@ -15,6 +15,7 @@
 """Tests for tf_record.TFRecordWriter and tf_record.tf_record_iterator."""
 
 import gzip
+import json
 import os
 import random
 import string
@@ -569,6 +570,289 @@ class TFRecordRandomReaderTest(TFCompressionTestCase):
       reader.read(0)
 
 
+class TFRecordIndexedReaderTest(TFCompressionTestCase):
+
+  def setUp(self):
+    super(TFRecordIndexedReaderTest, self).setUp()
+    self._num_records = 300
+
+  def _LargeRecord(self, f, r):
+    # Large enough records for compressed files to span several blocks.
+    return self._Record(f, r) * 200
+
+  def _CreateIndexedFiles(self, compression_type):
+    filenames = []
+    records = []
+    options = tf_record.TFRecordOptions(compression_type)
+    for i in range(self._num_files):
+      fn = os.path.join(self.get_temp_dir(), "indexed.%d.tfrecord" % i)
+      with tf_record.TFRecordWriter(fn, options, write_index=True) as writer:
+        for j in range(self._num_records):
+          record = self._LargeRecord(i, j)
+          writer.write(record)
+          records.append(record)
+      filenames.append(fn)
+    return filenames, records
+
+  def _testReadRecords(self, compression_type):
+    filenames, records = self._CreateIndexedFiles(compression_type)
+    for fn in filenames:
+      self.assertTrue(os.path.exists(tf_record.tf_record_index_path(fn)))
+
+    with tf_record.TFRecordIndexedReader(filenames) as reader:
+      self.assertLen(reader, len(records))
+      for i in [0, 1, self._num_records - 1, self._num_records, -1]:
+        self.assertEqual(reader.read(i), records[i])
+
+      rng = random.Random(0)
+      record_ids = [rng.randrange(len(records)) for _ in range(100)]
+      self.assertEqual(
+          reader.read_batch(record_ids), [records[i] for i in record_ids])
+
+  def testReadRecords(self):
+    self._testReadRecords(TFRecordCompressionType.NONE)
+
+  def testReadZlibRecords(self):
+    self._testReadRecords(TFRecordCompressionType.ZLIB)
+
+  def testReadGzipRecords(self):
+    self._testReadRecords(TFRecordCompressionType.GZIP)
+
+  def testIndexedGzipFileIsReadableByIterator(self):
+    filenames, records = self._CreateIndexedFiles(TFRecordCompressionType.GZIP)
+    options = tf_record.TFRecordOptions(TFRecordCompressionType.GZIP)
+    actual = list(tf_record.tf_record_iterator(filenames[0], options))
+    self.assertEqual(actual, records[:self._num_records])
+
+  def testReadRecordsAfterFlush(self):
+    fn = os.path.join(self.get_temp_dir(), "flushed.tfrecord")
+    records = [self._Record(0, i) for i in range(10)]
+    with tf_record.TFRecordWriter(
+        fn, TFRecordCompressionType.ZLIB, write_index=True) as writer:
+      for i, record in enumerate(records):
+        writer.write(record)
+        if i % 3 == 0:
+          writer.flush()
+
+    with tf_record.TFRecordIndexedReader(fn) as reader:
+      self.assertEqual(reader.read_batch(range(10)[::-1]), records[::-1])
+
+  def testCorruptedCompressedRecord(self):
+    fn = os.path.join(self.get_temp_dir(), "corrupted.tfrecord")
+    records = [self._Record(0, i) for i in range(3)]
+    with tf_record.TFRecordWriter(
+        fn, TFRecordCompressionType.ZLIB, write_index=True) as writer:
+      for record in records:
+        writer.write(record)
+    with open(fn, "rb") as f:
+      data = bytearray(zlib.decompress(f.read()))
+    # Flip a byte of the data of the second record.
+    data[len(records[0]) + 16 + 12] ^= 0xFF
+    with open(fn, "wb") as f:
+      f.write(zlib.compress(bytes(data)))
+
+    with tf_record.TFRecordIndexedReader(fn) as reader:
+      self.assertEqual(reader.read(0), records[0])
+      with self.assertRaisesRegex(errors_impl.DataLossError,
+                                  r"corrupted record"):
+        reader.read(1)
+
+  def testReadOutOfRange(self):
+    filenames, records = self._CreateIndexedFiles(TFRecordCompressionType.NONE)
+    with tf_record.TFRecordIndexedReader(filenames) as reader:
+      with self.assertRaisesRegex(IndexError, r"out of range"):
+        reader.read(len(records))
+      with self.assertRaisesRegex(IndexError, r"out of range"):
+        reader.read_batch([0, -len(records) - 1])
+
+  def testMissingIndex(self):
+    records = [self._Record(0, i) for i in range(self._num_records)]
+    fn = self._WriteRecordsToFile(records, "unindexed_records")
+    with self.assertRaises(errors_impl.NotFoundError):
+      tf_record.TFRecordIndexedReader(fn)
+
+  def testCorruptedIndex(self):
+    filenames, _ = self._CreateIndexedFiles(TFRecordCompressionType.NONE)
+    with open(tf_record.tf_record_index_path(filenames[0]), "wb") as f:
+      f.write(b"not an index")
+    with self.assertRaisesRegex(errors_impl.DataLossError, r"TFRecord index"):
+      tf_record.TFRecordIndexedReader(filenames)
+
+
+class TFRecordMmapIteratorTest(TFCompressionTestCase):
+
+  def setUp(self):
+    super(TFRecordMmapIteratorTest, self).setUp()
+    self._records = [self._Record(0, i) for i in range(self._num_records)]
+    self._fn = self._WriteRecordsToFile(self._records, "mmap_records")
+
+  def testIterator(self):
+    with tf_record.TFRecordMmapIterator(self._fn) as records:
+      actual = list(records)
+    self.assertIsInstance(actual[0], memoryview)
+    self.assertEqual([bytes(r) for r in actual], self._records)
+
+  def testReadBatch(self):
+    with tf_record.TFRecordMmapIterator(
+        self._fn, verify_checksums=True) as records:
+      first = records.read_batch(3)
+      rest = records.read_batch(100)
+      self.assertEqual(records.read_batch(100), [])
+    self.assertEqual([bytes(r) for r in first], self._records[:3])
+    self.assertEqual([bytes(r) for r in rest], self._records[3:])
+
+  def testEmptyFile(self):
+    fn = self._WriteRecordsToFile([], "empty_records")
+    with tf_record.TFRecordMmapIterator(fn) as records:
+      self.assertEqual(list(records), [])
+
+  def testTruncatedFile(self):
+    with open(self._fn, "rb") as f:
+      content = f.read()
+    with open(self._fn, "wb") as f:
+      f.write(content[:-3])
+    with tf_record.TFRecordMmapIterator(
+        self._fn, verify_checksums=True) as records:
+      actual = [bytes(r) for r in records.read_batch(100)]
+      with self.assertRaisesRegex(errors_impl.DataLossError, r"runcated"):
+        next(records)
+    self.assertEqual(actual, self._records[:-1])
+
+  def testCorruptedLength(self):
+    with open(self._fn, "rb") as f:
+      content = bytearray(f.read())
+    # Corrupt the length of the second record.
+    content[len(self._records[0]) + 16 + 2] ^= 0xff
+    with open(self._fn, "wb") as f:
+      f.write(content)
+
+    with tf_record.TFRecordMmapIterator(self._fn) as records:
+      self.assertEqual(bytes(next(records)), self._records[0])
+      with self.assertRaisesRegex(errors_impl.DataLossError, r"corrupted"):
+        next(records)
+
+  def testCorruptedRecord(self):
+    with open(self._fn, "rb") as f:
+      content = bytearray(f.read())
+    # Corrupt the data of the first record.
+    content[13] ^= 0xff
+    with open(self._fn, "wb") as f:
+      f.write(content)
+
+    with tf_record.TFRecordMmapIterator(self._fn) as records:
+      self.assertLen(records.read_batch(100), self._num_records)
+    with tf_record.TFRecordMmapIterator(
+        self._fn, verify_checksums=True) as records:
+      with self.assertRaisesRegex(errors_impl.DataLossError, r"corrupted"):
+        records.read_batch(100)
+
+  def testViewsOutliveIterator(self):
+    records = tf_record.TFRecordMmapIterator(self._fn)
+    first = next(records)
+    records.close()
+    self.assertEqual(bytes(first), self._records[0])
+    self.assertEqual(list(records), [])
+
+
+class ShardedTFRecordWriterTest(TFCompressionTestCase):
+
+  def setUp(self):
+    super(ShardedTFRecordWriterTest, self).setUp()
+    self._num_records = 100
+    self._records = [self._Record(0, i) for i in range(self._num_records)]
+    self._prefix = os.path.join(self.get_temp_dir(), "sharded")
+
+  def _ReadShards(self, paths, options=None):
+    return [list(tf_record.tf_record_iterator(path, options))
+            for path in paths]
+
+  def testRollByRecordCount(self):
+    with tf_record.ShardedTFRecordWriter(
+        self._prefix, max_shard_records=30) as writer:
+      for record in self._records:
+        writer.write(record)
+    self.assertEqual(
+        writer.shard_paths,
+        ["%s-%05d" % (self._prefix, i) for i in range(4)])
+    shards = self._ReadShards(writer.shard_paths)
+    self.assertEqual([len(shard) for shard in shards], [30, 30, 30, 10])
+    self.assertEqual(sum(shards, []), self._records)
+
+  def testRollByBytes(self):
+    record_bytes = len(self._records[0]) + 16
+    with tf_record.ShardedTFRecordWriter(
+        self._prefix, max_shard_bytes=10 * record_bytes) as writer:
+      for record in self._records:
+        writer.write(record)
+    shards = self._ReadShards(writer.shard_paths)
+    self.assertLen(shards, 10)
+    self.assertEqual(sum(shards, []), self._records)
+
+  def testGzipShards(self):
+    options = tf_record.TFRecordOptions(TFRecordCompressionType.GZIP)
+    with tf_record.ShardedTFRecordWriter(
+        self._prefix, options, max_shard_records=10, num_parallel_writes=4,
+        max_pending_bytes=100) as writer:
+      for record in self._records:
+        writer.write(record)
+    shards = self._ReadShards(writer.shard_paths, options)
+    self.assertEqual(sum(shards, []), self._records)
+
+  def testCompressedShardsWithIndex(self):
+    # Large enough records for each shard to be compressed in several chunks.
+    records = [self._Record(0, i) * 2000 for i in range(self._num_records)]
+    for compression_type in [TFRecordCompressionType.ZLIB,
+                             TFRecordCompressionType.GZIP]:
+      options = tf_record.TFRecordOptions(compression_type)
+      prefix = self._prefix + str(compression_type)
+      with tf_record.ShardedTFRecordWriter(
+          prefix, options, max_shard_records=60, num_parallel_writes=4,
+          write_index=True) as writer:
+        for record in records:
+          writer.write(record)
+      shards = self._ReadShards(writer.shard_paths, options)
+      self.assertEqual([len(shard) for shard in shards], [60, 40])
+      self.assertEqual(sum(shards, []), records)
+      with tf_record.TFRecordIndexedReader(writer.shard_paths) as reader:
+        self.assertEqual(reader.read_batch(range(99, -1, -7)),
+                         records[99::-7])
+
+  def testManifest(self):
+    with tf_record.ShardedTFRecordWriter(
+        self._prefix, max_shard_records=40) as writer:
+      for record in self._records:
+        writer.write(record)
+    with open(self._prefix + ".manifest.json") as f:
+      manifest = json.load(f)
+    self.assertEqual(manifest["num_records"], self._num_records)
+    self.assertEqual([shard["path"] for shard in manifest["shards"]],
+                     writer.shard_paths)
+    self.assertEqual([shard["num_records"] for shard in manifest["shards"]],
+                     [40, 40, 20])
+
+  def testFlush(self):
+    writer = tf_record.ShardedTFRecordWriter(self._prefix)
+    for record in self._records:
+      writer.write(record)
+    writer.flush()
+    self.assertEqual(self._ReadShards(writer.shard_paths), [self._records])
+    writer.close()
+
+  def testWriteAfterCloseIsError(self):
+    writer = tf_record.ShardedTFRecordWriter(self._prefix)
+    writer.close()
+    writer.close()
+    with self.assertRaises(errors_impl.FailedPreconditionError):
+      writer.write(self._records[0])
+
+  def testWriteErrorIsRaisedOnClose(self):
+    prefix = os.path.join(self.get_temp_dir(), "missing_dir", "sharded")
+    writer = tf_record.ShardedTFRecordWriter(prefix)
+    writer.write(self._records[0])
+    with self.assertRaises(errors_impl.NotFoundError):
+      writer.close()
+
+
 class TFRecordWriterCloseAndFlushTests(test.TestCase):
   """TFRecordWriter close and flush tests"""
 
@@ -17,6 +17,7 @@
 # pylint: disable=g-bad-name
 import contextlib
 import functools
+import threading
 import weakref
 
 import numpy as np
@@ -71,6 +72,11 @@ acd.register_read_only_resource_op("_ReadVariablesOp")
 # TODO(allenl): Remove this alias and migrate callers.
 get_resource_handle_data = handle_data_util.get_resource_handle_data
 
+# Serializes deferred restores, see `BaseResourceVariable._defer_restore`.
+_deferred_restore_lock = threading.RLock()
+# Marks a deferred restore which is running.
+_DEFERRED_RESTORE_RUNNING = object()
+
 
 def get_eager_safe_handle_data(handle):
   """Get the data handle from the Tensor `handle`."""
@@ -373,6 +379,13 @@ def default_variable_creator_v2(next_creator=None, **kwargs):
 class BaseResourceVariable(variables.Variable, core.Tensor):
   """A python variable from an existing handle."""
 
+  # A callable restoring the variable's value from a checkpoint, run the first
+  # time the handle is used. See `_defer_restore`.
+  _deferred_restore = None
+  # Whether the handle was used while building a function, which may have
+  # captured it. See `_defer_restore`.
+  _handle_used_in_function = False
+
   # TODO(wangpeng): Deprecate `constraint` when callers no long pass it in.
   def __init__(  # pylint: disable=super-init-not-called
       self,
@@ -503,7 +516,7 @@ class BaseResourceVariable(variables.Variable, core.Tensor):
           self.name, self.get_shape(), self.dtype.name)
 
   def __tf_tracing_type__(self, signature_context):
-    alias_id = signature_context.alias_global_id(self._handle._id)  # pylint:disable=protected-access
+    alias_id = signature_context.alias_global_id(self.handle._id)  # pylint:disable=protected-access
     # TODO(xjun): Create variable placeholders directly from VariableSpec
     # without using original values.
     signature_context.add_placeholder(alias_id, self)
@@ -619,8 +632,59 @@ class BaseResourceVariable(variables.Variable, core.Tensor):
   @property
   def handle(self):
     """The handle by which this variable can be accessed."""
+    if self._deferred_restore is not None or not context.executing_eagerly():
+      self._prepare_handle_use()
     return self._handle
 
+  def _prepare_handle_use(self):
+    """Runs the deferred restore, and records uses while building functions."""
+    if not context.executing_eagerly():
+      self._handle_used_in_function = True
+    if self._deferred_restore is not None:
+      self._run_deferred_restore()
+
+  def _defer_restore(self, restore_fn):
+    """Runs `restore_fn` the first time this variable's handle is used.
+
+    Used to restore large variables from a checkpoint lazily: reads, writes,
+    saving, and tracing or calling a `tf.function` with the variable all go
+    through the handle, so they observe the restored value. Functions which
+    captured the handle earlier would use it directly instead, so the restore
+    is not deferred once the handle has been used while building a function.
+    Replaces any deferred restore which has not run yet.
+
+    Args:
+      restore_fn: A callable taking no arguments, which assigns the restored
+        value to this variable. Run under `init_scope`.
+
+    Returns:
+      Whether the restore was deferred. If not, the caller must restore the
+      variable right away.
+    """
+    if self._handle_used_in_function:
+      return False
+    with _deferred_restore_lock:
+      self._deferred_restore = restore_fn
+    return True
+
+  def _run_deferred_restore(self):
+    """Runs the deferred restore, if it has not run yet."""
+    with _deferred_restore_lock:
+      restore_fn = self._deferred_restore
+      # The restore itself uses the handle; it must not run again.
+      if restore_fn is None or restore_fn is _DEFERRED_RESTORE_RUNNING:
+        return
+      self._deferred_restore = _DEFERRED_RESTORE_RUNNING
+      restored = False
+      try:
+        with ops.init_scope():
+          restore_fn()
+        restored = True
+      finally:
+        # After a failure, retry (and fail again) on the next use rather than
+        # silently keeping the value from before the restore.
+        self._deferred_restore = None if restored else restore_fn
+
   def value(self):
     """A cached operation which reads the value of this variable."""
     if self._cached_value is not None:
@@ -1011,7 +1075,8 @@ class BaseResourceVariable(variables.Variable, core.Tensor):
         shape=self._shape,
         in_graph_mode=self._in_graph_mode,
         parent_op=op,
-        unique_id=self._unique_id)
+        unique_id=self._unique_id,
+        variable=self)
 
   def assign(self, value, use_locking=None, name=None, read_value=True):
     """Assigns a new value to this variable.
@@ -2343,7 +2408,10 @@ class _UnreadVariable(BaseResourceVariable):
   Pretends to be the tensor if anyone looks.
   """
 
-  def __init__(self, handle, dtype, shape, in_graph_mode, parent_op, unique_id):
+  def __init__(self, handle, dtype, shape, in_graph_mode, parent_op, unique_id,
+               variable=None):
+    # The variable which was assigned, sharing `handle`.
+    self._variable = variable
     if isinstance(handle, ops.EagerTensor):
       handle_name = ""
     else:
@@ -2374,6 +2442,13 @@ class _UnreadVariable(BaseResourceVariable):
     else:
       return "UnreadVariable"
 
+  @property
+  def handle(self):
+    if self._variable is not None:
+      # Runs the deferred restore of the assigned variable, if any.
+      return self._variable.handle
+    return super(_UnreadVariable, self).handle
+
   def value(self):
     return self._read_variable_op()
 
@@ -2382,9 +2457,9 @@ class _UnreadVariable(BaseResourceVariable):
 
   def _read_variable_op(self):
     with ops.control_dependencies([self._parent_op]):
-      result = gen_resource_variable_ops.read_variable_op(
-          self._handle, self._dtype)
-      _maybe_set_handle_data(self._dtype, self._handle, result)
+      handle = self.handle
+      result = gen_resource_variable_ops.read_variable_op(handle, self._dtype)
+      _maybe_set_handle_data(self._dtype, handle, result)
       return result
 
   def assign_sub(self, delta, use_locking=None, name=None, read_value=True):
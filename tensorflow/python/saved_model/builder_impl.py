@@ -795,7 +795,7 @@ def _add_asset_to_metagraph(meta_graph_def, asset_filename, asset_tensor):
 
 
 def copy_assets_to_destination_dir(asset_filename_map, destination_dir,
-                                   saved_files=None):
+                                   saved_files=None, executor=None):
   """Copy all assets from source path to destination path.
 
   Args:
@@ -804,6 +804,8 @@ def copy_assets_to_destination_dir(asset_filename_map, destination_dir,
     destination_dir: the destination directory that assets are stored in.
     saved_files: a set of destination filepaths that have already been copied
       and will be skipped
+    executor: an optional `concurrent.futures.Executor`. If set, assets are
+      copied on it, and this function returns once all copies have finished.
   """
   if saved_files is None:
     saved_files = set()
@@ -812,6 +814,7 @@ def copy_assets_to_destination_dir(asset_filename_map, destination_dir,
       destination_dir)
 
   # Copy each asset from source path to destination path.
+  copies = []
   for asset_basename, asset_source_filepath in asset_filename_map.items():
     asset_destination_filepath = file_io.join(
         compat.as_bytes(assets_destination_dir),
@@ -822,9 +825,16 @@ def copy_assets_to_destination_dir(asset_filename_map, destination_dir,
     if (file_io.file_exists(asset_source_filepath) and
         asset_source_filepath != asset_destination_filepath and
         asset_destination_filepath not in saved_files):
-      file_io.copy(
-          asset_source_filepath, asset_destination_filepath, overwrite=True)
+      if executor is None:
+        file_io.copy(
+            asset_source_filepath, asset_destination_filepath, overwrite=True)
+      else:
+        copies.append(executor.submit(
+            file_io.copy, asset_source_filepath, asset_destination_filepath,
+            overwrite=True))
       saved_files.add(asset_destination_filepath)
+  for copy in copies:
+    copy.result()
 
   tf_logging.info("Assets written to: %s",
                   compat.as_text(assets_destination_dir))
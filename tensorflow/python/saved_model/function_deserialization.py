@@ -17,6 +17,7 @@
 import collections
 import pprint
 import re
+import threading
 
 from absl import logging
 
@@ -215,12 +216,18 @@ def setup_bare_concrete_function(saved_bare_concrete_function,
       saved_bare_concrete_function.argument_keywords)
   concrete_function._num_positional_args = (
       saved_bare_concrete_function.allowed_positional_arguments)
+  # pylint: enable=protected-access
+  function_spec = None
   if saved_bare_concrete_function.HasField("function_spec"):
     function_spec = _deserialize_function_spec_as_nonmethod(
         saved_bare_concrete_function.function_spec)
-    set_preinitialized_function_spec(concrete_function, function_spec)
-  # pylint: enable=protected-access
-  concrete_function.add_to_graph()
+
+  def setup(concrete_function):
+    if function_spec is not None:
+      set_preinitialized_function_spec(concrete_function, function_spec)
+    concrete_function.add_to_graph()
+
+  run_when_loaded(concrete_function, setup)
   return concrete_function
 
 
@@ -344,7 +351,8 @@ def recreate_function(saved_function, concrete_functions):
     concrete_function_objects.append(concrete_functions[concrete_function_name])
 
   for cf in concrete_function_objects:
-    set_preinitialized_function_spec(cf, function_spec)
+    run_when_loaded(
+        cf, lambda cf: set_preinitialized_function_spec(cf, function_spec))
 
   restored_function = RestoredFunction(restored_function_body,
                                        restored_function_body.__name__,
@@ -356,10 +364,144 @@ def recreate_function(saved_function, concrete_functions):
       decorator_argspec=function_spec.fullargspec)
 
 
+class _LazyConcreteFunction(function_lib.ConcreteFunction):
+  """A `ConcreteFunction` of a `LazyFunctionLibrary` not deserialized yet.
+
+  Looking up any attribute which is not set deserializes the function, and this
+  instance then takes over the attributes and class of the deserialized
+  `ConcreteFunction`. Attributes set before then take precedence.
+  """
+
+  def __init__(self, library, name):  # pylint: disable=super-init-not-called
+    self._lazy_library = library
+    self._lazy_name = name
+
+  def __getattr__(self, name):
+    # Trackable state is initialized on first use, and special methods are
+    # probed by Python itself; neither requires the function.
+    if name.startswith("_self_") or (
+        name.startswith("__") and name.endswith("__")):
+      raise AttributeError(name)
+    vars(self)["_lazy_library"].load(vars(self)["_lazy_name"])
+    return getattr(self, name)
+
+
+class LazyFunctionLibrary(collections.abc.Mapping):
+  """Maps function names to `ConcreteFunction`s deserialized on first use.
+
+  Returned by `load_function_def_library(..., lazy=True)`. The values are
+  placeholders which deserialize the function, and the functions it calls,
+  the first time one of their attributes is used.
+  """
+
+  def __init__(self, library, function_deps, load_function_def):
+    """Creates a library.
+
+    Args:
+      library: FunctionDefLibrary proto message.
+      function_deps: Map from function name to the names of the functions it
+        depends on.
+      load_function_def: Deserializes a FunctionDef and returns the
+        `ConcreteFunction`, once the functions it depends on are loaded.
+    """
+    self._fdefs = {fdef.signature.name: fdef for fdef in library.function}
+    self._function_deps = function_deps
+    self._load_function_def = load_function_def
+    self._functions = {
+        name: _LazyConcreteFunction(self, name) for name in self._fdefs}
+    self._setup_functions = collections.defaultdict(list)
+    self._loaded = set()
+    self._loading = set()
+    self._lock = threading.RLock()
+
+  def __getitem__(self, name):
+    return self._functions[name]
+
+  def __iter__(self):
+    return iter(self._functions)
+
+  def __len__(self):
+    return len(self._functions)
+
+  def is_loaded(self, name):
+    """Returns whether the function `name` has been deserialized."""
+    with self._lock:
+      return name in self._loaded
+
+  def run_when_loaded(self, name, setup_function):
+    """Calls `setup_function` with the function `name` once deserialized."""
+    with self._lock:
+      if name not in self._loaded:
+        self._setup_functions[name].append(setup_function)
+        return
+    setup_function(self._functions[name])
+
+  def load(self, name):
+    """Deserializes the function `name` and its dependencies, if needed."""
+    with self._lock:
+      if name in self._loaded:
+        return
+      if name in self._loading:
+        raise ValueError("There is a cyclic dependency between functions. "
+                         f"Could not resolve {sorted(self._loading)}.")
+      self._loading.add(name)
+      try:
+        for dep in sorted(self._function_deps[name]):
+          self.load(dep)
+        with ops.init_scope():
+          loaded = self._load_function_def(self._fdefs[name])
+          function = self._functions[name]
+          # Other threads may look up attributes meanwhile, so all attributes
+          # are set before the class is switched and the lazy state dropped.
+          for key, value in vars(loaded).items():
+            vars(function).setdefault(key, value)
+          function.__class__ = type(loaded)
+          del function._lazy_library, function._lazy_name  # pylint: disable=protected-access
+          self._loaded.add(name)
+          logging.vlog(1, "Deserialized function %s on first use.", name)
+          for setup_function in self._setup_functions.pop(name, []):
+            setup_function(function)
+      finally:
+        self._loading.discard(name)
+
+
+def _lazy_function_source(concrete_function):
+  """Returns the `LazyFunctionLibrary` and name of a function, or None."""
+  attributes = vars(concrete_function)
+  if "_lazy_library" not in attributes:
+    return None
+  return attributes["_lazy_library"], attributes["_lazy_name"]
+
+
+def is_loaded(concrete_function):
+  """Returns False for functions of a `LazyFunctionLibrary` not used yet."""
+  source = _lazy_function_source(concrete_function)
+  return source is None or source[0].is_loaded(source[1])
+
+
+def run_when_loaded(concrete_function, setup_function):
+  """Calls `setup_function(concrete_function)` once it is deserialized.
+
+  Functions of a `LazyFunctionLibrary` are set up the first time they are
+  used; others right away.
+
+  Args:
+    concrete_function: A `ConcreteFunction`.
+    setup_function: A function taking `concrete_function`.
+  """
+  source = _lazy_function_source(concrete_function)
+  if source is None:
+    setup_function(concrete_function)
+  else:
+    library, name = source
+    library.run_when_loaded(name, setup_function)
+
+
 def load_function_def_library(library,
                               saved_object_graph=None,
                               load_shared_name_suffix=None,
-                              wrapper_function=None):
+                              wrapper_function=None,
+                              lazy=False):
   """Load a set of functions as concrete functions without captured inputs.
 
   Functions names are manipulated during load such that they do not overlap
@@ -375,10 +517,13 @@ def load_function_def_library(library,
     load_shared_name_suffix: If specified, used to uniquify shared names.
       Otherwise, a unique name is generated.
     wrapper_function: An object that will be wrapped on newly created functions.
+    lazy: If True, functions are deserialized the first time they are used
+      rather than by this call. Requires eager execution.
 
   Returns:
     Map of original function names in the library to instances of
-    `ConcreteFunction` without captured inputs.
+    `ConcreteFunction` without captured inputs. If `lazy`, a
+    `LazyFunctionLibrary`.
 
   Raises:
     ValueError: if functions dependencies have a cycle.
@@ -422,7 +567,9 @@ def load_function_def_library(library,
         fdef, library_function_names, library_gradient_names)
 
   loaded_gradients = {}
-  for fdef in _sort_function_defs(library, function_deps):
+
+  def load_function_def(fdef):
+    """Deserializes `fdef`. The functions it depends on must be loaded."""
     orig_name = _fix_fdef_in_place(fdef, functions, load_shared_name_suffix,
                                    new_gradient_op_types)
 
@@ -497,7 +644,12 @@ def load_function_def_library(library,
       gradient_op_type = gradients_to_register[orig_name]
       loaded_gradients[compat.as_bytes(gradient_op_type)] = func
       ops.RegisterGradient(gradient_op_type)(_gen_gradient_func(func))
+    return func
 
+  if lazy:
+    return LazyFunctionLibrary(library, function_deps, load_function_def)
+  for fdef in _sort_function_defs(library, function_deps):
+    load_function_def(fdef)
   return functions
 
 
@@ -157,11 +157,17 @@ class Loader(object):
         node.name: node.attr for node in meta_graph.graph_def.node}
     self._proto = object_graph_proto
     self._export_dir = export_dir
+    # Functions are only deserialized on first use with `experimental_lazy_load`
+    # when executing eagerly, since they are added to the graph they are used
+    # in otherwise.
+    self._lazy_load = (save_options.experimental_lazy_load and
+                       ops.executing_eagerly_outside_functions())
     self._concrete_functions = (
         function_deserialization.load_function_def_library(
             library=meta_graph.graph_def.library,
             saved_object_graph=self._proto,
-            wrapper_function=_WrapperFunction))
+            wrapper_function=_WrapperFunction,
+            lazy=self._lazy_load))
     # Store a set of all concrete functions that have been set up with
     # captures.
     self._restored_concrete_functions = set()
@@ -400,7 +406,10 @@ class Loader(object):
     concrete_function = self._concrete_functions[concrete_function_name]
     proto = self._proto.concrete_functions[concrete_function_name]
     inputs = [nodes[node_id] for node_id in proto.bound_inputs]
-    restore_captures.restore_captures(concrete_function, inputs)
+    # Lazily loaded functions capture their inputs when first used.
+    function_deserialization.run_when_loaded(
+        concrete_function,
+        functools.partial(restore_captures.restore_captures, inputs=inputs))
 
   def _initialize_loaded_nodes(self):
     nodes = {}
@@ -607,7 +616,12 @@ class Loader(object):
       node, func = key.split("@")
       new_func = ""
       if func in self._concrete_functions:
-        new_func = self._concrete_functions[func].function_def.signature.name
+        concrete_function = self._concrete_functions[func]
+        if function_deserialization.is_loaded(concrete_function):
+          new_func = concrete_function.function_def.signature.name
+        else:
+          # Functions not used yet keep the name they were saved with.
+          new_func = func
       output_debug_info.traces[node + "@" + new_func].CopyFrom(
           debug_info.traces[key])
     return output_debug_info
@@ -1036,7 +1050,9 @@ def load_partial(export_dir, filters, tags=None, options=None):
     object_graph_proto = meta_graph_def.object_graph_def
 
     ckpt_options = checkpoint_options.CheckpointOptions(
-        experimental_io_device=options.experimental_io_device)
+        experimental_io_device=options.experimental_io_device,
+        experimental_lazy_restore_min_bytes=(
+            0 if options.experimental_lazy_load else None))
     with ops.init_scope():
       try:
         loader = Loader(object_graph_proto, saved_model_proto, export_dir,
@@ -29,14 +29,15 @@ class LoadOptions(object):
   # Define object attributes in __slots__ for improved memory and performance.
   __slots__ = ("allow_partial_checkpoint", "experimental_io_device",
                "experimental_skip_checkpoint", "experimental_variable_policy",
-               "experimental_load_function_aliases")
+               "experimental_load_function_aliases", "experimental_lazy_load")
 
   def __init__(self,
                allow_partial_checkpoint=False,
                experimental_io_device=None,
                experimental_skip_checkpoint=False,
                experimental_variable_policy=None,
-               experimental_load_function_aliases=False):
+               experimental_load_function_aliases=False,
+               experimental_lazy_load=False):
     """Creates an object that stores options for SavedModel loading.
 
     *When to set `allow_partial_checkpoint=True`?*
@@ -108,6 +109,12 @@ class LoadOptions(object):
       experimental_load_function_aliases: bool. Defaults to `False`. If set to
         `True`, a `function_aliases` attribute will be added to the loaded
         SavedModel object.
+      experimental_lazy_load: bool. Defaults to `False`. If set to `True`, each
+        function is deserialized the first time it is called rather than by
+        `load`, and resource variables are restored the first time they are
+        used, so that loading is fast and only the functions and variables
+        which are used are paid for. The SavedModel must not be deleted while
+        the loaded object is in use. Only applies when executing eagerly.
 
     Example:
 
@@ -123,3 +130,4 @@ class LoadOptions(object):
     self.experimental_variable_policy = (
         save_options.VariablePolicy.from_obj(experimental_variable_policy))
     self.experimental_load_function_aliases = experimental_load_function_aliases
+    self.experimental_lazy_load = experimental_lazy_load
@@ -66,6 +66,7 @@ from tensorflow.python.ops import variables
 from tensorflow.python.ops import while_loop
 from tensorflow.python.ops.ragged import ragged_factory_ops
 from tensorflow.python.ops.ragged import ragged_tensor
+from tensorflow.python.saved_model import function_deserialization
 from tensorflow.python.saved_model import load
 from tensorflow.python.saved_model import load_options
 from tensorflow.python.saved_model import loader_impl
@@ -3347,6 +3348,43 @@ class SingleCycleTests(test.TestCase, parameterized.TestCase):
         loaded.function_aliases["my_func"][1], types_core.ConcreteFunction
     )
 
+  def test_lazy_load(self, use_cpp_bindings):
+    if use_cpp_bindings:
+      self.skipTest("Not implemented for cpp.")
+
+    root = autotrackable.AutoTrackable()
+    root.v = variables.Variable(3.)
+    root.f = def_function.function(
+        lambda x: root.v * x,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.float32)])
+    root.g = def_function.function(
+        lambda x: root.v + x,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.float32)])
+    save_dir = os.path.join(self.get_temp_dir(), "saved_model")
+    save.save(root, save_dir, root.f)
+    loaded = test_load(
+        save_dir,
+        use_cpp_bindings=use_cpp_bindings,
+        options=load_options.LoadOptions(experimental_lazy_load=True),
+    )
+
+    [f_function] = loaded.f.concrete_functions
+    [g_function] = loaded.g.concrete_functions
+    self.assertFalse(function_deserialization.is_loaded(f_function))
+    self.assertFalse(function_deserialization.is_loaded(g_function))
+
+    self.assertEqual(6., loaded.f(2.).numpy())
+    self.assertTrue(function_deserialization.is_loaded(f_function))
+    self.assertFalse(function_deserialization.is_loaded(g_function))
+    self.assertIsInstance(f_function, types_core.ConcreteFunction)
+
+    self.assertEqual(5., loaded.g(2.).numpy())
+    self.assertEqual(
+        6.,
+        loaded.signatures["serving_default"](
+            x=constant_op.constant(2.))["output_0"].numpy())
+    self.assertEqual(3., loaded.v.numpy())
+
   def test_function_aliases_name_collision(self, use_cpp_bindings):
     if use_cpp_bindings:
       self.skipTest("Not implemented for cpp.")
@@ -15,6 +15,7 @@
 """Exports a SavedModel from a Trackable Python object."""
 
 import collections
+import concurrent.futures
 import os
 import re
 import sys
@@ -36,6 +37,7 @@ from tensorflow.python.checkpoint import functional_saver
 from tensorflow.python.checkpoint import graph_view
 from tensorflow.python.checkpoint import save_util_v1
 from tensorflow.python.checkpoint import util as checkpoint_util
+from tensorflow.python.distribute import distribute_lib
 from tensorflow.python.eager import context
 from tensorflow.python.eager import def_function
 from tensorflow.python.eager import function as defun
@@ -1463,22 +1465,42 @@ def save_and_return_nodes(
   saved_model = saved_model_pb2.SavedModel()
   meta_graph_def = saved_model.meta_graphs.add()
 
-  _, exported_graph, object_saver, asset_info, saved_nodes, node_paths = (
-      _build_meta_graph(obj, signatures, options, meta_graph_def))
-  saved_model.saved_model_schema_version = (
-      constants.SAVED_MODEL_SCHEMA_VERSION)
-
-  # Write the checkpoint, copy assets into the assets directory, and write out
-  # the SavedModel proto itself.
-  if not experimental_skip_checkpoint:
-    path_helpers.get_or_create_variables_dir(export_dir)
-    ckpt_options = checkpoint_options.CheckpointOptions(
-        experimental_io_device=options.experimental_io_device,
-        experimental_sharding_callback=options.experimental_sharding_callback)
-    object_saver.save(
-        path_helpers.get_variables_path(export_dir), options=ckpt_options)
-  builder_impl.copy_assets_to_destination_dir(asset_info.asset_filename_map,
-                                              export_dir)
+  export_executor = None
+  if (options.experimental_export_threads and context.executing_eagerly() and
+      not distribute_lib.has_strategy()):
+    export_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=options.experimental_export_threads,
+        thread_name_prefix="saved_model_export")
+  checkpoint_futures = []
+
+  def write_checkpoint_in_background(object_saver):
+    # Variable values are written by kernels which release the GIL, so this
+    # overlaps with serializing the functions on this thread.
+    checkpoint_futures.append(export_executor.submit(
+        _write_checkpoint, object_saver, export_dir, options))
+
+  try:
+    _, exported_graph, object_saver, asset_info, saved_nodes, node_paths = (
+        _build_meta_graph(
+            obj, signatures, options, meta_graph_def,
+            object_saver_callback=(
+                write_checkpoint_in_background
+                if export_executor and not experimental_skip_checkpoint
+                else None)))
+    saved_model.saved_model_schema_version = (
+        constants.SAVED_MODEL_SCHEMA_VERSION)
+
+    # Write the checkpoint, copy assets into the assets directory, and write
+    # out the SavedModel proto itself.
+    if not experimental_skip_checkpoint and not checkpoint_futures:
+      _write_checkpoint(object_saver, export_dir, options)
+    builder_impl.copy_assets_to_destination_dir(
+        asset_info.asset_filename_map, export_dir, executor=export_executor)
+    for future in checkpoint_futures:
+      future.result()
+  finally:
+    if export_executor is not None:
+      export_executor.shutdown(wait=True)
   # Note that this needs to be the last file operation when saving the
   # SavedModel. Users rely on checking saved_model_dir/saved_model.pb as an
   # indication that the SavedModel is completely written.
@@ -1523,6 +1545,16 @@ def save_and_return_nodes(
   return saved_nodes, node_paths
 
 
+def _write_checkpoint(object_saver, export_dir, options):
+  """Writes the variables of a SavedModel to its variables directory."""
+  path_helpers.get_or_create_variables_dir(export_dir)
+  ckpt_options = checkpoint_options.CheckpointOptions(
+      experimental_io_device=options.experimental_io_device,
+      experimental_sharding_callback=options.experimental_sharding_callback)
+  object_saver.save(
+      path_helpers.get_variables_path(export_dir), options=ckpt_options)
+
+
 def export_meta_graph(
     obj,
     filename: str,
@@ -1570,7 +1602,11 @@ def export_meta_graph(
 
 
 def _build_meta_graph_impl(
-    obj, signatures, options: save_options.SaveOptions, meta_graph_def=None
+    obj,
+    signatures,
+    options: save_options.SaveOptions,
+    meta_graph_def=None,
+    object_saver_callback=None,
 ):
   """Creates a MetaGraph containing the resources and functions of an object."""
   if ops.inside_function():
@@ -1603,6 +1639,8 @@ def _build_meta_graph_impl(
   # Use _SaveableView to provide a frozen listing of properties and functions.
   saveable_view = _SaveableView(augmented_graph_view, options)
   object_saver = checkpoint.TrackableSaver(augmented_graph_view)
+  if object_saver_callback is not None:
+    object_saver_callback(object_saver)
   asset_info, exported_graph = _fill_meta_graph_def(
       meta_graph_def=meta_graph_def,
       saveable_view=saveable_view,
@@ -1651,6 +1689,7 @@ def _build_meta_graph(
     signatures,
     options: save_options.SaveOptions,
     meta_graph_def: meta_graph_pb2.MetaGraphDef = None,
+    object_saver_callback=None,
 ):
   """Creates a MetaGraph under a save context.
 
@@ -1664,6 +1703,8 @@ def _build_meta_graph(
     options: `tf.saved_model.SaveOptions` object that specifies options for
       saving.
     meta_graph_def: Optional, the MetaGraphDef proto fill.
+    object_saver_callback: Optional, called with the `TrackableSaver` of `obj`
+      once the object graph is frozen, before the functions are serialized.
 
   Raises:
     AssertionError: If `export_meta_graph` is executing inside a `tf.function`.
@@ -1679,4 +1720,5 @@ def _build_meta_graph(
   """
 
   with save_context.save_context(options):
-    return _build_meta_graph_impl(obj, signatures, options, meta_graph_def)
+    return _build_meta_graph_impl(obj, signatures, options, meta_graph_def,
+                                  object_saver_callback)
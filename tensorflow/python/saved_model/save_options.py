@@ -111,6 +111,7 @@ class SaveOptions:
       "experimental_skip_saver",
       "experimental_sharding_callback",
       "extra_tags",
+      "experimental_export_threads",
   )
 
   def __init__(
@@ -126,6 +127,7 @@ class SaveOptions:
       experimental_skip_saver=False,
       experimental_sharding_callback=None,
       extra_tags=None,
+      experimental_export_threads=None,
   ):
     """Creates an object that stores options for SavedModel saving.
 
@@ -184,10 +186,16 @@ class SaveOptions:
       experimental_sharding_callback: `tf.train.experimental.ShardingCallback`.
         A pre-made or custom callback that determines how checkpoints are
         sharded on disk. Pre-made callback options are
-        `tf.train.experimental.ShardByDevicePolicy` and
-        `tf.train.experimental.MaxShardSizePolicy`. You may also write a custom
-        callback, see `tf.train.experimental.ShardingCallback`.
+        `tf.train.experimental.ShardByDevicePolicy`,
+        `tf.train.experimental.MaxShardSizePolicy` and
+        `tf.train.experimental.BalancedShardSizePolicy`. You may also write a
+        custom callback, see `tf.train.experimental.ShardingCallback`.
       extra_tags: Extra tags to be saved with the MetaGraph in the SavedModel.
+      experimental_export_threads: int. The number of threads used to write the
+        SavedModel. If set, when saving eagerly outside of a
+        `tf.distribute.Strategy`, variables are written to the checkpoint in
+        the background while functions are serialized, and assets are copied
+        concurrently. If `None` (default), everything is written sequentially.
     """
     self.namespace_whitelist = _validate_namespace_whitelist(
         namespace_whitelist
@@ -222,6 +230,15 @@ class SaveOptions:
     self.experimental_sharding_callback = experimental_sharding_callback
     self.extra_tags = extra_tags
 
+    if experimental_export_threads is not None and (
+        experimental_export_threads < 1
+    ):
+      raise ValueError(
+          "The experimental_export_threads save option must be at least 1 or "
+          f"None, got {experimental_export_threads}."
+      )
+    self.experimental_export_threads = experimental_export_threads
+
 
 def _validate_namespace_whitelist(namespace_whitelist):
   """Validates namespace whitelist argument."""
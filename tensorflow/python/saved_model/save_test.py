@@ -1406,6 +1406,10 @@ class SavingOptionsTest(test.TestCase):
       options = save_options.SaveOptions(
           experimental_variable_policy="not_a_valid_value")
 
+  def test_invalid_export_threads(self):
+    with self.assertRaisesRegex(ValueError, "at least 1"):
+      save_options.SaveOptions(experimental_export_threads=0)
+
 
 class AssetTests(test.TestCase):
 
@@ -1517,6 +1521,32 @@ class AssetTests(test.TestCase):
     save_and_load("first")
     save_and_load("second")
 
+  def test_export_threads(self):
+    other_path = os.path.join(self.get_temp_dir(), "other.txt")
+    with open(other_path, "w") as f:
+      f.write("delta\n")
+    root = autotrackable.AutoTrackable()
+    root.v = variables.Variable(3.)
+    root.vocab = asset.Asset(self._vocab_path)
+    root.other = asset.Asset(other_path)
+    root.f = def_function.function(
+        lambda x: root.v * x,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.float32)])
+    root.read = def_function.function(
+        lambda: io_ops.read_file(root.other))
+
+    save_dir = os.path.join(self.get_temp_dir(), "saved_model")
+    save.save(root, save_dir,
+              options=save_options.SaveOptions(experimental_export_threads=2))
+    self.assertCountEqual(
+        ["vocab.txt", "other.txt"],
+        file_io.list_directory(os.path.join(save_dir, "assets")))
+
+    imported = load.load(save_dir)
+    self.assertEqual(3., self.evaluate(imported.v))
+    self.assertEqual(6., self.evaluate(imported.f(constant_op.constant(2.))))
+    self.assertEqual(b"delta\n", self.evaluate(imported.read()))
+
 
 class ExportMetaGraphTests(test.TestCase):
 
@@ -15,16 +15,55 @@
 
 """Provides a method for reading events from an event file via an iterator."""
 
+import bisect
+from concurrent import futures
+import hashlib
+import json
+import multiprocessing
+import os
+
 from tensorflow.core.util import event_pb2
+from tensorflow.python.framework import errors
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.lib.io import tf_record
+from tensorflow.python.util import compat
 from tensorflow.python.util.tf_export import tf_export
 
 
+def _compression_type(path):
+  """Returns the compression type of the event file at `path`.
+
+  `EventFileWriter`s write compressed event files when given a `compression`.
+  The compression is detected by reading the first event of the file.
+
+  Args:
+    path: The path to an event file.
+
+  Returns:
+    `"GZIP"`, `"ZLIB"`, or `""` for an uncompressed or unreadable file.
+  """
+  try:
+    next(tf_record.tf_record_iterator(path), None)
+    return ""
+  except errors.DataLossError as e:
+    # The first event is still being written.
+    if "truncated record" in str(e):
+      return ""
+  for compression_type in ("GZIP", "ZLIB"):
+    try:
+      next(tf_record.tf_record_iterator(path, compression_type), None)
+      return compression_type
+    except errors.DataLossError:
+      pass
+  return ""
+
+
 class _SummaryIterator(object):
   """Yields `Event` protocol buffers from a given path."""
 
   def __init__(self, path):
-    self._tf_record_iterator = tf_record.tf_record_iterator(path)
+    self._tf_record_iterator = tf_record.tf_record_iterator(
+        path, _compression_type(path))
 
   def __iter__(self):
     return self
@@ -82,6 +121,9 @@ def summary_iterator(path):
   [Summary](https://www.tensorflow.org/code/tensorflow/core/framework/summary.proto)
   for more information about their attributes.
 
+  Event files compressed with GZIP or ZLIB, e.g. by a `FileWriter` with a
+  `compression`, are also read.
+
   Args:
     path: The path to an event file created by a `SummaryWriter`.
 
@@ -89,3 +131,292 @@ def summary_iterator(path):
     A iterator that yields `Event` protocol buffers
   """
   return _SummaryIterator(path)
+
+
+def _scan_event_file(path, offset):
+  """Indexes the summary values of the events of `path` from `offset` on.
+
+  Runs in a worker process of `IndexedSummaryReader`.
+
+  Args:
+    path: The path to an event file.
+    offset: The offset of the first event to index.
+
+  Returns:
+    A tuple `(tags, end_offset)`, where `tags` maps each tag to a tuple of
+    lists `(steps, offsets)` and `end_offset` is the offset following the last
+    complete event.
+
+  Raises:
+    ValueError: If the event file is compressed.
+  """
+  # The offsets of a compressed file are not those of its events.
+  if offset == 0 and _compression_type(path):
+    raise ValueError(
+        "Event file %s is compressed. IndexedSummaryReader only reads "
+        "uncompressed event files, use summary_iterator instead." % path)
+  tags = {}
+  reader = tf_record.tf_record_random_reader(path)
+  try:
+    while True:
+      try:
+        record, next_offset = reader.read(offset)
+      except IndexError:
+        break
+      except errors.DataLossError as e:
+        # The last event is still being written.
+        if "truncated record" in str(e):
+          break
+        raise
+      event = event_pb2.Event.FromString(record)
+      for value in event.summary.value:
+        steps, offsets = tags.setdefault(value.tag, ([], []))
+        steps.append(event.step)
+        offsets.append(offset)
+      offset = next_offset
+  finally:
+    reader.close()
+  return tags, offset
+
+
+class _EventFileIndex(object):
+  """The offsets of the events of one file, by summary tag and step."""
+
+  def __init__(self, path):
+    self.path = path
+    self.end_offset = 0
+    # Maps each tag to a tuple of lists `(steps, offsets)`, in file order.
+    self.tags = {}
+    # Tags whose steps are not in increasing order.
+    self.unsorted_tags = set()
+
+  def extend(self, tags, end_offset):
+    for tag, (steps, offsets) in tags.items():
+      tag_steps, tag_offsets = self.tags.setdefault(tag, ([], []))
+      if (tag in self.unsorted_tags or
+          (tag_steps and steps[0] < tag_steps[-1]) or
+          any(a > b for a, b in zip(steps, steps[1:]))):
+        self.unsorted_tags.add(tag)
+      tag_steps.extend(steps)
+      tag_offsets.extend(offsets)
+    self.end_offset = end_offset
+
+  def offsets(self, tag, step_range):
+    """Returns the offsets of the events with `tag` in `step_range`."""
+    if tag not in self.tags:
+      return []
+    steps, offsets = self.tags[tag]
+    if step_range is None:
+      return list(offsets)
+    min_step, max_step = step_range
+    if tag in self.unsorted_tags:
+      return [offset for step, offset in zip(steps, offsets)
+              if min_step <= step <= max_step]
+    return offsets[bisect.bisect_left(steps, min_step):
+                   bisect.bisect_right(steps, max_step)]
+
+  def segment_to_json(self, start_offset, tags):
+    """Serializes the entries `tags` added from `start_offset` on."""
+    return json.dumps({"path": self.path,
+                       "start_offset": start_offset,
+                       "end_offset": self.end_offset,
+                       "tags": tags})
+
+  @staticmethod
+  def segment_from_json(data):
+    """Returns the `(path, start_offset, end_offset, tags)` of a segment."""
+    data = json.loads(data)
+    return (data["path"], data["start_offset"], data["end_offset"],
+            {tag: tuple(value) for tag, value in data["tags"].items()})
+
+
+# Number of cached index segments of an event file after which they are merged.
+_MAX_INDEX_SEGMENTS = 32
+
+
+class IndexedSummaryReader(object):
+  """Reads summary values by tag and step range from event files.
+
+  The first query scans the event files and indexes the offset of every event
+  by summary tag and step; later queries only read the matching events. Files
+  are scanned concurrently on a process pool. `refresh()` indexes the events
+  appended since the last scan, as well as new files matching the pattern.
+
+  Usage example:
+  ```python
+  reader = IndexedSummaryReader(os.path.join(logdir, "events.out.tfevents.*"))
+  while True:
+    for event in reader.read("loss", step_range=(1000, 2000)):
+      print(event.step, tf.make_ndarray(event.summary.value[0].tensor))
+    time.sleep(wait time)
+    reader.refresh()
+  ```
+
+  If `cache_dir` is set, the index of each file is saved there and reused by
+  other readers, which then only scan new events. Each scan which indexes new
+  events only writes a segment with these events, and the segments of a file
+  are periodically merged.
+
+  Only uncompressed event files can be indexed: scanning a compressed one, e.g.
+  written by a `FileWriter` with a `compression`, raises a `ValueError`.
+  """
+
+  def __init__(self, pattern, cache_dir=None, num_parallel_scans=None):
+    """Creates an `IndexedSummaryReader`.
+
+    Args:
+      pattern: A glob pattern, or a list of paths, of event files.
+      cache_dir: (optional) Directory in which the indices are cached.
+      num_parallel_scans: (optional) Number of processes scanning files
+        concurrently. Defaults to the number of CPUs. With 1, files are
+        scanned in the calling process.
+    """
+    self._pattern = pattern
+    self._cache_dir = cache_dir
+    self._num_parallel_scans = num_parallel_scans or os.cpu_count() or 1
+    self._executor = None
+    self._indices = {}
+    # The paths of the cached index segments of each file.
+    self._segments = {}
+    self._scanned = False
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def close(self):
+    """Shuts down the scanning processes."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=True)
+      self._executor = None
+
+  def _paths(self):
+    if isinstance(self._pattern, (str, bytes)):
+      return sorted(file_io.get_matching_files(self._pattern))
+    return [compat.as_str_any(path) for path in self._pattern]
+
+  def _cache_prefix(self, path):
+    name = hashlib.sha256(compat.as_bytes(path)).hexdigest()
+    return os.path.join(self._cache_dir, name)
+
+  def _load_index(self, path):
+    """Returns the cached index of `path` if valid, or a new empty index."""
+    index = _EventFileIndex(path)
+    segments = []
+    if self._cache_dir is not None:
+      segments = sorted(file_io.get_matching_files(
+          self._cache_prefix(path) + "-*.json"))
+      for segment in segments:
+        segment_path, start_offset, end_offset, tags = (
+            _EventFileIndex.segment_from_json(
+                file_io.read_file_to_string(segment)))
+        if segment_path != path:
+          continue
+        # Segments written concurrently by other readers may overlap, so only
+        # contiguous ones are used, and merged segments replace the others.
+        if start_offset == 0 and end_offset > index.end_offset:
+          index = _EventFileIndex(path)
+          index.extend(tags, end_offset)
+        elif start_offset == index.end_offset < end_offset:
+          index.extend(tags, end_offset)
+      # Event files are only appended to, so a shorter file was replaced.
+      if index.end_offset > file_io.stat(path).length:
+        self._delete_segments(segments)
+        index = _EventFileIndex(path)
+        segments = []
+    self._segments[path] = segments
+    return index
+
+  def _delete_segments(self, segments):
+    for segment in segments:
+      try:
+        file_io.delete_file(segment)
+      except errors.NotFoundError:
+        pass
+
+  def _save_index(self, index, start_offset, tags):
+    """Caches the entries `tags` added to `index` from `start_offset` on."""
+    segments = self._segments[index.path]
+    number = 0
+    if segments:
+      number = int(segments[-1][-len("000000.json"):-len(".json")]) + 1
+    segment = "%s-%06d.json" % (self._cache_prefix(index.path), number)
+    file_io.recursive_create_dir(self._cache_dir)
+    if len(segments) + 1 < _MAX_INDEX_SEGMENTS:
+      file_io.atomic_write_string_to_file(
+          segment, index.segment_to_json(start_offset, tags))
+      segments.append(segment)
+    else:
+      file_io.atomic_write_string_to_file(
+          segment, index.segment_to_json(0, index.tags))
+      self._delete_segments(segments)
+      segments[:] = [segment]
+
+  def refresh(self):
+    """Indexes new events and event files."""
+    for path in self._paths():
+      if path not in self._indices:
+        self._indices[path] = self._load_index(path)
+    stale = [index for index in self._indices.values()
+             if file_io.stat(index.path).length > index.end_offset]
+    if len(stale) > 1 and self._num_parallel_scans > 1:
+      if self._executor is None:
+        # Workers are spawned, since forking a process running TensorFlow is
+        # not safe.
+        self._executor = futures.ProcessPoolExecutor(
+            max_workers=self._num_parallel_scans,
+            mp_context=multiprocessing.get_context("spawn"))
+      results = self._executor.map(
+          _scan_event_file, [index.path for index in stale],
+          [index.end_offset for index in stale])
+    else:
+      results = (_scan_event_file(index.path, index.end_offset)
+                 for index in stale)
+    for index, (tags, end_offset) in zip(stale, results):
+      start_offset = index.end_offset
+      index.extend(tags, end_offset)
+      # Without new entries, the next reader rescans the events which were
+      # just scanned, which is cheaper than rewriting the index.
+      if self._cache_dir is not None and tags:
+        self._save_index(index, start_offset, tags)
+    self._scanned = True
+
+  def tags(self):
+    """Returns the set of summary tags in the event files."""
+    if not self._scanned:
+      self.refresh()
+    return set().union(*(index.tags for index in self._indices.values()))
+
+  def read(self, tag, step_range=None):
+    """Returns the events with summary values for `tag`.
+
+    The summary of each returned `Event` only holds the values for `tag`.
+
+    Args:
+      tag: The tag of the summary values.
+      step_range: (optional) A tuple `(min_step, max_step)` of the inclusive
+        range of steps to read.
+
+    Returns:
+      A list of `Event` protocol buffers, ordered by file and then by offset.
+    """
+    if not self._scanned:
+      self.refresh()
+    events = []
+    for path in sorted(self._indices):
+      offsets = self._indices[path].offsets(tag, step_range)
+      if not offsets:
+        continue
+      reader = tf_record.tf_record_random_reader(path)
+      try:
+        for offset in offsets:
+          event = event_pb2.Event.FromString(reader.read(offset)[0])
+          values = [v for v in event.summary.value if v.tag == tag]
+          del event.summary.value[:]
+          event.summary.value.extend(values)
+          events.append(event)
+      finally:
+        reader.close()
+    return events
@@ -17,10 +17,13 @@
 import glob
 import os.path
 
+from tensorflow.core.framework import summary_pb2
 from tensorflow.core.util import event_pb2
 from tensorflow.python.framework import test_util
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.platform import test
 from tensorflow.python.summary import summary_iterator
+from tensorflow.python.summary.writer import event_file_writer
 from tensorflow.python.summary.writer import writer
 
 
@@ -53,5 +56,146 @@ class SummaryIteratorTestCase(test.TestCase):
       # Get EOF again.
       self.assertRaises(StopIteration, lambda: next(rr))
 
+  def testCompressedEventFiles(self):
+    for compression in ["GZIP", "ZLIB"]:
+      with self.subTest(compression=compression):
+        test_dir = os.path.join(self.get_temp_dir(), compression)
+        w = event_file_writer.EventFileWriter(
+            test_dir, compression=compression)
+        for step in range(3):
+          w.add_event(event_pb2.Event(step=step))
+        w.close()
+        path = glob.glob(os.path.join(test_dir, "event*"))[0]
+
+        events = list(summary_iterator.summary_iterator(path))
+        self.assertEqual("brain.Event:2", events[0].file_version)
+        self.assertEqual([0, 1, 2], [e.step for e in events[1:]])
+        reader = summary_iterator.IndexedSummaryReader(
+            [path], num_parallel_scans=1)
+        with self.assertRaisesRegex(ValueError, "is compressed"):
+          reader.tags()
+
+
+class IndexedSummaryReaderTest(test.TestCase):
+
+  def _Event(self, step, tags):
+    return event_pb2.Event(
+        step=step,
+        summary=summary_pb2.Summary(value=[
+            summary_pb2.Summary.Value(tag=tag, simple_value=step)
+            for tag in tags
+        ]))
+
+  def _WriteEvents(self, path, events, mode="wb"):
+    if mode == "ab":
+      with open(path, "rb") as f:
+        content = f.read()
+    with tf_record.TFRecordWriter(path) as w:
+      for event in events:
+        w.write(event.SerializeToString())
+    if mode == "ab":
+      with open(path, "rb") as f:
+        appended = f.read()
+      with open(path, "wb") as f:
+        f.write(content + appended)
+
+  def _Steps(self, events):
+    return [(e.step, [v.tag for v in e.summary.value]) for e in events]
+
+  def setUp(self):
+    super(IndexedSummaryReaderTest, self).setUp()
+    self._dir = os.path.join(self.get_temp_dir(), "indexed")
+    os.makedirs(self._dir)
+    self._path = os.path.join(self._dir, "events.out.tfevents.0")
+    self._WriteEvents(self._path, [
+        event_pb2.Event(file_version="brain.Event:2")] + [
+            self._Event(step, ["loss", "accuracy"]) for step in range(10)])
+    self._pattern = os.path.join(self._dir, "events.out.tfevents.*")
+
+  def testRead(self):
+    reader = summary_iterator.IndexedSummaryReader(
+        self._pattern, num_parallel_scans=1)
+    self.assertEqual(reader.tags(), {"loss", "accuracy"})
+    self.assertEqual(
+        self._Steps(reader.read("loss", step_range=(3, 5))),
+        [(3, ["loss"]), (4, ["loss"]), (5, ["loss"])])
+    self.assertLen(reader.read("accuracy"), 10)
+    self.assertEqual(reader.read("missing"), [])
+
+  def testUnsortedSteps(self):
+    self._WriteEvents(self._path, [self._Event(2, ["loss"])], mode="ab")
+    reader = summary_iterator.IndexedSummaryReader(
+        [self._path], num_parallel_scans=1)
+    self.assertEqual(
+        [e.step for e in reader.read("loss", step_range=(1, 2))], [1, 2, 2])
+
+  def testRefresh(self):
+    reader = summary_iterator.IndexedSummaryReader(
+        self._pattern, num_parallel_scans=1)
+    self.assertLen(reader.read("loss"), 10)
+    self._WriteEvents(self._path, [self._Event(10, ["loss"])], mode="ab")
+    self._WriteEvents(
+        os.path.join(self._dir, "events.out.tfevents.1"),
+        [self._Event(11, ["loss"])])
+    self.assertLen(reader.read("loss"), 10)
+    reader.refresh()
+    self.assertEqual(
+        [e.step for e in reader.read("loss", step_range=(9, 20))],
+        [9, 10, 11])
+
+  def testTruncatedEventIsIndexedOnceComplete(self):
+    with open(self._path, "rb") as f:
+      content = f.read()
+    with open(self._path, "wb") as f:
+      f.write(content[:-5])
+    reader = summary_iterator.IndexedSummaryReader(
+        [self._path], num_parallel_scans=1)
+    self.assertLen(reader.read("loss"), 9)
+    with open(self._path, "wb") as f:
+      f.write(content)
+    reader.refresh()
+    self.assertLen(reader.read("loss"), 10)
+
+  def testCache(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    reader = summary_iterator.IndexedSummaryReader(
+        self._pattern, cache_dir=cache_dir, num_parallel_scans=1)
+    self.assertLen(reader.read("loss"), 10)
+    self.assertLen(os.listdir(cache_dir), 1)
+
+    self._WriteEvents(self._path, [self._Event(10, ["loss"])], mode="ab")
+    reader = summary_iterator.IndexedSummaryReader(
+        self._pattern, cache_dir=cache_dir, num_parallel_scans=1)
+    self.assertEqual(
+        [e.step for e in reader.read("loss", step_range=(8, 10))], [8, 9, 10])
+    # Only the new event is written to a new segment.
+    self.assertLen(os.listdir(cache_dir), 2)
+    reader.refresh()
+    self.assertLen(os.listdir(cache_dir), 2)
+
+  def testCacheSegmentsAreMerged(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    reader = summary_iterator.IndexedSummaryReader(
+        [self._path], cache_dir=cache_dir, num_parallel_scans=1)
+    for step in range(10, 10 + summary_iterator._MAX_INDEX_SEGMENTS):
+      self._WriteEvents(self._path, [self._Event(step, ["loss"])], mode="ab")
+      reader.refresh()
+    self.assertLen(os.listdir(cache_dir), 1)
+
+    reader = summary_iterator.IndexedSummaryReader(
+        [self._path], cache_dir=cache_dir, num_parallel_scans=1)
+    self.assertEqual(
+        [e.step for e in reader.read("loss")],
+        list(range(10 + summary_iterator._MAX_INDEX_SEGMENTS)))
+
+  def testParallelScan(self):
+    self._WriteEvents(
+        os.path.join(self._dir, "events.out.tfevents.1"),
+        [self._Event(step, ["loss"]) for step in range(10, 20)])
+    with summary_iterator.IndexedSummaryReader(
+        self._pattern, num_parallel_scans=2) as reader:
+      self.assertEqual([e.step for e in reader.read("loss")], list(range(20)))
+
+
 if __name__ == "__main__":
   test.main()
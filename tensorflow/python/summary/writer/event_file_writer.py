@@ -16,15 +16,35 @@
 
 import collections
 import os.path
+import socket
 import sys
 import threading
 import time
 
+from tensorflow.core.util import event_pb2
 from tensorflow.python.client import _pywrap_events_writer
+from tensorflow.python.eager import monitoring
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 
+_queue_depth_gauge = monitoring.IntGauge(
+    "/tensorflow/api/summary/event_file_writer/queue_depth",
+    "Number of events pending in the queue of an EventFileWriter, sampled "
+    "whenever its writer thread dequeues events.", "logdir")
+
+_dropped_events_counter = monitoring.Counter(
+    "/tensorflow/api/summary/event_file_writer/dropped_events",
+    "Number of events dropped by EventFileWriters because their queue was "
+    "full.", "logdir")
+
+_flush_latency_usecs_sampler = monitoring.Sampler(
+    "/tensorflow/api/summary/event_file_writer/flush_latency_usecs",
+    monitoring.ExponentialBuckets(scale=10, growth_factor=2, bucket_count=24),
+    "Time (in microseconds) taken by EventFileWriters to flush event files.",
+    "logdir")
+
 
 class EventFileWriter:
   """Writes `Event` protocol buffers to an event file.
@@ -37,7 +57,8 @@ class EventFileWriter:
   """
 
   def __init__(self, logdir, max_queue=10, flush_secs=120,
-               filename_suffix=None):
+               filename_suffix=None, batch_size=None, compression=None,
+               drop_when_full=False):
     """Creates a `EventFileWriter` and an event file to write to.
 
     On construction the summary writer creates a new event file in `logdir`.
@@ -50,7 +71,11 @@ class EventFileWriter:
     *  `flush_secs`: How often, in seconds, to flush the added summaries
        and events to disk.
     *  `max_queue`: Maximum number of summaries or events pending to be
-       written to disk before one of the 'add' calls block.
+       written to disk before one of the 'add' calls block, or drops the
+       event if `drop_when_full` is set.
+    *  `batch_size`: If set, the writer thread dequeues up to `batch_size`
+       events at once, merges consecutive scalar summaries for the same step
+       into a single event and writes the batch before flushing.
 
     Args:
       logdir: A string. Directory where event file will be written.
@@ -59,16 +84,29 @@ class EventFileWriter:
         pending events and summaries to disk.
       filename_suffix: A string. Every event file's name is suffixed with
         `filename_suffix`.
+      batch_size: Integer. Maximum number of events written per batch, or
+        `None` to write events one at a time.
+      compression: `"GZIP"`, `"ZLIB"` or `None`. The compression of the event
+        files, which are uncompressed by default. Compressed event files can be
+        read with `summary_iterator`, but not with `IndexedSummaryReader`.
+      drop_when_full: Boolean. Whether to drop events added while the queue
+        is full instead of blocking.
     """
     self._logdir = str(logdir)
     gfile.MakeDirs(self._logdir)
     self._max_queue = max_queue
     self._flush_secs = flush_secs
+    self._batch_size = batch_size
+    self._drop_when_full = drop_when_full
     self._flush_complete = threading.Event()
     self._flush_sentinel = object()
     self._close_sentinel = object()
-    self._ev_writer = _pywrap_events_writer.EventsWriter(
-        compat.as_bytes(os.path.join(self._logdir, "events")))
+    if compression:
+      self._ev_writer = _CompressedEventsWriter(
+          os.path.join(self._logdir, "events"), compression)
+    else:
+      self._ev_writer = _pywrap_events_writer.EventsWriter(
+          compat.as_bytes(os.path.join(self._logdir, "events")))
     if filename_suffix:
       self._ev_writer.InitWithSuffix(compat.as_bytes(filename_suffix))
     self._initialize()
@@ -84,7 +122,9 @@ class EventFileWriter:
     self._worker = _EventLoggerThread(self._event_queue, self._ev_writer,
                                       self._flush_secs, self._flush_complete,
                                       self._flush_sentinel,
-                                      self._close_sentinel)
+                                      self._close_sentinel,
+                                      self._batch_size,
+                                      self._logdir)
 
     self._worker.start()
 
@@ -111,9 +151,10 @@ class EventFileWriter:
       event: An `Event` protocol buffer.
     """
     if not self._closed:
-      self._try_put(event)
+      if not self._try_put(event, block=not self._drop_when_full):
+        _dropped_events_counter.get_cell(self._logdir).increase_by(1)
 
-  def _try_put(self, item):
+  def _try_put(self, item, block=True):
     """Attempts to enqueue an item to the event queue.
 
     If the queue is closed, this will close the EventFileWriter and reraise the
@@ -121,14 +162,20 @@ class EventFileWriter:
 
     Args:
       item: the item to enqueue
+      block: whether to wait for space in the queue if it is full.
+
+    Returns:
+      False if `block` is False and the queue is full, in which case the item
+      is dropped. True otherwise, including when the queue is closed.
     """
     try:
-      self._event_queue.put(item)
+      return self._event_queue.put(item, block=block)
     except QueueClosedError:
       self._internal_close()
       if self._worker.failure_exc_info:
         _, exception, _ = self._worker.failure_exc_info
         raise exception from None
+      return True
 
   def flush(self):
     """Flushes the event file to disk.
@@ -167,7 +214,7 @@ class _EventLoggerThread(threading.Thread):
   """Thread that logs events."""
 
   def __init__(self, queue, ev_writer, flush_secs, flush_complete,
-               flush_sentinel, close_sentinel):
+               flush_sentinel, close_sentinel, batch_size=None, logdir=""):
     """Creates an _EventLoggerThread.
 
     Args:
@@ -184,6 +231,10 @@ class _EventLoggerThread(threading.Thread):
         flush the writer and mark the current flush operation complete.
       close_sentinel: A sentinel element in queue that tells this thread to
         terminate and close the queue.
+      batch_size: Maximum number of events to dequeue and write at once, or
+        `None` to write events one at a time.
+      logdir: The directory of the event file, which labels the metrics of
+        this writer.
     """
     threading.Thread.__init__(self, name="EventLoggerThread")
     self.daemon = True
@@ -195,24 +246,31 @@ class _EventLoggerThread(threading.Thread):
     self._flush_complete = flush_complete
     self._flush_sentinel = flush_sentinel
     self._close_sentinel = close_sentinel
+    self._batch_size = batch_size
+    self._queue_depth_cell = _queue_depth_gauge.get_cell(logdir)
+    self._flush_latency_cell = _flush_latency_usecs_sampler.get_cell(logdir)
     # Populated when writing logic raises an exception and kills the thread.
     self.failure_exc_info = ()
 
   def run(self):
     try:
+      if self._batch_size:
+        self._run_batched()
+        return
       while True:
         event = self._queue.get()
+        self._queue_depth_cell.set(self._queue.qsize())
         if event is self._close_sentinel:
           return
         elif event is self._flush_sentinel:
-          self._ev_writer.Flush()
+          self._flush()
           self._flush_complete.set()
         else:
           self._ev_writer.WriteEvent(event)
           # Flush the event writer every so often.
           now = time.time()
           if now > self._next_event_flush_time:
-            self._ev_writer.Flush()
+            self._flush()
             self._next_event_flush_time = now + self._flush_secs
     except Exception as e:
       logging.error("EventFileWriter writer thread error: %s", e)
@@ -226,6 +284,126 @@ class _EventLoggerThread(threading.Thread):
       self._flush_complete.set()
       self._queue.close()
 
+  def _run_batched(self):
+    """Writes batches of events until the close sentinel is dequeued."""
+    while True:
+      items = self._queue.get_batch(self._batch_size)
+      self._queue_depth_cell.set(self._queue.qsize())
+      events = []
+      for item in items:
+        if item is self._close_sentinel or item is self._flush_sentinel:
+          self._write_events(events)
+          events = []
+          if item is self._close_sentinel:
+            return
+          self._flush()
+          self._flush_complete.set()
+        else:
+          events.append(item)
+      self._write_events(events)
+      # Flush the event writer every so often.
+      now = time.time()
+      if events and now > self._next_event_flush_time:
+        self._flush()
+        self._next_event_flush_time = now + self._flush_secs
+
+  def _write_events(self, events):
+    for event in _merge_scalar_events(events):
+      self._ev_writer.WriteEvent(event)
+
+  def _flush(self):
+    start = time.time()
+    self._ev_writer.Flush()
+    self._flush_latency_cell.add((time.time() - start) * 1e6)
+
+
+def _is_scalar_summary_event(event):
+  """Returns whether `event` only holds scalar summary values."""
+  if event.WhichOneof("what") != "summary":
+    return False
+  for value in event.summary.value:
+    kind = value.WhichOneof("value")
+    if kind == "tensor":
+      if value.tensor.tensor_shape.dim:
+        return False
+    elif kind != "simple_value":
+      return False
+  return True
+
+
+def _merge_scalar_events(events):
+  """Merges consecutive scalar summary events for the same step.
+
+  Args:
+    events: A list of `Event` protocol buffers.
+
+  Returns:
+    A list of `Event` protocol buffers, where each run of scalar summary
+    events for the same step is replaced by a single event holding all their
+    values, with the wall time of the first event of the run.
+  """
+  merged = []
+  # Whether the last event of `merged` is a copy that can be modified.
+  copied = False
+  for event in events:
+    if (merged and merged[-1].step == event.step and
+        _is_scalar_summary_event(event) and
+        _is_scalar_summary_event(merged[-1])):
+      if not copied:
+        merged[-1] = event_pb2.Event.FromString(
+            merged[-1].SerializeToString())
+        copied = True
+      merged[-1].summary.value.extend(event.summary.value)
+    else:
+      merged.append(event)
+      copied = False
+  return merged
+
+
+class _CompressedEventsWriter(object):
+  """Writes compressed event files, with the interface of `EventsWriter`."""
+
+  def __init__(self, file_prefix, compression):
+    self._file_prefix = file_prefix
+    self._options = tf_record.TFRecordOptions(compression)
+    self._file_suffix = ""
+    self._filename = None
+    self._writer = None
+
+  def InitWithSuffix(self, suffix):  # pylint: disable=invalid-name
+    self._file_suffix = compat.as_str(suffix)
+    self._init()
+
+  def FileName(self):  # pylint: disable=invalid-name
+    if self._writer is None:
+      self._init()
+    return self._filename
+
+  def WriteEvent(self, event):  # pylint: disable=invalid-name
+    if self._writer is None:
+      self._init()
+    self._writer.write(event.SerializeToString())
+
+  def Flush(self):  # pylint: disable=invalid-name
+    if self._writer is not None:
+      self._writer.flush()
+
+  def Close(self):  # pylint: disable=invalid-name
+    if self._writer is not None:
+      self._writer.close()
+      self._writer = None
+
+  def _init(self):
+    """Opens a new event file, named like the files of `EventsWriter`."""
+    self.Close()
+    now = time.time()
+    self._filename = "%s.out.tfevents.%010d.%s%s" % (
+        self._file_prefix, int(now), socket.gethostname(), self._file_suffix)
+    self._writer = tf_record.TFRecordWriter(self._filename, self._options)
+    self._writer.write(event_pb2.Event(
+        wall_time=now, file_version="brain.Event:2").SerializeToString())
+    self._writer.flush()
+
 
 class CloseableQueue:
   """Stripped-down fork of the standard library Queue that is closeable."""
@@ -263,16 +441,45 @@ class CloseableQueue:
       self._not_full.notify()
       return item
 
-  def put(self, item):
+  def get_batch(self, max_items):
+    """Remove and return up to `max_items` items from the queue.
+
+    If the queue is empty, blocks until an item is available.
+
+    Args:
+      max_items: the maximum number of items to return.
+
+    Returns:
+      a non-empty list of items from the queue, in order
+    """
+    with self._not_empty:
+      while not self._queue:
+        self._not_empty.wait()
+      items = [self._queue.popleft()
+               for _ in range(min(max_items, len(self._queue)))]
+      self._not_full.notify_all()
+      return items
+
+  def qsize(self):
+    """Returns the number of items in the queue."""
+    with self._mutex:
+      return len(self._queue)
+
+  def put(self, item, block=True):
     """Put an item into the queue.
 
     If the queue is closed, fails immediately.
 
     If the queue is full, blocks until space is available or until the queue
-    is closed by a call to close(), at which point this call fails.
+    is closed by a call to close(), at which point this call fails. If `block`
+    is False, returns immediately instead of waiting for space.
 
     Args:
       item: an item to add to the queue
+      block: whether to wait for space if the queue is full
+
+    Returns:
+      Whether the item was added to the queue.
 
     Raises:
       QueueClosedError: if insertion failed because the queue is closed
@@ -281,12 +488,15 @@ class CloseableQueue:
       if self._closed:
         raise QueueClosedError()
       if self._maxsize > 0:
+        if not block and len(self._queue) == self._maxsize:
+          return False
         while len(self._queue) == self._maxsize:
           self._not_full.wait()
           if self._closed:
             raise QueueClosedError()
       self._queue.append(item)
       self._not_empty.notify()
+      return True
 
   def close(self):
     """Closes the queue, causing any pending or future `put()` calls to fail."""
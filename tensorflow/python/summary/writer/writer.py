@@ -355,7 +355,10 @@ class FileWriter(SummaryToEventTransformer):
                flush_secs=120,
                graph_def=None,
                filename_suffix=None,
-               session=None):
+               session=None,
+               batch_size=None,
+               compression=None,
+               drop_when_full=False):
     """Creates a `FileWriter`, optionally shared within the given session.
 
     Typically, constructing a file writer creates a new event file in `logdir`.
@@ -395,9 +398,19 @@ class FileWriter(SummaryToEventTransformer):
       filename_suffix: A string. Every event file's name is suffixed with
         `suffix`.
       session: A `tf.compat.v1.Session` object. See details above.
+      batch_size: Integer. If set, up to `batch_size` pending events are
+        written at once, and consecutive scalar summaries for the same step are
+        merged into a single event.
+      compression: `"GZIP"`, `"ZLIB"` or `None`. The compression of the event
+        file, which is uncompressed by default. Compressed event files can be
+        read with `summary_iterator`, but not with `IndexedSummaryReader`.
+      drop_when_full: Boolean. Whether to drop events added while `max_queue`
+        events are pending instead of blocking.
 
     Raises:
       RuntimeError: If called with eager execution enabled.
+      ValueError: If `batch_size`, `compression` or `drop_when_full` is set
+        together with `session`.
 
     @compatibility(eager)
       `v1.summary.FileWriter` is not compatible with eager execution.
@@ -412,11 +425,17 @@ class FileWriter(SummaryToEventTransformer):
           "Use `tf.summary.create_file_writer`,"
           "or a `with v1.Graph().as_default():` context")
     if session is not None:
+      if batch_size or compression or drop_when_full:
+        raise ValueError(
+            "`batch_size`, `compression` and `drop_when_full` are not "
+            "supported together with `session`.")
       event_writer = EventFileWriterV2(
           session, logdir, max_queue, flush_secs, filename_suffix)
     else:
-      event_writer = EventFileWriter(logdir, max_queue, flush_secs,
-                                     filename_suffix)
+      event_writer = EventFileWriter(
+          logdir, max_queue, flush_secs, filename_suffix,
+          batch_size=batch_size, compression=compression,
+          drop_when_full=drop_when_full)
 
     self._closed = False
     super(FileWriter, self).__init__(event_writer, graph, graph_def)
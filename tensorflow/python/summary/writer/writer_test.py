@@ -34,11 +34,13 @@ from tensorflow.python.framework import errors_impl
 from tensorflow.python.framework import meta_graph
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import test_util
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.ops import summary_ops_v2
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import test
 from tensorflow.python.summary import plugin_asset
 from tensorflow.python.summary import summary_iterator
+from tensorflow.python.summary.writer import event_file_writer
 from tensorflow.python.summary.writer import writer
 from tensorflow.python.summary.writer import writer_cache
 from tensorflow.python.util import compat
@@ -744,5 +746,141 @@ class FileWriterCacheTest(test.TestCase):
       self.assertFalse(sw1 == sw2)
 
 
+class EventFileWriterTest(test.TestCase):
+
+  def _ScalarEvent(self, step, tag):
+    return event_pb2.Event(
+        step=step,
+        summary=summary_pb2.Summary(
+            value=[summary_pb2.Summary.Value(tag=tag, simple_value=step)]))
+
+  def _ReadEvents(self, path, options=None):
+    return [event_pb2.Event.FromString(r)
+            for r in tf_record.tf_record_iterator(path, options)]
+
+  def testMergeScalarEvents(self):
+    events = [self._ScalarEvent(step, tag)
+              for step in range(3) for tag in ["a", "b", "c"]]
+    events += [event_pb2.Event(step=2, file_version="marker"),
+               self._ScalarEvent(2, "d")]
+    merged = event_file_writer._merge_scalar_events(events)  # pylint: disable=protected-access
+    self.assertEqual(
+        [(e.step, [v.tag for v in e.summary.value]) for e in merged],
+        [(0, ["a", "b", "c"]), (1, ["a", "b", "c"]), (2, ["a", "b", "c"]),
+         (2, []), (2, ["d"])])
+
+  def testBatchedWriter(self):
+    test_dir = self.get_temp_dir()
+    w = event_file_writer.EventFileWriter(
+        test_dir, max_queue=100, batch_size=10)
+    for step in range(20):
+      for tag in ["a", "b"]:
+        w.add_event(self._ScalarEvent(step, tag))
+    w.flush()
+    w.add_event(self._ScalarEvent(20, "a"))
+    w.close()
+
+    events = self._ReadEvents(glob.glob(os.path.join(test_dir, "event*"))[0])
+    self.assertEqual("brain.Event:2", events[0].file_version)
+    values = [(e.step, v.tag) for e in events[1:] for v in e.summary.value]
+    self.assertEqual(
+        values,
+        [(step, tag) for step in range(20) for tag in ["a", "b"]] + [(20, "a")])
+    self.assertLessEqual(len(events), 22)
+
+  def testMergeDoesNotModifyEvents(self):
+    events = [self._ScalarEvent(0, "a"), self._ScalarEvent(0, "b")]
+    merged = event_file_writer._merge_scalar_events(events)  # pylint: disable=protected-access
+    self.assertLen(merged, 1)
+    self.assertLen(merged[0].summary.value, 2)
+    self.assertLen(events[0].summary.value, 1)
+
+  def testMergeSkipsNonScalarSummaries(self):
+    histogram = summary_pb2.Summary.Value(tag="h")
+    histogram.histo.num = 1
+    events = [self._ScalarEvent(0, "a"),
+              event_pb2.Event(step=0, summary=summary_pb2.Summary(
+                  value=[histogram])),
+              self._ScalarEvent(0, "b")]
+    merged = event_file_writer._merge_scalar_events(events)  # pylint: disable=protected-access
+    self.assertLen(merged, 3)
+
+  def testCompressedEventFile(self):
+    test_dir = self.get_temp_dir()
+    w = event_file_writer.EventFileWriter(
+        test_dir, compression="GZIP", filename_suffix=".gz", batch_size=10)
+    for step in range(5):
+      w.add_event(self._ScalarEvent(step, "loss"))
+    w.flush()
+    w.close()
+
+    paths = glob.glob(os.path.join(test_dir, "event*.gz"))
+    self.assertLen(paths, 1)
+    events = self._ReadEvents(
+        paths[0], tf_record.TFRecordOptions(compression_type="GZIP"))
+    self.assertEqual("brain.Event:2", events[0].file_version)
+    self.assertEqual([e.step for e in events[1:]], list(range(5)))
+
+  @test_util.run_deprecated_v1
+  def testFileWriterPassesOptions(self):
+    test_dir = self.get_temp_dir()
+    w = writer.FileWriter(
+        test_dir, compression="GZIP", filename_suffix=".gz", batch_size=10)
+    w.add_summary(
+        summary_pb2.Summary(
+            value=[summary_pb2.Summary.Value(tag="loss", simple_value=1.0)]),
+        global_step=1)
+    w.close()
+
+    paths = glob.glob(os.path.join(test_dir, "event*.gz"))
+    self.assertLen(paths, 1)
+    events = self._ReadEvents(
+        paths[0], tf_record.TFRecordOptions(compression_type="GZIP"))
+    self.assertEqual("brain.Event:2", events[0].file_version)
+    self.assertEqual("loss", events[-1].summary.value[0].tag)
+
+  @test_util.run_deprecated_v1
+  def testFileWriterRejectsOptionsWithSession(self):
+    with self.assertRaises(ValueError):
+      writer.FileWriter(
+          self.get_temp_dir(), session=object(), compression="GZIP")
+
+  def testDropWhenFull(self):
+    test_dir = self.get_temp_dir()
+    w = event_file_writer.EventFileWriter(
+        test_dir, max_queue=2, drop_when_full=True)
+    writer_thread = w._worker  # pylint: disable=protected-access
+    with test.mock.patch.object(
+        writer_thread, "_ev_writer", autospec=True) as mock_writer:
+      event_written = threading.Event()
+      unblock_writer = threading.Event()
+      def _BlockingWriteEvent(event):
+        del event  # unused
+        event_written.set()
+        unblock_writer.wait()
+      mock_writer.WriteEvent.side_effect = _BlockingWriteEvent
+      w.add_event(self._ScalarEvent(0, "a"))
+      event_written.wait()
+      # The writer thread is blocked, so only two more events fit the queue.
+      for step in range(1, 5):
+        w.add_event(self._ScalarEvent(step, "a"))
+      unblock_writer.set()
+      w.close()
+      self.assertEqual(mock_writer.WriteEvent.call_count, 3)
+
+  def testAddEventToClosedQueueIsNotDropped(self):
+    test_dir = self.get_temp_dir()
+    dropped_events = event_file_writer._dropped_events_counter.get_cell(  # pylint: disable=protected-access
+        test_dir)
+    w = event_file_writer.EventFileWriter(
+        test_dir, max_queue=2, drop_when_full=True)
+    # The writer thread exits and closes the queue.
+    w._event_queue.put(w._close_sentinel)  # pylint: disable=protected-access
+    w._worker.join()  # pylint: disable=protected-access
+    dropped_before = dropped_events.value()
+    w.add_event(self._ScalarEvent(0, "a"))
+    self.assertEqual(dropped_before, dropped_events.value())
+
+
 if __name__ == "__main__":
   test.main()
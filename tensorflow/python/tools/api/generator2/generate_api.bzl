@@ -383,7 +383,11 @@ def generate_apis(
         # "//conditions:default": True,
         # }),
         # copybara:uncomment_end_and_comment_begin
-        use_lazy_loading = False,
+        use_lazy_loading = select({
+            "//tensorflow/python/tools/api/generator2:lazy_gen_api_indexable": False,
+            "//tensorflow/python/tools/api/generator2:lazy_gen": True,
+            "//conditions:default": False,
+        }),
         # copybara:comment_end
         output_package = output_package,
         root_file_name = root_file_name,
@@ -0,0 +1,88 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks the time and memory taken by `import tensorflow`.
+
+Each import runs in a fresh interpreter, so the numbers include everything
+`import tensorflow` loads. Build with `--config=lazy_api` to measure the lazily
+loaded API.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from tensorflow.python.platform import test
+
+_IMPORT_SCRIPT = """
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import tensorflow as tf
+import_time = time.perf_counter() - start
+max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+  max_rss_kb //= 1024  # Reported in bytes on macOS.
+modules = list(sys.modules)
+
+# The first op pays for whatever a lazily loaded API deferred.
+start = time.perf_counter()
+tf.constant(1.).numpy()
+first_op_time = time.perf_counter() - start
+
+print(json.dumps({
+    "import_time": import_time,
+    "first_op_time": first_op_time,
+    "max_rss_kb": max_rss_kb,
+    "num_modules": len(modules),
+    "num_gen_ops_modules": sum(
+        1 for name in modules if name.startswith("tensorflow.python.ops.gen_")),
+}))
+"""
+
+
+class ImportBenchmark(test.Benchmark):
+
+  def _import_tensorflow(self):
+    output = subprocess.check_output(
+        [sys.executable, "-c", _IMPORT_SCRIPT], env=os.environ.copy())
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+  def benchmark_import_tensorflow(self):
+    num_iters = 5
+    results = [self._import_tensorflow() for _ in range(num_iters)]
+
+    def median(key):
+      return float(np.median([result[key] for result in results]))
+
+    self.report_benchmark(
+        iters=num_iters,
+        wall_time=median("import_time"),
+        name="import_tensorflow",
+        extras={
+            "first_op_time": median("first_op_time"),
+            "max_rss_mb": median("max_rss_kb") / 1024,
+            "num_modules": median("num_modules"),
+            "num_gen_ops_modules": median("num_gen_ops_modules"),
+        })
+
+
+if __name__ == "__main__":
+  test.main()
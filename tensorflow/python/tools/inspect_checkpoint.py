@@ -14,18 +14,35 @@
 # ==============================================================================
 """A simple script for inspect checkpoint files."""
 import argparse
+import collections
+import concurrent.futures
+import hashlib
 import re
 import sys
 
 from absl import app
 import numpy as np
 
+from tensorflow.python.checkpoint import delta_checkpoint
+from tensorflow.python.checkpoint.sharding import sharding_util
+from tensorflow.python.eager import context
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import flags
-from tensorflow.python.training import py_checkpoint_reader
 
 FLAGS = None
 
+TensorMetadata = collections.namedtuple(
+    "TensorMetadata", ["dtype", "shape", "num_bytes"])
+TensorStats = collections.namedtuple(
+    "TensorStats",
+    ["min", "max", "mean", "nan_count", "l1_norm", "l2_norm"])
+CheckpointDiff = collections.namedtuple(
+    "CheckpointDiff", ["added", "removed", "changed", "unchanged"])
+
 
 def _count_total_params(reader, count_exclude_pattern=""):
   """Count total number of variables."""
@@ -51,6 +68,287 @@ def _count_total_params(reader, count_exclude_pattern=""):
   return np.sum(var_sizes, dtype=int)
 
 
+def _saved_tensor_maps(reader):
+  """Returns the shape and dtype maps of the saved values in a checkpoint.
+
+  Keys describing the checkpoint itself, such as the object graph and shard
+  layout, are left out.
+  """
+  shape_map = reader.get_variable_to_shape_map()
+  dtype_map = reader.get_variable_to_dtype_map()
+  for key in delta_checkpoint.METADATA_KEYS:
+    shape_map.pop(key, None)
+    dtype_map.pop(key, None)
+  return shape_map, dtype_map
+
+
+class _CheckpointSlices(object):
+  """Reads the tensors of a checkpoint one stored slice at a time."""
+
+  def __init__(self, file_name):
+    self.file_name = file_name
+    # Only reads the index, not the tensors.
+    self.reader = delta_checkpoint.new_checkpoint_reader(file_name)
+    self.shape_map, self.dtype_map = _saved_tensor_maps(self.reader)
+    self.row_splits = {}
+    if self.reader.has_tensor(sharding_util.SHARD_LAYOUT_KEY):
+      self.row_splits = sharding_util.get_row_splits(
+          self.reader.get_tensor(sharding_util.SHARD_LAYOUT_KEY))
+    self.tensor_locations = None
+    if isinstance(self.reader, delta_checkpoint.DeltaCheckpointReader):
+      self.tensor_locations = self.reader.tensor_locations
+
+  def read(self, key):
+    """Yields the slices a tensor is stored in, along its first axis."""
+    shape = self.shape_map[key]
+    splits = self.row_splits.get(key)
+    if splits:
+      slice_specs = [
+          variables.Variable.SaveSliceInfo(
+              full_name=key,
+              full_shape=shape,
+              var_offset=[start] + [0] * (len(shape) - 1),
+              var_shape=[stop - start] + shape[1:]).spec
+          for start, stop in zip(splits[:-1], splits[1:])]
+    else:
+      slice_specs = [""]
+    for slice_spec in slice_specs:
+      with ops.device("cpu:0"):
+        [value] = delta_checkpoint.restore_v2(
+            self.file_name, [key], [slice_spec], [self.dtype_map[key]],
+            tensor_locations=self.tensor_locations)
+      yield value
+
+
+def _map_tensors(fn, keys, num_threads):
+  """Returns `{key: fn(key)}`, calling `fn` on `num_threads` threads."""
+
+  def run_eagerly(key):
+    with context.eager_mode():
+      return fn(key)
+
+  with concurrent.futures.ThreadPoolExecutor(
+      max_workers=num_threads,
+      thread_name_prefix="inspect_checkpoint") as executor:
+    return dict(zip(keys, executor.map(run_eagerly, keys)))
+
+
+def get_tensor_metadata(file_name):
+  """Returns the dtype, shape and size of each tensor in a checkpoint.
+
+  Only reads the checkpoint index, not the tensors. Keys describing the
+  checkpoint itself, such as the object graph, are left out.
+
+  Args:
+    file_name: Name of the checkpoint file.
+
+  Returns:
+    A dict mapping tensor names to `TensorMetadata`. `num_bytes` is None for
+    tensors whose size is not known from the index, e.g. strings.
+  """
+  reader = delta_checkpoint.new_checkpoint_reader(file_name)
+  var_to_shape_map, var_to_dtype_map = _saved_tensor_maps(reader)
+  metadata = {}
+  for key, shape in var_to_shape_map.items():
+    dtype = var_to_dtype_map[key]
+    num_bytes = None
+    if dtype not in (dtypes.string, dtypes.resource, dtypes.variant):
+      num_bytes = int(np.prod(shape, dtype=np.int64)) * dtype.size
+    metadata[key] = TensorMetadata(dtype, shape, num_bytes)
+  return metadata
+
+
+def _slice_stats(values):
+  """Returns the count, NaN count, min, max, sum, L1 and squared L2 norm."""
+  values = np.asarray(values).reshape(-1)
+  if values.dtype.kind not in "iuf":
+    # E.g. bfloat16, which numpy can't reduce natively.
+    values = values.astype(np.float32)
+  nan_count = 0
+  if values.dtype.kind == "f":
+    nan_mask = np.isnan(values)
+    nan_count = int(np.count_nonzero(nan_mask))
+    if nan_count:
+      values = values[~nan_mask]
+  if not values.size:
+    return 0, nan_count, None, None, 0., 0., 0.
+  as_float = values.astype(np.float64, copy=False)
+  return (values.size, nan_count, values.min().item(), values.max().item(),
+          float(np.sum(as_float)), float(np.sum(np.abs(as_float))),
+          float(np.dot(as_float, as_float)))
+
+
+def compute_tensor_stats(file_name, tensor_names=None, num_threads=None):
+  """Computes statistics of the tensors in a checkpoint.
+
+  Tensors are read one stored slice at a time, on `num_threads` threads, so
+  that at most `num_threads` slices are in memory at once. NaNs are counted,
+  and excluded from the other statistics.
+
+  Args:
+    file_name: Name of the checkpoint file.
+    tensor_names: Optional list of tensor names to compute statistics for.
+      Defaults to all the numeric tensors in the checkpoint.
+    num_threads: The number of threads to read tensors on. Defaults to the
+      default of `concurrent.futures.ThreadPoolExecutor`.
+
+  Returns:
+    A dict mapping tensor names to `TensorStats`. Statistics of tensors which
+    are empty, or only contain NaNs, are None except for `nan_count`.
+
+  Raises:
+    ValueError: If a tensor of `tensor_names` is not in the checkpoint, or is
+      not numeric.
+  """
+  checkpoint_slices = _CheckpointSlices(file_name)
+  if tensor_names is None:
+    tensor_names = sorted(
+        key for key, dtype in checkpoint_slices.dtype_map.items()
+        if dtype.is_floating or dtype.is_integer)
+  for key in tensor_names:
+    dtype = checkpoint_slices.dtype_map.get(key)
+    if dtype is None:
+      raise ValueError("Tensor %s not found in checkpoint %s." %
+                       (key, file_name))
+    if not (dtype.is_floating or dtype.is_integer):
+      raise ValueError("Can not compute statistics of tensor %s of dtype %s; "
+                       "only numeric tensors are supported." %
+                       (key, dtype.name))
+
+  def tensor_stats(key):
+    count = nan_count = 0
+    minimum = maximum = None
+    total = l1_norm = l2_squared = 0.
+    for value in checkpoint_slices.read(key):
+      (slice_count, slice_nan_count, slice_min, slice_max, slice_sum,
+       slice_l1, slice_l2_squared) = _slice_stats(value.numpy())
+      del value
+      nan_count += slice_nan_count
+      if not slice_count:
+        continue
+      minimum = slice_min if minimum is None else min(minimum, slice_min)
+      maximum = slice_max if maximum is None else max(maximum, slice_max)
+      count += slice_count
+      total += slice_sum
+      l1_norm += slice_l1
+      l2_squared += slice_l2_squared
+    if not count:
+      return TensorStats(None, None, None, nan_count, None, None)
+    return TensorStats(minimum, maximum, total / count, nan_count, l1_norm,
+                       float(np.sqrt(l2_squared)))
+
+  return _map_tensors(tensor_stats, list(tensor_names), num_threads)
+
+
+def _tensor_digest(checkpoint_slices, key):
+  """Returns a digest of a tensor which doesn't depend on its slicing."""
+  dtype = checkpoint_slices.dtype_map[key]
+  shape = checkpoint_slices.shape_map[key]
+  digest = hashlib.sha256(("%s %s" % (dtype.name, shape)).encode("utf-8"))
+  if np.prod(shape, dtype=np.int64) == 0:
+    return digest.digest()
+  for value in checkpoint_slices.read(key):
+    # Fingerprints each row, so the digest is the same for any slicing along
+    # the first axis.
+    rows = array_ops.reshape(value, [value.shape[0] if shape else 1, -1])
+    digest.update(array_ops.fingerprint(rows).numpy().tobytes())
+  return digest.digest()
+
+
+def diff_checkpoints(file_name, other_file_name, num_threads=None):
+  """Compares the tensors of two checkpoints by digest.
+
+  Tensors are read one stored slice at a time, on `num_threads` threads, and
+  only digests of the slices are kept, so neither checkpoint is loaded in
+  memory. Tensors with different dtypes or shapes are not read.
+
+  Args:
+    file_name: Name of the checkpoint file.
+    other_file_name: Name of the checkpoint file to compare against.
+    num_threads: The number of threads to read tensors on. Defaults to the
+      default of `concurrent.futures.ThreadPoolExecutor`.
+
+  Returns:
+    A `CheckpointDiff` of sorted lists of tensor names: `added` are only in
+    `other_file_name`, `removed` only in `file_name`, and `changed` and
+    `unchanged` are in both. Resource and variant tensors, which have no
+    contents to compare, are only listed if they were added or removed. Keys
+    describing the checkpoints themselves, such as the object graph and shard
+    layout, are not compared.
+  """
+  checkpoint_slices = _CheckpointSlices(file_name)
+  other_slices = _CheckpointSlices(other_file_name)
+  keys = set(checkpoint_slices.shape_map)
+  other_keys = set(other_slices.shape_map)
+  changed = []
+  compared = []
+  for key in sorted(keys & other_keys):
+    if (checkpoint_slices.dtype_map[key] != other_slices.dtype_map[key] or
+        checkpoint_slices.shape_map[key] != other_slices.shape_map[key]):
+      changed.append(key)
+    elif checkpoint_slices.dtype_map[key] in (dtypes.resource, dtypes.variant):
+      continue
+    else:
+      compared.append(key)
+
+  def is_unchanged(key):
+    return (_tensor_digest(checkpoint_slices, key) ==
+            _tensor_digest(other_slices, key))
+
+  unchanged = []
+  for key, equal in _map_tensors(is_unchanged, compared, num_threads).items():
+    (unchanged if equal else changed).append(key)
+  return CheckpointDiff(
+      added=sorted(other_keys - keys),
+      removed=sorted(keys - other_keys),
+      changed=sorted(changed),
+      unchanged=sorted(unchanged))
+
+
+def print_tensor_stats_in_checkpoint_file(file_name, tensor_name="",
+                                          num_threads=None):
+  """Prints statistics of the tensors in a checkpoint file.
+
+  Args:
+    file_name: Name of the checkpoint file.
+    tensor_name: Name of the tensor to print statistics of. Defaults to all the
+      numeric tensors.
+    num_threads: The number of threads to read tensors on.
+  """
+  metadata = get_tensor_metadata(file_name)
+  try:
+    stats = compute_tensor_stats(
+        file_name, [tensor_name] if tensor_name else None, num_threads)
+  except ValueError as e:
+    print(str(e))
+    return
+  for key, tensor_stats in sorted(stats.items()):
+    print("tensor: %s (%s) %s min=%s max=%s mean=%s nan_count=%d "
+          "l1_norm=%s l2_norm=%s" % (
+              key, metadata[key].dtype.name, metadata[key].shape,
+              tensor_stats.min, tensor_stats.max, tensor_stats.mean,
+              tensor_stats.nan_count, tensor_stats.l1_norm,
+              tensor_stats.l2_norm))
+
+
+def print_checkpoint_diff(file_name, other_file_name, num_threads=None):
+  """Prints the tensors which differ between two checkpoint files.
+
+  Args:
+    file_name: Name of the checkpoint file.
+    other_file_name: Name of the checkpoint file to compare against.
+    num_threads: The number of threads to read tensors on.
+  """
+  diff = diff_checkpoints(file_name, other_file_name, num_threads)
+  for label, keys in (("added", diff.added), ("removed", diff.removed),
+                      ("changed", diff.changed)):
+    for key in keys:
+      print("%s: %s" % (label, key))
+  print("# %d added, %d removed, %d changed, %d unchanged tensors." % (
+      len(diff.added), len(diff.removed), len(diff.changed),
+      len(diff.unchanged)))
+
+
 def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
                                      all_tensor_names=False,
                                      count_exclude_pattern=""):
@@ -69,7 +367,7 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
     count_exclude_pattern: Regex string, pattern to exclude tensors when count.
   """
   try:
-    reader = py_checkpoint_reader.NewCheckpointReader(file_name)
+    reader = delta_checkpoint.new_checkpoint_reader(file_name)
     if all_tensors or all_tensor_names:
       var_to_shape_map = reader.get_variable_to_shape_map()
       var_to_dtype_map = reader.get_variable_to_dtype_map()
@@ -151,8 +449,17 @@ def main(unused_argv):
           "[--tensor_name=tensor_to_print] "
           "[--all_tensors] "
           "[--all_tensor_names] "
+          "[--tensor_stats] "
+          "[--diff_with=other_checkpoint_file_name] "
+          "[--num_threads=n] "
           "[--printoptions]")
     sys.exit(1)
+  elif FLAGS.diff_with:
+    print_checkpoint_diff(
+        FLAGS.file_name, FLAGS.diff_with, num_threads=FLAGS.num_threads)
+  elif FLAGS.tensor_stats:
+    print_tensor_stats_in_checkpoint_file(
+        FLAGS.file_name, FLAGS.tensor_name, num_threads=FLAGS.num_threads)
   else:
     print_tensors_in_checkpoint_file(
         FLAGS.file_name, FLAGS.tensor_name,
@@ -194,6 +501,26 @@ if __name__ == "__main__":
       type="bool",
       default=False,
       help="If True, print the names of all the tensors.")
+  parser.add_argument(
+      "--tensor_stats",
+      nargs="?",
+      const=True,
+      type="bool",
+      default=False,
+      help="If True, print the min, max, mean, NaN count and norms of the "
+      "tensor named by --tensor_name, or of all numeric tensors.")
+  parser.add_argument(
+      "--diff_with",
+      type=str,
+      default="",
+      help="Checkpoint filename to compare against. Prints the tensors which "
+      "were added, removed or changed, compared by digest.")
+  parser.add_argument(
+      "--num_threads",
+      type=int,
+      default=None,
+      help="Number of threads to read tensors on for --tensor_stats and "
+      "--diff_with.")
   parser.add_argument(
       "--printoptions",
       nargs="*",
@@ -0,0 +1,86 @@
+# Copyright 2024 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for inspect_checkpoint."""
+
+import os
+
+import numpy as np
+
+from tensorflow.python.checkpoint import checkpoint
+from tensorflow.python.checkpoint import checkpoint_options
+from tensorflow.python.checkpoint.sharding import sharding_policies
+from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
+from tensorflow.python.ops import variables
+from tensorflow.python.tools import inspect_checkpoint
+
+_KEY = "v/.ATTRIBUTES/VARIABLE_VALUE"
+
+
+class InspectCheckpointTest(test.TestCase):
+
+  def _save(self, name, options=None, **kwargs):
+    ckpt = checkpoint.Checkpoint(
+        **{k: variables.Variable(v) for k, v in kwargs.items()})
+    return ckpt.write(os.path.join(self.get_temp_dir(), name), options=options)
+
+  def test_tensor_metadata(self):
+    path = self._save("ckpt", v=np.zeros([3, 4], np.float32))
+    metadata = inspect_checkpoint.get_tensor_metadata(path)
+    self.assertEqual([3, 4], metadata[_KEY].shape)
+    self.assertEqual("float32", metadata[_KEY].dtype.name)
+    self.assertEqual(48, metadata[_KEY].num_bytes)
+    self.assertNotIn("_CHECKPOINTABLE_OBJECT_GRAPH", metadata)
+
+  def test_tensor_stats(self):
+    path = self._save(
+        "ckpt", v=constant_op.constant([[-3., np.nan], [4., 0.]]),
+        step=constant_op.constant(7))
+    stats = inspect_checkpoint.compute_tensor_stats(path, num_threads=2)
+    self.assertEqual(1, stats[_KEY].nan_count)
+    self.assertEqual(-3., stats[_KEY].min)
+    self.assertEqual(4., stats[_KEY].max)
+    self.assertAllClose(1. / 3, stats[_KEY].mean)
+    self.assertAllClose(7., stats[_KEY].l1_norm)
+    self.assertAllClose(5., stats[_KEY].l2_norm)
+    self.assertEqual(7, stats["step/.ATTRIBUTES/VARIABLE_VALUE"].max)
+    self.assertNotIn("_CHECKPOINTABLE_OBJECT_GRAPH", stats)
+
+  def test_tensor_stats_invalid_name(self):
+    path = self._save("ckpt", v=1., name=constant_op.constant("a"))
+    with self.assertRaisesRegex(ValueError, "not found"):
+      inspect_checkpoint.compute_tensor_stats(path, ["unknown"])
+    with self.assertRaisesRegex(ValueError, "only numeric tensors"):
+      inspect_checkpoint.compute_tensor_stats(
+          path, ["name/.ATTRIBUTES/VARIABLE_VALUE"])
+
+  def test_diff(self):
+    values = np.arange(40, dtype=np.float32).reshape([10, 4])
+    path = self._save("a", v=values, w=1., removed=2.)
+    # Saving in slices doesn't change the digest of `v`.
+    other_path = self._save(
+        "b", v=values, w=3., added=4.,
+        options=checkpoint_options.CheckpointOptions(
+            experimental_sharding_callback=(
+                sharding_policies.BalancedShardSizePolicy(num_shards=2))))
+    diff = inspect_checkpoint.diff_checkpoints(path, other_path)
+    self.assertEqual(["added/.ATTRIBUTES/VARIABLE_VALUE"], diff.added)
+    self.assertEqual(["removed/.ATTRIBUTES/VARIABLE_VALUE"], diff.removed)
+    self.assertEqual(["w/.ATTRIBUTES/VARIABLE_VALUE"], diff.changed)
+    self.assertEqual([_KEY], diff.unchanged)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -24,6 +24,7 @@ import os
 import time
 
 from tensorflow.python.checkpoint import checkpoint_management
+from tensorflow.python.checkpoint import delta_checkpoint
 from tensorflow.python.distribute import distribute_lib
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import io_ops
@@ -32,7 +33,6 @@ from tensorflow.python.ops import variable_scope as vs
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
-from tensorflow.python.training import py_checkpoint_reader
 from tensorflow.python.training.saving import saveable_object_util
 from tensorflow.python.util.tf_export import tf_export
 
@@ -48,7 +48,9 @@ def load_checkpoint(ckpt_dir_or_file):
   """Returns `CheckpointReader` for checkpoint found in `ckpt_dir_or_file`.
 
   If `ckpt_dir_or_file` resolves to a directory with multiple checkpoints,
-  reader for the latest checkpoint is returned.
+  reader for the latest checkpoint is returned. For delta and deduplicated
+  checkpoints (see `tf.train.CheckpointOptions`), the reader also reads the
+  tensors stored in the checkpoints they are based on.
 
   Example usage:
 
@@ -77,7 +79,7 @@ def load_checkpoint(ckpt_dir_or_file):
   if filename is None:
     raise ValueError("Couldn't find 'checkpoint' file or checkpoints in "
                      "given directory %s" % ckpt_dir_or_file)
-  return py_checkpoint_reader.NewCheckpointReader(filename)
+  return delta_checkpoint.new_checkpoint_reader(filename)
 
 
 @tf_export("train.load_variable")
@@ -384,6 +386,11 @@ def _init_from_checkpoint(ckpt_dir_or_file, assignment_map):
   ckpt_file = _get_checkpoint_filename(ckpt_dir_or_file)
   reader = load_checkpoint(ckpt_dir_or_file)
   variable_map = reader.get_variable_to_shape_map()
+  # Tensors of delta and deduplicated checkpoints may be stored in other
+  # checkpoints.
+  tensor_locations = {}
+  if isinstance(reader, delta_checkpoint.DeltaCheckpointReader):
+    tensor_locations = reader.tensor_locations
   if isinstance(assignment_map, abc.Mapping):
     assignment_map = assignment_map.items()
 
@@ -425,7 +432,9 @@ def _init_from_checkpoint(ckpt_dir_or_file, assignment_map):
         var_name = var.name
       else:
         var_name = ",".join(v.name for v in var)
-      _set_variable_or_list_initializer(var, ckpt_file, tensor_name_in_ckpt)
+      _set_variable_or_list_initializer(
+          var, tensor_locations.get(tensor_name_in_ckpt, ckpt_file),
+          tensor_name_in_ckpt)
       logging.debug("Initialize variable %s from checkpoint %s with %s",
                     var_name, ckpt_dir_or_file, tensor_name_in_ckpt)
     else:
@@ -467,7 +476,9 @@ def _init_from_checkpoint(ckpt_dir_or_file, assignment_map):
         var = store_vars.get(var_name, None)
         if var is None:
           var = _collect_partitioned_variable(var_name, store_vars)
-        _set_variable_or_list_initializer(var, ckpt_file, full_tensor_name)
+        _set_variable_or_list_initializer(
+            var, tensor_locations.get(full_tensor_name, ckpt_file),
+            full_tensor_name)
         logging.debug("Initialize variable %s from checkpoint %s with %s",
                       var_name, ckpt_dir_or_file, full_tensor_name)
 
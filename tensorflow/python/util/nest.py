@@ -630,6 +630,41 @@ def map_structure(func, *structure, **kwargs):
   )
 
 
+def structure_plan(structure, expand_composites=False):
+  """Compiles `structure` into a plan for repeated flattening and packing.
+
+  The plan walks the type hierarchy of `structure` and sorts its dictionary
+  keys once, so that hot loops processing many values of the same structure
+  do not pay for it on every call:
+
+  >>> plan = structure_plan({"b": 1, "a": (2, 3)})
+  >>> plan.pack([4, 5, 6])
+  {'b': 6, 'a': (4, 5)}
+  >>> plan.map(lambda x, y: x + y, {"b": 1, "a": (2, 3)}, {"b": 1, "a": (1, 1)})
+  {'b': 2, 'a': (3, 4)}
+  >>> plan.flatten_up_to({"b": [7], "a": ([8], 9)})
+  [[8], 9, [7]]
+
+  `plan.pack(flat_sequence)` is equivalent to
+  `pack_sequence_as(structure, flat_sequence)`, `plan.flatten_up_to(tree)` to
+  `flatten_up_to(structure, tree)` and `plan.map(func, *values)` to
+  `map_structure(func, *values)` for values with the structure of the plan.
+
+  Args:
+    structure: an arbitrarily nested structure. The plan holds on to it and
+      assumes that it is not mutated.
+    expand_composites: If true, then composite tensors such as
+      `tf.sparse.SparseTensor` and `tf.RaggedTensor` are expanded into their
+      component tensors.
+
+  Returns:
+    A `nest_util.StructurePlan` for `structure`.
+  """
+  return nest_util.StructurePlan(
+      nest_util.Modality.CORE, structure, expand_composites
+  )
+
+
 def map_structure_with_paths(func, *structure, **kwargs):
   """Applies `func` to each entry in `structure` and returns a new structure.
 
@@ -889,6 +889,120 @@ class NestTest(parameterized.TestCase, test.TestCase):
         ValueError, "Structure had 2 atoms, but flat_sequence had 1 items."):
       nest.pack_sequence_as(val, [val], expand_composites=True)
 
+  def testStructurePlanPack(self):
+    structure = [self.PointXY(x=1, y=(2, 3)),
+                 collections.OrderedDict([("d", 4), ("b", 5)]),
+                 {"z": None, "a": [6]}]
+    plan = nest.structure_plan(structure)
+    self.assertIs(plan.structure, structure)
+    self.assertEqual(plan.num_leaves, 7)
+    self.assertEqual(plan.flatten(structure), nest.flatten(structure))
+    plan.assert_same_structure(structure)
+
+    flat = list("abcdefg")
+    packed = plan.pack(flat)
+    self.assertEqual(packed, nest.pack_sequence_as(structure, flat))
+    self.assertIsInstance(packed[0], self.PointXY)
+    self.assertEqual(list(packed[1]), ["d", "b"])
+    self.assertEqual(list(packed[2]), ["z", "a"])
+
+    self.assertEqual("a", nest.structure_plan(None).pack(["a"]))
+    with self.assertRaisesRegex(ValueError, "Could not pack sequence"):
+      plan.pack(flat[:-1])
+    with self.assertRaisesRegex(TypeError, "flat_sequence"):
+      plan.pack("bye")
+    with self.assertRaises(ValueError):
+      plan.assert_same_structure([1, 2])
+
+  def testStructurePlanMap(self):
+    structure = {"b": [1, 2], "a": self.PointXY(x=3, y=4)}
+    plan = nest.structure_plan(structure)
+    self.assertEqual(
+        plan.map(lambda x, y: x * y, structure, structure),
+        nest.map_structure(lambda x, y: x * y, structure, structure))
+    with self.assertRaisesRegex(ValueError, "same nested structure"):
+      plan.map(lambda x: x, {"b": [1], "a": self.PointXY(x=3, y=4)})
+    # Values with as many leaves as the plan but a different nesting or
+    # different keys are rejected like in `map_structure`.
+    with self.assertRaisesRegex(ValueError, "same nested structure"):
+      plan.map(lambda x: x, {"b": [1, [2]], "a": self.PointXY(x=3, y=4)})
+    with self.assertRaises(ValueError):
+      plan.map(lambda x: x, {"c": [1, 2], "a": self.PointXY(x=3, y=4)})
+    with self.assertRaises(TypeError):
+      plan.map(lambda x: x, {"b": (1, 2), "a": self.PointXY(x=3, y=4)})
+    self.assertEqual(
+        plan.map(lambda x: x, {"b": (1, 2), "a": self.PointXY(x=3, y=4)},
+                 check_types=False),
+        {"b": [1, 2], "a": self.PointXY(x=3, y=4)})
+    with self.assertRaises(ValueError):
+      plan.map(lambda x: x)
+    with self.assertRaises(TypeError):
+      plan.map("not callable", structure)
+
+  def testStructurePlanMapOtherTypes(self):
+    structure = {"b": [1, 2], "a": self.PointXY(x=3, y=4)}
+    plan = nest.structure_plan(structure)
+    # Values whose node types are those of the plan are not checked again.
+    with test.mock.patch.object(
+        type(plan), "assert_same_structure", side_effect=AssertionError):
+      self.assertEqual(plan.map(lambda x, y: x + y, structure, structure),
+                       {"b": [2, 4], "a": self.PointXY(x=6, y=8)})
+    # Values whose node types differ from the plan are checked like in
+    # `map_structure`.
+    ordered = collections.OrderedDict(b=[1, 2], a=self.PointXY(x=3, y=4))
+    self.assertEqual(
+        plan.map(lambda x, y: x + y, structure, ordered),
+        nest.map_structure(lambda x, y: x + y, structure, ordered))
+    defaultdict = collections.defaultdict(list)
+    defaultdict["b"] = [1, 2]
+    defaultdict["c"] = self.PointXY(x=3, y=4)
+    with self.assertRaises(ValueError):
+      plan.map(lambda x: x, defaultdict)
+    self.assertNotIn("a", defaultdict)
+
+  def testStructurePlanFlatten(self):
+    structure = {"b": [1, 2], "a": self.PointXY(x=3, y=4)}
+    plan = nest.structure_plan(structure)
+    self.assertEqual(plan.flatten(structure), [3, 4, 1, 2])
+    # Only the number of leaves is checked.
+    self.assertEqual(plan.flatten(([1], (2, 3), {"x": 4})), [1, 2, 3, 4])
+    self.assertEqual(plan.flatten({"b": [1, [2]], "a": [3, 4]}),
+                     [3, 4, 1, 2])
+    with self.assertRaisesRegex(ValueError, "Expected a structure with 4"):
+      plan.flatten({"b": [1, [2, 5]], "a": self.PointXY(x=3, y=4)})
+
+  def testStructurePlanMapCompositeTensor(self):
+    rt = ragged_tensor.RaggedTensor.from_row_splits(values=[1, 2],
+                                                    row_splits=[0, 1, 2])
+    plan = nest.structure_plan((rt, 3), expand_composites=True)
+    self.assertEqual(plan.num_leaves, 3)
+    result = plan.map(lambda x, y: y, (rt, 3), (rt, 4))
+    self.assertIsInstance(result[0], ragged_tensor.RaggedTensor)
+    self.assertAllEqual(result[0].values, [1, 2])
+    self.assertEqual(result[1], 4)
+
+  def testStructurePlanFlattenUpTo(self):
+    shallow_tree = [self.PointXY(x=0, y=0), {"b": 0, "a": 0}, 0]
+    plan = nest.structure_plan(shallow_tree)
+    input_tree = [self.PointXY(x=[1], y=(2, 3)), {"a": 4, "b": {"c": 5}}, [6]]
+    self.assertEqual(plan.flatten_up_to(input_tree),
+                     nest.flatten_up_to(shallow_tree, input_tree))
+    self.assertEqual(plan.flatten_up_to(input_tree),
+                     [[1], (2, 3), 4, {"c": 5}, [6]])
+
+    # Inputs that differ in type from the plan take the generic path.
+    ordered = [self.PointXY(x=1, y=2), collections.OrderedDict(a=3, b=4), 5]
+    self.assertEqual(plan.flatten_up_to(ordered), [1, 2, 3, 4, 5])
+    with self.assertRaisesRegex(TypeError, "don't have the same sequence type"):
+      plan.flatten_up_to((self.PointXY(x=1, y=2), {"b": 0, "a": 0}, 0))
+    self.assertEqual(
+        plan.flatten_up_to((self.PointXY(x=1, y=2), {"b": 3, "a": 4}, 5),
+                           check_types=False), [1, 2, 4, 3, 5])
+    with self.assertRaisesRegex(ValueError, "same sequence length"):
+      plan.flatten_up_to([self.PointXY(x=1, y=2), {"b": 3, "a": 4}])
+    with self.assertRaisesRegex(ValueError, "not in the input_tree"):
+      plan.flatten_up_to([self.PointXY(x=1, y=2), {"b": 3, "c": 4}, 5])
+
   @test_util.assert_no_new_pyobjects_executing_eagerly()
   def testIsNested(self):
     self.assertFalse(nest.is_nested("1234"))
@@ -1934,6 +2048,26 @@ class NestBenchmark(test.Benchmark):
     self.report_benchmark(iters=test_iter, wall_time=(t1 - t0) / test_iter,
                           name=name)
 
+  def benchmark_structure_plan_map(self):
+    structure = [{"ids": i, "mask": (i, i), "labels": [i, i]}
+                 for i in range(10)]
+    plan = nest.structure_plan(structure)
+    add = lambda x, y: x + y
+    burn_iter, test_iter = 100, 10000
+    for name, map_fn in [
+        ("map_structure", lambda: nest.map_structure(add, structure,
+                                                     structure)),
+        ("structure_plan_map", lambda: plan.map(add, structure, structure)),
+    ]:
+      for _ in range(burn_iter):
+        map_fn()
+      t0 = time.time()
+      for _ in range(test_iter):
+        map_fn()
+      t1 = time.time()
+      self.report_benchmark(iters=test_iter, wall_time=(t1 - t0) / test_iter,
+                            name="%s_50_elem" % name)
+
   def benchmark_assert_structure(self):
     s1 = (((1, 2), 3), 4, (5, 6))
     s2 = ((("foo1", "foo2"), "foo3"), "foo4", ("foo5", "foo6"))
@@ -26,6 +26,8 @@ avoid / minimize further divergence between the two APIs over time.
 
 import collections as _collections
 import enum
+import functools as _functools
+import operator as _operator
 
 import wrapt as _wrapt
 
@@ -1724,3 +1726,452 @@ def _tf_data_map_structure_up_to(shallow_tree, func, *inputs):
   return _tf_data_pack_sequence_as(
       structure=shallow_tree, flat_sequence=results
   )
+
+
+def _sequence_like_fn(instance):
+  """Returns a function equivalent to `sequence_like(instance, args)`.
+
+  The type dispatch of `sequence_like` and, for dictionaries, the key sort are
+  resolved once, so that the returned function can rebuild `instance`-like
+  values repeatedly at the cost of a single constructor call.
+
+  Args:
+    instance: a nested structure instance, see `sequence_like`.
+
+  Returns:
+    A function taking a list of items and returning them with the type of
+    `instance`.
+  """
+  instance_type = type(instance)
+  if instance_type is tuple or instance_type is list:
+    return instance_type
+  if instance_type in (dict, _collections.OrderedDict, _collections.defaultdict):
+    # `args` follow the sorted key order, the result follows `instance`'s own.
+    sorted_position = {key: i for i, key in enumerate(_tf_core_sorted(instance))}
+    keys = tuple(instance)
+    permutation = tuple(sorted_position[key] for key in keys)
+    if instance_type is _collections.defaultdict:
+      default_factory = instance.default_factory
+
+      def make_defaultdict(args):
+        result = _collections.defaultdict(default_factory)
+        result.update(zip(keys, [args[i] for i in permutation]))
+        return result
+
+      return make_defaultdict
+
+    def make_dict(args):
+      return instance_type(zip(keys, [args[i] for i in permutation]))
+
+    return make_dict
+  if not isinstance(instance, _wrapt.ObjectProxy) and (
+      is_namedtuple(instance) or _is_attrs(instance)
+  ):
+    return lambda args: instance_type(*args)
+  return _functools.partial(sequence_like, instance)
+
+
+def _compile_packer(structure, index, is_nested_fn, yield_value_fn):
+  """Compiles a function packing flat values into `structure`.
+
+  Args:
+    structure: Substructure to mimic.
+    index: Index into the flat values at which `structure` starts.
+    is_nested_fn: Function used to test if a value should be treated as a nested
+      structure.
+    yield_value_fn: Function yielding the children of a nested structure.
+
+  Returns:
+    The tuple (new_index, packer), where:
+      * new_index - the index into the flat values following `structure`.
+      * packer - a function mapping a flat sequence to the value for
+                 `structure`, reading from `index` onwards.
+  """
+  if not is_nested_fn(structure):
+    return index + 1, _operator.itemgetter(index)
+  children = []
+  for s in yield_value_fn(structure):
+    index, child = _compile_packer(s, index, is_nested_fn, yield_value_fn)
+    children.append(child)
+  children = tuple(children)
+  make = _sequence_like_fn(structure)
+
+  def packer(flat):
+    return make([child(flat) for child in children])
+
+  return index, packer
+
+
+# Node types whose children can be read directly off an input of the very same
+# type, by position or by key, when flattening up to a compiled structure.
+_POSITIONAL_NODE_TYPES = (tuple, list)
+_KEYED_NODE_TYPES = (dict, _collections.OrderedDict, _collections.defaultdict)
+
+
+def _compile_flattener_up_to(
+    modality, shallow_tree, is_nested_fn, yield_value_fn, expand_composites
+):
+  """Compiles a function flattening values up to `shallow_tree`.
+
+  Nodes of `shallow_tree` that are plain tuples, lists, namedtuples or dicts are
+  matched against inputs of the same type and length without re-deriving the
+  shallow structure. Any other input is handed to `flatten_up_to` for that
+  subtree, so errors and type checks are the same as for `flatten_up_to`.
+
+  Args:
+    modality: enum value of supported modality [Modality.CORE or Modality.DATA]
+    shallow_tree: Substructure to flatten up to.
+    is_nested_fn: Function used to test if a value should be treated as a nested
+      structure.
+    yield_value_fn: Function yielding the children of a nested structure.
+    expand_composites: Arg valid for Modality.CORE only, see `flatten_up_to`.
+
+  Returns:
+    A function `(input_tree, flat, check_types)` appending the values of
+    `input_tree` up to `shallow_tree` to the list `flat`.
+  """
+  if not is_nested_fn(shallow_tree):
+    return lambda value, flat, check_types: flat.append(value)
+
+  def flatten_slow(value, flat, check_types):
+    if modality == Modality.CORE:
+      flat.extend(
+          flatten_up_to(
+              modality, shallow_tree, value, check_types, expand_composites
+          )
+      )
+    else:
+      flat.extend(flatten_up_to(modality, shallow_tree, value))
+
+  node_type = type(shallow_tree)
+  if node_type in _KEYED_NODE_TYPES:
+    keys = tuple(_tf_core_sorted(shallow_tree))
+  elif node_type in _POSITIONAL_NODE_TYPES or (
+      is_namedtuple(shallow_tree) and not _is_attrs(shallow_tree)
+  ):
+    keys = None
+  else:
+    return flatten_slow
+
+  children = tuple(
+      _compile_flattener_up_to(
+          modality, s, is_nested_fn, yield_value_fn, expand_composites
+      )
+      for s in yield_value_fn(shallow_tree)
+  )
+  num_children = len(children)
+
+  def flatten_fast(value, flat, check_types):
+    if type(value) is not node_type or len(value) != num_children:  # pylint: disable=unidiomatic-typecheck
+      return flatten_slow(value, flat, check_types)
+    if keys is not None:
+      try:
+        value = [value[key] for key in keys]
+      except KeyError:
+        return flatten_slow(value, flat, check_types)
+    for child, v in zip(children, value):
+      child(v, flat, check_types)
+
+  return flatten_fast
+
+
+def _compile_flattener(structure, is_nested_fn, yield_value_fn):
+  """Compiles a function flattening values nested exactly like `structure`.
+
+  The compiled function only accepts inputs whose nodes have the very same type,
+  length and keys as those of `structure`, and whose leaves are not nested.
+  Such inputs have the same structure as `structure` whatever `check_types`,
+  so they need not be checked with `assert_same_structure`.
+
+  Args:
+    structure: The nested structure to compile.
+    is_nested_fn: Function used to test if a value should be treated as a nested
+      structure.
+    yield_value_fn: Function yielding the children of a nested structure.
+
+  Returns:
+    A function `(value, flat)` appending the leaves of `value` to the list
+    `flat` and returning whether `value` matched, or None if `structure` has
+    nodes other than plain tuples, lists, namedtuples or dicts.
+  """
+  if not is_nested_fn(structure):
+
+    def flatten_leaf(value, flat):
+      if is_nested_fn(value):
+        return False
+      flat.append(value)
+      return True
+
+    return flatten_leaf
+
+  node_type = type(structure)
+  if node_type in _KEYED_NODE_TYPES:
+    keys = tuple(_tf_core_sorted(structure))
+    key_set = frozenset(keys)
+  elif node_type in _POSITIONAL_NODE_TYPES or (
+      is_namedtuple(structure) and not _is_attrs(structure)
+  ):
+    keys = None
+  else:
+    return None
+
+  children = []
+  for s in yield_value_fn(structure):
+    child = _compile_flattener(s, is_nested_fn, yield_value_fn)
+    if child is None:
+      return None
+    children.append(child)
+  children = tuple(children)
+  num_children = len(children)
+
+  def flatten_node(value, flat):
+    if type(value) is not node_type or len(value) != num_children:  # pylint: disable=unidiomatic-typecheck
+      return False
+    if keys is not None:
+      if value.keys() != key_set:
+        return False
+      value = [value[key] for key in keys]
+    for child, v in zip(children, value):
+      if not child(v, flat):
+        return False
+    return True
+
+  return flatten_node
+
+
+class StructurePlan(object):
+  """A nested structure compiled for repeated flattening and packing.
+
+  Creating a plan walks `structure` once, resolving the type of every nested
+  node and the sorted key order of every dictionary. Packing, mapping and
+  flattening up to the structure then reuse that work, which makes a plan
+  considerably cheaper than the corresponding module level functions when the
+  same structure is processed many times, e.g. once per element of a `tf.data`
+  pipeline or once per training step.
+
+  A plan holds on to `structure` and assumes that it is not mutated.
+  """
+
+  __slots__ = (
+      "_modality",
+      "_structure",
+      "_expand_composites",
+      "_is_nested_fn",
+      "_num_leaves",
+      "_packer",
+      "_flattener",
+      "_flattener_up_to",
+  )
+
+  def __init__(self, modality, structure, expand_composites=False):
+    """Compiles `structure` into a plan.
+
+    Args:
+      modality: enum value of supported modality [Modality.CORE or
+        Modality.DATA]
+      structure: the nested structure to compile.
+      expand_composites: Arg valid for Modality.CORE only. If true, then
+        composite tensors such as `tf.sparse.SparseTensor` and
+        `tf.RaggedTensor` are expanded into their component tensors.
+
+    Raises:
+      ValueError: If `modality` is unknown.
+    """
+    if modality == Modality.CORE:
+      expand_composites = bool(expand_composites)
+      is_nested_fn = (
+          _is_nested_or_composite if expand_composites else _tf_core_is_nested
+      )
+      yield_value_fn = _tf_core_yield_value
+    elif modality == Modality.DATA:
+      expand_composites = False
+      is_nested_fn = _tf_data_is_nested
+      yield_value_fn = _tf_data_yield_value
+    else:
+      raise ValueError(
+          "Unknown modality used {} for nested structure".format(modality)
+      )
+    self._modality = modality
+    self._structure = structure
+    self._expand_composites = expand_composites
+    self._is_nested_fn = is_nested_fn
+    self._num_leaves, self._packer = _compile_packer(
+        structure, 0, is_nested_fn, yield_value_fn
+    )
+    self._flattener = _compile_flattener(
+        structure, is_nested_fn, yield_value_fn
+    )
+    self._flattener_up_to = _compile_flattener_up_to(
+        modality, structure, is_nested_fn, yield_value_fn, expand_composites
+    )
+
+  @property
+  def modality(self):
+    return self._modality
+
+  @property
+  def structure(self):
+    """The nested structure this plan was compiled from."""
+    return self._structure
+
+  @property
+  def num_leaves(self):
+    """The number of leaves in the structure."""
+    return self._num_leaves
+
+  def flatten(self, value):
+    """Returns a flat list of the leaves of `value`.
+
+    Only the number of leaves is checked against the plan, use
+    `assert_same_structure` to validate the structure of `value` fully.
+
+    Args:
+      value: a nested structure matching the plan.
+
+    Returns:
+      A Python list, the flattened version of `value`.
+
+    Raises:
+      ValueError: If `value` does not have as many leaves as the plan.
+    """
+    flat = self._flatten_matching(value)
+    if flat is not None:
+      return flat
+    flat = self._flatten(value)
+    if len(flat) != self._num_leaves:
+      raise ValueError(
+          f"Expected a structure with {self._num_leaves} elements, but got "
+          f"{len(flat)} elements. Received: {value}."
+      )
+    return flat
+
+  def pack(self, flat_sequence):
+    """Returns `flat_sequence` packed into the structure of the plan.
+
+    Equivalent to `pack_sequence_as(self.structure, flat_sequence)`.
+
+    Args:
+      flat_sequence: flat sequence to pack.
+
+    Returns:
+      `flat_sequence` converted to have the same recursive structure as the
+      plan.
+
+    Raises:
+      TypeError: If `flat_sequence` is not a sequence.
+      ValueError: If `flat_sequence` does not have as many elements as the plan
+        has leaves.
+    """
+    if not (
+        isinstance(flat_sequence, list) or self._is_nested_fn(flat_sequence)
+    ):
+      raise TypeError(
+          "Argument `flat_sequence` must be a sequence. Got "
+          f"'{type(flat_sequence).__name__}'."
+      )
+    if len(flat_sequence) != self._num_leaves:
+      raise ValueError(
+          "Could not pack sequence. Argument `structure` had "
+          f"{self._num_leaves} elements, but argument `flat_sequence` had "
+          f"{len(flat_sequence)} elements. Received structure: "
+          f"{self._structure}, flat_sequence: {flat_sequence}."
+      )
+    return self._packer(flat_sequence)
+
+  def map(self, func, *values, check_types=True):
+    """Applies `func` to the leaves of `values` and packs the results.
+
+    Equivalent to `map_structure(func, *values, check_types=check_types)` for
+    values matching the plan, with the result packed into the structure of the
+    plan. Values whose nodes have the same types as those of the plan are
+    flattened by the compiled plan, others are checked against the plan with
+    `assert_same_structure`.
+
+    Args:
+      func: A callable that accepts as many arguments as there are values.
+      *values: nested structures matching the plan.
+      check_types: If set to `True` (default) the types of iterables within the
+        values have to be the same as in the plan, see `map_structure`.
+
+    Returns:
+      A new structure with the structure of the plan, whose leaves are the
+      return values of `func`.
+
+    Raises:
+      TypeError: If `func` is not callable or if a value differs from the plan
+        in the type of sequence in any of its substructures.
+      ValueError: If no values are provided or if a value is not nested in the
+        same way as the plan.
+    """
+    if not callable(func):
+      raise TypeError(f"Argument `func` must be callable, got: {func}")
+    if not values:
+      raise ValueError("Must provide at least one structure")
+    flat_values = []
+    for value in values:
+      flat = self._flatten_matching(value)
+      if flat is None:
+        self.assert_same_structure(value, check_types)
+        flat = self._flatten(value)
+      flat_values.append(flat)
+    return self._packer([func(*args) for args in zip(*flat_values)])
+
+  def _flatten(self, value):
+    if self._modality == Modality.CORE:
+      return _tf_core_flatten(value, self._expand_composites)
+    return _tf_data_flatten(value)
+
+  def _flatten_matching(self, value):
+    """Returns the leaves of `value` if it matches the compiled plan, or None."""
+    if self._flattener is None:
+      return None
+    flat = []
+    if not self._flattener(value, flat):
+      return None
+    return flat
+
+  def flatten_up_to(self, input_tree, check_types=True):
+    """Flattens `input_tree` up to the structure of the plan.
+
+    Equivalent to `flatten_up_to(self.structure, input_tree, check_types)`.
+
+    Args:
+      input_tree: an arbitrarily nested structure whose upper levels match the
+        plan.
+      check_types: Arg valid for Modality.CORE only, see `flatten_up_to`.
+
+    Returns:
+      A Python list, the partially flattened version of `input_tree`.
+
+    Raises:
+      TypeError: If `input_tree` is not nested in the same way as the plan.
+      ValueError: If the structure lengths or keys of `input_tree` differ from
+        those of the plan.
+    """
+    flat = []
+    self._flattener_up_to(input_tree, flat, check_types)
+    return flat
+
+  def assert_same_structure(self, value, check_types=True):
+    """Asserts that `value` is nested in the same way as the plan.
+
+    Args:
+      value: an arbitrarily nested structure.
+      check_types: see `assert_same_structure`.
+
+    Raises:
+      ValueError: If `value` is not nested in the same way as the plan.
+      TypeError: If `value` differs from the plan in the type of sequence in any
+        of its substructures. Only possible if `check_types` is `True`.
+    """
+    if self._modality == Modality.CORE:
+      _tf_core_assert_same_structure(
+          self._structure, value, check_types, self._expand_composites
+      )
+    else:
+      _tf_data_assert_same_structure(self._structure, value, check_types)
+
+  def __repr__(self):
+    return "StructurePlan(modality={}, structure={})".format(
+        self._modality, self._structure
+    )
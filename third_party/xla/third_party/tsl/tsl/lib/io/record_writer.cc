@@ -155,5 +155,22 @@ Status RecordWriter::Flush() {
   return dest_->Flush();
 }
 
+Status RecordWriter::AppendRestartPoint() {
+  if (dest_ == nullptr) {
+    return Status(absl::StatusCode::kFailedPrecondition,
+                  "Writer not initialized or previously closed");
+  }
+#if !defined(IS_SLIM_BUILD)
+  if (IsZlibCompressed(options_)) {
+    return static_cast<ZlibOutputBuffer*>(dest_)->AppendRestartPoint();
+  }
+  if (IsSnappyCompressed(options_)) {
+    return dest_->Flush();
+  }
+#endif  // IS_SLIM_BUILD
+  // Uncompressed records are appended to the file as they are written.
+  return OkStatus();
+}
+
 }  // namespace io
 }  // namespace tsl
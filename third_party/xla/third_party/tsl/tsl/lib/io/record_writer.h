@@ -88,6 +88,11 @@ class RecordWriter {
   // WritableFile.
   Status Flush();
 
+  // Writes the records written so far to the WritableFile without flushing it.
+  // For ZLIB compression, the compressed stream can be inflated starting at the
+  // current position of the file afterwards.
+  Status AppendRestartPoint();
+
   // Writes all output to the file. Does *not* close the WritableFile.
   //
   // After calling Close(), any further calls to `WriteRecord()` or `Flush()`
@@ -201,11 +201,18 @@ Status ZlibOutputBuffer::Append(const absl::Cord& cord) {
 #endif
 
 Status ZlibOutputBuffer::Flush() {
-  TF_RETURN_IF_ERROR(DeflateBuffered(Z_PARTIAL_FLUSH));
+  TF_RETURN_IF_ERROR(DeflateBuffered(
+      zlib_options_.flush_mode == Z_FULL_FLUSH ? Z_FULL_FLUSH
+                                               : Z_PARTIAL_FLUSH));
   TF_RETURN_IF_ERROR(FlushOutputBufferToFile());
   return file_->Flush();
 }
 
+Status ZlibOutputBuffer::AppendRestartPoint() {
+  TF_RETURN_IF_ERROR(DeflateBuffered(Z_FULL_FLUSH));
+  return FlushOutputBufferToFile();
+}
+
 Status ZlibOutputBuffer::Name(StringPiece* result) const {
   return file_->Name(result);
 }
@@ -70,8 +70,17 @@ class ZlibOutputBuffer : public WritableFile {
 #endif
 
   // Deflates any cached input and writes all output to file.
+  //
+  // If the configured flush mode is Z_FULL_FLUSH the deflate state is reset,
+  // so the compressed stream can be inflated starting at the flushed position.
   Status Flush() override;
 
+  // Deflates any cached input with Z_FULL_FLUSH, so the compressed stream can
+  // be inflated starting at the current position, and appends all output to
+  // file. Contrary to `Flush()` this does not flush the underlying file, which
+  // is expensive on filesystems that rewrite the whole object on each flush.
+  Status AppendRestartPoint();
+
   // Compresses any cached input and writes all output to file. This must be
   // called before the destructor to avoid any data loss.
   //